@@ -18,7 +18,10 @@
 # ═══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
-from typing import Optional
+import hashlib
+from typing import Iterable, Mapping, Optional, Sequence
+
+import numpy as np
 
 from config.constants import (
     CI_ELECTRICITY,
@@ -39,6 +42,7 @@ from config.constants import (
     PART_L_2021_ND_U_GLAZING,
     FHS_MAX_PRIMARY_ENERGY,
 )
+from services import carbon_intensity
 
 # ─────────────────────────────────────────────────────────────────────────────
 # CONSTANTS — BEIS GHG Conversion Factors 2023
@@ -57,6 +61,10 @@ from config.constants import (
 _EPC_BANDS_LIST: list[tuple[int, str, str]] = [
     (b["threshold"], b["band"], b["colour"]) for b in EPC_BANDS
 ]
+# Ascending thresholds for the batch band search; band index 0 = A
+_BAND_THRESHOLDS = np.array([t for t, _, _ in reversed(_EPC_BANDS_LIST)], dtype=float)
+_BAND_LETTERS = np.array([b for _, b, _ in _EPC_BANDS_LIST] + ["G"])
+_BAND_COLOURS = np.array([c for _, _, c in _EPC_BANDS_LIST] + ["#C0392B"])
 
 # ─────────────────────────────────────────────────────────────────────────────
 # SEGMENT BUILDING TEMPLATES
@@ -106,6 +114,46 @@ def validate_u_value(u: float, label: str = "U-value") -> tuple[bool, str]:
 # EPC RATING ESTIMATION  (SAP 10.2 proxy, indicative)
 # ─────────────────────────────────────────────────────────────────────────────
 
+_RESIDENTIAL_TYPES = ("residential", "individual_selfbuild")
+
+
+def _sap_proxy(eui, u_wall, u_roof, u_glazing, glazing_ratio, residential) -> np.ndarray:
+    """
+    Proxy SAP score (1–100) for scalars or broadcastable arrays: a
+    piecewise-linear map of EUI less fabric penalties against Part L 2021.
+    """
+    eui = np.asarray(eui, dtype=float)
+    # Map EUI to a base SAP score (lower EUI = higher SAP)
+    # Reference ranges (approximate, non-domestic mixed use):
+    #   EUI < 50   → very efficient  (SAP 90+)
+    #   EUI 50–100 → good (SAP 75–89)
+    #   EUI 100–175 → average (SAP 55–74)
+    #   EUI 175–250 → poor (SAP 40–54)
+    #   EUI 250+   → very poor (SAP < 40)
+    base_sap = np.select(
+        [eui <= 50, eui <= 100, eui <= 175, eui <= 250],
+        [
+            90 + np.maximum(0.0, (50 - eui) / 50 * 9),     # up to 99
+            75 + (100 - eui) / 50 * 15,
+            55 + (175 - eui) / 75 * 20,
+            40 + (250 - eui) / 75 * 15,
+        ],
+        np.maximum(1.0, 40 - (eui - 250) / 10),
+    )
+
+    # Fabric penalty: compare U-values to Part L 2021 notional targets
+    ref_u_wall    = np.where(residential, PART_L_2021_U_WALL, PART_L_2021_ND_U_WALL)
+    ref_u_roof    = np.where(residential, PART_L_2021_U_ROOF, PART_L_2021_ND_U_ROOF)
+    ref_u_glazing = np.where(residential, PART_L_2021_U_GLAZING, PART_L_2021_ND_U_GLAZING)
+
+    # Penalty per unit excess U-value above target (scaled to SAP points)
+    wall_penalty    = np.maximum(0.0, u_wall    - ref_u_wall)    * 8
+    roof_penalty    = np.maximum(0.0, u_roof    - ref_u_roof)    * 6
+    glazing_penalty = np.maximum(0.0, u_glazing - ref_u_glazing) * 2 * glazing_ratio * 10
+
+    return np.maximum(1.0, np.minimum(100.0, base_sap - wall_penalty - roof_penalty - glazing_penalty))
+
+
 def _band_from_sap(sap: float) -> tuple[str, str]:
     """Return (band_letter, hex_colour) for a given SAP score."""
     for threshold, band, colour in _EPC_BANDS_LIST:
@@ -114,6 +162,35 @@ def _band_from_sap(sap: float) -> tuple[str, str]:
     return "G", "#C0392B"
 
 
+def band_index(sap: "np.typing.ArrayLike") -> np.ndarray:
+    """EPC band index (0 = A … 6 = G) for SAP scores, by binary search over ``EPC_BANDS``."""
+    found = np.searchsorted(_BAND_THRESHOLDS, np.asarray(sap, dtype=float), side="right")
+    return np.minimum(len(_BAND_THRESHOLDS) - found, len(_BAND_THRESHOLDS) - 1)
+
+
+def epc_recommendation(band: str) -> str:
+    """Plain English MEES summary for an EPC band."""
+    band_order = ["A", "B", "C", "D", "E", "F", "G"]
+    band_idx = band_order.index(band)
+    mees_gap_bands = max(0, band_idx - band_order.index(MEES_2028_TARGET_BAND))
+    if mees_gap_bands == 0:
+        return (
+            f"EPC {band} — already meets the planned 2028 MEES minimum (C). "
+            "No additional upgrade is typically required for MEES C alignment, subject to formal EPC confirmation."
+        )
+    if band_idx <= band_order.index(MEES_CURRENT_MIN_BAND):
+        return (
+            f"EPC {band} — meets the current MEES minimum (E) but is {mees_gap_bands} band(s) "
+            f"below the planned 2028 target (C). Improvement works are recommended before 2028 "
+            "to avoid letting restrictions and civil penalties."
+        )
+    return (
+        f"EPC {band} — below the current MEES minimum (E). This property cannot legally be "
+        "let in England & Wales without an applicable exemption. Immediate improvement planning "
+        "and accredited EPC reassessment are advised before letting decisions."
+    )
+
+
 def estimate_epc_rating(
     floor_area_m2: float | None = None,
     annual_energy_kwh: float | None = None,
@@ -165,42 +242,9 @@ def estimate_epc_rating(
         raise ValueError("EPC estimation: glazing_ratio must be between 0 and 1 (exclusive).")
 
     eui = annual_energy_kwh / max(floor_area_m2, 1.0)   # kWh/m²/yr
-
-    # Map EUI to a base SAP score (lower EUI = higher SAP)
-    # Reference ranges (approximate, non-domestic mixed use):
-    #   EUI < 50   → very efficient  (SAP 90+)
-    #   EUI 50–100 → good (SAP 75–89)
-    #   EUI 100–175 → average (SAP 55–74)
-    #   EUI 175–250 → poor (SAP 40–54)
-    #   EUI 250+   → very poor (SAP < 40)
-    if eui <= 50:
-        base_sap = 90 + max(0.0, (50 - eui) / 50 * 9)     # up to 99
-    elif eui <= 100:
-        base_sap = 75 + (100 - eui) / 50 * 15
-    elif eui <= 175:
-        base_sap = 55 + (175 - eui) / 75 * 20
-    elif eui <= 250:
-        base_sap = 40 + (250 - eui) / 75 * 15
-    else:
-        base_sap = max(1.0, 40 - (eui - 250) / 10)
-
-    # Fabric penalty: compare U-values to Part L 2021 notional targets
-    if building_type in ("residential", "individual_selfbuild"):
-        ref_u_wall    = PART_L_2021_U_WALL
-        ref_u_roof    = PART_L_2021_U_ROOF
-        ref_u_glazing = PART_L_2021_U_GLAZING
-    else:
-        ref_u_wall    = PART_L_2021_ND_U_WALL
-        ref_u_roof    = PART_L_2021_ND_U_ROOF
-        ref_u_glazing = PART_L_2021_ND_U_GLAZING
-
-    # Penalty per unit excess U-value above target (scaled to SAP points)
-    wall_penalty    = max(0.0, u_wall    - ref_u_wall)    * 8
-    roof_penalty    = max(0.0, u_roof    - ref_u_roof)    * 6
-    glazing_penalty = max(0.0, u_glazing - ref_u_glazing) * 2 * glazing_ratio * 10
-
-    sap_score = max(1.0, min(100.0, base_sap - wall_penalty - roof_penalty - glazing_penalty))
-
+    sap_score = float(_sap_proxy(
+        eui, u_wall, u_roof, u_glazing, glazing_ratio, building_type in _RESIDENTIAL_TYPES
+    ))
     band, colour = _band_from_sap(sap_score)
 
     # MEES compliance checks
@@ -212,25 +256,7 @@ def estimate_epc_rating(
     mees_compliant_now  = band_idx <= mees_min_idx
     mees_2028_compliant = band_idx <= mees_2028_idx
     mees_gap_bands      = max(0, band_idx - mees_2028_idx)
-
-    # Plain English recommendation
-    if mees_2028_compliant:
-        recommendation = (
-            f"EPC {band} — already meets the planned 2028 MEES minimum (C). "
-            "No additional upgrade is typically required for MEES C alignment, subject to formal EPC confirmation."
-        )
-    elif mees_compliant_now:
-        recommendation = (
-            f"EPC {band} — meets the current MEES minimum (E) but is {mees_gap_bands} band(s) "
-            f"below the planned 2028 target (C). Improvement works are recommended before 2028 "
-            "to avoid letting restrictions and civil penalties."
-        )
-    else:
-        recommendation = (
-            f"EPC {band} — below the current MEES minimum (E). This property cannot legally be "
-            "let in England & Wales without an applicable exemption. Immediate improvement planning "
-            "and accredited EPC reassessment are advised before letting decisions."
-        )
+    recommendation = epc_recommendation(band)
 
     return {
         "sap_score":           round(sap_score, 1),
@@ -246,6 +272,84 @@ def estimate_epc_rating(
     }
 
 
+def epc_inputs(buildings: Iterable[Mapping]) -> dict[str, np.ndarray]:
+    """Pack portfolio asset dicts into the arrays read by ``estimate_epc_rating_batch``."""
+    rows = list(buildings)
+
+    def column(key: str, default: float, factor: float = 1.0) -> np.ndarray:
+        values = (b.get(key, default) for b in rows)
+        return np.fromiter((float(v) * factor if v is not None else np.nan for v in values), float, len(rows))
+
+    return {
+        "floor_area_m2":     column("floor_area_m2", np.nan),
+        "annual_energy_kwh": column("baseline_energy_mwh", 0.0, 1000.0),
+        "u_wall":            column("u_value_wall", PART_L_2021_ND_U_WALL),
+        "u_roof":            column("u_value_roof", PART_L_2021_ND_U_ROOF),
+        "u_glazing":         column("u_value_glazing", PART_L_2021_ND_U_GLAZING),
+        "glazing_ratio":     column("glazing_ratio", 0.30),
+    }
+
+
+def estimate_epc_rating_batch(
+    floor_area_m2: "np.typing.ArrayLike",
+    annual_energy_kwh: "np.typing.ArrayLike",
+    u_wall: "np.typing.ArrayLike" = PART_L_2021_ND_U_WALL,
+    u_roof: "np.typing.ArrayLike" = PART_L_2021_ND_U_ROOF,
+    u_glazing: "np.typing.ArrayLike" = PART_L_2021_ND_U_GLAZING,
+    glazing_ratio: "np.typing.ArrayLike" = 0.30,
+    building_type: "str | Sequence[str]" = "commercial",
+    *,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorised ``estimate_epc_rating`` over broadcastable input arrays.
+
+    Returns (N,) arrays ``sap_score``, ``band_index`` (0 = A … 6 = G),
+    ``epc_band``, ``epc_colour``, ``eui_kwh_m2``, ``mees_compliant_now``,
+    ``mees_2028_compliant``, ``mees_gap_bands`` and the boolean ``valid``
+    mask, matching the scalar function row for row.  Recommendation text is
+    left to ``epc_recommendation`` for the rows actually shown.  With
+    ``strict=False`` invalid rows are NaN / band "" instead of raising.
+
+    DISCLAIMER: Indicative only. Not a formal SAP/SBEM assessment.
+    """
+    area, energy, u_wall, u_roof, u_glazing, glazing = np.broadcast_arrays(*(
+        np.atleast_1d(np.asarray(v, dtype=float))
+        for v in (floor_area_m2, annual_energy_kwh, u_wall, u_roof, u_glazing, glazing_ratio)
+    ))
+    residential = np.isin(np.asarray(building_type), _RESIDENTIAL_TYPES)
+
+    valid = (area > 0) & (area <= 1_000_000) & (energy >= 0) & (energy <= 100_000_000)
+    for u in (u_wall, u_roof, u_glazing):
+        valid &= (u > 0) & (u <= 6.0)
+    valid &= (glazing > 0.0) & (glazing < 1.0)
+    if strict and not valid.all():
+        i = int(np.argmin(valid))
+        estimate_epc_rating(
+            floor_area_m2=float(area[i]), annual_energy_kwh=float(energy[i]), u_wall=float(u_wall[i]),
+            u_roof=float(u_roof[i]), u_glazing=float(u_glazing[i]), glazing_ratio=float(glazing[i]),
+        )
+        raise ValueError("EPC estimation: invalid inputs.")
+
+    with np.errstate(invalid="ignore"):
+        eui = energy / np.maximum(area, 1.0)
+        sap = _sap_proxy(eui, u_wall, u_roof, u_glazing, glazing, residential)
+    index = band_index(np.where(valid, sap, 0.0))
+    mees_min_idx = "ABCDEFG".index(MEES_CURRENT_MIN_BAND)
+    mees_2028_idx = "ABCDEFG".index(MEES_2028_TARGET_BAND)
+    return {
+        "sap_score":           np.where(valid, np.round(sap, 1), np.nan),
+        "band_index":          np.where(valid, index, -1),
+        "epc_band":            np.where(valid, _BAND_LETTERS[index], ""),
+        "epc_colour":          np.where(valid, _BAND_COLOURS[index], ""),
+        "eui_kwh_m2":          np.where(valid, np.round(eui, 1), np.nan),
+        "mees_compliant_now":  valid & (index <= mees_min_idx),
+        "mees_2028_compliant": valid & (index <= mees_2028_idx),
+        "mees_gap_bands":      np.where(valid, np.maximum(0, index - mees_2028_idx), -1),
+        "valid":               valid,
+    }
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # MEES GAP ANALYSIS — upgrade cost and measure prioritisation
 # ─────────────────────────────────────────────────────────────────────────────
@@ -367,6 +471,10 @@ def calculate_carbon_baseline(
     lpg_kwh:         float = 0.0,
     fleet_miles:     float = 0.0,
     floor_area_m2:   Optional[float] = None,
+    *,
+    reporting_year:  Optional[int] = None,
+    basis:           str = "location",
+    elec_profile_kwh: Optional[Sequence[float]] = None,
 ) -> dict:
     """
     Calculate Scope 1 and Scope 2 carbon emissions for SECR reporting.
@@ -379,6 +487,12 @@ def calculate_carbon_baseline(
       fleet_miles   : miles — business fleet miles (Scope 1, car average 0.168 kgCO2e/mile)
       floor_area_m2 : m² — optional, used to compute intensity metric
 
+    Scope 2 options (services.carbon_intensity):
+      reporting_year   : year whose grid factor applies (default: CI_ELECTRICITY)
+      basis            : "location" (SECR) or "marginal"
+      elec_profile_kwh : 12 / 8760 / 17520-step consumption shape; weights the
+                         factor by when electricity is used
+
     Returns:
       scope1_tco2e        : float — Scope 1 total (tCO₂e)
       scope2_tco2e        : float — Scope 2 total (tCO₂e)
@@ -418,8 +532,16 @@ def calculate_carbon_baseline(
     lpg_kgco2   = lpg_kwh  * CI_LPG
     scope1_kgco2 = gas_kgco2 + oil_kgco2 + lpg_kgco2 + fleet_kgco2
 
-    # Scope 2: electricity (location-based, BEIS 2023 UK grid)
-    scope2_kgco2 = elec_kwh * CI_ELECTRICITY
+    # Scope 2: electricity (location-based, BEIS 2023 UK grid unless a
+    # reporting year, basis or consumption profile selects the curve)
+    if reporting_year is None and basis == "location" and elec_profile_kwh is None:
+        elec_factor = CI_ELECTRICITY
+    else:
+        year = 2023 if reporting_year is None else int(reporting_year)
+        elec_factor = float(carbon_intensity.annual_factor(year, basis))
+        if elec_profile_kwh is not None:
+            elec_factor *= float(carbon_intensity.profile_weight(elec_profile_kwh, basis))
+    scope2_kgco2 = elec_kwh * elec_factor
 
     scope1_tco2e = scope1_kgco2 / 1000.0
     scope2_tco2e = scope2_kgco2 / 1000.0
@@ -459,6 +581,8 @@ def calculate_carbon_baseline(
             "lpg_scope1_tco2e":         round(lpg_kgco2   / 1000, 2),
             "fleet_scope1_tco2e":       round(fleet_kgco2 / 1000, 2),
         },
+        "electricity_factor_kg_per_kwh": round(elec_factor, 5),
+        "scope2_basis":       basis,
         "secr_threshold_check": secr_check,
     }
 
@@ -467,6 +591,17 @@ def calculate_carbon_baseline(
 # PART L / FUTURE HOMES STANDARD COMPLIANCE  (self-build / new dwellings)
 # ─────────────────────────────────────────────────────────────────────────────
 
+# Target tables resolved once: row 0 dwellings (ADL1A), row 1 non-domestic (ADL2A)
+_PART_L_ELEMENTS = ("External Wall", "Roof / Ceiling", "Windows / Glazing")
+_PART_L_TARGETS = np.array([
+    [PART_L_2021_U_WALL, PART_L_2021_U_ROOF, PART_L_2021_U_GLAZING],
+    [PART_L_2021_ND_U_WALL, PART_L_2021_ND_U_ROOF, PART_L_2021_ND_U_GLAZING],
+])
+_PART_L_LABELS = np.array(["Part L 2021 (Dwellings — ADL1A)", "Part L 2021 (Non-Domestic — ADL2A)"])
+_PART_L_FIELDS = ("u_value_wall", "u_value_roof", "u_value_glazing", "floor_area_m2", "baseline_energy_mwh")
+_PRIMARY_ENERGY_FACTOR = 2.5   # PE factor ~2.5 for elec
+
+
 def part_l_compliance_check(
     u_wall:    float,
     u_roof:    float,
@@ -501,50 +636,90 @@ def part_l_compliance_check(
         if not ok:
             raise ValueError(f"Part L check: {msg}")
 
-    if building_type in ("residential", "individual_selfbuild"):
-        target_wall    = PART_L_2021_U_WALL
-        target_roof    = PART_L_2021_U_ROOF
-        target_glazing = PART_L_2021_U_GLAZING
-        regs_label     = "Part L 2021 (Dwellings — ADL1A)"
-    else:
-        target_wall    = PART_L_2021_ND_U_WALL
-        target_roof    = PART_L_2021_ND_U_ROOF
-        target_glazing = PART_L_2021_ND_U_GLAZING
-        regs_label     = "Part L 2021 (Non-Domestic — ADL2A)"
+    batch = part_l_compliance_check_batch(
+        u_wall, u_roof, u_glazing, floor_area_m2, annual_energy_kwh, building_type
+    )
+    return part_l_details({k: v[0].tolist() for k, v in batch.items()})
+
+
+def part_l_compliance_check_batch(
+    u_wall:    "np.typing.ArrayLike",
+    u_roof:    "np.typing.ArrayLike",
+    u_glazing: "np.typing.ArrayLike",
+    floor_area_m2: "np.typing.ArrayLike",
+    annual_energy_kwh: "np.typing.ArrayLike",
+    building_type: "str | np.typing.ArrayLike" = "residential",
+    *,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Vectorised ``part_l_compliance_check`` over broadcastable input arrays,
+    with each row's targets taken from the shared domestic / non-domestic tables.
+
+    Returns (N,) ``part_l_2021_pass``, ``fhs_ready``, ``primary_energy_est``,
+    ``fhs_threshold``, ``regs_label``, ``failed_elements`` and ``valid``,
+    plus (N, 3) ``proposed_u``, ``target_u``, ``gap`` and ``element_pass``
+    (wall, roof, glazing).  Pass one row to ``part_l_details`` for the
+    item list, verdict and improvement actions.  Invalid rows raise the
+    scalar message, or with ``strict=False`` are ``valid=False`` and fail.
+    """
+    area, energy, u_wall, u_roof, u_glazing, domestic = np.broadcast_arrays(
+        *(np.atleast_1d(np.asarray(v, dtype=float))
+          for v in (floor_area_m2, annual_energy_kwh, u_wall, u_roof, u_glazing)),
+        np.atleast_1d(np.isin(np.asarray(building_type), _RESIDENTIAL_TYPES)),
+    )
+    proposed = np.column_stack([u_wall, u_roof, u_glazing])
+
+    valid = (area > 0) & (area <= 1_000_000) & (energy >= 0) & (energy <= 100_000_000)
+    valid &= ((proposed > 0) & (proposed <= 6.0)).all(axis=1)
+    if strict and not valid.all():
+        i = int(np.argmin(valid))
+        part_l_compliance_check(*(float(u) for u in proposed[i]), float(area[i]), float(energy[i]))
+        raise ValueError("Part L check: invalid inputs.")
+
+    target = _PART_L_TARGETS[np.where(domestic, 0, 1)]
+    element_pass = (proposed <= target) & valid[:, None]
+    all_pass = element_pass.all(axis=1)
+    with np.errstate(invalid="ignore"):
+        primary_energy = energy / np.maximum(area, 1.0) * _PRIMARY_ENERGY_FACTOR
+    return {
+        "part_l_2021_pass":   all_pass,
+        "fhs_ready":          all_pass & (primary_energy <= FHS_MAX_PRIMARY_ENERGY),
+        "primary_energy_est": np.where(valid, primary_energy, np.nan),
+        "fhs_threshold":      np.full(area.shape, FHS_MAX_PRIMARY_ENERGY),
+        "regs_label":         _PART_L_LABELS[np.where(domestic, 0, 1)],
+        "failed_elements":    np.where(valid, (~element_pass).sum(axis=1), 0),
+        "proposed_u":         proposed,
+        "target_u":           target,
+        "gap":                np.round(np.maximum(0.0, proposed - target), 3),
+        "element_pass":       element_pass,
+        "valid":              valid,
+    }
+
 
+def part_l_details(row: Mapping) -> dict:
+    """
+    Full ``part_l_compliance_check`` result for one building from its row
+    of ``part_l_compliance_check_batch`` (``{k: v[i] for k, v in batch.items()}``).
+    """
+    regs_label = str(row["regs_label"])
+    threshold = row["fhs_threshold"]
+    primary_energy_est = float(row["primary_energy_est"])
     items = [
         {
-            "element":       "External Wall",
-            "proposed_u":    u_wall,
-            "target_u":      target_wall,
-            "pass":          u_wall <= target_wall,
-            "gap":           round(max(0.0, u_wall - target_wall), 3),
-            "unit":          "W/m²K",
-        },
-        {
-            "element":       "Roof / Ceiling",
-            "proposed_u":    u_roof,
-            "target_u":      target_roof,
-            "pass":          u_roof <= target_roof,
-            "gap":           round(max(0.0, u_roof - target_roof), 3),
-            "unit":          "W/m²K",
-        },
-        {
-            "element":       "Windows / Glazing",
-            "proposed_u":    u_glazing,
-            "target_u":      target_glazing,
-            "pass":          u_glazing <= target_glazing,
-            "gap":           round(max(0.0, u_glazing - target_glazing), 3),
+            "element":       element,
+            "proposed_u":    float(proposed),
+            "target_u":      float(target),
+            "pass":          bool(passed),
+            "gap":           float(gap),
             "unit":          "W/m²K",
-        },
+        }
+        for element, proposed, target, passed, gap in zip(
+            _PART_L_ELEMENTS, row["proposed_u"], row["target_u"], row["element_pass"], row["gap"]
+        )
     ]
-
-    all_pass = all(item["pass"] for item in items)
-
-    # Proxy primary energy kWh/m²/yr
-    primary_energy_est = annual_energy_kwh / max(floor_area_m2, 1.0) * 2.5  # PE factor ~2.5 for elec
-
-    fhs_ready = primary_energy_est <= FHS_MAX_PRIMARY_ENERGY and all_pass
+    all_pass = bool(row["part_l_2021_pass"])
+    fhs_ready = bool(row["fhs_ready"])
 
     improvement_actions = []
     for item in items:
@@ -553,9 +728,9 @@ def part_l_compliance_check(
                 f"Improve {item['element']} from {item['proposed_u']} to ≤ {item['target_u']} W/m²K "
                 f"(gap: {item['gap']} W/m²K) — indicative target aligned with {regs_label}; confirm via formal design-stage assessment."
             )
-    if primary_energy_est > FHS_MAX_PRIMARY_ENERGY:
+    if primary_energy_est > threshold:
         improvement_actions.append(
-            f"Reduce primary energy from ~{primary_energy_est:.0f} to ≤ {FHS_MAX_PRIMARY_ENERGY} "
+            f"Reduce primary energy from ~{primary_energy_est:.0f} to ≤ {threshold} "
             "kWh/m²/yr — indicative Future Homes Standard readiness threshold. "
             "Consider ASHP, solar PV, and enhanced fabric."
         )
@@ -581,7 +756,7 @@ def part_l_compliance_check(
         "part_l_2021_pass":      all_pass,
         "fhs_ready":             fhs_ready,
         "primary_energy_est":    round(primary_energy_est, 1),
-        "fhs_threshold":         FHS_MAX_PRIMARY_ENERGY,
+        "fhs_threshold":         threshold,
         "regs_label":            regs_label,
         "compliance_items":      items,
         "overall_verdict":       verdict,
@@ -589,6 +764,203 @@ def part_l_compliance_check(
     }
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# COMPLIANCE RESULT STORE — incremental EPC / MEES / Part L per asset
+# Each asset's results are keyed by a hash of the fields the checks read, so
+# a rerun recomputes only assets whose inputs changed; identical assets share
+# one entry.  Portfolio aggregates are adjusted by each changed asset's delta.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Asset fields read by estimate_epc_rating, mees_gap_analysis (via the SAP
+# score) and part_l_compliance_check
+COMPLIANCE_FIELDS: tuple[str, ...] = (
+    "floor_area_m2",
+    "baseline_energy_mwh",
+    "u_value_wall",
+    "u_value_roof",
+    "u_value_glazing",
+    "glazing_ratio",
+)
+
+_AGGREGATE_KEYS: tuple[str, ...] = (
+    "assets", "rated", "below_current_min", "below_target", "gap_cost_low", "gap_cost_high",
+    "part_l_checked", "part_l_fail", "fhs_fail",
+)
+
+
+def segment_building_type(segment_id: str | None) -> str:
+    """Building type passed to the compliance checks for a user segment."""
+    return "individual_selfbuild" if segment_id == "individual_selfbuild" else "non-residential"
+
+
+def asset_content_key(asset: Mapping, building_type: str = "commercial", target_band: str = MEES_2028_TARGET_BAND) -> str:
+    """Stable hash of the compliance inputs of *asset*; cosmetic keys never enter it."""
+    values = []
+    for field in COMPLIANCE_FIELDS:
+        value = asset.get(field)
+        # int/float/bool collapse to float so 500 and 500.0 share an entry
+        values.append(float(value) if isinstance(value, (int, float)) else value)
+    payload = repr((tuple(values), building_type, target_band)).encode()
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def asset_store_key(asset: Mapping, index: int) -> str:
+    """ComplianceStore name of the portfolio asset in slot *index*: its id, else the slot."""
+    return str(asset.get("id") or f"slot-{index}")
+
+
+def meter_sites(buildings: Mapping[str, Mapping]) -> dict[str, dict]:
+    """
+    ``core.secr`` site info (floor area) for assets keyed by store name.
+
+    Meter files name sites as users see them, so each asset is listed under
+    its ``display_name`` and ``name`` as well as its key; the first asset
+    claiming a name keeps it.
+    """
+    sites: dict[str, dict] = {}
+    for key, b in buildings.items():
+        for site in dict.fromkeys((b.get("display_name"), b.get("name"), key)):
+            if site:
+                sites.setdefault(str(site), {"floor_area_m2": b.get("floor_area_m2")})
+    return sites
+
+
+class ComplianceStore:
+    """
+    Per-asset compliance results and portfolio aggregates, recomputed only
+    for assets whose ``COMPLIANCE_FIELDS`` changed.
+
+    Each result is ``{"key", "valid", "epc", "mees_gap", "part_l"}``:
+    ``epc`` holds the ``estimate_epc_rating`` fields except the
+    recommendation (see ``epc_recommendation``), ``mees_gap`` the
+    ``mees_gap_analysis`` of assets below *target_band* and ``part_l`` the
+    asset's ``part_l_compliance_check_batch`` row (expand it with
+    ``part_l_details``); invalid inputs give ``None``.  The building type
+    selects the Part L / FHS targets only; EPC ratings keep the rating's
+    default building type.  Assets are named by the caller, e.g. with
+    ``asset_store_key``.
+    """
+
+    def __init__(self, target_band: str = MEES_2028_TARGET_BAND):
+        if target_band not in tuple("ABCDEFG"):
+            raise ValueError(f"Invalid target band '{target_band}'. Must be A–G.")
+        self.target_band = target_band
+        self.computed = 0
+        self.reused = 0
+        self._keys: dict[str, str] = {}          # asset name → content key
+        self._results: dict[str, dict] = {}      # content key → result
+        self._refs: dict[str, int] = {}          # content key → number of assets using it
+        self._totals = dict.fromkeys(_AGGREGATE_KEYS, 0)
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+    def __contains__(self, name: str) -> bool:
+        return name in self._keys
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def names(self) -> list[str]:
+        return list(self._keys)
+
+    def result(self, name: str) -> dict:
+        return self._results[self._keys[name]]
+
+    def results(self) -> dict[str, dict]:
+        return {name: self._results[key] for name, key in self._keys.items()}
+
+    def aggregates(self) -> dict:
+        """Portfolio totals: assets, rated, below_current_min, below_target, gap costs, Part L / FHS failures."""
+        return dict(self._totals)
+
+    def info(self) -> dict:
+        return {"assets": len(self._keys), "entries": len(self._results),
+                "computed": self.computed, "reused": self.reused}
+
+    # ── Updates ───────────────────────────────────────────────────────────────
+    def update(self, name: str, asset: Mapping, building_type: str = "commercial") -> bool:
+        """Add or replace one asset; returns True if its results were recomputed."""
+        return bool(self._apply({name: asset}, building_type))
+
+    def remove(self, name: str) -> None:
+        key = self._keys.pop(name, None)
+        if key is not None:
+            self._release(key)
+
+    def sync(self, assets: Mapping[str, Mapping], building_type: str = "commercial") -> list[str]:
+        """
+        Make the store hold exactly *assets*: drop names no longer present and
+        recompute changed ones in one batch.  Returns the recomputed names.
+        """
+        for name in [n for n in self._keys if n not in assets]:
+            self.remove(name)
+        return self._apply(assets, building_type)
+
+    def _apply(self, assets: Mapping[str, Mapping], building_type: str) -> list[str]:
+        changed = {}
+        for name, asset in assets.items():
+            key = asset_content_key(asset, building_type, self.target_band)
+            if self._keys.get(name) != key:
+                changed[name] = (key, asset)
+        missing = {key: asset for key, asset in changed.values() if key not in self._results}
+        if missing:
+            for key, result in zip(missing, self._compute(list(missing.values()), building_type)):
+                self._results[key] = {"key": key, **result}
+                self._refs[key] = 0
+            self.computed += len(missing)
+        self.reused += len(changed) - len(missing)
+        for name, (key, _) in changed.items():
+            if name in self._keys:
+                self._release(self._keys[name])
+            self._keys[name] = key
+            self._refs[key] += 1
+            self._count(self._results[key], +1)
+        return [name for name, (key, _) in changed.items() if key in missing]
+
+    def _release(self, key: str) -> None:
+        self._count(self._results[key], -1)
+        self._refs[key] -= 1
+        if not self._refs[key]:
+            del self._refs[key], self._results[key]
+
+    def _count(self, result: dict, sign: int) -> None:
+        totals = self._totals
+        totals["assets"] += sign
+        epc, gap, part_l = result["epc"], result["mees_gap"], result["part_l"]
+        if epc is not None:
+            totals["rated"] += sign
+            totals["below_current_min"] += sign * (not epc["mees_compliant_now"])
+            totals["below_target"] += sign * (gap is not None)
+        if gap is not None:
+            totals["gap_cost_low"] += sign * gap["total_cost_low"]
+            totals["gap_cost_high"] += sign * gap["total_cost_high"]
+        if part_l is not None:
+            totals["part_l_checked"] += sign
+            totals["part_l_fail"] += sign * (not part_l["part_l_2021_pass"])
+            totals["fhs_fail"] += sign * (not part_l["fhs_ready"])
+
+    def _compute(self, assets: list[Mapping], building_type: str) -> list[dict]:
+        inputs = epc_inputs(assets)
+        ratings = estimate_epc_rating_batch(**inputs, strict=False)
+        target_idx = "ABCDEFG".index(self.target_band)
+        # Part L needs declared fabric; the EPC defaults stand in only for rating
+        has_fabric = [all(a.get(k) is not None for k in _PART_L_FIELDS) for a in assets]
+        checks = part_l_compliance_check_batch(
+            inputs["u_wall"], inputs["u_roof"], inputs["u_glazing"],
+            inputs["floor_area_m2"], inputs["annual_energy_kwh"], building_type, strict=False,
+        )
+        out = []
+        for i in range(len(assets)):
+            epc = gap = part_l = None
+            if ratings["valid"][i]:
+                epc = {k: v[i].item() for k, v in ratings.items() if k != "valid"}
+                if epc["band_index"] > target_idx:
+                    gap = mees_gap_analysis(epc["sap_score"], self.target_band)
+            if has_fabric[i] and checks["valid"][i]:
+                part_l = {k: v[i].tolist() for k, v in checks.items() if k != "valid"}
+            out.append({"valid": epc is not None, "epc": epc, "mees_gap": gap, "part_l": part_l})
+        return out
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # SEGMENT METADATA
 # ─────────────────────────────────────────────────────────────────────────────
@@ -11,7 +11,10 @@ import uuid
 import html as html_mod
 import streamlit as st
 
+import app.compliance as compliance
+import app.session as session
 import services.epc as epc_service
+from core.heating_systems import DEFAULT_HEATING_SYSTEM, HEATING_SYSTEM_IDS, HEATING_SYSTEMS
 
 # ── EPC band colour mapping ───────────────────────────────────────────────────
 _EPC_COLOURS: dict[str, str] = {
@@ -255,6 +258,14 @@ def _render_search_panel(segment: str) -> None:
             step=1,
             key="pm_built_year",
         )
+        heating_system = st.selectbox(
+            "Heating System",
+            options=HEATING_SYSTEM_IDS,
+            index=HEATING_SYSTEM_IDS.index(DEFAULT_HEATING_SYSTEM),
+            format_func=lambda s: HEATING_SYSTEMS[s]["label"],
+            key="pm_heating_system",
+            help="Sets the heating fuel and efficiency (or heat-pump COP) used to price and carbon-account the asset.",
+        )
 
         st.markdown("---")
         st.markdown("**Step 3 — Choose Replacement Slot**")
@@ -287,6 +298,7 @@ def _render_search_panel(segment: str) -> None:
                 built_year=int(built_year),
                 selected_result=selected_result,
                 segment=seg,
+                heating_system=heating_system,
             )
 
 
@@ -298,6 +310,7 @@ def _confirm_replace(
     built_year: int,
     selected_result: dict,
     segment: str,
+    heating_system: str = DEFAULT_HEATING_SYSTEM,
 ) -> None:
     """Build asset dict, enforce uniqueness, replace slot, rerun."""
     portfolio: list[dict] = st.session_state.get("portfolio", [])
@@ -352,6 +365,7 @@ def _confirm_replace(
         "glazing_ratio": 0.35,
         "occupancy_hours": 2500,
         "height_m": 8.0,
+        "heating_system": heating_system,
         "is_default": False,
         "source": selected_result.get("source", "manual_entry"),
     }
@@ -360,6 +374,11 @@ def _confirm_replace(
     while len(portfolio) <= slot_index:
         portfolio.append({})
 
+    # Re-rate only the replaced slot; the compliance tab reuses the rest
+    store = session.compliance_store()
+    store.remove(compliance.asset_store_key(portfolio[slot_index], slot_index))
+    store.update(compliance.asset_store_key(new_asset, slot_index), new_asset, compliance.segment_building_type(segment))
+
     portfolio[slot_index] = new_asset
     st.session_state.portfolio = portfolio[:3]
 
@@ -60,6 +60,7 @@ from app.session import ensure_portfolio_defaults
 from config.scenarios import SCENARIOS, SEGMENT_SCENARIOS, SEGMENT_DEFAULT_SCENARIOS
 from app.segments.university_he import BUILDINGS
 from core.physics import calculate_thermal_load
+from core.scenario_registry import register_scenario
 
 # Re-export helpers used by legacy tests
 from app.session import _get_secret          # noqa: F401
@@ -121,6 +122,7 @@ def _add_scenario_from_json(json_str: str) -> tuple[bool, str]:
     if not name:
         return False, 'Missing "name" field in scenario definition'
     SCENARIOS[name] = {k: v for k, v in data.items() if k != "name"}
+    register_scenario(name, SCENARIOS[name])
     return True, name
 
 
@@ -72,6 +72,7 @@ def init_session() -> None:
 
         # Financial analysis parameters
         "energy_tariff_gbp_per_kwh": ELEC_COST_PER_KWH,
+        "energy_tariff_schedule": None,   # core.tariffs schedule; None = flat tariff above
         "discount_rate": 5.0,
         "analysis_period_yrs": 10,
 
@@ -397,6 +398,21 @@ _SEGMENT_DEFAULTS: dict[str, list[dict]] = {
 }
 
 
+def active_tariff() -> float | dict:
+    """Tariff chosen in Settings: its core.tariffs schedule, else the flat £/kWh."""
+    return st.session_state.get("energy_tariff_schedule") or float(
+        st.session_state.get("energy_tariff_gbp_per_kwh", ELEC_COST_PER_KWH)
+    )
+
+
+def compliance_store():
+    """This session's app.compliance.ComplianceStore, created on first use."""
+    if "_compliance_store" not in st.session_state:
+        from app.compliance import ComplianceStore
+        st.session_state["_compliance_store"] = ComplianceStore()
+    return st.session_state["_compliance_store"]
+
+
 def load_segment_defaults(segment: str) -> list[dict]:
     """
     Returns 3 realistic hardcoded default assets for the segment.
@@ -22,6 +22,7 @@ except ImportError:
     def validate_gemini_key(key: str) -> tuple[bool, str]:
         return True, ""
 
+from app.session import active_tariff
 from core.agent import run_agent_turn
 from core.orchestrator import ESGOrchestrator
 
@@ -149,6 +150,7 @@ def render(handler, weather: dict, portfolio: list[dict]) -> None:
     segment = current_segment
     segment_name = st.session_state.get("current_segment_name", "University / Higher Education")
     portfolio = st.session_state.get("portfolio", [])
+    tariff = active_tariff()
 
     # Keep legacy and current keys synchronized
     st.session_state["chat_history"] = st.session_state["ai_chat_history"]
@@ -229,6 +231,7 @@ def render(handler, weather: dict, portfolio: list[dict]) -> None:
                                     segment=segment,
                                     portfolio=portfolio,
                                     api_key=api_key,
+                                    tariff=tariff,
                                 )
 
                             with concurrent.futures.ThreadPoolExecutor() as executor:
@@ -18,16 +18,32 @@ import streamlit as st
 
 import app.branding as branding
 import app.compliance as compliance
+import app.session as session
+import core.secr as secr
+
+# Asset expanders rendered in the MEES and Part L panels; a large book lists the worst first
+MAX_MEES_ASSET_ROWS = 50
+MAX_PART_L_ASSET_ROWS = 50
+MAX_AFFECTED_NAMES = 20
 
 
 def render(handler, portfolio: list[dict]) -> None:
     """Render the compliance hub tab for the active segment."""
-    buildings = handler.building_registry   # dict[name → building dict]
+    # The user's portfolio when loaded, else the segment's reference buildings.
+    # Portfolio assets are keyed by id so two with the same name stay apart.
+    buildings = {
+        compliance.asset_store_key(a, i): a for i, a in enumerate(portfolio) if a.get("name")
+    } or handler.building_registry   # dict[key → building dict]
+    labels = {key: b.get("display_name") or b.get("name") or key for key, b in buildings.items()}
 
     if not buildings:
         st.info("No buildings available for compliance checks.")
         return
 
+    # Only assets whose compliance inputs changed since the last run are re-rated
+    store = session.compliance_store()
+    store.sync(buildings, compliance.segment_building_type(handler.segment_id))
+
     branding.render_html(
         f'<h2 class="page-h2">Compliance Hub — {handler.display_label}</h2>'
     )
@@ -40,11 +56,11 @@ def render(handler, portfolio: list[dict]) -> None:
 
     # Panel B — MEES & EPC
     if "epc_mees" in checks:
-        _panel_mees_epc(buildings)
+        _panel_mees_epc(store, labels)
 
     # Panel C — Part L 2021 & FHS
     if "part_l" in checks or "fhs" in checks:
-        _panel_part_l_fhs(buildings, handler.segment_id, show_fhs="fhs" in checks)
+        _panel_part_l_fhs(store, labels, show_fhs="fhs" in checks)
         branding.render_html('<div class="main-section-divider"></div>')
 
 
@@ -121,7 +137,10 @@ def _panel_secr_tcfd(buildings: dict) -> None:
         )
         st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
 
-    # ── Section 4: TCFD Framework Alignment ──────────────────────────────────
+    # ── Section 4: Metered Scope 1 & 2 (meter data upload) ───────────────────
+    _section_metered_secr(buildings)
+
+    # ── Section 5: TCFD Framework Alignment ──────────────────────────────────
     branding.render_html(
         '<div class="subsec-label">TCFD Framework Alignment</div>'
     )
@@ -147,30 +166,86 @@ def _panel_secr_tcfd(buildings: dict) -> None:
     branding.render_html('<div class="main-section-divider"></div>')
 
 
+def _section_metered_secr(buildings: dict) -> None:
+    """Scope 1 & 2 per site, region and year from uploaded meter readings."""
+    branding.render_html(
+        '<div class="subsec-label">Metered Scope 1 &amp; 2</div>'
+    )
+    with st.container(border=True):
+        upload = st.file_uploader(
+            "Meter readings (CSV or Parquet)",
+            type=["csv", "parquet"],
+            key="secr_meter_upload",
+            help="One row per reading: site, fuel (electricity / gas / oil / lpg), kWh and a "
+                 "year or timestamp; optional meter, region and floor_area_m2. Sites named as "
+                 "in the portfolio take the asset's floor area. Monthly bills or half-hourly "
+                 "AMR data — the file is streamed in chunks, so a full year of half-hourly "
+                 "readings loads without holding it in memory.",
+        )
+        if upload is None:
+            st.caption("Figures above are a proxy from modelled building energy. "
+                       "Upload meter data for reportable Scope 1 & 2 totals.")
+            return
+
+        # Sites match assets by display name, name or store key
+        sites = compliance.meter_sites(buildings)
+        areas = tuple((site, info["floor_area_m2"]) for site, info in sites.items())
+
+        # Aggregate once per uploaded file and set of floor areas; reruns reuse the totals
+        cached = st.session_state.get("_secr_metered")
+        if cached is None or cached[0] != (upload.file_id, areas):
+            try:
+                with st.spinner("Aggregating meter readings…"):
+                    upload.seek(0)
+                    result = secr.aggregate_meter_data(upload, sites, strict=False)
+            except (ValueError, ImportError) as exc:
+                st.error(f"Could not read meter data: {exc}")
+                return
+            cached = ((upload.file_id, areas), result)
+            st.session_state["_secr_metered"] = cached
+        result = cached[1]
+
+        years = result["years"]
+        if years.empty:
+            st.warning("No usable readings found in the uploaded file.")
+            return
+        latest = years.iloc[-1]
+        k1, k2, k3 = st.columns(3)
+        k1.metric(f"Scope 1 ({int(latest['year'])})", f"{latest['scope1_tco2e']:,.1f} t")
+        k2.metric(f"Scope 2 ({int(latest['year'])})", f"{latest['scope2_tco2e']:,.1f} t")
+        k3.metric("Total tCO\u2082e", f"{latest['total_tco2e']:,.1f} t")
+        st.caption(
+            f"{result['rows']:,} readings from {int(latest['sites'])} site(s)"
+            + (f"; {result['rejected_rows']:,} unusable row(s) skipped." if result["rejected_rows"] else ".")
+        )
+
+        columns = ["scope1_tco2e", "scope2_tco2e", "total_tco2e", "energy_kwh", "intensity_kgco2_m2"]
+        by_region, by_site = st.tabs(["By region & year", "By site & year"])
+        with by_region:
+            st.dataframe(result["regions"][["region", "year", "sites", *columns]].round(2),
+                         use_container_width=True, hide_index=True)
+        with by_site:
+            st.dataframe(result["sites"][["site", "region", "year", "meters", *columns]].round(2),
+                         use_container_width=True, hide_index=True)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # PANEL B — MEES & EPC
 # ─────────────────────────────────────────────────────────────────────────────
 
-def _panel_mees_epc(buildings: dict) -> None:
+def _panel_mees_epc(store: compliance.ComplianceStore, labels: dict[str, str]) -> None:
     """MEES & EPC Compliance Overview — status banner + per-asset gap analysis."""
     branding.render_html(
         '<div class="sec-hdr">MEES &amp; EPC Compliance Overview</div>'
     )
 
-    # Pre-compute all building ratings for the portfolio-level banner
-    results: dict[str, dict] = {}
-    for b_name, b_data in buildings.items():
-        results[b_name] = compliance.estimate_epc_rating(
-            floor_area_m2=b_data["floor_area_m2"],
-            annual_energy_kwh=b_data["baseline_energy_mwh"] * 1000,
-            u_wall=b_data["u_value_wall"],
-            u_roof=b_data["u_value_roof"],
-            u_glazing=b_data["u_value_glazing"],
-            glazing_ratio=b_data["glazing_ratio"],
-        )
+    # Per-asset ratings and portfolio totals come from the incremental store
+    results = store.results()
+    totals = store.aggregates()
+    rated = [(name, r) for name, r in results.items() if r["valid"]]
 
-    below_target = [n for n, r in results.items() if not r["mees_2028_compliant"]]
-    n_fail = len(below_target)
+    below_target = [labels[name] for name, r in rated if r["mees_gap"] is not None]
+    n_fail = totals["below_target"]
 
     # ── Section 1: Compliance Status Banner ──────────────────────────────────
     with st.container(border=True):
@@ -189,7 +264,8 @@ def _panel_mees_epc(buildings: dict) -> None:
                 f'<div style="color:#F0B429;font-weight:600;margin-bottom:4px;">'
                 f"&#9888; {n_fail} {asset_word} below 2028 MEES target (Band C)</div>"
                 f'<div style="font-size:0.78rem;color:#CBD8E6;">'
-                f"Affected: {', '.join(below_target)}</div>"
+                f"Affected: {', '.join(below_target[:MAX_AFFECTED_NAMES])}"
+                f"{f' and {n_fail - MAX_AFFECTED_NAMES} more' if n_fail > MAX_AFFECTED_NAMES else ''}</div>"
                 f"</div>"
             )
 
@@ -198,10 +274,19 @@ def _panel_mees_epc(buildings: dict) -> None:
         '<div class="subsec-label">Asset Gap Analysis</div>'
     )
 
-    for b_name, res in results.items():
+    # Worst bands first; recommendation text is built only for the rows shown
+    shown = sorted(rated, key=lambda item: -item[1]["epc"]["band_index"])[:MAX_MEES_ASSET_ROWS]
+    if totals["rated"] > len(shown):
+        st.caption(f"Showing the {len(shown)} lowest-rated of {totals['rated']} assets.")
+    if totals["rated"] < totals["assets"]:
+        st.caption(f"{totals['assets'] - totals['rated']} asset(s) lack valid data for an EPC estimate.")
+
+    for b_name, result in shown:
+        res = dict(result["epc"])
+        res["recommendation"] = compliance.epc_recommendation(res["epc_band"])
         compliant = res["mees_2028_compliant"]
         # Auto-expand non-compliant assets to draw attention
-        with st.expander(f"Asset: {b_name}", expanded=not compliant):
+        with st.expander(f"Asset: {labels[b_name]}", expanded=not compliant):
             info_col, status_col = st.columns([1, 2])
 
             with info_col:
@@ -216,7 +301,7 @@ def _panel_mees_epc(buildings: dict) -> None:
                 else:
                     st.warning(res["recommendation"])
 
-                    gap = compliance.mees_gap_analysis(res["sap_score"], "C")
+                    gap = result["mees_gap"] or {}
                     measures = gap.get("recommended_measures", [])
 
                     if measures:
@@ -265,38 +350,23 @@ def _panel_part_l_fhs_stub() -> None:
     pass  # render() calls _panel_part_l_fhs directly; stub retained for safety
 
 
-def _panel_part_l_fhs(buildings: dict, segment_id: str, show_fhs: bool) -> None:
+def _panel_part_l_fhs(store: compliance.ComplianceStore, labels: dict[str, str], show_fhs: bool) -> None:
     """Part L 2021 & FHS Readiness Overview — fabric check + primary energy proxy."""
     branding.render_html(
         '<div class="sec-hdr">Part L 2021 &amp; FHS Readiness Overview</div>'
     )
 
-    # Select the correct building_type string for the compliance engine
-    b_type = "individual_selfbuild" if segment_id == "individual_selfbuild" else "non-residential"
-
-    # Run compliance check for every building; collect results
-    checked: list[dict] = []
-    for b_name, b_data in buildings.items():
-        try:
-            res = compliance.part_l_compliance_check(
-                u_wall=b_data["u_value_wall"],
-                u_roof=b_data["u_value_roof"],
-                u_glazing=b_data["u_value_glazing"],
-                floor_area_m2=b_data["floor_area_m2"],
-                annual_energy_kwh=b_data["baseline_energy_mwh"] * 1000,
-                building_type=b_type,
-            )
-            checked.append({"name": b_name, **res})
-        except (ValueError, KeyError):
-            continue
+    # Checked with the segment's building type when the store was synced
+    rows = [(b_name, r["part_l"]) for b_name, r in store.results().items() if r["part_l"] is not None]
+    totals = store.aggregates()
 
-    if not checked:
+    if not rows:
         st.warning("Insufficient building data for Part L compliance check.")
         branding.render_html('<div class="main-section-divider"></div>')
         return
 
-    any_fabric_fail = any(not c["part_l_2021_pass"] for c in checked)
-    any_fhs_fail    = any(not c["fhs_ready"] for c in checked)
+    any_fabric_fail = totals["part_l_fail"] > 0
+    any_fhs_fail    = totals["fhs_fail"] > 0
 
     # ── Section 1: Overall Status Banner ─────────────────────────────────────
     with st.container(border=True):
@@ -326,7 +396,12 @@ def _panel_part_l_fhs(buildings: dict, segment_id: str, show_fhs: bool) -> None:
         '<div class="subsec-label">Fabric U-Value Check</div>'
     )
 
-    for c in checked:
+    # Item lists and actions are built only for the expanders shown, failures first
+    rows.sort(key=lambda nr: (nr[1]["part_l_2021_pass"], -nr[1]["failed_elements"]))
+    if len(rows) > MAX_PART_L_ASSET_ROWS:
+        st.caption(f"Showing the {MAX_PART_L_ASSET_ROWS} assets with the most failing elements of {len(rows)} checked.")
+    for b_name, row in rows[:MAX_PART_L_ASSET_ROWS]:
+        c = {"name": labels[b_name], **compliance.part_l_details(row)}
         b_pass = c["part_l_2021_pass"]
         with st.expander(f"Asset: {c['name']}", expanded=not b_pass):
 
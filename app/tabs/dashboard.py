@@ -14,7 +14,9 @@ Block order (per Prompt B specification):
 """
 from __future__ import annotations
 
+import hashlib
 import html as html_mod
+import json
 
 import pandas as pd
 import plotly.graph_objects as go
@@ -22,11 +24,13 @@ import streamlit as st
 
 import app.branding as branding
 import core.physics as physics
+from core.scenario_registry import scenario_columns_for
+from core.tariffs import resolve_tariff, schedule_key
 from config.scenarios import SCENARIOS, SEGMENT_SCENARIOS
 
 
 from services.report_generator import generate_portfolio_report
-from app.session import switch_segment_with_defaults
+from app.session import active_tariff, switch_segment_with_defaults
 from app.segments import SEGMENT_LABELS
 
 
@@ -166,34 +170,32 @@ def render(handler, weather: dict, portfolio: list[dict]) -> None:
     weather_for_calc = weather if weather.get("temperature_c") is not None else {"temperature_c": 10.0}
 
     # Calculate results
-    tariff = st.session_state.get("energy_tariff_gbp_per_kwh", 0.28)
+    schedule = active_tariff()
+    tariff = resolve_tariff(schedule)
     scenario_totals = {}
 
-    for s_name in selected_names:
-        if s_name not in SCENARIOS:
-            continue
-
-        s_data = SCENARIOS[s_name]
-        totals = {
-            "annual_energy_mwh": 0.0,
-            "carbon_saving_tco2": 0.0,
-            "cost_saving_gbp": 0.0,
-            "install_cost_gbp": 0.0,
-            "energy_saving_mwh": 0.0,
+    for building in segment_portfolio:
+        if "height_m" not in building:
+            building["height_m"] = 3.5
+
+    calc_names = [s_name for s_name in selected_names if s_name in SCENARIOS]
+    scenario_cols = scenario_columns_for(calc_names)
+    grid = physics.calculate_thermal_load_batch(
+        physics.building_columns(segment_portfolio),
+        scenario_cols,
+        weather_for_calc["temperature_c"],
+        schedule,
+    )
+    # Round per building before summing, matching the per-call result dicts
+    for j, s_name in enumerate(calc_names):
+        scenario_totals[s_name] = {
+            "annual_energy_mwh": float(grid["scenario_energy_mwh"][:, j].round(1).sum()),
+            "carbon_saving_tco2": float(grid["carbon_saving_t"][:, j].round(1).sum()),
+            "cost_saving_gbp": float(grid["annual_saving_gbp"][:, j].round(0).sum()),
+            "install_cost_gbp": float(scenario_cols["install_cost_gbp"][j]) * len(segment_portfolio),
+            "energy_saving_mwh": float(grid["energy_saving_mwh"][:, j].round(1).sum()),
         }
 
-        for building in segment_portfolio:
-            if "height_m" not in building:
-                building["height_m"] = 3.5
-            r = physics.calculate_thermal_load(building, s_data, weather_for_calc, tariff)
-            totals["annual_energy_mwh"] += r["scenario_energy_mwh"]
-            totals["carbon_saving_tco2"] += r["carbon_saving_t"]
-            totals["cost_saving_gbp"] += r["annual_saving_gbp"]
-            totals["energy_saving_mwh"] += r["energy_saving_mwh"]
-            totals["install_cost_gbp"] += s_data.get("install_cost_gbp", 0.0)
-
-        scenario_totals[s_name] = totals
-
     # Determine baseline and best scenario for KPIs
     baseline_data = scenario_totals.get("Baseline (No Intervention)", {})
     
@@ -410,3 +412,214 @@ def render(handler, weather: dict, portfolio: list[dict]) -> None:
             font=dict(family="Nunito Sans"),
         )
         st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+    branding.render_html('<div class="main-section-divider"></div>')
+
+    # ── BLOCK 8: UNCERTAINTY (MONTE CARLO) ────────────────────────────────────
+    _render_uncertainty_panel(segment_portfolio, calc_names, weather_for_calc, schedule)
+
+    # ── BLOCK 9: PARETO FRONTIER ──────────────────────────────────────────────
+    _render_pareto_panel(segment_portfolio, calc_names, grid)
+
+    # ── BLOCK 10: RETROFIT PHASING 2025–2035 ──────────────────────────────────
+    _render_phasing_panel(segment_portfolio, weather_for_calc, tariff)
+
+
+def _content_key(portfolio: list[dict], scenario_names: list[str]) -> str:
+    """Hash of the model-read portfolio columns and the named scenario definitions."""
+    digest = hashlib.blake2b(digest_size=16)
+    for name, column in physics.building_columns(portfolio).items():
+        digest.update(name.encode())
+        digest.update(column.tobytes())
+    digest.update(json.dumps({n: SCENARIOS.get(n) for n in scenario_names}, sort_keys=True, default=str).encode())
+    return digest.hexdigest()
+
+
+def _render_uncertainty_panel(
+    portfolio: list[dict], scenario_names: list[str], weather: dict, tariff: float | dict
+) -> None:
+    """P10 / P50 / P90 portfolio outcomes per scenario, computed on demand."""
+    from core.uncertainty import run_monte_carlo, summarise_portfolio
+
+    names = [s for s in scenario_names if s != "Baseline (No Intervention)"]
+    with st.expander("🎲 Uncertainty range (Monte Carlo, P10 / P50 / P90)"):
+        if not names or not portfolio:
+            st.caption("Select at least one retrofit scenario to run the uncertainty analysis.")
+            return
+        discount = float(st.session_state.get("fin_rate_pct", 5.0)) / 100.0
+        term = int(st.session_state.get("fin_term_yrs", 10))
+        run_key = (
+            tuple(names), _content_key(portfolio, names), round(float(weather["temperature_c"]), 1),
+            schedule_key(tariff) if isinstance(tariff, dict) else round(float(tariff), 4), discount, term,
+        )
+        cached = st.session_state.get("mc_result")
+        if st.button("Run 2,000-draw analysis", key="dash_mc_run"):
+            with st.spinner("Sampling U-values, air-tightness, tariff, carbon and install costs…"):
+                result = run_monte_carlo(
+                    portfolio, names, weather["temperature_c"],
+                    tariff_gbp_per_kwh=tariff, discount_rate=discount, term_years=term,
+                )
+            cached = {"key": run_key, "result": result}
+            st.session_state.mc_result = cached
+        if not cached or cached["key"] != run_key:
+            st.caption("Results reflect sampled input uncertainty; press Run after changing inputs.")
+            return
+
+        def _years(v):
+            return f"{v:.1f}" if v is not None else "—"
+
+        rows = []
+        for j, s_name in enumerate(cached["result"]["scenario_names"]):
+            q = summarise_portfolio(cached["result"], j)
+            rows.append({
+                "Scenario": s_name,
+                "Saving P10 (£/yr)": q["annual_saving_gbp"]["p10"],
+                "Saving P50 (£/yr)": q["annual_saving_gbp"]["p50"],
+                "Saving P90 (£/yr)": q["annual_saving_gbp"]["p90"],
+                f"NPV P10 ({term}y, £)": q["npv_gbp"]["p10"],
+                f"NPV P50 ({term}y, £)": q["npv_gbp"]["p50"],
+                "Payback P50–P90 (yrs)": f"{_years(q['payback_years']['p50'])} – {_years(q['payback_years']['p90'])}",
+            })
+        st.dataframe(
+            pd.DataFrame(rows),
+            use_container_width=True,
+            hide_index=True,
+            column_config={
+                c: st.column_config.NumberColumn(format="£%.0f")
+                for c in rows[0] if c.endswith("£/yr)") or c.endswith(", £)")
+            },
+        )
+        st.caption(
+            f"{cached['result']['draws']:,} draws per building. P10 is the pessimistic case: "
+            "9 in 10 outcomes are at least this good."
+        )
+
+
+def _render_pareto_panel(portfolio: list[dict], scenario_names: list[str], grid: dict) -> None:
+    """Cost vs. carbon scatter of every option with the non-dominated set highlighted."""
+    from core.pareto import frontier_from_grid
+
+    with st.expander("⚖️ Trade-off frontier (cost · carbon · payback · NPV)"):
+        b_names = [b.get("name", f"Asset {i + 1}") for i, b in enumerate(portfolio)]
+        discount = float(st.session_state.get("fin_rate_pct", 5.0)) / 100.0
+        term = int(st.session_state.get("fin_term_yrs", 10))
+        front = frontier_from_grid(grid, b_names, scenario_names, discount_rate=discount, term_years=term)
+        if not front["frontier"]:
+            st.caption("No retrofit option saves carbon or money for the selected scenarios.")
+            return
+
+        on_front = {(r["building"], r["scenario"]) for r in front["frontier"]}
+        fig = go.Figure()
+        for label, keep, colour in (("Dominated", False, "rgba(90,122,144,0.45)"), ("Frontier", True, "#00C2A8")):
+            pts = [
+                (b_names[i], s_name, float(grid["install_cost_gbp"][i, j]), float(grid["carbon_saving_t"][i, j]))
+                for i in range(len(b_names)) for j, s_name in enumerate(scenario_names)
+                # The frontier's candidates: options saving carbon or money
+                if grid["valid"][i, j]
+                and (grid["carbon_saving_t"][i, j] > 0 or grid["annual_saving_gbp"][i, j] > 0)
+                and ((b_names[i], s_name) in on_front) == keep
+            ]
+            if not pts:
+                continue
+            fig.add_trace(go.Scatter(
+                x=[p[2] for p in pts], y=[p[3] for p in pts], mode="markers", name=label,
+                marker=dict(color=colour, size=10 if keep else 7),
+                text=[f"{p[0]} — {p[1]}" for p in pts], hovertemplate="%{text}<extra></extra>",
+            ))
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            margin=dict(t=20, b=40, l=40, r=20),
+            height=350,
+            xaxis_title="Install cost (£)",
+            yaxis_title="Carbon saving (tCO₂e/yr)",
+            font=dict(family="Nunito Sans"),
+        )
+        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+        st.dataframe(
+            pd.DataFrame(front["frontier"]).rename(columns={
+                "building": "Asset", "scenario": "Scenario", "install_cost_gbp": "Install (£)",
+                "carbon_saving_t": "Carbon (t/yr)", "annual_saving_gbp": "Saving (£/yr)",
+                "payback_years": "Payback (yrs)", "npv_gbp": f"NPV ({term}y, £)",
+            }).round(1),
+            use_container_width=True,
+            hide_index=True,
+        )
+        st.caption(
+            f"{len(front['frontier'])} of {front['candidates']} options are non-dominated: "
+            "no other option is at least as good on cost, carbon, payback and NPV and strictly better on one."
+        )
+
+
+def _render_phasing_panel(portfolio: list[dict], weather: dict, tariff: float) -> None:
+    """Year-by-year measure schedule under annual capex limits, with MEES dates."""
+    from core.phasing import MEES_SCHEDULE, PhasingSimulator
+
+    with st.expander("🗓️ Retrofit phasing 2025–2035 (annual capex limits)"):
+        if not portfolio:
+            st.caption("Add assets to plan a retrofit programme.")
+            return
+        buildings = {b.get("name", f"Asset {i + 1}"): b for i, b in enumerate(portfolio)}
+        # Keyed on the model-read asset data, so fabric / energy / heating edits re-plan
+        sim_key = (
+            tuple(buildings), _content_key(portfolio, []),
+            round(float(weather["temperature_c"]), 1), round(float(tariff), 4),
+        )
+        cached = st.session_state.get("phasing_sim")
+        if not cached or cached["key"] != sim_key:
+            cached = {"key": sim_key, "sim": PhasingSimulator(buildings, weather["temperature_c"], tariff)}
+            st.session_state.phasing_sim = cached
+        sim = cached["sim"]
+        c1, c2, c3 = st.columns([2, 1, 2])
+        capex = c1.slider(
+            "Annual capex limit (£)", 0, 250_000, 50_000, step=5_000, key="phasing_capex",
+        )
+        change_year = c2.selectbox(
+            "Change limit from", sim.years[1:], index=sim.years.index(MEES_SCHEDULE[1][0]) - 1, key="phasing_change_year",
+        )
+        later_capex = c3.slider(
+            f"Limit from {change_year} (£)", 0, 250_000, 50_000, step=5_000, key="phasing_capex_later",
+        )
+        budgets = {y: float(capex if y < change_year else later_capex) for y in sim.years}
+        # The simulator keeps every year's state, so changing the later limit
+        # or its start year re-plans only from the first changed year
+        result = sim.run(budgets)
+
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            x=result["years"], y=result["spent_gbp"], name="Capex spent (£)",
+            marker_color="rgba(90,122,144,0.55)", yaxis="y2",
+        ))
+        fig.add_trace(go.Scatter(
+            x=result["years"], y=result["carbon_t"], name="Portfolio carbon (tCO₂e)",
+            mode="lines+markers", line=dict(color="#00C2A8"),
+        ))
+        fig.update_layout(
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            margin=dict(t=20, b=40, l=40, r=40),
+            height=320,
+            yaxis=dict(title="tCO₂e / yr"),
+            yaxis2=dict(title="£", overlaying="y", side="right", showgrid=False),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            font=dict(family="Nunito Sans"),
+        )
+        st.plotly_chart(fig, use_container_width=True, config={"displayModeBar": False})
+
+        rows = []
+        for name, asset in result["assets"].items():
+            rows.append({
+                "Asset": name,
+                f"EPC {result['years'][0]}": asset["epc_band"][0],
+                f"EPC {result['years'][-1]}": asset["epc_band"][-1],
+                "MEES-compliant from": str(asset["compliant_from"] or f"Not by {result['years'][-1]}"),
+                "Works": "; ".join(f"{y}: {', '.join(m)}" for y, m in asset["works"].items()) or "—",
+            })
+        st.dataframe(pd.DataFrame(rows), use_container_width=True, hide_index=True)
+        schedule = ", ".join(
+            f"{band} from {start}" if start else f"{band} now" for start, band in MEES_SCHEDULE
+        )
+        st.caption(
+            f"Minimum band: {schedule}. Carbon uses a declining grid-intensity pathway. "
+            "Indicative SAP lifts and midpoint costs."
+        )
@@ -1,32 +1,74 @@
+import numpy as np
 import streamlit as st
 import pandas as pd
 import plotly.graph_objects as go
-from core.physics import calculate_thermal_load
-from config.scenarios import SCENARIOS
+from core.cashflow import DEFAULT_ASSUMPTIONS, CashFlowModel
+from core.physics import building_columns, calculate_thermal_load_batch, electricity_meters, sensitivity_analysis
+from core.scenario_registry import scenario_columns_for
+from core.tariffs import TARIFF_PRESETS, effective_rate
 from config.constants import ELEC_COST_PER_KWH
+from config.scenarios import SCENARIOS
+from services import tmy
+
+# Recent (rate, term, tariff, cash-flow assumption) results kept per session
+FIN_RESULT_CACHE_SIZE = 64
+
+# Cash-flow inputs, one list per expander column: (session key, label, max, step).
+# Percentages are entered as % and passed to core.cashflow as decimals.
+_CASHFLOW_INPUTS = (
+    (
+        ("fin_cf_energy_price_escalation", "Energy price escalation (%/yr)", 15.0, 0.5),
+        ("fin_cf_pv_degradation", "PV degradation (%/yr)", 5.0, 0.1),
+        ("fin_cf_maintenance_pct_capex", "Maintenance (% of CAPEX/yr)", 10.0, 0.5),
+        ("fin_cf_salvage_pct_capex", "Salvage value (% of CAPEX)", 100.0, 5.0),
+    ),
+    (
+        ("fin_cf_loan_fraction", "Debt-financed (% of CAPEX)", 100.0, 5.0),
+        ("fin_cf_loan_rate", "Loan interest rate (%)", 20.0, 0.25),
+        ("fin_cf_loan_term_years", "Loan term (years)", 30.0, 1.0),
+    ),
+    (
+        ("fin_cf_corporation_tax_rate", "Corporation tax (%)", 50.0, 1.0),
+        ("fin_cf_first_year_allowance", "First-year allowance (%)", 100.0, 10.0),
+        ("fin_cf_writing_down_rate", "Writing-down allowance (%/yr)", 100.0, 1.0),
+    ),
+)
 
 
-def _irr(cash_flows: list) -> float | None:
+def _input_default(key: str) -> float:
+    name = key.removeprefix("fin_cf_")
+    value = DEFAULT_ASSUMPTIONS[name]
+    return float(value) if name == "loan_term_years" else float(value) * 100.0
+
+
+def _physics_stage(buildings: dict, scenarios: list[str], temperature_c: float):
     """
-    Newton-Raphson IRR solver using the same cash flows as NPV.
-    Returns IRR as a decimal (e.g. 0.18 = 18%), or None if no valid solution.
-    No external dependencies — uses only built-in Python arithmetic.
+    Physics grid and its ``CashFlowModel`` for the current inputs.
+
+    Neither depends on the discount rate, term, tariff or cash-flow
+    assumptions, so both are kept in session state and rebuilt only when a
+    model-read building or scenario field, or the temperature, changes.  The
+    model carries each cell's monthly electricity meters, so a time-of-use
+    schedule prices every asset on its own profile.
+    Keying on the scenario columns rather than their names picks up edited
+    definitions saved under an existing name.
     """
-    # Guard: if savings are zero or negative the solver will never converge
-    if sum(cash_flows[1:]) <= 0:
-        return None
-    rate = 0.1  # initial guess: 10%
-    for _ in range(1000):
-        npv = sum(cf / (1.0 + rate) ** t for t, cf in enumerate(cash_flows))
-        d_npv = sum(-t * cf / (1.0 + rate) ** (t + 1) for t, cf in enumerate(cash_flows))
-        if d_npv == 0:
-            break
-        new_rate = rate - npv / d_npv
-        if abs(new_rate - rate) < 1e-8:
-            # Guard: reject economically unreasonable values
-            return new_rate if -1.0 < new_rate < 100.0 else None
-        rate = new_rate
-    return None
+    columns = building_columns(buildings.values())
+    sc_columns = scenario_columns_for(scenarios)
+    key = (
+        tuple(scenarios),
+        float(temperature_c),
+        tuple((field, col.tobytes()) for field, col in columns.items()),
+        tuple((field, col.tobytes()) for field, col in sc_columns.items()),
+    )
+    cached = st.session_state.get("fin_physics_stage")
+    if cached is None or cached["key"] != key:
+        grid = calculate_thermal_load_batch(columns, sc_columns, temperature_c)
+        meters = electricity_meters(columns, sc_columns, temperature_c)
+        model = CashFlowModel(grid, maxsize=FIN_RESULT_CACHE_SIZE, electricity_meters=meters)
+        cached = {"key": key, "grid": grid, "model": model}
+        st.session_state.fin_physics_stage = cached
+    return cached["grid"], cached["model"]
 
 
 def render(handler, portfolio: list[dict]) -> None:
@@ -39,13 +81,26 @@ def render(handler, portfolio: list[dict]) -> None:
     st.header("Capital Investment Performance Analysis")
 
     # ── Session state ──────────────────────────────────────────────────────
-    for key, default in [("fin_rate_pct", 5.0), ("fin_term_yrs", 10)]:
+    for key, default in [
+        ("fin_rate_pct", 5.0),
+        ("fin_term_yrs", 10),
+    ]:
         if key not in st.session_state:
             st.session_state[key] = default
+    # The tariff inputs follow Settings whenever Settings changes, and keep
+    # any local override in between.
+    settings_schedule = st.session_state.get("energy_tariff_schedule") or {}
+    settings_tariff = (
+        float(st.session_state.get("energy_tariff_gbp_per_kwh", ELEC_COST_PER_KWH)),
+        settings_schedule.get("name", "Flat"),
+    )
+    if st.session_state.get("fin_tariff_synced") != settings_tariff:
+        st.session_state.fin_tariff, st.session_state.fin_tariff_schedule = settings_tariff
+        st.session_state.fin_tariff_synced = settings_tariff
 
     # ── Section 1: Assumptions Card ───────────────────────────────────────
     with st.container(border=True):
-        c1, c2 = st.columns([3, 2])
+        c1, c2, c3 = st.columns([3, 2, 2])
 
         with c1:
             st.markdown("**Discount Rate**")
@@ -74,8 +129,57 @@ def render(handler, portfolio: list[dict]) -> None:
             )
             st.caption(f"{st.session_state.fin_term_yrs} years selected")
 
+        with c3:
+            st.markdown("**Electricity Tariff**")
+            st.selectbox(
+                "Tariff schedule", ["Flat"] + list(TARIFF_PRESETS),
+                key="fin_tariff_schedule", label_visibility="collapsed",
+            )
+            if st.session_state.fin_tariff_schedule in TARIFF_PRESETS:
+                schedule = TARIFF_PRESETS[st.session_state.fin_tariff_schedule]
+                st.caption(
+                    f"Priced on each asset's modelled meter; £{effective_rate(schedule):.3f}/kWh "
+                    "on the fixed heating profile"
+                )
+            else:
+                st.number_input(
+                    "£/kWh", 0.01, 2.0, step=0.01, format="%.2f",
+                    key="fin_tariff", label_visibility="collapsed",
+                )
+                st.caption("£/kWh applied to energy savings")
+
+        with st.expander("Cash-flow assumptions"):
+            saved_sets = st.session_state.setdefault("fin_assumption_sets", {})
+            if saved_sets:
+                pick = st.selectbox("Saved assumption set", ["—"] + list(saved_sets), key="fin_set_pick")
+                if pick != "—" and st.button("Load", key="fin_set_load"):
+                    for k, v in saved_sets[pick].items():
+                        st.session_state[k] = v
+                    st.rerun()
+            e1, e2, e3 = st.columns(3)
+            for col, fields in zip((e1, e2, e3), _CASHFLOW_INPUTS):
+                with col:
+                    for key, label, hi, step in fields:
+                        st.session_state.setdefault(key, _input_default(key))
+                        lo = 1.0 if key.endswith("_years") else 0.0
+                        st.number_input(label, lo, hi, step=step, key=key)
+            s1, s2 = st.columns([3, 1])
+            set_name = s1.text_input("Save as", key="fin_set_name", placeholder="e.g. Funded, 2 % escalation")
+            if s2.button("Save set", key="fin_set_save") and set_name.strip():
+                saved_sets[set_name.strip()] = {
+                    key: st.session_state[key]
+                    for fields in _CASHFLOW_INPUTS for key, *_ in fields
+                }
+
     discount_rate = float(st.session_state.fin_rate_pct) / 100.0
     term_years = int(st.session_state.fin_term_yrs)
+    tariff = TARIFF_PRESETS.get(st.session_state.fin_tariff_schedule) or float(st.session_state.fin_tariff)
+    assumptions = {"discount_rate": discount_rate, "term_years": term_years}
+    for fields in _CASHFLOW_INPUTS:
+        for key, *_ in fields:
+            name = key.removeprefix("fin_cf_")
+            value = float(st.session_state[key])
+            assumptions[name] = int(value) if name == "loan_term_years" else value / 100.0
 
     # ── Data preparation ───────────────────────────────────────────────────
     buildings = handler.building_registry
@@ -85,31 +189,35 @@ def render(handler, portfolio: list[dict]) -> None:
         st.info("Insufficient data for financial analysis.")
         return
 
-    avg_weather = {"temperature_c": 10.5}
-    roi_data = []
+    avg_weather = {"temperature_c": tmy.default_annual_temperature(
+        st.session_state.get("wx_lat"), st.session_state.get("wx_lon"),
+    )}
+    b_names = list(buildings)
+    n_b, n_s = len(b_names), len(scenarios)
 
-    for b_name, b_data in buildings.items():
-        for s_name in scenarios:
-            sc = SCENARIOS[s_name]
-            res = calculate_thermal_load(b_data, sc, avg_weather)
-
-            saving_gbp = res["annual_saving_gbp"]
-            capex = res["install_cost_gbp"]
-            payback = res["payback_years"] or 999
-
-            cash_flows = [-capex] + [saving_gbp] * term_years
-            npv = sum(cf / ((1.0 + discount_rate) ** t) for t, cf in enumerate(cash_flows))
-            irr_val = _irr(cash_flows)
-
-            roi_data.append({
-                "Asset": b_name,
-                "Scenario": s_name,
-                "CAPEX (£)": capex,
-                "OPEX Savings (£)": saving_gbp,
-                "Payback (Yrs)": payback,
-                "NPV (£)": npv,
-                "IRR (%)": irr_val * 100.0 if irr_val is not None else None,
-            })
+    # Physics stage (cached until the buildings, scenarios or weather change),
+    # then the finance stage served from the model's LRU of assumption sets.
+    grid, model = _physics_stage(buildings, scenarios, avg_weather["temperature_c"])
+    result = model.evaluate(assumptions, tariff_gbp_per_kwh=tariff)
+    saving_gbp = result["annual_saving_gbp"].round(0)
+    capex = grid["install_cost_gbp"]
+    payback = np.where(np.isnan(result["simple_payback_years"]), 999, result["simple_payback_years"].round(1))
+    payback = np.where(payback == 0, 999, payback)
+    npv = result["npv_gbp"]
+    irr = result["irr"]
+    disc_payback = np.where(np.isfinite(result["discounted_payback_years"]),
+                            result["discounted_payback_years"].round(1), np.nan)
+
+    roi_data = {
+        "Asset": np.repeat(b_names, n_s),
+        "Scenario": np.tile(scenarios, n_b),
+        "CAPEX (£)": capex.ravel(),
+        "OPEX Savings (£)": saving_gbp.ravel(),
+        "Payback (Yrs)": payback.ravel(),
+        "NPV (£)": npv.ravel(),
+        "IRR (%)": irr.ravel() * 100.0,
+        "Discounted Payback (Yrs)": disc_payback.ravel(),
+    }
 
     df = pd.DataFrame(roi_data)
 
@@ -162,7 +270,10 @@ def render(handler, portfolio: list[dict]) -> None:
     st.markdown("<div style='margin-top:24px'></div>", unsafe_allow_html=True)
     with st.container(border=True):
         st.markdown("**Detailed Financial Metrics**")
-        display_df = df[["Asset", "Scenario", "CAPEX (£)", "OPEX Savings (£)", "NPV (£)", "IRR (%)"]].copy()
+        display_df = df[[
+            "Asset", "Scenario", "CAPEX (£)", "OPEX Savings (£)", "NPV (£)", "IRR (%)",
+            "Discounted Payback (Yrs)",
+        ]].copy()
         st.dataframe(
             display_df.style.format(
                 {
@@ -170,9 +281,64 @@ def render(handler, portfolio: list[dict]) -> None:
                     "OPEX Savings (£)": "£{:,.0f}",
                     "NPV (£)": "£{:,.0f}",
                     "IRR (%)": "{:.1f}%",
+                    "Discounted Payback (Yrs)": "{:.1f}",
                 },
                 na_rep="N/A",
             ),
             use_container_width=True,
             hide_index=True,
         )
+
+    # ── Section 5: Payback Drivers (tornado) ───────────────────────────────
+    st.markdown("<div style='margin-top:24px'></div>", unsafe_allow_html=True)
+    with st.container(border=True):
+        st.markdown("**Payback Drivers**")
+        st.caption(
+            "Change in payback when each input moves ±10 % about its current value "
+            f"(temperatures ±1 K), for {sel_scenario}."
+        )
+        sel_asset = st.selectbox("Asset", b_names, key="fin_tornado_asset", label_visibility="collapsed")
+        try:
+            sens = sensitivity_analysis(
+                buildings[sel_asset],
+                SCENARIOS[sel_scenario],
+                avg_weather,
+                tariff,
+                rel_step=0.10,
+                rank_by="payback_years",
+            )
+        except ValueError as exc:
+            st.warning(f"Sensitivity unavailable: {exc}")
+            return
+        base = sens["nominal"]["payback_years"]
+        bars = [
+            r for r in sens["inputs"]
+            if base is not None and r["low"]["payback_years"] is not None
+            and r["high"]["payback_years"] is not None and r["elasticity"]["payback_years"]
+        ][:8][::-1]
+        if not bars:
+            st.info("No payback for this asset and scenario, so there is nothing to rank.")
+            return
+        fig = go.Figure()
+        fig.add_trace(go.Bar(
+            y=[r["label"] for r in bars],
+            x=[r["low"]["payback_years"] - base for r in bars],
+            base=base, orientation="h", name="Input lower",
+        ))
+        fig.add_trace(go.Bar(
+            y=[r["label"] for r in bars],
+            x=[r["high"]["payback_years"] - base for r in bars],
+            base=base, orientation="h", name="Input higher",
+        ))
+        fig.update_layout(
+            barmode="overlay",
+            height=360,
+            paper_bgcolor="rgba(0,0,0,0)",
+            plot_bgcolor="rgba(0,0,0,0)",
+            font=dict(color="#CBD8E6"),
+            xaxis=dict(title="Payback Period (Years)", gridcolor="rgba(203,216,230,0.15)"),
+            yaxis=dict(showgrid=False),
+            legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+            margin=dict(t=20, b=40),
+        )
+        st.plotly_chart(fig, use_container_width=True)
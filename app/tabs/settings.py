@@ -1,6 +1,7 @@
 import streamlit as st
 from typing import Dict, Any
 from app.segments import SEGMENT_LABELS
+from core.tariffs import TARIFF_PRESETS, effective_rate
 try:
     from app.utils import validate_gemini_key
 except ImportError:
@@ -26,14 +27,31 @@ def render(weather_data: Dict[str, Any]):
     with st.container(border=True):
         st.subheader("System Configuration")
         st.caption("Energy Costs")
-        st.session_state.energy_tariff_gbp_per_kwh = st.number_input(
-            "Electricity Tariff (£/kWh)",
-            min_value=0.05, max_value=1.00,
-            value=float(st.session_state.get("energy_tariff_gbp_per_kwh", 0.28)),
-            step=0.01,
-            format="%.2f",
-            help="Used for financial calculations across all scenarios."
+        current = st.session_state.get("energy_tariff_schedule") or {}
+        options = ["Flat"] + list(TARIFF_PRESETS)
+        choice = st.selectbox(
+            "Tariff Schedule", options,
+            index=options.index(current.get("name")) if current.get("name") in TARIFF_PRESETS else 0,
+            help="Time-of-use schedules price savings on a typical heating load profile.",
         )
+        if choice == "Flat":
+            st.session_state.energy_tariff_schedule = None
+            st.session_state.energy_tariff_gbp_per_kwh = st.number_input(
+                "Electricity Tariff (£/kWh)",
+                min_value=0.05, max_value=1.00,
+                value=float(st.session_state.get("energy_tariff_gbp_per_kwh", 0.28)),
+                step=0.01,
+                format="%.2f",
+                help="Used for financial calculations across all scenarios."
+            )
+        else:
+            schedule = TARIFF_PRESETS[choice]
+            st.session_state.energy_tariff_schedule = schedule
+            # Flat-rate readers see the schedule's effective rate
+            st.session_state.energy_tariff_gbp_per_kwh = round(effective_rate(schedule), 4)
+            st.caption(
+                f"Effective rate on the heating profile: £{effective_rate(schedule):.3f}/kWh"
+            )
 
     # Section 3 — AI & API Integration
     with st.container(border=True):
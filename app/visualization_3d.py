@@ -16,10 +16,12 @@ import math
 import requests
 import html
 from typing import Dict, List
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from config.constants import CI_ELECTRICITY, ELEC_COST_PER_KWH, HEATING_SETPOINT_C
+from config.constants import CI_ELECTRICITY, ELEC_COST_PER_KWH
+from core.tariffs import monthly_rates
 
 try:
     from config.scenarios import SCENARIOS
@@ -69,13 +71,12 @@ _MONTH_NAMES: List[str] = [
     "July", "August", "September", "October", "November", "December",
 ]
 
-# ── Seasonal energy model constants ──────────────────────────────────────────
-# ~60% of UK campus energy is heating-related (HESA 2022-23 sector data).
-# The remaining 40% (lighting, equipment, hot water) is roughly flat year-round.
-# Heating load scales with heating degree days vs. the annual average.
-_HEATING_FRACTION = 0.60
-_UK_ANNUAL_AVG_TEMP_C = 11.0    # °C — UK annual mean (Met Office 1991–2020)
-_SETPOINT_C = HEATING_SETPOINT_C  # Part L heating set-point
+# ── Reference fabric for timeline rows that carry no building geometry ──────
+# Typical pre-1990 UK non-domestic block; only the monthly *shape* is used.
+_REFERENCE_FABRIC: dict[str, float] = {
+    "floor_area_m2": 2000.0, "height_m": 3.5, "glazing_ratio": 0.30,
+    "u_value_wall": 1.5, "u_value_roof": 1.8, "u_value_glazing": 2.8,
+}
 
 # ── Emissions & cost constants ────────────────────────────────────────────────
 _CI               = CI_ELECTRICITY    # kgCO₂e/kWh  (BEIS 2023 grid intensity)
@@ -190,17 +191,55 @@ def _assign_osm_polygons(
     return result
 
 
-def _seasonal_energy_mwh(baseline_mwh: float, month_temp: float) -> float:
+def _monthly_energy_mwh(buildings: list[dict]) -> np.ndarray:
     """
-    Scale annual baseline energy to a monthly-temperature-equivalent figure.
-    Uses a simplified heating degree day (HDD) ratio:
-      total = non_heating_base + heating_base × (HDD_month / HDD_annual_avg)
+    Modelled monthly energy (N × 12 MWh) for each building under no intervention.
+
+    Runs the physics time-series mode over ``_MONTHLY_TEMPS``; rows sum to the
+    declared ``baseline_energy_mwh``.  Buildings the model cannot evaluate fall
+    back to a flat split of their declared baseline.
     """
-    annual_hdd = max(0.0, _SETPOINT_C - _UK_ANNUAL_AVG_TEMP_C)
-    month_hdd  = max(0.0, _SETPOINT_C - month_temp)
-    hdd_factor = (month_hdd / annual_hdd) if annual_hdd > 0 else 1.0
-    return ((1.0 - _HEATING_FRACTION) * baseline_mwh
-            + _HEATING_FRACTION * baseline_mwh * hdd_factor)
+    declared = np.array([float(b.get("baseline_energy_mwh", 0.0) or 0.0) for b in buildings])
+    flat = np.multiply.outer(declared, np.full(12, 1.0 / 12.0))
+    if not buildings:
+        return flat
+    try:
+        import core.physics as physics
+        series = physics.simulate_thermal_series(
+            physics.building_columns(buildings),
+            [_MONTHLY_TEMPS[m] for m in range(1, 13)],
+            strict=False,
+        )
+    except (ImportError, ValueError):
+        return flat
+    return np.where(series["valid"][:, None], series["energy_mwh"], flat)
+
+
+def _monthly_timeline(buildings_data: List[Dict]) -> Dict[int, List[Dict]]:
+    """
+    Split each row's annual ``energy_kwh`` / ``carbon_tonnes`` into months.
+
+    The monthly shape comes from the physics time-series mode, using the
+    row's own fabric where present and ``_REFERENCE_FABRIC`` otherwise.
+    """
+    if not buildings_data:
+        return {}
+    fabrics = [
+        {**_REFERENCE_FABRIC, **{k: b[k] for k in _REFERENCE_FABRIC if k in b}, "baseline_energy_mwh": 1.0}
+        for b in buildings_data
+    ]
+    shares = _monthly_energy_mwh(fabrics)
+    return {
+        m: [
+            {
+                **b,
+                "energy_kwh":    float(b.get("energy_kwh", 0.0)) * shares[i, m - 1],
+                "carbon_tonnes": float(b.get("carbon_tonnes", 0.0)) * shares[i, m - 1],
+            }
+            for i, b in enumerate(buildings_data)
+        ]
+        for m in range(1, 13)
+    }
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -253,13 +292,14 @@ def _compute_all_buildings(
     tooltip can show the full comparison in one hover card.
     """
     try:
-        from core.physics import calculate_thermal_load
+        import core.physics as physics
+        from core.scenario_registry import scenario_columns_for
     except ImportError:
         # Fallback stub if physics engine is missing
-        def calculate_thermal_load(b, s, w):
-            return {"baseline_energy_mwh": 100, "scenario_energy_mwh": 90, 
-                    "energy_saving_pct": 10, "baseline_carbon_t": 20, 
-                    "scenario_carbon_t": 18, "carbon_saving_t": 2, "payback_years": 5.0}
+        physics = None
+        _stub = {"baseline_energy_mwh": 100, "scenario_energy_mwh": 90,
+                 "energy_saving_pct": 10, "baseline_carbon_t": 20,
+                 "scenario_carbon_t": 18, "carbon_saving_t": 2, "payback_years": 5.0}
 
     scenario_cfg = SCENARIOS.get(scenario_name)
     if scenario_cfg is None:
@@ -268,14 +308,27 @@ def _compute_all_buildings(
     bcoords = _building_coords(center_lat, center_lon, list(buildings.keys()))
     rows: list[dict] = []
 
-    for bname, bdata in buildings.items():
-        coords = bcoords.get(bname)
-        if coords is None:
-            continue
+    placed = [(bname, bdata) for bname, bdata in buildings.items() if bname in bcoords]
+    grid = None
+    if physics is not None and placed:
         try:
-            res = calculate_thermal_load(bdata, scenario_cfg, weather)
+            grid = physics.calculate_thermal_load_batch(
+                physics.building_columns(bdata for _, bdata in placed),
+                scenario_columns_for([scenario_name]),
+                weather["temperature_c"],
+                strict=False,
+            )
         except Exception:
+            return []
+
+    for i, (bname, bdata) in enumerate(placed):
+        coords = bcoords[bname]
+        if grid is None:
+            res = _stub
+        elif not grid["valid"][i, 0]:
             continue
+        else:
+            res = physics.thermal_load_record(grid, i, 0)
 
         payback = res.get("payback_years")
         tariff = st.session_state.get("energy_tariff_gbp_per_kwh", _ELEC_GBP_PER_KWH)
@@ -984,12 +1037,13 @@ def _info_tab_seasonal(bdata: dict) -> None:
     """Monthly energy bar chart + monthly cost grid."""
     import plotly.graph_objects as go
 
-    baseline = float(bdata.get("baseline_energy_mwh", 100.0))
+    schedule = st.session_state.get("energy_tariff_schedule")
     tariff   = st.session_state.get("energy_tariff_gbp_per_kwh", _ELEC_GBP_PER_KWH)
+    rates    = monthly_rates(schedule) if schedule else [tariff] * 12
     months   = list(range(1, 13))
-    energies = [round(_seasonal_energy_mwh(baseline, _MONTHLY_TEMPS[m]), 1) for m in months]
+    energies = [round(float(e), 1) for e in _monthly_energy_mwh([bdata])[0]]
     carbons  = [round(e * 1000 * _CI / 1000, 1)               for e in energies]
-    costs    = [round(e * 1000 * tariff / 1000, 2) for e in energies]
+    costs    = [round(e * 1000 * r / 1000, 2) for e, r in zip(energies, rates)]
 
     fig = go.Figure()
     fig.add_trace(go.Bar(
@@ -1027,7 +1081,7 @@ def _info_tab_seasonal(bdata: dict) -> None:
                     value=f"£{costs[m - 1]:.1f}k",
                     delta=f"{energies[m - 1]:.0f} MWh",
                 )
-    st.caption("Monthly energy via HDD model · Met Office 1991–2020 normals (Reading)")
+    st.caption("Monthly energy via degree-hour physics model · Met Office 1991–2020 normals (Reading)")
 
 
 def _info_tab_scenarios(
@@ -1267,7 +1321,13 @@ def render_4d_carbon_timeline(
     buildings_data: List[Dict],
     scenarios_over_time: Dict[int, List[Dict]],
 ) -> None:
-    """Render a month-by-month carbon intensity timeline using a pydeck map."""
+    """Render a month-by-month carbon intensity timeline using a pydeck map.
+
+    When *scenarios_over_time* is empty the monthly rows are modelled from
+    the annual figures in *buildings_data* (see ``_monthly_timeline``).
+    """
+    if not scenarios_over_time:
+        scenarios_over_time = _monthly_timeline(buildings_data)
     if not scenarios_over_time:
         st.info("No timeline data available.")
         return
@@ -5,13 +5,24 @@ Physical and financial constants for the CrowAgent™ Platform.
 # Grid & Energy
 CI_ELECTRICITY = 0.20482  # kgCO2e/kWh (BEIS 2023)
 
+# Projected grid intensity, kgCO2e/kWh — indicative decarbonisation pathway
+# from the 2023 factor towards a largely decarbonised 2035 grid.  Years
+# outside the table hold the nearest value.
+GRID_CARBON_TRAJECTORY = {
+    2025: 0.171, 2026: 0.153, 2027: 0.136, 2028: 0.119, 2029: 0.104, 2030: 0.090,
+    2031: 0.077, 2032: 0.066, 2033: 0.056, 2034: 0.048, 2035: 0.041,
+}
+
 CI_GAS = 0.18316
 CI_OIL = 0.24666
 CI_LPG = 0.21448
 
 ELEC_COST_PER_KWH = 0.28  # £/kWh (HESA 2022-23)
 GAS_COST_PER_KWH = 0.07
+OIL_COST_PER_KWH = 0.07   # £/kWh delivered, kerosene (indicative 2024)
+LPG_COST_PER_KWH = 0.09
 DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH = ELEC_COST_PER_KWH
+SEG_EXPORT_TARIFF_GBP_PER_KWH = 0.05  # Smart Export Guarantee, typical fixed offer
 
 # Physics / Thermal Model
 HEATING_SETPOINT_C = 21.0
@@ -21,6 +32,15 @@ SOLAR_IRRADIANCE_KWH_M2_YEAR = 1000.0
 SOLAR_APERTURE_FACTOR = 0.7
 SOLAR_UTILISATION_FACTOR = 0.85
 INFILTRATION_HEAT_CAPACITY_FACTOR = 0.33
+# Relative monthly global horizontal irradiation, Jan–Dec (southern England,
+# kWh/m²) — shape used to spread annual solar gains in time-series mode.
+SOLAR_MONTHLY_PROFILE = (20.0, 35.0, 70.0, 110.0, 145.0, 150.0, 150.0, 125.0, 85.0, 50.0, 25.0, 15.0)
+# Relative monthly space-heating demand, Jan–Dec (UK heating degree-days,
+# base 15.5 °C) and hour-of-day heating shape (occupied 06:00–22:00) — the
+# default load profile for pricing annual savings under a time-of-use tariff.
+HEATING_MONTHLY_PROFILE = (340.0, 300.0, 280.0, 210.0, 140.0, 70.0, 35.0, 40.0, 80.0, 170.0, 260.0, 320.0)
+HEATING_DIURNAL_PROFILE = (0.0,) * 6 + (1.0,) * 16 + (0.0,) * 2
+PHYSICS_CACHE_MAXSIZE = 4096  # thermal-load results kept in the physics LRU
 
 # Compliance Targets (Part L 2021)
 PART_L_2021_U_WALL = 0.18
@@ -18,8 +18,18 @@ import time
 from typing import Any
 
 import config.constants as constants
+import core.calibration as calibration
+import core.heating_systems as heating_systems
+import core.heat_pump as heat_pump
 import core.physics as physics
+import core.optimiser as optimiser
+import core.pareto as pareto
+import core.pv_matching as pv_matching
+import core.solar as solar
+from core.scenario_registry import scenario_columns_for
+from core.tariffs import resolve_tariff
 from config.scenarios import SCENARIOS
+from services import carbon_intensity, tmy
 
 # ─────────────────────────────────────────────────────────────────────────────
 # API & MODEL CONSTANTS
@@ -150,7 +160,7 @@ AGENT_TOOLS = [
                 },
                 "temperature_c": {
                     "type": "number",
-                    "description": "External ambient temperature in °C. Default 10.5 (UK annual average).",
+                    "description": "External ambient temperature in °C. Default: typical-year annual mean for Reading.",
                 },
             },
             "required": ["building_name", "scenario_name"],
@@ -174,7 +184,7 @@ AGENT_TOOLS = [
                 },
                 "temperature_c": {
                     "type": "number",
-                    "description": "External temperature °C. Default 10.5.",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
                 },
             },
             "required": ["scenario_name"],
@@ -196,7 +206,7 @@ AGENT_TOOLS = [
                 },
                 "temperature_c": {
                     "type": "number",
-                    "description": "External temperature °C. Default 10.5.",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
                 },
             },
             "required": ["budget_gbp"],
@@ -244,15 +254,330 @@ AGENT_TOOLS = [
                 },
                 "temperature_c": {
                     "type": "number",
-                    "description": "External temperature °C. Default 10.5.",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
                 },
             },
             "required": ["building_name"],
         },
     },
+    {
+        "name": "explain_drivers",
+        "description": (
+            "Sensitivity (tornado) analysis for one building and one scenario. "
+            "Perturbs every model input — fabric, scenario factors, weather, "
+            "tariff, grid carbon and model constants — by ±5% (temperatures by "
+            "±1 K) and returns the elasticity of scenario energy, carbon and "
+            "payback to each (per kelvin for temperatures), ranked by swing. "
+            "Useful for 'what drives the payback for Building X?' questions."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_name": {
+                    "type": "string",
+                    "description": "The name of the building to analyze.",
+                },
+                "scenario_name": {
+                    "type": "string",
+                    "description": "The intervention scenario to analyze.",
+                },
+                "rank_by": {
+                    "type": "string",
+                    "description": (
+                        "Output to rank inputs by. One of: "
+                        "'scenario_energy_mwh', 'scenario_carbon_t', 'payback_years'"
+                    ),
+                },
+                "temperature_c": {
+                    "type": "number",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
+                },
+            },
+            "required": ["building_name", "scenario_name"],
+        },
+    },
+    {
+        "name": "optimise_retrofit_plan",
+        "description": (
+            "Choose the best COMBINATION of retrofit measures across the whole "
+            "portfolio under one capital budget (exact knapsack optimisation over "
+            "insulation, glazing, LED, heat pump and solar PV measures). Maximises "
+            "total carbon saved, or the number of buildings lifted to the MEES "
+            "target band. Use this instead of find_best_for_budget when the budget "
+            "can be split across several buildings."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "budget_gbp": {
+                    "type": "number",
+                    "description": "Total capital budget in GBP to allocate across the portfolio.",
+                },
+                "objective": {
+                    "type": "string",
+                    "description": "One of: 'carbon' (most tCO₂e saved) or 'mees' (most assets reaching the target EPC band).",
+                },
+                "target_band": {
+                    "type": "string",
+                    "description": "Target EPC band for the 'mees' objective. Default: 'C'.",
+                },
+                "temperature_c": {
+                    "type": "number",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
+                },
+            },
+            "required": ["budget_gbp"],
+        },
+    },
+    {
+        "name": "mees_upgrade_path",
+        "description": (
+            "Find the CHEAPEST combination of retrofit measures (insulation, glazing, "
+            "LED, heat pump, solar PV) that lifts each building to a target EPC band. "
+            "Every combination is re-rated with the upgraded fabric and modelled "
+            "energy, so interactions between measures are counted. Use this for "
+            "MEES compliance questions about individual buildings."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_name": {
+                    "type": "string",
+                    "description": "Building to assess. Omit to assess every building.",
+                },
+                "target_band": {
+                    "type": "string",
+                    "description": "Target EPC band. Default: 'C' (2028 MEES target).",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "pareto_options",
+        "description": (
+            "Compute the Pareto frontier of all building × scenario options: the "
+            "non-dominated set over install cost, carbon saving, payback and NPV. "
+            "Every option NOT on the frontier is dominated by some frontier option: "
+            "no worse on every metric and strictly better on at least one. Use this "
+            "for trade-off questions instead of ranking by "
+            "one metric at a time."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "discount_rate_pct": {
+                    "type": "number",
+                    "description": "Discount rate for NPV in percent. Default: 5.",
+                },
+                "term_years": {
+                    "type": "number",
+                    "description": "NPV appraisal period in years. Default: 10.",
+                },
+                "temperature_c": {
+                    "type": "number",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "lifetime_carbon",
+        "description": (
+            "Cumulative carbon for one building under one scenario over a range of "
+            "years: electricity on historical and projected GB grid factors, gas, oil "
+            "and LPG on their fixed fuel factors. "
+            "basis 'location' is the average-mix factor used for SECR reporting; "
+            "'marginal' is the factor for the plant that responds to a change in "
+            "demand and is the right basis for appraising an intervention's savings."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_name": {
+                    "type": "string",
+                    "description": "The name of the building to analyze.",
+                },
+                "scenario_name": {
+                    "type": "string",
+                    "description": "The intervention scenario to compare with the baseline.",
+                },
+                "start_year": {"type": "number", "description": "First year, inclusive. Default: 2025."},
+                "end_year": {"type": "number", "description": "Last year, inclusive. Default: 2035."},
+                "basis": {
+                    "type": "string",
+                    "description": "'location' (default) or 'marginal'.",
+                },
+                "temperature_c": {
+                    "type": "number",
+                    "description": "External temperature °C. Default: typical-year annual mean for Reading.",
+                },
+            },
+            "required": ["building_name", "scenario_name"],
+        },
+    },
+    {
+        "name": "heat_pump_screen",
+        "description": (
+            "Size an air or ground source heat pump for each building over an hourly "
+            "typical year and report capacity, seasonal performance factor (SPF), "
+            "electricity added and the change in running cost and carbon against the "
+            "current heating system. Flags buildings suitable for a heat pump "
+            "(SPF >= 2.5 and peak heat loss <= 100 W/m²)."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Buildings to screen. Default: all buildings.",
+                },
+                "kind": {"type": "string", "description": "'ashp' (default) or 'gshp'."},
+                "flow_temp_c": {
+                    "type": "number",
+                    "description": "Design flow temperature °C. Default: 45 (55 for unchanged radiators).",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "solar_pv_yield",
+        "description": (
+            "Estimate rooftop solar PV generation for a building from its roof area, "
+            "location, tilt and azimuth: installed kWp, annual and monthly kWh and "
+            "specific yield (kWh/kWp)."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_name": {"type": "string", "description": "Name of the building."},
+                "roof_fraction": {
+                    "type": "number",
+                    "description": "Share of the roof covered with PV, 0–1. Default: 0.5.",
+                },
+                "tilt_deg": {"type": "number", "description": "Panel tilt in degrees. Default: 35."},
+                "azimuth_deg": {
+                    "type": "number",
+                    "description": "Panel azimuth, degrees clockwise from north (180 = south). Default: facing the equator.",
+                },
+            },
+            "required": ["building_name"],
+        },
+    },
+    {
+        "name": "pv_self_consumption",
+        "description": (
+            "Match a PV scenario's hourly generation against each building's hourly "
+            "electricity load over a typical year, with an optional battery. Splits the "
+            "PV value into avoided import (self-consumed kWh at the import tariff) and "
+            "Smart Export Guarantee income, and shows the annual-netting value for comparison."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_names": {
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "description": "Buildings to model. Default: all buildings.",
+                },
+                "scenario_name": {
+                    "type": "string",
+                    "description": "PV scenario. Default: 'Renewables (Solar PV)'.",
+                },
+                "roof_fraction": {
+                    "type": "number",
+                    "description": "Override: PV on this share of each roof (0–1) instead of the scenario's PV.",
+                },
+                "battery_kwh": {"type": "number", "description": "Battery capacity per building, kWh. Default: 0."},
+                "base_load_kwh": {
+                    "type": "number",
+                    "description": "Non-heating electricity use per building, kWh a year. Default: 0.",
+                },
+                "export_tariff_gbp_per_kwh": {
+                    "type": "number",
+                    "description": "SEG export rate £/kWh. Default: 0.05.",
+                },
+            },
+            "required": [],
+        },
+    },
+    {
+        "name": "calibrate_building",
+        "description": (
+            "Calibrate a building's physics model to its metered energy: fits effective "
+            "U-values, air-change rate and non-heating base load to 12 monthly meter "
+            "readings and reports the fit quality against ASHRAE Guideline 14. The "
+            "calibrated values are saved on the portfolio asset for later analysis."
+        ),
+        "parameters": {
+            "type": "object",
+            "properties": {
+                "building_name": {"type": "string", "description": "Name of the building."},
+                "monthly_mwh": {
+                    "type": "array",
+                    "items": {"type": "number"},
+                    "description": "Delivered energy of the heating fuel meter for January–December, in MWh.",
+                },
+                "city": {
+                    "type": "string",
+                    "description": "Typical-year weather city. Default: the building's city or nearest store city.",
+                },
+            },
+            "required": ["building_name", "monthly_mwh"],
+        },
+    },
 ]
 
 
+def _evaluate_grid(
+    buildings: dict,
+    scenarios: dict,
+    weather: dict,
+    tariff: float | dict,
+    calc,
+) -> list[tuple[str, str, dict | None, str | None]]:
+    """
+    Evaluate every building × scenario pair as (building, scenario, result, error).
+
+    The stock physics engine is evaluated in one batch call; an injected
+    ``calculate_fn`` is still called pair by pair.
+    """
+    if calc is not physics.calculate_thermal_load:
+        out = []
+        for bname, bdata in buildings.items():
+            for sname, sdata in scenarios.items():
+                try:
+                    out.append((bname, sname, calc(bdata, sdata, weather, tariff), None))
+                except Exception as exc:
+                    out.append((bname, sname, None, str(exc)))
+        return out
+
+    b_items, s_items = list(buildings.items()), list(scenarios.items())
+    try:
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(b for _, b in b_items),
+            scenario_columns_for([sname for sname, _ in s_items], scenarios),
+            weather["temperature_c"],
+            tariff,
+            strict=False,
+        )
+    except ValueError as exc:
+        return [(bname, sname, None, str(exc)) for bname, _ in b_items for sname, _ in s_items]
+
+    out = []
+    for i, (bname, bdata) in enumerate(b_items):
+        for j, (sname, sdata) in enumerate(s_items):
+            if grid["valid"][i, j]:
+                out.append((bname, sname, physics.thermal_load_record(grid, i, j), None))
+            else:
+                err = physics.batch_row_error(bdata, sdata, weather["temperature_c"])
+                out.append((bname, sname, None, err))
+    return out
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # TOOL EXECUTOR
 # Receives a function name + args from Gemini → calls the real Python function
@@ -264,19 +589,27 @@ def execute_tool(
     buildings: dict,
     scenarios: dict,
     calculate_fn=None,
-    tariff: float = constants.DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    tariff: float | dict = constants.DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
 ) -> dict[str, Any]:
     """
     Execute a named tool with given args.
     buildings and scenarios are injected from the main app.
-    Calls core.physics directly.
+    Calls core.physics directly.  ``tariff`` may be a core.tariffs schedule:
+    the physics-engine tools price it on each building's own electricity
+    meters, ``pv_self_consumption`` prices each hour off it, and the
+    optimiser, frontier and heat-pump screen (and an injected
+    ``calculate_fn``) use its effective £/kWh.
     """
+    schedule, tariff = tariff, resolve_tariff(tariff)
+    default_temp = tmy.default_annual_temperature()
     try:
-        temp = float(args.get("temperature_c", 10.5))
+        temp = float(args.get("temperature_c", default_temp))
     except (ValueError, TypeError):
-        temp = 10.5
+        temp = default_temp
     weather = {"temperature_c": temp, "wind_speed_mph": 9.2}
     calc = calculate_fn or physics.calculate_thermal_load
+    # The stock engine takes the schedule itself
+    priced = schedule if calc is physics.calculate_thermal_load else tariff
 
     # ── Tool: run_scenario ────────────────────────────────────────────────────
     if name == "run_scenario":
@@ -290,7 +623,7 @@ def execute_tool(
                     f"Available: {list(scenarios.keys())}"}
         try:
             result = calc(
-                buildings[bname], scenarios[sname], weather, tariff
+                buildings[bname], scenarios[sname], weather, priced
             )
         except Exception as exc:
             return {"error": f"Scenario calculation failed for '{bname}' / '{sname}': {exc}"}
@@ -312,13 +645,11 @@ def execute_tool(
             return {"error": f"Scenario '{sname}' not found."}
         rows = []
         errors = []
-        for bname, bdata in buildings.items():
-            try:
-                r = calc(
-                    bdata, scenarios[sname], weather, tariff
-                )
-            except Exception as exc:
-                errors.append({"building": bname, "error": str(exc)})
+        for bname, _, r, err in _evaluate_grid(
+            buildings, {sname: scenarios[sname]}, weather, priced, calc
+        ):
+            if err is not None:
+                errors.append({"building": bname, "error": err})
                 continue
             cost = scenarios[sname]["install_cost_gbp"]
             rows.append({
@@ -341,33 +672,29 @@ def execute_tool(
         budget = float(args["budget_gbp"])
         candidates = []
         errors = []
-        for bname, bdata in buildings.items():
-            for sname, sdata in scenarios.items():
-                if sdata["install_cost_gbp"] <= 0:
-                    continue
-                if sdata["install_cost_gbp"] > budget:
-                    continue
-                try:
-                    r = calc(
-                        bdata, sdata, weather, tariff
-                    )
-                except Exception as exc:
-                    errors.append({"building": bname, "scenario": sname, "error": str(exc)})
-                    continue
-                if r["carbon_saving_t"] <= 0:
-                    continue
-                candidates.append({
-                    "building":           bname,
-                    "scenario":           sname,
-                    "install_cost_gbp":   sdata["install_cost_gbp"],
-                    "carbon_saving_t":    r["carbon_saving_t"],
-                    "annual_saving_gbp":  r["annual_saving_gbp"],
-                    "payback_years":      r["payback_years"],
-                    "energy_saving_mwh":  r["energy_saving_mwh"],
-                    "cost_per_tonne_co2": round(
-                        sdata["install_cost_gbp"] / max(r["carbon_saving_t"], 0.01), 1
-                    ),
-                })
+        affordable = {
+            sname: sdata for sname, sdata in scenarios.items()
+            if 0 < sdata["install_cost_gbp"] <= budget
+        }
+        for bname, sname, r, err in _evaluate_grid(buildings, affordable, weather, priced, calc):
+            sdata = affordable[sname]
+            if err is not None:
+                errors.append({"building": bname, "scenario": sname, "error": err})
+                continue
+            if r["carbon_saving_t"] <= 0:
+                continue
+            candidates.append({
+                "building":           bname,
+                "scenario":           sname,
+                "install_cost_gbp":   sdata["install_cost_gbp"],
+                "carbon_saving_t":    r["carbon_saving_t"],
+                "annual_saving_gbp":  r["annual_saving_gbp"],
+                "payback_years":      r["payback_years"],
+                "energy_saving_mwh":  r["energy_saving_mwh"],
+                "cost_per_tonne_co2": round(
+                    sdata["install_cost_gbp"] / max(r["carbon_saving_t"], 0.01), 1
+                ),
+            })
         if not candidates:
             error_message = f"No scenarios fit within £{budget:,.0f} budget."
             if errors:
@@ -416,7 +743,7 @@ def execute_tool(
         for sname, sdata in scenarios.items():
             try:
                 r = calc(
-                    buildings[bname], sdata, weather, tariff
+                    buildings[bname], sdata, weather, priced
                 )
             except Exception as exc:
                 errors.append({"scenario": sname, "error": str(exc)})
@@ -447,6 +774,239 @@ def execute_tool(
             "calculation_errors": errors,
         }
 
+    # ── Tool: explain_drivers ─────────────────────────────────────────────────
+    elif name == "explain_drivers":
+        bname = args["building_name"]
+        sname = args["scenario_name"]
+        rank_by = args.get("rank_by", "scenario_energy_mwh")
+        if bname not in buildings:
+            return {"error": f"Building '{bname}' not found."}
+        if sname not in scenarios:
+            return {"error": f"Scenario '{sname}' not found."}
+        if rank_by not in physics.SENSITIVITY_METRICS:
+            rank_by = "scenario_energy_mwh"
+        try:
+            sens = physics.sensitivity_analysis(
+                buildings[bname], scenarios[sname], weather, schedule, rank_by=rank_by
+            )
+        except Exception as exc:
+            return {"error": f"Sensitivity analysis failed for '{bname}' / '{sname}': {exc}"}
+        return {
+            "building":      bname,
+            "scenario":      sname,
+            "ranked_by":     rank_by,
+            "perturbation":  f"±{sens['rel_step'] * 100:.0f}% (temperatures ±{physics.SENSITIVITY_STEP_K:g} K)",
+            "nominal":       {k: round(v, 2) if v is not None else None for k, v in sens["nominal"].items()},
+            "drivers": [
+                {
+                    "input":      r["label"],
+                    "group":      r["group"],
+                    "value":      r["value"],
+                    "step":       r["step"],
+                    "elasticity": {
+                        k: round(v, 3) if v is not None else None for k, v in r["elasticity"].items()
+                    },
+                }
+                for r in sens["inputs"]
+            ],
+            "temperature_c": temp,
+        }
+
+    # ── Tool: optimise_retrofit_plan ──────────────────────────────────────────
+    elif name == "optimise_retrofit_plan":
+        try:
+            budget = float(args["budget_gbp"])
+            plan = optimiser.optimise_portfolio(
+                buildings,
+                budget,
+                temp,
+                tariff,
+                objective=args.get("objective", "carbon"),
+                target_band=args.get("target_band", "C"),
+            )
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Portfolio optimisation failed: {exc}"}
+        plan["temperature_c"] = temp
+        return plan
+
+    # ── Tool: mees_upgrade_path ───────────────────────────────────────────────
+    elif name == "mees_upgrade_path":
+        bname = args.get("building_name")
+        if bname is not None and bname not in buildings:
+            return {"error": f"Building '{bname}' not found."}
+        selected = {bname: buildings[bname]} if bname else buildings
+        try:
+            path = optimiser.mees_pathfinder(selected, str(args.get("target_band", "C")).upper())
+        except (ValueError, TypeError) as exc:
+            return {"error": f"MEES upgrade path failed: {exc}"}
+        result = {}
+        for i, n in enumerate(path["names"]):
+            if not path["valid"][i]:
+                result[n] = {"error": "Insufficient building data for an EPC estimate."}
+                continue
+            k = path["subset"][i]
+            result[n] = {
+                "measures":          [m for m, on in zip(path["measures"], path["masks"][k]) if on],
+                "cost_gbp":          round(float(path["cost_gbp"][i])),
+                "sap_before":        round(float(path["sap_before"][i]), 1),
+                "sap_after":         round(float(path["sap_after"][i]), 1),
+                "band_before":       str(path["band_before"][i]),
+                "band_after":        str(path["band_after"][i]),
+                "energy_after_mwh":  round(float(path["energy_after_mwh"][i]), 1),
+                "reaches_target":    bool(path["reachable"][i]),
+            }
+        return {"target_band": path["target_band"], "cost_basis": path["cost_basis"], "buildings": result}
+
+    # ── Tool: pareto_options ──────────────────────────────────────────────────
+    elif name == "pareto_options":
+        try:
+            front = pareto.portfolio_frontier(
+                buildings,
+                list(scenarios),
+                temp,
+                scenarios=scenarios,
+                tariff_gbp_per_kwh=tariff,
+                discount_rate=float(args.get("discount_rate_pct", 5.0)) / 100.0,
+                term_years=int(args.get("term_years", 10)),
+            )
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Pareto frontier failed: {exc}"}
+        front["temperature_c"] = temp
+        return front
+
+    # ── Tool: lifetime_carbon ─────────────────────────────────────────────────
+    elif name == "lifetime_carbon":
+        bname = args["building_name"]
+        sname = args["scenario_name"]
+        basis = args.get("basis", "location")
+        if bname not in buildings:
+            return {"error": f"Building '{bname}' not found."}
+        if sname not in scenarios:
+            return {"error": f"Scenario '{sname}' not found."}
+        try:
+            start, end = int(args.get("start_year", 2025)), int(args.get("end_year", 2035))
+            r = calc(buildings[bname], scenarios[sname], weather, priced)
+            # The grid trajectory applies to the electricity meter only, on the
+            # winter-weighted heating profile when it carries the heating;
+            # gas, oil and LPG keep their fixed factors every year.
+            electric = bool(heating_systems.is_electric(heating_systems.system_code(r["heating_system"])))
+            profile = constants.HEATING_MONTHLY_PROFILE if electric else None
+            tonnes = [
+                float(carbon_intensity.lifetime_carbon_t(
+                    r[f"{side}_electricity_mwh"] * 1000.0, start, end, basis, profile_kwh=profile
+                ))
+                + (end - start + 1) * sum(
+                    r[f"{side}_{fuel}_mwh"] * heating_systems.FUEL_CARBON_KG_PER_KWH[fuel]
+                    for fuel in heating_systems.FUELS if fuel != "electricity"
+                )
+                for side in ("baseline", "scenario")
+            ]
+        except (ValueError, TypeError, KeyError) as exc:
+            return {"error": f"Lifetime carbon failed for '{bname}' / '{sname}': {exc}"}
+        return {
+            "building":             bname,
+            "scenario":             sname,
+            "basis":                basis,
+            "years":                f"{start}–{end}",
+            "baseline_tco2e":       round(tonnes[0], 1),
+            "scenario_tco2e":       round(tonnes[1], 1),
+            "saving_tco2e":         round(tonnes[0] - tonnes[1], 1),
+            "factor_range_kg_per_kwh": [
+                round(carbon_intensity.annual_factor(start, basis), 4),
+                round(carbon_intensity.annual_factor(end, basis), 4),
+            ],
+            "temperature_c":        temp,
+        }
+
+    # ── Tool: heat_pump_screen ────────────────────────────────────────────────
+    elif name == "heat_pump_screen":
+        names = args.get("building_names") or list(buildings)
+        missing = [n for n in names if n not in buildings]
+        if missing:
+            return {"error": f"Buildings not found: {missing}"}
+        try:
+            screen = heat_pump.screen_portfolio(
+                {n: buildings[n] for n in names},
+                kind=args.get("kind", "ashp"),
+                flow_temp_c=float(args.get("flow_temp_c", 45.0)),
+                tariff_gbp_per_kwh=tariff,
+            )
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Heat-pump screen failed: {exc}"}
+        return {
+            "kind":      args.get("kind", "ashp"),
+            "city":      tmy.DEFAULT_TMY_CITY,
+            "buildings": screen,
+            "suitable":  sorted(n for n, r in screen.items() if r["suitable"]),
+        }
+
+    # ── Tool: solar_pv_yield ──────────────────────────────────────────────────
+    elif name == "solar_pv_yield":
+        bname = args.get("building_name", "")
+        if bname not in buildings:
+            return {"error": f"Building '{bname}' not found."}
+        building = dict(buildings[bname])
+        if args.get("tilt_deg") is not None:
+            building["pv_tilt_deg"] = args["tilt_deg"]
+        if args.get("azimuth_deg") is not None:
+            building["pv_azimuth_deg"] = args["azimuth_deg"]
+        try:
+            pv = solar.building_pv(building, float(args.get("roof_fraction", 0.5)))
+        except (ValueError, TypeError) as exc:
+            return {"error": f"PV estimate failed: {exc}"}
+        return {"building": bname, **pv}
+
+    # ── Tool: pv_self_consumption ─────────────────────────────────────────────
+    elif name == "pv_self_consumption":
+        names = args.get("building_names") or list(buildings)
+        missing = [n for n in names if n not in buildings]
+        if missing:
+            return {"error": f"Buildings not found: {missing}"}
+        sname = args.get("scenario_name", "Renewables (Solar PV)")
+        if sname not in scenarios:
+            return {"error": f"Scenario '{sname}' not found."}
+        scenario = dict(scenarios[sname])
+        if args.get("roof_fraction") is not None:
+            scenario.update(pv_roof_fraction=args["roof_fraction"], renewable_kwh=0.0)
+        try:
+            summary = pv_matching.summarise_portfolio(
+                {n: buildings[n] for n in names},
+                scenario,
+                battery_kwh=float(args.get("battery_kwh", 0.0)),
+                base_load_kwh=float(args.get("base_load_kwh", 0.0)),
+                tariff_gbp_per_kwh=schedule,
+                export_tariff_gbp_per_kwh=float(
+                    args.get("export_tariff_gbp_per_kwh", constants.SEG_EXPORT_TARIFF_GBP_PER_KWH)
+                ),
+            )
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Self-consumption model failed: {exc}"}
+        return {"scenario": sname, "city": tmy.DEFAULT_TMY_CITY, "buildings": summary}
+
+    # ── Tool: calibrate_building ──────────────────────────────────────────────
+    elif name == "calibrate_building":
+        bname = args.get("building_name", "")
+        if bname not in buildings:
+            return {"error": f"Building '{bname}' not found."}
+        building = dict(buildings[bname])
+        if args.get("city"):
+            if args["city"] not in tmy.available_cities():
+                return {"error": f"No typical-year weather for '{args['city']}'."}
+            building["city"] = args["city"]
+        try:
+            readings = args.get("monthly_mwh") or []
+            if len(readings) != 12:
+                return {"error": "monthly_mwh must hold 12 monthly readings."}
+            fitted = calibration.calibrate_assets({bname: building}, {bname: readings})[bname]
+        except (ValueError, TypeError) as exc:
+            return {"error": f"Calibration failed: {exc}"}
+        return {
+            "building": bname,
+            **{f: fitted[f] for f in calibration.CALIBRATED_FIELDS},
+            **{k: v for k, v in fitted["calibration"].items() if k != "prior"},
+            "declared": fitted["calibration"]["prior"],
+        }
+
     elif name == "list_buildings":
         return {"buildings": sorted(list(buildings.keys()))}
 
@@ -591,6 +1151,15 @@ def _invoke_gemini_with_compat(
     )
 
 
+def _store_calibration(portfolio: list, result: dict) -> None:
+    """Save a calibrate_building *result* onto the matching portfolio asset, in place."""
+    for asset in portfolio:
+        if asset.get("name") == result.get("building"):
+            calibrated = calibration.apply_calibration(asset, result)
+            asset.clear()
+            asset.update(calibrated)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # AGENTIC LOOP
 # Think → Call tools → Observe results → Think again → Final answer
@@ -602,6 +1171,7 @@ def run_agent_turn(
     portfolio: list,
     api_key: str,
     status_widget=None,
+    tariff: float | dict = constants.DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
 ) -> str:
     """
     Run the full agentic loop for one user turn.
@@ -614,7 +1184,6 @@ def run_agent_turn(
     # Convert portfolio list to building registry dict for tool execution
     building_registry = {b["name"]: b for b in portfolio}
     scenario_registry = SCENARIOS
-    tariff = constants.DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH
 
     # Build initial message list for this turn
     messages: list = []
@@ -678,6 +1247,9 @@ def run_agent_turn(
                     calculate_fn=physics.calculate_thermal_load,
                     tariff=tariff,
                 )
+                # Calibrated parameters replace the declared ones in the session portfolio
+                if name == "calibrate_building" and "error" not in result:
+                    _store_calibration(portfolio, result)
 
                 tool_calls_log.append({
                     "name": name,
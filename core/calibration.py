@@ -0,0 +1,352 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Meter Calibration
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Fits building parameters to metered delivered energy so that scenarios start
+# from a physically consistent baseline instead of one scalar rescale.  Each
+# reading is modelled with the core.physics series engine as
+#
+#     base load × step share + max(0, (f·UA + ach·Hv)·degree-hours − solar) / η
+#
+# where f scales the declared fabric U-values, ach is the effective air-change
+# rate, Hv the ventilation loss per ach and η the heating-system efficiency.
+# The model runs hourly whenever hourly temperatures are available (always,
+# for the typical year); monthly readings are matched against the hourly
+# heating summed per month, so the clamp at zero acts on each hour as it does
+# in the series engine rather than on a month's mean degree-days.
+# The fit is a bounded least-squares solve per building, vectorised over the
+# portfolio as batched 3×3 normal equations, with the clamped-heating steps
+# found by iterating the active set.
+#
+# Metered energy only sees the total heat-loss coefficient, so the split
+# between fabric and ventilation follows a weak prior centred on the declared
+# values (ASHRAE Guideline 14 "calibrated simulation", Bayesian form).
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+
+import core.physics as physics
+from config.constants import HEATING_HOURS_PER_YEAR, HEATING_SETPOINT_C
+from core import heating_systems
+from services import tmy
+
+# Prior uncertainty of the declared fabric and ventilation, as relative SDs
+PRIOR_FABRIC_REL_SD = 0.3
+PRIOR_ACH_REL_SD = 0.5
+PRIOR_WEIGHT = 1e-4                 # ridge strength relative to the data
+FABRIC_FACTOR_LIMITS = (0.2, 3.0)
+MIN_AIR_CHANGE_RATE = 0.1
+MIN_READINGS = 6
+MAX_ITERATIONS = 12
+
+# ASHRAE Guideline 14 acceptance: (max CV(RMSE), max |NMBE|)
+GUIDELINE_14_LIMITS: dict[str, tuple[float, float]] = {
+    "monthly": (0.15, 0.05),
+    "hourly":  (0.30, 0.10),
+}
+
+_PARAMS = 3                         # fabric factor, air-change rate, base load
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# READINGS
+# ─────────────────────────────────────────────────────────────────────────────
+def meter_steps(readings: "np.typing.ArrayLike") -> np.ndarray:
+    """
+    (N, T) delivered energy in MWh per model step from (N, 12) monthly,
+    (N, 8760) hourly or (N, 17520) half-hourly readings; half-hours are
+    summed into hours.  NaN marks a missing reading.
+    """
+    meter = np.atleast_2d(np.asarray(readings, dtype=float))
+    if meter.shape[-1] == 2 * physics.HOURS_PER_YEAR:
+        meter = meter.reshape(meter.shape[0], physics.HOURS_PER_YEAR, 2).sum(axis=-1)
+    if meter.shape[-1] not in (12, physics.HOURS_PER_YEAR):
+        raise ValueError("readings must hold 12 monthly, 8760 hourly or 17520 half-hourly values.")
+    if (meter < 0).any():
+        raise ValueError("Meter readings must be >= 0.")
+    return meter
+
+
+def default_temperatures(city: str | None = None) -> np.ndarray:
+    """Typical-year hourly temperatures for *city* (default ``tmy.DEFAULT_TMY_CITY``), for any meter resolution."""
+    return tmy.hourly_temperatures(city or tmy.DEFAULT_TMY_CITY)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# BATCH FIT
+# ─────────────────────────────────────────────────────────────────────────────
+def _solve(normal: np.ndarray, rhs: np.ndarray, fixed: np.ndarray, fixed_value: np.ndarray) -> np.ndarray:
+    """Batched (N, P, P) normal equations with the *fixed* parameters pinned to *fixed_value*."""
+    normal = np.where(fixed[:, :, None], np.eye(_PARAMS), normal)
+    rhs = np.where(fixed, fixed_value, rhs)
+    return np.linalg.solve(normal, rhs[..., None])[..., 0]
+
+
+def calibrate_batch(
+    buildings: Mapping[str, "np.typing.ArrayLike"],
+    readings: "np.typing.ArrayLike",
+    temperatures_c: "np.typing.ArrayLike | None" = None,
+    *,
+    solar_weights: "np.typing.ArrayLike | None" = None,
+    prior_weight: float = PRIOR_WEIGHT,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Fit every building in *buildings* (``physics.building_columns``) to its
+    row of *readings* (see ``meter_steps``) under *temperatures_c* — shared
+    or one row per building, at the meter resolution or hourly (8760 or
+    17520 values) for monthly readings; default the hourly typical year of
+    ``tmy.DEFAULT_TMY_CITY``.  With hourly temperatures monthly readings are
+    fitted to the hourly model summed per month; *solar_weights* follow the
+    temperature resolution.  The declared U-values and air-change rate are
+    the prior; ``baseline_energy_mwh`` and ``base_load_mwh`` are ignored.
+
+    Returns (N,) ``fabric_factor``, calibrated ``u_value_wall`` /
+    ``u_value_roof`` / ``u_value_glazing``, ``air_change_rate``,
+    ``base_load_mwh`` (annual), the fitted year's ``heating_mwh``,
+    ``baseline_energy_mwh`` and ``heating_fraction``, the fit statistics
+    ``cv_rmse``, ``nmbe`` and ``meets_guideline_14``, ``n_readings``,
+    ``iterations`` and the boolean ``valid`` mask, plus the (N, T)
+    ``fitted_mwh``.  With ``strict=False`` buildings that cannot be fitted
+    (invalid inputs, fewer than ``MIN_READINGS`` readings) are NaN.
+    """
+    if not prior_weight > 0:
+        raise ValueError("prior_weight must be > 0.")
+    meter = meter_steps(readings)
+    n, steps = meter.shape
+    b = {k: np.asarray(buildings[k], dtype=float).reshape(-1) for k in physics.BUILDING_FIELDS}
+    if len(b["floor_area_m2"]) != n:
+        raise ValueError("readings must have one row per building.")
+    systems = heating_systems.system_codes(buildings.get("heating_system"), n)
+
+    temps = default_temperatures() if temperatures_c is None else np.asarray(temperatures_c, dtype=float)
+    if temps.shape[-1] == 2 * physics.HOURS_PER_YEAR:
+        temps = temps.reshape(*temps.shape[:-1], physics.HOURS_PER_YEAR, 2).mean(axis=-1)
+    model_steps = temps.shape[-1]
+    if model_steps not in (steps, physics.HOURS_PER_YEAR) or temps.shape not in ((model_steps,), (n, model_steps)):
+        raise ValueError(
+            "temperatures_c must match the meter resolution (or be hourly), shared or one row per building."
+        )
+    if not ((temps >= -40.0) & (temps <= 60.0)).all():
+        raise ValueError("temperatures_c must lie within the physically plausible range [-40, 60] °C.")
+    step_hours = physics._series_step_hours(model_steps)
+    weights = physics._series_solar_weights(model_steps, solar_weights)
+    # Hourly model terms are summed into the meter's months
+    to_meter = physics.series_to_monthly if model_steps != steps else (lambda x: x)
+
+    observed = np.isfinite(meter)
+    n_readings = observed.sum(axis=1)
+    ok = physics._valid_building_rows(b) & (systems >= 0) & (n_readings >= MIN_READINGS)
+    if strict and not ok.all():
+        i = int(np.argmin(ok))
+        if n_readings[i] < MIN_READINGS:
+            raise ValueError(f"Calibration needs at least {MIN_READINGS} meter readings per building.")
+        row = {**physics._row(b, i), "heating_system": int(systems[i]) if systems[i] >= 0 else "unknown"}
+        physics._validate_model_inputs(row, {}, {"temperature_c": float(np.ravel(temps)[0])})
+        raise ValueError("Invalid calibration inputs.")
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        efficiency = heating_systems.efficiency(systems[:, None], temps if temps.ndim == 2 else temps[None, :])
+        degree = np.maximum(0.0, HEATING_SETPOINT_C - temps) * step_hours * (
+            HEATING_HOURS_PER_YEAR / physics.HOURS_PER_YEAR
+        ) / 1_000_000.0
+        geometry = physics._series_geometry(b)
+        ua, hv, solar = physics._series_coefficients(
+            u_wall=b["u_value_wall"],
+            u_roof=b["u_value_roof"],
+            u_glazing=b["u_value_glazing"],
+            infiltration_reduction=0.0,
+            solar_gain_reduction=0.0,
+            base_ach=1.0,
+            **geometry,
+        )
+        # Per-step columns of the model, each (N, T)
+        loss = degree / efficiency                          # MWh of delivered energy per W/K
+        gains = np.multiply.outer(solar, weights) / efficiency
+        share = np.broadcast_to(physics._series_step_hours(steps) / physics.HOURS_PER_YEAR, (n, steps))
+
+        prior_ach = physics._air_change_rate(b["air_change_rate"])
+        sd = np.stack([np.full(n, PRIOR_FABRIC_REL_SD), PRIOR_ACH_REL_SD * prior_ach], axis=1)
+        max_factor = np.minimum(
+            FABRIC_FACTOR_LIMITS[1],
+            6.0 / np.maximum.reduce([b["u_value_wall"], b["u_value_roof"], b["u_value_glazing"]]),
+        )
+        # Parameters are solved as (prior offsets in SDs, base load), so the ridge is isotropic
+        lower = np.stack([(FABRIC_FACTOR_LIMITS[0] - 1.0) / sd[:, 0], (MIN_AIR_CHANGE_RATE - prior_ach) / sd[:, 1],
+                          np.zeros(n)], axis=1)
+        upper = np.stack([(max_factor - 1.0) / sd[:, 0], (physics.MAX_AIR_CHANGE_RATE - prior_ach) / sd[:, 1],
+                          np.full(n, np.inf)], axis=1)
+
+        # Both heating columns are multiples of the active loss column, so the
+        # normal equations reduce to a handful of row sums per iteration
+        y = np.where(observed, meter, 0.0)
+        step_share = np.where(observed, share, 0.0)
+        ss, sy = np.einsum("nt,nt->n", step_share, step_share), np.einsum("nt,nt->n", step_share, y)
+        coef = np.nan_to_num(np.stack([ua * sd[:, 0], hv * sd[:, 1]], axis=1))
+        prior_loss = np.nan_to_num(ua + prior_ach * hv)
+        theta = np.zeros((n, _PARAMS))
+        fixed = np.zeros((n, _PARAMS), dtype=bool)
+        fixed_value = np.zeros((n, _PARAMS))
+        active = None
+        iterations = np.zeros(n, dtype=int)
+        for _ in range(MAX_ITERATIONS):
+            factor = 1.0 + theta[:, 0] * sd[:, 0]
+            ach = prior_ach + theta[:, 1] * sd[:, 1]
+            heat = (factor * ua + ach * hv)[:, None] * loss - gains
+            new_active = heat > 0
+            if model_steps == steps:
+                new_active &= observed
+            if active is not None and (new_active == active).all():
+                break
+            active = new_active
+            iterations += 1
+            active_loss = np.where(observed, to_meter(np.where(active, loss, 0.0)), 0.0)
+            active_gains = np.where(observed, to_meter(np.where(active, gains, 0.0)), 0.0)
+            ll = np.einsum("nt,nt->n", active_loss, active_loss)
+            ls = np.einsum("nt,nt->n", active_loss, step_share)
+            # Target is the meter less the heating the prior already explains
+            lt = np.einsum("nt,nt->n", active_loss, y + active_gains) - prior_loss * ll
+            st = sy + np.einsum("nt,nt->n", step_share, active_gains) - prior_loss * ls
+
+            normal = np.empty((n, _PARAMS, _PARAMS))
+            normal[:, :2, :2] = coef[:, :, None] * coef[:, None, :] * ll[:, None, None]
+            normal[:, :2, 2] = normal[:, 2, :2] = coef * ls[:, None]
+            normal[:, 2, 2] = ss
+            ridge = prior_weight * (coef ** 2).sum(axis=1) * ll / 2.0 + 1e-12
+            normal[:, 0, 0] += ridge
+            normal[:, 1, 1] += ridge
+            normal[:, 2, 2] += 1e-12
+            rhs = np.stack([coef[:, 0] * lt, coef[:, 1] * lt, st], axis=1)
+            normal, rhs = np.nan_to_num(normal), np.nan_to_num(rhs)
+            for _ in range(_PARAMS + 1):
+                theta = _solve(normal, rhs, fixed, fixed_value)
+                low, high = theta < lower, theta > upper
+                if not (low | high).any():
+                    break
+                fixed |= low | high
+                fixed_value = np.where(low, lower, np.where(high, upper, fixed_value))
+            theta = np.clip(theta, lower, upper)
+
+        factor = 1.0 + theta[:, 0] * sd[:, 0]
+        ach = prior_ach + theta[:, 1] * sd[:, 1]
+        base = theta[:, 2]
+        heating = to_meter(np.maximum(0.0, (factor * ua + ach * hv)[:, None] * loss - gains))
+        fitted = heating + base[:, None] * share
+
+        residual = np.where(observed, meter - fitted, 0.0)
+        dof = np.maximum(n_readings - _PARAMS, 1)
+        mean = np.where(observed, meter, 0.0).sum(axis=1) / np.maximum(n_readings, 1)
+        cv_rmse = np.sqrt((residual ** 2).sum(axis=1) / dof) / mean
+        nmbe = residual.sum(axis=1) / dof / mean
+        annual = fitted.sum(axis=1)
+        heating_mwh = heating.sum(axis=1)
+
+    cv_limit, nmbe_limit = GUIDELINE_14_LIMITS["monthly" if steps == 12 else "hourly"]
+    nan = np.where(ok, 1.0, np.nan)
+    return {
+        "fabric_factor":       factor * nan,
+        "u_value_wall":        b["u_value_wall"] * factor * nan,
+        "u_value_roof":        b["u_value_roof"] * factor * nan,
+        "u_value_glazing":     b["u_value_glazing"] * factor * nan,
+        "air_change_rate":     ach * nan,
+        "base_load_mwh":       base * nan,
+        "heating_mwh":         heating_mwh * nan,
+        "baseline_energy_mwh": annual * nan,
+        "heating_fraction":    np.where(annual > 0, heating_mwh / np.where(annual > 0, annual, 1.0), 0.0) * nan,
+        "cv_rmse":             cv_rmse * nan,
+        "nmbe":                nmbe * nan,
+        "meets_guideline_14":  ok & (cv_rmse <= cv_limit) & (np.abs(nmbe) <= nmbe_limit),
+        "n_readings":          n_readings,
+        "iterations":          iterations,
+        "fitted_mwh":          fitted * nan[:, None],
+        "valid":               ok,
+    }
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PORTFOLIO ASSETS — fit and store calibrated parameters on each asset
+# ─────────────────────────────────────────────────────────────────────────────
+CALIBRATED_FIELDS = (
+    "u_value_wall", "u_value_roof", "u_value_glazing", "air_change_rate", "base_load_mwh", "baseline_energy_mwh",
+)
+
+
+def _asset_city(asset: Mapping) -> str:
+    if asset.get("city") in tmy.available_cities():
+        return asset["city"]
+    lat, lon = asset.get("latitude"), asset.get("longitude")
+    if lat is not None and lon is not None:
+        return tmy.nearest_city(float(lat), float(lon))
+    return tmy.DEFAULT_TMY_CITY
+
+
+def _prior(asset: Mapping) -> dict:
+    """The asset as declared, before any earlier calibration (``None`` = field was absent)."""
+    prior = dict(asset.get("calibration") or {}).get("prior", {})
+    declared = {k: v for k, v in asset.items() if k not in prior and k != "calibration"}
+    declared.update({k: v for k, v in prior.items() if v is not None})
+    return declared
+
+
+def apply_calibration(asset: Mapping, fit: Mapping) -> dict:
+    """
+    Copy of *asset* carrying the calibrated fields from *fit* (one building's
+    scalars from ``calibrate_batch``) plus a ``calibration`` record of the
+    fit statistics and the declared values it replaced.
+    """
+    declared = _prior(asset)
+    calibrated = {**declared, **{f: round(float(fit[f]), 4) for f in CALIBRATED_FIELDS}}
+    calibrated["calibration"] = {
+        "fabric_factor":      round(float(fit["fabric_factor"]), 4),
+        "heating_fraction":   round(float(fit["heating_fraction"]), 4),
+        "cv_rmse":            round(float(fit["cv_rmse"]), 4),
+        "nmbe":               round(float(fit["nmbe"]), 4),
+        "meets_guideline_14": bool(fit["meets_guideline_14"]),
+        "n_readings":         int(fit["n_readings"]),
+        "prior":              {f: declared.get(f) for f in CALIBRATED_FIELDS},
+    }
+    return calibrated
+
+
+def calibrate_assets(
+    assets: Mapping[str, Mapping],
+    readings: Mapping[str, Sequence[float]],
+    temperatures_c: "np.typing.ArrayLike | None" = None,
+    *,
+    strict: bool = True,
+) -> dict[str, dict]:
+    """
+    Calibrate the named *assets* that have *readings* and return them with
+    ``apply_calibration`` applied.  Readings of each resolution are fitted
+    in one batch; without *temperatures_c* each asset uses the typical year
+    of its ``city``, or the store city nearest its coordinates.  A
+    re-calibration starts again from the declared values.  With
+    ``strict=False`` assets that cannot be fitted are left out.
+    """
+    missing = [name for name in readings if name not in assets]
+    if missing:
+        raise ValueError(f"Buildings not found: {missing}")
+    groups: dict[int, list[str]] = {}
+    for name, values in readings.items():
+        groups.setdefault(meter_steps(values).shape[-1], []).append(name)
+
+    out = {}
+    for steps, names in groups.items():
+        rows = [_prior(assets[name]) for name in names]
+        temps = temperatures_c
+        if temps is None:
+            temps = np.stack([default_temperatures(_asset_city(row)) for row in rows])
+        fit = calibrate_batch(
+            physics.building_columns(rows),
+            np.concatenate([meter_steps(readings[name]) for name in names]),
+            temps,
+            strict=strict,
+        )
+        for i, name in enumerate(names):
+            if fit["valid"][i]:
+                out[name] = apply_calibration(assets[name], {k: v[i] for k, v in fit.items() if k != "fitted_mwh"})
+    return out
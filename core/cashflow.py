@@ -0,0 +1,264 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Retrofit Cash-Flow Model
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Builds the full asset × scenario × year cash-flow matrix from one physics
+# grid (core.physics.calculate_thermal_load_batch) under an assumption set:
+# energy-price escalation, PV output degradation, maintenance opex, loan
+# financing, corporation tax with capital allowances, and salvage value.
+# NPV, IRR and payback are all read off that one matrix (core.finance).
+#
+# Results are cached per assumption set on the model, so switching back to a
+# set already evaluated is a dictionary lookup.
+#
+# Timing conventions: year 0 is the install (equity share of capex); savings,
+# opex, loan payments and tax effects fall at the end of years 1..T; salvage
+# and any outstanding loan balance settle at the end of year T.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+
+from core import heating_systems
+from core.finance import annuity_factor, discounted_payback_flows, irr, npv
+from core.physics import PhysicsCache, electricity_rates
+from core.tariffs import price_index, resolve_tariff, schedule_key
+
+CASHFLOW_CACHE_MAXSIZE = 32      # assumption sets kept per model
+
+# Neutral defaults reproduce the flat ``[-capex] + [saving] * term`` model.
+DEFAULT_ASSUMPTIONS: dict[str, float] = {
+    "discount_rate":           0.05,
+    "term_years":              10,
+    "energy_price_escalation": 0.0,    # real annual tariff growth
+    "pv_degradation":          0.0,    # annual PV output loss (≈0.005 for c-Si)
+    "maintenance_pct_capex":   0.0,    # annual opex as a share of capex
+    "loan_fraction":           0.0,    # share of capex debt-financed
+    "loan_rate":               0.06,
+    "loan_term_years":         10,
+    "corporation_tax_rate":    0.0,    # 0 = pre-tax appraisal
+    "first_year_allowance":    0.0,    # 1.0 = full expensing / AIA
+    "writing_down_rate":       0.18,   # main-pool reducing-balance rate
+    "salvage_pct_capex":       0.0,    # residual value at end of term
+}
+
+_FRACTIONS = (
+    "pv_degradation", "loan_fraction", "corporation_tax_rate",
+    "first_year_allowance", "writing_down_rate",
+)
+_YEARS = ("term_years", "loan_term_years")
+
+
+def normalise_assumptions(assumptions: Mapping[str, float] | None = None) -> dict:
+    """Merge *assumptions* over the defaults and validate every value."""
+    merged = dict(DEFAULT_ASSUMPTIONS)
+    if assumptions:
+        unknown = set(assumptions) - set(DEFAULT_ASSUMPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown cash-flow assumptions: {sorted(unknown)}.")
+        merged.update(assumptions)
+    out = {}
+    for key, value in merged.items():
+        value = float(value)
+        if not np.isfinite(value):
+            raise ValueError(f"{key} must be finite.")
+        if key in _YEARS:
+            if value < 1 or value != int(value):
+                raise ValueError(f"{key} must be a whole number of years >= 1.")
+            value = int(value)
+        elif key in _FRACTIONS and not 0.0 <= value <= 1.0:
+            raise ValueError(f"{key} must be between 0 and 1.")
+        elif key in ("discount_rate", "energy_price_escalation", "loan_rate") and value <= -1.0:
+            raise ValueError(f"{key} must be > -1.")
+        elif key in ("maintenance_pct_capex", "salvage_pct_capex") and value < 0.0:
+            raise ValueError(f"{key} must be >= 0.")
+        out[key] = value
+    return out
+
+
+def _assumption_key(assumptions: Mapping[str, float]) -> tuple:
+    return tuple(assumptions[k] for k in DEFAULT_ASSUMPTIONS)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MATRIX
+# ─────────────────────────────────────────────────────────────────────────────
+
+def cash_flow_matrix(
+    grid: Mapping[str, np.ndarray],
+    assumptions: Mapping[str, float] | None = None,
+    *,
+    prices: "np.typing.ArrayLike | None" = None,
+) -> np.ndarray:
+    """
+    Cash flows ``(..., T + 1)`` for every cell of a physics *grid*.
+
+    *grid* needs ``install_cost_gbp``, ``annual_saving_gbp``,
+    ``energy_saving_mwh`` and ``renewable_mwh``.  The PV share of each
+    saving (renewable MWh over total MWh saved) degrades; the rest does not.
+    With tax enabled, net savings and opex are taxed and the capital
+    allowances and loan interest give relief; the salvage receipt is untaxed.
+    *prices* is an optional (T,) tariff index for years 1..T (e.g.
+    ``core.tariffs.price_index``), applied on top of energy_price_escalation.
+    """
+    a = normalise_assumptions(assumptions)
+    T = a["term_years"]
+    capex = np.asarray(grid["install_cost_gbp"], dtype=float)
+    saving = np.asarray(grid["annual_saving_gbp"], dtype=float)
+    saved_mwh = np.asarray(grid["energy_saving_mwh"], dtype=float)
+    pv_mwh = np.asarray(grid["renewable_mwh"], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        pv_share = np.where(saved_mwh > 0, np.clip(pv_mwh / saved_mwh, 0.0, 1.0), 0.0)
+
+    t = np.arange(1, T + 1, dtype=float)
+    escalation = (1.0 + a["energy_price_escalation"]) ** (t - 1.0)
+    if prices is not None:
+        prices = np.asarray(prices, dtype=float).reshape(-1)
+        if prices.size != T:
+            raise ValueError("prices must hold one value per year of the term.")
+        escalation = escalation * prices
+    degradation = (1.0 - a["pv_degradation"]) ** (t - 1.0)
+    savings = saving[..., None] * escalation * (
+        (1.0 - pv_share)[..., None] + pv_share[..., None] * degradation
+    )
+    operating = savings - a["maintenance_pct_capex"] * capex[..., None]
+
+    # Level-payment loan: instalments for min(loan term, T) years, balance
+    # outstanding after year T repaid with the final flow.
+    loan = a["loan_fraction"] * capex
+    r, n = a["loan_rate"], a["loan_term_years"]
+    payment = loan / annuity_factor(r, n)
+    in_loan = t <= n
+    repay = payment[..., None] * in_loan
+    interest = r * payment[..., None] * annuity_factor(r, np.maximum(n - (t - 1.0), 0.0)) * in_loan
+    balloon = payment * annuity_factor(r, max(n - T, 0))
+
+    # Capital allowances: first-year allowance, remainder written down on a
+    # reducing balance from year 1.
+    fya, wda = a["first_year_allowance"], a["writing_down_rate"]
+    allowance = (1.0 - fya) * wda * (1.0 - wda) ** (t - 1.0)
+    allowance[0] += fya
+    tax = a["corporation_tax_rate"]
+
+    flows = np.empty(capex.shape + (T + 1,))
+    flows[..., 0] = -(capex - loan)
+    flows[..., 1:] = (
+        operating * (1.0 - tax)
+        + tax * (allowance * capex[..., None] + interest)
+        - repay
+    )
+    flows[..., -1] += a["salvage_pct_capex"] * capex - balloon
+    return flows
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MODEL — one physics grid, many assumption sets
+# ─────────────────────────────────────────────────────────────────────────────
+
+class CashFlowModel:
+    """
+    Cash-flow metrics for one physics grid under any number of assumption sets.
+
+    ``evaluate`` returns the flow matrix plus NPV, IRR (equity IRR when a
+    loan is modelled), simple and discounted payback for every cell; each
+    distinct assumption set and tariff is computed once and then served
+    from an LRU.  ``payback_years`` is read off the flows, so it is ``inf``
+    beyond the term; ``simple_payback_years`` is capex over year-1 saving.
+    *electricity_meters* (core.physics.electricity_meters of the grid's
+    buildings and scenarios) lets a schedule price each cell's own meters.
+    """
+
+    def __init__(
+        self,
+        grid: Mapping[str, np.ndarray],
+        maxsize: int = CASHFLOW_CACHE_MAXSIZE,
+        electricity_meters: Mapping[str, np.ndarray] | None = None,
+    ):
+        self.grid = {
+            k: np.asarray(grid[k], dtype=float)
+            for k in ("install_cost_gbp", "annual_saving_gbp", "energy_saving_mwh", "renewable_mwh")
+        }
+        # A tariff re-prices the electricity share of each saving; savings in
+        # other fuels keep their fuel price.  A grid without the per-fuel keys
+        # is treated as all electricity.
+        if "baseline_electricity_mwh" in grid:
+            self._baseline_electric_mwh = np.asarray(grid["baseline_electricity_mwh"], dtype=float)
+            self._scenario_electric_mwh = np.asarray(grid["scenario_electricity_mwh"], dtype=float)
+            self._electric_saving_mwh = self._baseline_electric_mwh - self._scenario_electric_mwh
+            self._fuel_saving_gbp = sum(
+                (np.asarray(grid[f"baseline_{f}_mwh"], dtype=float) - np.asarray(grid[f"scenario_{f}_mwh"], dtype=float))
+                * 1000.0 * heating_systems.FUEL_PRICE_GBP_PER_KWH[f]
+                for f in heating_systems.FUELS if f != "electricity"
+            )
+        else:
+            self._electric_saving_mwh = self.grid["energy_saving_mwh"]
+            self._fuel_saving_gbp = 0.0
+        self._meters = electricity_meters if "baseline_electricity_mwh" in grid else None
+        self._cache = PhysicsCache(maxsize)
+
+    def evaluate(
+        self,
+        assumptions: Mapping[str, float] | None = None,
+        tariff_gbp_per_kwh: float | Mapping | None = None,
+    ) -> dict:
+        """
+        Metrics under *assumptions*.  A *tariff_gbp_per_kwh* re-prices the
+        grid's electricity savings (they are linear in the tariff), so the
+        physics grid never needs recomputing for a tariff change; gas, oil
+        and LPG savings keep their fuel prices.  A core.tariffs
+        schedule prices each cell's baseline and scenario electricity on its
+        own meter when the model has ``electricity_meters`` (else at the
+        schedule's effective rate), and its escalation curve drives the
+        savings from year 2 on.
+        """
+        a = normalise_assumptions(assumptions)
+        prices = None
+        schedule = None
+        tariff_key = tariff_gbp_per_kwh
+        if isinstance(tariff_gbp_per_kwh, Mapping):
+            schedule = tariff_gbp_per_kwh
+            tariff_key = schedule_key(tariff_gbp_per_kwh)
+            prices = price_index(tariff_gbp_per_kwh, a["term_years"])
+            tariff_gbp_per_kwh = resolve_tariff(tariff_gbp_per_kwh)
+        if tariff_gbp_per_kwh is not None and not tariff_gbp_per_kwh > 0:
+            raise ValueError("tariff_gbp_per_kwh must be > 0.")
+        key = _assumption_key(a) + (tariff_key,)
+        result = self._cache.get(key)
+        if result is None:
+            grid = self.grid
+            if schedule is not None and self._meters is not None:
+                baseline_rate, scenario_rate = electricity_rates(self._meters, schedule)
+                grid = {
+                    **grid,
+                    "annual_saving_gbp": self._fuel_saving_gbp + 1000.0 * (
+                        self._baseline_electric_mwh * baseline_rate - self._scenario_electric_mwh * scenario_rate
+                    ),
+                }
+            elif tariff_gbp_per_kwh is not None:
+                grid = {
+                    **grid,
+                    "annual_saving_gbp": self._fuel_saving_gbp + self._electric_saving_mwh * 1000.0 * tariff_gbp_per_kwh,
+                }
+            capex, saving = grid["install_cost_gbp"], grid["annual_saving_gbp"]
+            flows = cash_flow_matrix(grid, a, prices=prices)
+            result = {
+                "assumptions":              a,
+                "tariff_gbp_per_kwh":       tariff_gbp_per_kwh,
+                "annual_saving_gbp":        saving,
+                "simple_payback_years":     np.where(
+                    (saving > 0) & (capex != 0), capex / np.where(saving > 0, saving, 1.0), np.nan
+                ),
+                "flows":                    flows,
+                "npv_gbp":                  npv(a["discount_rate"], flows),
+                "irr":                      irr(flows),
+                "payback_years":            discounted_payback_flows(0.0, flows),
+                "discounted_payback_years": discounted_payback_flows(a["discount_rate"], flows),
+            }
+            self._cache.put(key, result)
+        return result
+
+    def cache_info(self) -> dict:
+        return self._cache.info()
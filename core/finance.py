@@ -0,0 +1,202 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Vectorised Financial Mathematics
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# NPV, IRR, discounted payback and levelised cost for whole arrays of cash
+# flows at once.  Level annuities (one capex, then a constant annual saving —
+# the shape every retrofit appraisal in the platform uses) have closed forms;
+# general cash-flow rows are discounted with one power table per call.
+#
+# IRR is a safeguarded Newton iteration vectorised over rows: each row keeps a
+# sign-change bracket and falls back to bisection whenever a Newton step would
+# leave it, so it converges wherever a root exists in the bracket.
+#
+# Conventions: rates are decimals (0.05 = 5 %); cash-flow arrays are (..., T+1)
+# with index t the year-t flow (t = 0 undiscounted).  Undefined results
+# (no IRR bracketed, never pays back) are NaN / inf, never None.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import numpy as np
+
+# IRR search bracket — rates outside it are treated as economically meaningless
+IRR_LOWER = -0.99
+IRR_UPPER = 100.0
+IRR_TOL = 1e-10
+IRR_MAX_ITER = 100
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# LEVEL ANNUITIES — closed forms
+# ─────────────────────────────────────────────────────────────────────────────
+
+def annuity_factor(rate: "np.typing.ArrayLike", years: "np.typing.ArrayLike") -> "np.ndarray | float":
+    """Present value of £1 a year for *years* years at discount *rate* (broadcasts)."""
+    r = np.asarray(rate, dtype=float)
+    n = np.asarray(years, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        # expm1/log1p keep the factor accurate for rates within rounding of zero
+        af = np.where(r == 0.0, n, -np.expm1(-n * np.log1p(r)) / np.where(r == 0.0, 1.0, r))
+    af = np.where(n > 0, af, 0.0)
+    return float(af) if af.ndim == 0 else af
+
+
+def _annuity_derivative(r: np.ndarray, n: np.ndarray) -> np.ndarray:
+    """d(annuity_factor)/d(rate)."""
+    with np.errstate(divide="ignore", invalid="ignore"):
+        safe = np.where(r == 0.0, 1.0, r)
+        d = (n * r * (1.0 + r) ** (-n - 1.0) - (1.0 - (1.0 + r) ** -n)) / safe ** 2
+    return np.where(r == 0.0, -n * (n + 1.0) / 2.0, d)
+
+
+def level_npv(
+    capex: "np.typing.ArrayLike",
+    annual: "np.typing.ArrayLike",
+    rate: "np.typing.ArrayLike",
+    years: "np.typing.ArrayLike",
+) -> np.ndarray:
+    """NPV of ``-capex`` now and ``annual`` at the end of each of *years* years."""
+    return np.asarray(annual, dtype=float) * annuity_factor(rate, years) - np.asarray(capex, dtype=float)
+
+
+def level_irr(
+    capex: "np.typing.ArrayLike", annual: "np.typing.ArrayLike", years: "np.typing.ArrayLike"
+) -> np.ndarray:
+    """
+    IRR of a level annuity, vectorised.
+
+    Savings that never recover the capex undiscounted give a negative IRR.
+    NaN where there is no root in ``(IRR_LOWER, IRR_UPPER)`` — no capex, no
+    saving, a negative saving or no years.
+    """
+    c, a, n = np.broadcast_arrays(
+        np.asarray(capex, dtype=float), np.asarray(annual, dtype=float), np.asarray(years, dtype=float)
+    )
+
+    def f(r):
+        return a * annuity_factor(r, n) - c, a * _annuity_derivative(r, n)
+
+    ok = (c > 0) & (a > 0) & (n > 0)
+    return _solve_rate(f, ok, c.shape)
+
+
+def discounted_payback(
+    capex: "np.typing.ArrayLike", annual: "np.typing.ArrayLike", rate: "np.typing.ArrayLike"
+) -> np.ndarray:
+    """
+    Years until discounted level savings recover *capex* (fractional, closed form).
+
+    ``inf`` where savings never recover it — including when ``annual / rate``
+    (the perpetuity value) does not exceed the capex.
+    """
+    c, a, r = np.broadcast_arrays(
+        np.asarray(capex, dtype=float), np.asarray(annual, dtype=float), np.asarray(rate, dtype=float)
+    )
+    with np.errstate(divide="ignore", invalid="ignore"):
+        simple = np.where(a > 0, c / np.where(a > 0, a, 1.0), np.inf)
+        inner = 1.0 - c * r / np.where(a > 0, a, 1.0)
+        disc = -np.log(np.where(inner > 0, inner, 1.0)) / np.log1p(np.where(r == 0.0, 1.0, r))
+    out = np.where(r == 0.0, simple, np.where((a > 0) & (inner > 0), disc, np.inf))
+    return np.where(c <= 0, 0.0, out)
+
+
+def lcoe(
+    capex: "np.typing.ArrayLike",
+    annual_energy_kwh: "np.typing.ArrayLike",
+    rate: "np.typing.ArrayLike",
+    years: "np.typing.ArrayLike",
+    annual_opex: "np.typing.ArrayLike" = 0.0,
+) -> np.ndarray:
+    """
+    Levelised cost, £/kWh: discounted lifetime cost over discounted lifetime
+    energy.  For a retrofit pass the annual energy *saved* to get the cost of
+    each kWh avoided.  NaN where the energy is not positive.
+    """
+    af = annuity_factor(rate, years)
+    energy = np.asarray(annual_energy_kwh, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        cost = np.asarray(capex, dtype=float) + np.asarray(annual_opex, dtype=float) * af
+        return np.where(energy * af > 0, cost / (energy * af), np.nan)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GENERAL CASH FLOWS
+# ─────────────────────────────────────────────────────────────────────────────
+
+def npv(rate: "np.typing.ArrayLike", cash_flows: "np.typing.ArrayLike") -> np.ndarray:
+    """NPV of each row of *cash_flows* (..., T+1); *rate* broadcasts over ``...``."""
+    cf = np.asarray(cash_flows, dtype=float)
+    r = np.asarray(rate, dtype=float)[..., None]
+    t = np.arange(cf.shape[-1])
+    return (cf * (1.0 + r) ** -t).sum(axis=-1)
+
+
+def irr(cash_flows: "np.typing.ArrayLike") -> np.ndarray:
+    """IRR of each row of *cash_flows* (..., T+1); NaN where no root is bracketed."""
+    cf = np.asarray(cash_flows, dtype=float)
+    t = np.arange(cf.shape[-1])
+
+    def f(r):
+        disc = (1.0 + r[..., None]) ** -t
+        return (cf * disc).sum(axis=-1), (-t * cf * disc / (1.0 + r[..., None])).sum(axis=-1)
+
+    ok = (cf[..., 1:].sum(axis=-1) > 0) & np.isfinite(cf).all(axis=-1)
+    return _solve_rate(f, ok, cf.shape[:-1])
+
+
+def discounted_payback_flows(rate: "np.typing.ArrayLike", cash_flows: "np.typing.ArrayLike") -> np.ndarray:
+    """
+    Years until cumulative discounted cash flow first turns non-negative,
+    interpolated within the crossing year; ``inf`` if it never does.
+    """
+    cf = np.asarray(cash_flows, dtype=float)
+    r = np.asarray(rate, dtype=float)[..., None]
+    cum = np.cumsum(cf * (1.0 + r) ** -np.arange(cf.shape[-1]), axis=-1)
+    crossed = cum >= 0
+    first = np.argmax(crossed, axis=-1)
+    never = ~crossed.any(axis=-1)
+    prev = np.take_along_axis(cum, np.maximum(first - 1, 0)[..., None], axis=-1)[..., 0]
+    here = np.take_along_axis(cum, first[..., None], axis=-1)[..., 0]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        frac = np.where(here > prev, -prev / (here - prev), 0.0)
+    years = np.where(first == 0, 0.0, first - 1 + frac)
+    return np.where(never, np.inf, years)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ROOT FINDER
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _solve_rate(f, ok: np.ndarray, shape: tuple) -> np.ndarray:
+    """
+    Safeguarded Newton on ``f(r) -> (value, derivative)`` for every element.
+
+    Only elements with ``ok`` and a sign change across the bracket are
+    solved; the rest are NaN.  NPV is decreasing in the rate for
+    conventional flows, so the bracket is kept as (positive, negative) ends.
+    """
+    lo = np.full(shape, IRR_LOWER)
+    hi = np.full(shape, IRR_UPPER)
+    f_lo, _ = f(lo)
+    f_hi, _ = f(hi)
+    active = np.broadcast_to(ok, shape) & (np.sign(f_lo) != np.sign(f_hi))
+    rate = np.where(active, 0.1, np.nan)
+    rising = f_lo < f_hi                    # orientation of each bracket
+    for _ in range(IRR_MAX_ITER):
+        if not active.any():
+            break
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            val, deriv = f(np.where(active, rate, 0.0))
+            # Tighten the bracket around the root
+            above = (val > 0) != rising     # root lies above the current rate
+            lo = np.where(active & above, rate, lo)
+            hi = np.where(active & ~above, rate, hi)
+            newton = rate - val / deriv
+            step = np.where(
+                np.isfinite(newton) & (newton > lo) & (newton < hi), newton, 0.5 * (lo + hi)
+            )
+        done = active & ((np.abs(step - rate) < IRR_TOL * (1.0 + np.abs(rate))) | (val == 0))
+        rate = np.where(active, step, rate)
+        active = active & ~done
+    return np.where(np.broadcast_to(ok, shape), rate, np.nan)
@@ -0,0 +1,288 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Heat-Pump Sizing and Performance
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Screens buildings for air- or ground-source heat pumps over an hourly
+# typical year.  Per building: the modelled heat-loss coefficient sizes the
+# unit at the design outdoor temperature; hourly COP follows a Carnot-fraction
+# model between the source (outdoor air, or a damped, lagged ground
+# temperature) and a weather-compensated flow temperature, each widened by a
+# heat-exchanger approach; demand above the derated capacity falls to a
+# direct-electric backup.  The whole portfolio is one (N, 8760) pass built
+# on core.physics.simulate_thermal_series.
+#
+# SPF here is SPF H2 (heat pump + backup, BS EN 15316-4-2); SCOP excludes the
+# backup heater.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+
+import core.physics as physics
+from config.constants import (
+    CI_ELECTRICITY,
+    DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    HEATING_HOURS_PER_YEAR,
+    HEATING_SETPOINT_C,
+)
+from core import heating_systems
+from services import tmy
+
+HEAT_PUMP_TYPES: dict[str, dict] = {
+    "ashp": {
+        "label":                 "Air source heat pump",
+        "carnot_efficiency":     0.45,
+        "defrost_band_c":        (-3.0, 5.0),   # frosting range of outdoor temperature
+        "defrost_penalty":       0.10,          # COP loss within the band
+        "capacity_derate_per_k": 0.015,         # output lost per K below 7 °C
+    },
+    "gshp": {
+        "label":                 "Ground source heat pump",
+        "carnot_efficiency":     0.50,
+        "ground_damping":        0.3,           # ground swing / air swing
+        "ground_lag_months":     1,
+        "capacity_derate_per_k": 0.0,
+    },
+}
+
+DESIGN_PERCENTILE = 0.004           # 99.6 % heating design temperature (CIBSE Guide A)
+RATING_TEMP_C = 7.0                 # EN 14511 air rating point
+FLOW_TEMP_MILD_C = 30.0             # compensated flow temperature at 16 °C outdoors
+COMPENSATION_END_C = 16.0
+APPROACH_K = 5.0                    # condenser / evaporator approach temperature
+MIN_TEMP_LIFT_K = 5.0
+COP_LIMITS = (1.0, 7.0)
+MIN_CAPACITY_FACTOR = 0.5
+
+# Screening thresholds: SPF 2.5 is the former RHI / current MCS minimum;
+# 100 W/m² is a common "heat-pump ready" peak specific heat loss.
+MIN_SPF = 2.5
+MAX_SPECIFIC_HEAT_LOSS_W_PER_M2 = 100.0
+
+_MONTH_OF_HOUR = np.repeat(np.arange(12), np.array(physics.DAYS_IN_MONTH) * 24)
+
+
+def _spec(kind: str) -> dict:
+    if kind not in HEAT_PUMP_TYPES:
+        raise ValueError(f"kind must be one of {tuple(HEAT_PUMP_TYPES)}.")
+    return HEAT_PUMP_TYPES[kind]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PERFORMANCE — functions of the hourly temperature series only
+# ─────────────────────────────────────────────────────────────────────────────
+
+def design_temperature(temperatures_c: "np.typing.ArrayLike") -> float:
+    """Heating design outdoor temperature: the 99.6 % cold percentile of the hourly series."""
+    return float(np.quantile(np.asarray(temperatures_c, dtype=float), DESIGN_PERCENTILE))
+
+
+def source_temperature(temperatures_c: "np.typing.ArrayLike", kind: str = "ashp") -> np.ndarray:
+    """
+    Hourly source temperature: outdoor air for ``ashp``; for ``gshp`` the
+    annual mean plus the monthly air anomaly, damped and lagged.
+    """
+    spec = _spec(kind)
+    temps = np.asarray(temperatures_c, dtype=float)
+    if "ground_damping" not in spec:
+        return temps
+    monthly = np.bincount(_MONTH_OF_HOUR, weights=temps, minlength=12) / np.bincount(_MONTH_OF_HOUR)
+    anomaly = np.roll(monthly - temps.mean(), spec["ground_lag_months"])
+    return temps.mean() + spec["ground_damping"] * anomaly[_MONTH_OF_HOUR]
+
+
+def flow_temperature(
+    temperatures_c: "np.typing.ArrayLike", design_temp_c: float, flow_temp_c: float = 45.0
+) -> np.ndarray:
+    """Weather-compensated flow: *flow_temp_c* at the design temperature, falling to 30 °C at 16 °C."""
+    return np.interp(
+        temperatures_c, [design_temp_c, COMPENSATION_END_C], [flow_temp_c, FLOW_TEMP_MILD_C]
+    )
+
+
+def hourly_cop(
+    temperatures_c: "np.typing.ArrayLike",
+    kind: str = "ashp",
+    *,
+    flow_temp_c: float = 45.0,
+    design_temp_c: float | None = None,
+) -> np.ndarray:
+    """
+    COP = η × T_cond / (T_cond − T_evap) in kelvin, where the condenser runs
+    ``APPROACH_K`` above the flow and the evaporator the same below the
+    source, with a defrost loss in the frosting band for air source,
+    clipped to ``COP_LIMITS``.
+    """
+    spec = _spec(kind)
+    temps = np.asarray(temperatures_c, dtype=float)
+    design = design_temperature(temps) if design_temp_c is None else float(design_temp_c)
+    condenser = flow_temperature(temps, design, flow_temp_c) + APPROACH_K
+    evaporator = source_temperature(temps, kind) - APPROACH_K
+    lift = np.maximum(condenser - evaporator, MIN_TEMP_LIFT_K)
+    cop = spec["carnot_efficiency"] * (condenser + 273.15) / lift
+    if "defrost_band_c" in spec:
+        low, high = spec["defrost_band_c"]
+        cop = np.where((temps >= low) & (temps <= high), cop * (1.0 - spec["defrost_penalty"]), cop)
+    return np.clip(cop, *COP_LIMITS)
+
+
+def capacity_factor(temperatures_c: "np.typing.ArrayLike", kind: str = "ashp") -> np.ndarray:
+    """Output as a fraction of rated capacity (1.0 at and above the 7 °C rating point)."""
+    derate = _spec(kind)["capacity_derate_per_k"]
+    temps = np.asarray(temperatures_c, dtype=float)
+    return np.clip(1.0 - derate * (RATING_TEMP_C - temps), MIN_CAPACITY_FACTOR, 1.0)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PORTFOLIO SIMULATION — N buildings × 8760 hours in one pass
+# ─────────────────────────────────────────────────────────────────────────────
+
+def simulate_heat_pump(
+    buildings: Mapping[str, "np.typing.ArrayLike"],
+    temperatures_c: "np.typing.ArrayLike",
+    scenario: Mapping | None = None,
+    *,
+    kind: str = "ashp",
+    flow_temp_c: float = 45.0,
+    design_temp_c: float | None = None,
+    sizing_factor: float = 1.0,
+    size_step_kw: float = 1.0,
+    tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = CI_ELECTRICITY,
+    calibrated: bool = False,
+    hourly: bool = False,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Size and simulate a heat pump for every building over an 8760-hour year.
+
+    *buildings* are batch columns (``physics.building_columns``), optionally
+    with ``heating_system`` codes for the system being replaced; *scenario*
+    is a fabric scenario applied first (``None`` = as-is).  The unit is
+    rated so that its derated output at the design temperature covers
+    ``sizing_factor`` × the design heat loss, rounded up to *size_step_kw*.
+    Heat demand and heat-loss coefficient are the modelled space-heating
+    values; ``calibrated=True`` scales both to the declared baseline
+    instead (which then attributes all declared energy, less any
+    ``base_load_mwh``, to heating).
+
+    Returns (N,) ``hlc_w_per_k``, ``design_load_kw``,
+    ``capacity_kw``, ``specific_heat_loss_w_per_m2``, ``heat_mwh``,
+    ``electricity_mwh``, ``backup_mwh``, ``spf``, ``scop``,
+    ``backup_fraction``, the current system's delivered ``current_mwh`` for
+    the same heat and its ``current_fuel``, ``electricity_added_mwh``, ``cost_change_gbp``,
+    ``carbon_change_t`` and the boolean ``suitable`` / ``valid`` masks, plus
+    scalar ``design_temp_c`` and the (8760,) ``cop``.  With ``hourly=True``
+    the (N, 8760) ``heat_hourly_mwh``, ``electricity_hourly_mwh`` and
+    ``backup_hourly_mwh`` are included.
+    """
+    temps = np.asarray(temperatures_c, dtype=float).reshape(-1)
+    if temps.size != physics.HOURS_PER_YEAR:
+        raise ValueError("temperatures_c must hold 8760 hourly values.")
+    if not sizing_factor > 0 or not size_step_kw > 0:
+        raise ValueError("sizing_factor and size_step_kw must be > 0.")
+    spec = _spec(kind)
+    series = physics.simulate_thermal_series(buildings, temps, scenario, strict=strict)
+    valid = series["valid"]
+    design = design_temperature(temps) if design_temp_c is None else float(design_temp_c)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        scale = series["heat_scale"] if calibrated else np.where(valid, 1.0, np.nan)
+        heat = series["heating_mwh"] * scale[:, None]
+        hlc = physics.heat_loss_coefficient(buildings, scenario) * scale
+        design_load_kw = hlc * max(HEATING_SETPOINT_C - design, 0.0) / 1000.0
+        rated = design_load_kw * sizing_factor / capacity_factor(design, kind)
+        capacity_kw = np.ceil(np.round(rated / size_step_kw, 9)) * size_step_kw
+
+        cop = hourly_cop(temps, kind, flow_temp_c=flow_temp_c, design_temp_c=design)
+        # Hourly heat is an average over heated and unheated hours, so the
+        # unit's hourly ceiling carries the same availability fraction.
+        availability = HEATING_HOURS_PER_YEAR / physics.HOURS_PER_YEAR
+        ceiling = np.multiply.outer(capacity_kw * availability / 1000.0, capacity_factor(temps, kind))
+        hp_heat = np.minimum(heat, ceiling)
+        backup = heat - hp_heat
+        electricity = hp_heat / cop + backup
+
+        heat_total = heat.sum(axis=1)
+        hp_total = hp_heat.sum(axis=1)
+        backup_total = backup.sum(axis=1)
+        elec_total = electricity.sum(axis=1)
+        compressor_total = elec_total - backup_total
+        spf = np.where(elec_total > 0, heat_total / np.where(elec_total > 0, elec_total, 1.0), np.nan)
+        scop = np.where(compressor_total > 0, hp_total / np.where(compressor_total > 0, compressor_total, 1.0), np.nan)
+        backup_fraction = np.where(heat_total > 0, backup_total / np.where(heat_total > 0, heat_total, 1.0), 0.0)
+        floor_area = np.asarray(buildings["floor_area_m2"], dtype=float).reshape(-1)
+        specific = design_load_kw * 1000.0 / floor_area
+
+        systems = heating_systems.system_codes(buildings.get("heating_system"), len(floor_area))
+        current = (heat / series["heating_efficiency"]).sum(axis=1)
+        current_electric = heating_systems.is_electric(systems)
+        price, carbon = heating_systems.fuel_rates(systems, tariff_gbp_per_kwh, carbon_intensity_kg_per_kwh)
+        cost_change = (elec_total * tariff_gbp_per_kwh - current * price) * 1000.0
+        carbon_change = elec_total * carbon_intensity_kg_per_kwh - current * carbon
+
+    result = {
+        "hlc_w_per_k":                 hlc,
+        "design_load_kw":              design_load_kw,
+        "capacity_kw":                 capacity_kw,
+        "specific_heat_loss_w_per_m2": specific,
+        "heat_mwh":                    heat_total,
+        "electricity_mwh":             elec_total,
+        "backup_mwh":                  backup_total,
+        "spf":                         spf,
+        "scop":                        scop,
+        "backup_fraction":             backup_fraction,
+        "current_mwh":                 current,
+        "current_fuel":                series["fuel"],
+        "electricity_added_mwh":       elec_total - np.where(current_electric, current, 0.0),
+        "cost_change_gbp":             cost_change,
+        "carbon_change_t":             carbon_change,
+        "suitable":                    valid & (spf >= MIN_SPF) & (specific <= MAX_SPECIFIC_HEAT_LOSS_W_PER_M2),
+        "valid":                       valid,
+        "design_temp_c":               design,
+        "cop":                         cop,
+        "kind":                        kind,
+        "label":                       spec["label"],
+    }
+    if hourly:
+        result["heat_hourly_mwh"] = heat
+        result["electricity_hourly_mwh"] = electricity
+        result["backup_hourly_mwh"] = backup
+    return result
+
+
+def screen_portfolio(
+    buildings: Mapping[str, Mapping],
+    city: str | None = None,
+    **kwargs,
+) -> dict[str, dict]:
+    """
+    Heat-pump screen of named building dicts on *city*'s typical year
+    (default ``tmy.DEFAULT_TMY_CITY``); invalid buildings are skipped.
+    Returns ``{name: {capacity_kw, spf, scop, backup_fraction,
+    electricity_added_mwh, cost_change_gbp, carbon_change_t, suitable}}``
+    rounded for display; *kwargs* go to ``simulate_heat_pump``.
+    """
+    names = list(buildings)
+    temps = tmy.hourly_temperatures(city or tmy.DEFAULT_TMY_CITY)
+    res = simulate_heat_pump(
+        physics.building_columns(buildings[n] for n in names), temps, strict=False, **kwargs
+    )
+    out = {}
+    for i, name in enumerate(names):
+        if not res["valid"][i]:
+            continue
+        out[name] = {
+            "capacity_kw":           round(float(res["capacity_kw"][i]), 1),
+            "spf":                   round(float(res["spf"][i]), 2),
+            "scop":                  round(float(res["scop"][i]), 2),
+            "backup_fraction":       round(float(res["backup_fraction"][i]), 3),
+            "electricity_added_mwh": round(float(res["electricity_added_mwh"][i]), 1),
+            "cost_change_gbp":       round(float(res["cost_change_gbp"][i]), 0),
+            "carbon_change_t":       round(float(res["carbon_change_t"][i]), 1),
+            "suitable":              bool(res["suitable"][i]),
+        }
+    return out
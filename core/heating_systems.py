@@ -0,0 +1,213 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Heating Systems and Fuels
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Each building may declare a ``heating_system``; the physics engine turns its
+# modelled heat demand into delivered energy of the system's fuel by dividing
+# by the seasonal efficiency (boilers, direct electric) or by a COP read off
+# an outdoor-temperature curve (heat pumps), then prices and carbon-accounts
+# every fuel at its own rate.  Buildings with no declared system are direct
+# electric at efficiency 1.0, which is the platform's original accounting.
+#
+# Systems are carried through the batch engine as small integer codes (index
+# into HEATING_SYSTEM_IDS) so every lookup here is a NumPy gather.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from config.constants import (
+    CI_ELECTRICITY,
+    CI_GAS,
+    CI_LPG,
+    CI_OIL,
+    ELEC_COST_PER_KWH,
+    GAS_COST_PER_KWH,
+    LPG_COST_PER_KWH,
+    OIL_COST_PER_KWH,
+)
+
+FUELS = ("electricity", "gas", "oil", "lpg")
+
+# Electricity entries are defaults only: the physics engine prices and
+# carbon-accounts electricity at the tariff / grid intensity it is called with.
+FUEL_CARBON_KG_PER_KWH: dict[str, float] = {
+    "electricity": CI_ELECTRICITY,
+    "gas":         CI_GAS,
+    "oil":         CI_OIL,
+    "lpg":         CI_LPG,
+}
+FUEL_PRICE_GBP_PER_KWH: dict[str, float] = {
+    "electricity": ELEC_COST_PER_KWH,
+    "gas":         GAS_COST_PER_KWH,
+    "oil":         OIL_COST_PER_KWH,
+    "lpg":         LPG_COST_PER_KWH,
+}
+
+# config.constants names behind each fuel's (carbon, price), re-read by reload_constants()
+_FUEL_CONSTANTS: dict[str, tuple[str, str]] = {
+    "electricity": ("CI_ELECTRICITY", "ELEC_COST_PER_KWH"),
+    "gas":         ("CI_GAS", "GAS_COST_PER_KWH"),
+    "oil":         ("CI_OIL", "OIL_COST_PER_KWH"),
+    "lpg":         ("CI_LPG", "LPG_COST_PER_KWH"),
+}
+
+# Seasonal efficiencies follow SAP 10.2 Table 4a/4b defaults for condensing
+# boilers.  Heat-pump COPs are typical EN 14511 curves at a 35–45 °C flow
+# temperature, (outdoor °C, COP) points, held flat beyond either end;
+# core.heat_pump simulates them hour by hour from the source temperature.
+HEATING_SYSTEMS: dict[str, dict] = {
+    "direct_electric": {"label": "Direct electric",       "fuel": "electricity", "efficiency": 1.0},
+    "gas_boiler":      {"label": "Gas boiler",            "fuel": "gas",         "efficiency": 0.89},
+    "oil_boiler":      {"label": "Oil boiler",            "fuel": "oil",         "efficiency": 0.86},
+    "lpg_boiler":      {"label": "LPG boiler",            "fuel": "lpg",         "efficiency": 0.89},
+    "ashp": {
+        "label": "Air source heat pump",
+        "fuel": "electricity",
+        "cop_curve": ((-7.0, 2.2), (2.0, 2.8), (7.0, 3.4), (12.0, 3.9), (20.0, 4.4)),
+    },
+    # Ground loop temperature barely follows the air; only weather-compensated
+    # flow temperature moves the COP.
+    "gshp": {
+        "label": "Ground source heat pump",
+        "fuel": "electricity",
+        "cop_curve": ((-7.0, 3.4), (7.0, 3.9), (20.0, 4.3)),
+    },
+}
+DEFAULT_HEATING_SYSTEM = "direct_electric"
+HEATING_SYSTEM_IDS = tuple(HEATING_SYSTEMS)
+
+_FUEL_OF_SYSTEM = np.array([FUELS.index(s["fuel"]) for s in HEATING_SYSTEMS.values()])
+_CURVES = [
+    tuple(np.array(axis, dtype=float) for axis in zip(*s["cop_curve"])) if "cop_curve" in s
+    else (np.zeros(1), np.array([float(s["efficiency"])]))
+    for s in HEATING_SYSTEMS.values()
+]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CODES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def system_code(value) -> int:
+    """Integer code of a system id (``None`` → default); raise ``ValueError`` if unknown."""
+    if value is None:
+        return HEATING_SYSTEM_IDS.index(DEFAULT_HEATING_SYSTEM)
+    if isinstance(value, str):
+        if value in HEATING_SYSTEMS:
+            return HEATING_SYSTEM_IDS.index(value)
+    elif isinstance(value, (int, np.integer)) and 0 <= value < len(HEATING_SYSTEM_IDS):
+        return int(value)
+    raise ValueError(f"heating_system must be one of {HEATING_SYSTEM_IDS}.")
+
+
+def system_codes(values: "Iterable | np.ndarray | None", n: int) -> np.ndarray:
+    """
+    (n,) integer codes for ids or codes in *values*; ``None`` means all
+    default.  Unknown entries become -1 so callers can mask them.
+    """
+    if values is None:
+        return np.full(n, system_code(None))
+    if isinstance(values, np.ndarray) and values.dtype.kind in "iuf":
+        codes = np.asarray(values).reshape(-1)
+        ok = np.isfinite(codes) & (codes >= 0) & (codes < len(HEATING_SYSTEM_IDS))
+        return np.where(ok, np.nan_to_num(codes), -1).astype(int)
+
+    def _code(value) -> int:
+        try:
+            return system_code(value)
+        except ValueError:
+            return -1
+
+    return np.fromiter((_code(v) for v in values), int, n)
+
+
+def fuel_index(codes: "np.typing.ArrayLike") -> np.ndarray:
+    """Index into FUELS of each system code (invalid codes map to electricity)."""
+    codes = np.asarray(codes, dtype=int)
+    return _FUEL_OF_SYSTEM[np.clip(codes, 0, len(HEATING_SYSTEM_IDS) - 1)] * (codes >= 0)
+
+
+def is_electric(codes: "np.typing.ArrayLike") -> np.ndarray:
+    return fuel_index(codes) == FUELS.index("electricity")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PERFORMANCE AND RATES — broadcast over codes and temperatures
+# ─────────────────────────────────────────────────────────────────────────────
+
+def efficiency(codes: "np.typing.ArrayLike", temperature_c: "np.typing.ArrayLike") -> np.ndarray:
+    """
+    Delivered-to-useful heat ratio (seasonal efficiency, or COP for heat
+    pumps at *temperature_c*) for every broadcast (code, temperature) pair.
+    Invalid codes give NaN.  A single-system input returns a read-only
+    broadcast view.
+    """
+    codes = np.asarray(codes, dtype=int)
+    temps = np.asarray(temperature_c, dtype=float)
+    present = np.unique(codes)
+    if present.size == 1 and present[0] >= 0:
+        xs, ys = _CURVES[present[0]]
+        value = np.interp(temps, xs, ys) if xs.size > 1 else ys[0]
+        return np.broadcast_to(value, np.broadcast_shapes(codes.shape, temps.shape))
+    out = np.full(np.broadcast_shapes(codes.shape, temps.shape), np.nan)
+    for code in present[present >= 0]:
+        xs, ys = _CURVES[code]
+        value = np.interp(temps, xs, ys) if xs.size > 1 else ys[0]
+        out = np.where(codes == code, value, out)
+    return out
+
+
+def fuel_rates(
+    codes: "np.typing.ArrayLike",
+    tariff_gbp_per_kwh: "float | np.ndarray",
+    carbon_intensity_kg_per_kwh: "float | np.ndarray",
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (£/kWh, kgCO₂e/kWh) of each system's fuel; electricity takes the given
+    tariff and grid intensity, which may themselves be arrays (e.g. per draw).
+    """
+    fuel = fuel_index(codes)
+    elec = fuel == FUELS.index("electricity")
+    price = np.array([FUEL_PRICE_GBP_PER_KWH[f] for f in FUELS])[fuel]
+    carbon = np.array([FUEL_CARBON_KG_PER_KWH[f] for f in FUELS])[fuel]
+    return (
+        np.where(elec, tariff_gbp_per_kwh, price),
+        np.where(elec, carbon_intensity_kg_per_kwh, carbon),
+    )
+
+
+def reload_constants() -> None:
+    """Re-read the fuel carbon factors and prices from ``config.constants``, in place."""
+    import config.constants as constants
+    for fuel, (carbon, price) in _FUEL_CONSTANTS.items():
+        FUEL_CARBON_KG_PER_KWH[fuel] = getattr(constants, carbon)
+        FUEL_PRICE_GBP_PER_KWH[fuel] = getattr(constants, price)
+
+
+def fuel_breakdown(
+    result: Mapping,
+    tariff_gbp_per_kwh: float = ELEC_COST_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = CI_ELECTRICITY,
+) -> dict[str, dict]:
+    """
+    Delivered MWh, cost and carbon per fuel from a physics result — a
+    ``calculate_thermal_load`` dict or a batch grid — as
+    ``{fuel: {"baseline_mwh", "scenario_mwh", "baseline_cost_gbp",
+    "scenario_cost_gbp", "baseline_carbon_t", "scenario_carbon_t"}}``.
+    """
+    out = {}
+    for fuel in FUELS:
+        price = tariff_gbp_per_kwh if fuel == "electricity" else FUEL_PRICE_GBP_PER_KWH[fuel]
+        carbon = carbon_intensity_kg_per_kwh if fuel == "electricity" else FUEL_CARBON_KG_PER_KWH[fuel]
+        entry = {}
+        for side in ("baseline", "scenario"):
+            mwh = result[f"{side}_{fuel}_mwh"]
+            entry[f"{side}_mwh"] = mwh
+            entry[f"{side}_cost_gbp"] = np.multiply(mwh, 1000.0 * price)
+            entry[f"{side}_carbon_t"] = np.multiply(mwh, carbon)
+        out[fuel] = entry
+    return out
@@ -0,0 +1,482 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Retrofit Package Optimiser
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Chooses a combination of retrofit measures for every building in a portfolio
+# to maximise carbon saved — or the number of assets lifted to the MEES target
+# band — under a single capital budget.
+#
+# Formulation: multiple-choice knapsack.  Each building picks exactly one of
+# the 2^K subsets of the K measures in app.compliance.MEES_MEASURES (the
+# empty subset is "do nothing").  Per-building outcomes for every subset are
+# computed once in a single batch-engine call (measure_outcomes) and can be
+# reused across budgets; dominated subsets are pruned and the knapsack is
+# solved exactly by dynamic programming over a discretised budget.
+#
+# Costs are rounded UP to the budget step, so a returned plan never exceeds
+# the budget.  mees_pathfinder instead re-rates every subset for every
+# building — U-values and physics-engine energy fed back through the EPC
+# estimate — and returns the cheapest subset reaching the target band.
+# DISCLAIMER: indicative costs and SAP lifts only.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import math
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from app.compliance import (
+    _BAND_LETTERS,
+    _EPC_BANDS_LIST,
+    MEES_MEASURES,
+    band_index,
+    estimate_epc_rating,
+    estimate_epc_rating_batch,
+)
+from config.constants import DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH
+from core import heating_systems
+from core.physics import (
+    GRID_CARBON_INTENSITY_KG_PER_KWH,
+    SCENARIO_FIELDS,
+    _series_solar_weights,
+    building_columns,
+    calculate_thermal_load_batch,
+    simulate_thermal_series,
+)
+from services import tmy
+
+OBJECTIVES = ("carbon", "mees")
+# Upper bound on budget states; the step widens for large budgets.
+MAX_BUDGET_STEPS = 20_000
+MIN_COST_STEP_GBP = 50.0
+# Rooftop PV yield used for the 10 kWp measure (UK average, kWh/kWp/yr)
+PV_YIELD_KWH_PER_KWP = 850.0
+
+# Physics-engine effect of each measure, as SCENARIO_FIELDS overrides.
+# Fabric factors multiply when measures are combined; renewable_kwh adds.
+# Measures absent here (LED lighting, ASHP) carry their SAP lift and cost
+# only — the steady-state heating model has no term for them.
+MEASURE_EFFECTS: dict[str, dict[str, float]] = {
+    "Loft / Roof Insulation Upgrade":    {"u_roof_factor": 1.0 - 0.60},
+    "Cavity / External Wall Insulation": {"u_wall_factor": 1.0 - 0.45},
+    "Double / Triple Glazing Upgrade":   {"u_glazing_factor": 1.0 - 0.55},
+    "Rooftop Solar PV (10 kWp)":         {"renewable_kwh": 10.0 * PV_YIELD_KWH_PER_KWP},
+}
+# Measures that replace the heating system (mees_pathfinder only): heating
+# energy scales by the efficiency ratio and the building becomes electric.
+MEASURE_HEATING_SYSTEMS: dict[str, str] = {
+    "Air Source Heat Pump (ASHP)": "ashp",
+}
+
+
+def _measure_cost(measure: Mapping, basis: str) -> float:
+    if basis == "low":
+        return float(measure["cost_low"])
+    if basis == "high":
+        return float(measure["cost_high"])
+    if basis == "mid":
+        return (float(measure["cost_low"]) + float(measure["cost_high"])) / 2.0
+    raise ValueError("cost_basis must be 'low', 'mid' or 'high'.")
+
+
+def _subset_scenarios(measures: Sequence[Mapping], cost_basis: str) -> tuple[np.ndarray, dict[str, np.ndarray]]:
+    """Subset masks (2^K, K) and the matching batch-engine scenario columns."""
+    k = len(measures)
+    masks = ((np.arange(2 ** k)[:, None] >> np.arange(k)[None, :]) & 1).astype(bool)
+    cols = {f: np.full(len(masks), default) for f, default in SCENARIO_FIELDS.items()}
+    for m, measure in enumerate(measures):
+        on = masks[:, m]
+        for field, value in MEASURE_EFFECTS.get(measure["name"], {}).items():
+            if field.endswith("_factor"):
+                cols[field][on] *= value
+            else:
+                cols[field][on] += value
+        cols["install_cost_gbp"][on] += _measure_cost(measure, cost_basis)
+    return masks, cols
+
+
+def _path_table(measures: Sequence[Mapping], cost_basis: str) -> dict:
+    """
+    Precomputed combination tensor for mees_pathfinder: subset masks, costs,
+    fabric factors, fixed SAP lifts, and each subset's index into the
+    distinct (fabric, heating system, generation) combinations — the only
+    inputs that change energy, so each is simulated once.
+    """
+    masks, cols = _subset_scenarios(measures, cost_basis)
+    system = np.full(len(masks), -1)
+    for m, measure in enumerate(measures):
+        if measure["name"] in MEASURE_HEATING_SYSTEMS:
+            system[masks[:, m]] = heating_systems.system_code(MEASURE_HEATING_SYSTEMS[measure["name"]])
+    modelled = np.array([
+        m["name"] in MEASURE_EFFECTS or m["name"] in MEASURE_HEATING_SYSTEMS for m in measures
+    ], dtype=bool)
+    lifts = np.array([float(m.get("sap_lift", 0.0)) for m in measures])
+    fabric = np.column_stack([cols["u_wall_factor"], cols["u_roof_factor"], cols["u_glazing_factor"]])
+    combos, combo_index = np.unique(
+        np.column_stack([fabric, system, cols["renewable_kwh"]]), axis=0, return_inverse=True
+    )
+    return {
+        "masks":       masks,
+        "cost_gbp":    cols["install_cost_gbp"],
+        "fabric":      fabric,
+        "fixed_lift":  masks[:, ~modelled] @ lifts[~modelled],
+        "combos":      combos,
+        "combo_index": combo_index.reshape(-1),
+    }
+
+
+_DEFAULT_PATH_TABLE = _path_table(MEES_MEASURES, "mid")
+
+
+def _current_sap(building: Mapping) -> float:
+    try:
+        return float(estimate_epc_rating(
+            floor_area_m2=building["floor_area_m2"],
+            annual_energy_kwh=building["baseline_energy_mwh"] * 1000,
+            u_wall=building["u_value_wall"],
+            u_roof=building["u_value_roof"],
+            u_glazing=building["u_value_glazing"],
+            glazing_ratio=building["glazing_ratio"],
+        )["sap_score"])
+    except (KeyError, TypeError, ValueError):
+        return float("nan")
+
+
+def measure_outcomes(
+    buildings: Mapping[str, Mapping],
+    temperature_c: float,
+    tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = GRID_CARBON_INTENSITY_KG_PER_KWH,
+    *,
+    measures: Sequence[Mapping] = MEES_MEASURES,
+    cost_basis: str = "mid",
+) -> dict:
+    """
+    Outcome table for every building × measure subset, from one batch call.
+
+    Returns ``names``, ``measures`` (measure names), ``masks`` (2^K, K),
+    ``cost_gbp`` and ``sap_lift`` (2^K,), ``carbon_saving_t``,
+    ``annual_saving_gbp`` and ``energy_mwh`` (N, 2^K), of which
+    ``electricity_mwh`` is on the electricity meter and the rest burns fuel
+    emitting ``fuel_carbon_t``, ``current_sap`` (N,) and ``valid`` (N,).
+    Buildings the physics validator rejects are ``valid=False`` and can only
+    take the empty subset.  Pass the result to ``optimise_portfolio`` as
+    ``outcomes=`` to re-solve for other budgets without recomputing.
+    """
+    if len(measures) > 12:
+        raise ValueError("At most 12 measures are supported (2^K subsets per building).")
+    names = list(buildings)
+    masks, scen_cols = _subset_scenarios(measures, cost_basis)
+    grid = calculate_thermal_load_batch(
+        building_columns(buildings[n] for n in names),
+        scen_cols,
+        temperature_c,
+        tariff_gbp_per_kwh,
+        carbon_intensity_kg_per_kwh,
+        strict=False,
+    )
+    valid = grid["valid"].all(axis=1)
+    # The empty subset is the baseline scenario: zero saving by definition.
+    carbon = np.where(valid[:, None], grid["carbon_saving_t"], 0.0)
+    saving = np.where(valid[:, None], grid["annual_saving_gbp"], 0.0)
+    carbon[:, 0] = 0.0
+    saving[:, 0] = 0.0
+    lifts = np.array([float(m.get("sap_lift", 0.0)) for m in measures])
+    return {
+        "names":             names,
+        "measures":          [m["name"] for m in measures],
+        "masks":             masks,
+        "cost_gbp":          scen_cols["install_cost_gbp"],
+        "sap_lift":          masks @ lifts,
+        "carbon_saving_t":   carbon,
+        "annual_saving_gbp": saving,
+        "energy_mwh":        grid["scenario_energy_mwh"],
+        "electricity_mwh":   grid["scenario_electricity_mwh"],
+        "fuel_carbon_t":     sum(
+            grid[f"scenario_{f}_mwh"] * heating_systems.FUEL_CARBON_KG_PER_KWH[f]
+            for f in heating_systems.FUELS if f != "electricity"
+        ),
+        "current_sap":       np.array([_current_sap(buildings[n]) for n in names]),
+        "valid":             valid,
+        "cost_basis":        cost_basis,
+    }
+
+
+def _objective_values(outcomes: Mapping, objective: str, target_band: str) -> np.ndarray:
+    """(N, 2^K) value of each option; MEES counts compliant assets, carbon breaks ties."""
+    carbon = np.maximum(outcomes["carbon_saving_t"], 0.0)
+    if objective == "carbon":
+        return carbon
+    bands = {band: thresh for thresh, band, _ in _EPC_BANDS_LIST}
+    if target_band not in bands:
+        raise ValueError(f"Invalid target band '{target_band}'. Must be A–G.")
+    current = outcomes["current_sap"][:, None]
+    after = current + outcomes["sap_lift"][None, :]
+    lifted = (current < bands[target_band]) & (after >= bands[target_band])
+    lifted &= outcomes["valid"][:, None]
+    # Scale carbon so the whole portfolio's tie-break is worth < 1 asset.
+    tie = carbon / (carbon.max(axis=1).sum() + 1.0)
+    return lifted.astype(float) + tie
+
+
+def _pareto_options(cost_units: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """Indices of non-dominated options (strictly more value for more cost)."""
+    order = np.lexsort((-value, cost_units))
+    keep, best = [], 0.0
+    for k in order:
+        if value[k] > best:
+            keep.append(k)
+            best = value[k]
+    return np.array(keep, dtype=np.intp)
+
+
+def solve_knapsack(
+    cost_gbp: np.ndarray,
+    values: np.ndarray,
+    budget_gbp: float,
+    *,
+    valid: np.ndarray | None = None,
+    cost_step_gbp: float | None = None,
+) -> tuple[np.ndarray, float]:
+    """
+    Exact multiple-choice knapsack: one option per row, shared option costs.
+
+    ``cost_gbp`` is (S,) with option 0 the free "do nothing" choice and
+    ``values`` is (N, S).  Rows with ``valid=False`` always take option 0.
+    Returns the chosen option per row and the budget step used.
+    """
+    if budget_gbp < 0:
+        raise ValueError("budget_gbp must be >= 0.")
+    step = cost_step_gbp or max(MIN_COST_STEP_GBP, math.ceil(budget_gbp / MAX_BUDGET_STEPS))
+    capacity = int(budget_gbp // step)
+    cost_units = np.ceil(np.asarray(cost_gbp) / step - 1e-9).astype(np.intp)
+    if valid is None:
+        valid = np.ones(len(values), dtype=bool)
+
+    # dp[c] = best value using at most c budget units over rows seen so far
+    dp = np.zeros(capacity + 1)
+    choices = np.zeros((len(values), capacity + 1), dtype=np.int16)
+    for i, row in enumerate(values):
+        if not valid[i]:
+            continue
+        options = _pareto_options(cost_units, row)
+        best = dp.copy()
+        pick = choices[i]
+        for k in options:
+            w = cost_units[k]
+            if k == 0 or w > capacity:
+                continue
+            cand = dp[: capacity + 1 - w] + row[k]
+            better = cand > best[w:]
+            best[w:][better] = cand[better]
+            pick[w:][better] = k
+        dp = best
+
+    # Walk back from the full budget
+    picked = np.zeros(len(values), dtype=np.intp)
+    c = capacity
+    for i in range(len(values) - 1, -1, -1):
+        k = int(choices[i, c])
+        picked[i] = k
+        c -= cost_units[k]
+    return picked, float(step)
+
+
+def optimise_portfolio(
+    buildings: Mapping[str, Mapping],
+    budget_gbp: float,
+    temperature_c: float | None = None,
+    tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = GRID_CARBON_INTENSITY_KG_PER_KWH,
+    *,
+    objective: str = "carbon",
+    target_band: str = "C",
+    outcomes: Mapping | None = None,
+    cost_step_gbp: float | None = None,
+) -> dict:
+    """
+    Best measure package per building under a shared capital budget.
+
+    ``objective="carbon"`` maximises total tCO₂e saved per year;
+    ``objective="mees"`` maximises the number of assets lifted to
+    ``target_band`` (carbon saved breaks ties).  Either ``temperature_c`` or
+    a precomputed ``outcomes`` table (``measure_outcomes``) is required.
+
+    Returns a dict with the portfolio totals and a ``plan`` list — one entry
+    per building that receives at least one measure.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}.")
+    if outcomes is None:
+        if temperature_c is None:
+            raise ValueError("temperature_c is required when outcomes is not supplied.")
+        outcomes = measure_outcomes(
+            buildings, temperature_c, tariff_gbp_per_kwh, carbon_intensity_kg_per_kwh
+        )
+
+    values = _objective_values(outcomes, objective, target_band)
+    picked, step = solve_knapsack(
+        outcomes["cost_gbp"], values, budget_gbp, valid=outcomes["valid"], cost_step_gbp=cost_step_gbp
+    )
+
+    plan = []
+    rows = np.arange(len(values))
+    for i in np.flatnonzero(picked):
+        k = picked[i]
+        plan.append({
+            "building":          outcomes["names"][i],
+            "measures":          [m for m, on in zip(outcomes["measures"], outcomes["masks"][k]) if on],
+            "cost_gbp":          float(outcomes["cost_gbp"][k]),
+            "carbon_saving_t":   float(outcomes["carbon_saving_t"][i, k]),
+            "annual_saving_gbp": float(outcomes["annual_saving_gbp"][i, k]),
+            "sap_before":        float(outcomes["current_sap"][i]),
+            "sap_after":         float(outcomes["current_sap"][i] + outcomes["sap_lift"][k]),
+        })
+    result = {
+        "objective":         objective,
+        "budget_gbp":        float(budget_gbp),
+        "cost_step_gbp":     step,
+        "spent_gbp":         float(outcomes["cost_gbp"][picked].sum()),
+        "carbon_saving_t":   float(outcomes["carbon_saving_t"][rows, picked].sum()),
+        "annual_saving_gbp": float(outcomes["annual_saving_gbp"][rows, picked].sum()),
+        "buildings_upgraded": len(plan),
+        "plan":              plan,
+    }
+    if objective == "mees":
+        result["target_band"] = target_band
+        result["assets_lifted"] = int(np.floor(values[rows, picked]).sum())
+    return result
+
+
+def _combo_energy(bcols: Mapping, temps: np.ndarray, combos: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """(N, C) annual delivered energy of every building under each combination, and the valid row mask."""
+    weights = _series_solar_weights(temps.size, None)
+    runs, valid = {}, None
+    for fabric in {tuple(c[:3]) for c in combos}:
+        scenario = dict(zip(("u_wall_factor", "u_roof_factor", "u_glazing_factor"), fabric))
+        run = simulate_thermal_series(bcols, temps, scenario, strict=False)
+        runs[fabric] = run
+        valid = run["valid"] if valid is None else valid & run["valid"]
+
+    base = next(iter(runs.values()))
+    step_share = base["step_hours"] / base["step_hours"].sum()
+    base_load = np.multiply.outer(np.nan_to_num(bcols["base_load_mwh"]), step_share)
+    systems = heating_systems.system_codes(bcols.get("heating_system"), len(base_load))
+    systems = np.where(systems >= 0, systems, heating_systems.system_code(None))
+    energy = np.empty((len(base_load), len(combos)))
+    for j, (*fabric, system, generation_kwh) in enumerate(combos):
+        run = runs[tuple(fabric)]
+        if system < 0 and not generation_kwh and not any(f != 1.0 for f in fabric):
+            energy[:, j] = run["annual_baseline_mwh"]      # declared baseline, as the engine reports it
+            continue
+        # Calibrated heat demand, delivered by the current or replacement system
+        heat = run["heating_mwh"] * run["heat_scale"][:, None]
+        if system >= 0:
+            delivered = heat / heating_systems.efficiency(np.full(len(heat), int(system))[:, None], temps[None, :])
+            electric = np.full(len(heat), bool(heating_systems.is_electric(int(system))))
+        else:
+            delivered = heat / run["heating_efficiency"]
+            electric = heating_systems.is_electric(systems)
+        # Generation nets off the electricity meter (base load, plus heating
+        # when electric) step by step, as in the physics engine
+        meter = np.where(electric[:, None], delivered, 0.0) + base_load - generation_kwh / 1000.0 * weights
+        energy[:, j] = (np.where(electric[:, None], 0.0, delivered) + np.maximum(meter, 0.0)).sum(axis=1)
+    return energy, valid
+
+
+def mees_pathfinder(
+    buildings: Mapping[str, Mapping],
+    target_band: str = "C",
+    temperatures_c: "np.typing.ArrayLike | None" = None,
+    *,
+    building_type: str = "commercial",
+    measures: Sequence[Mapping] = MEES_MEASURES,
+    cost_basis: str = "mid",
+) -> dict:
+    """
+    Cheapest measure subset that lifts each building to ``target_band``.
+
+    Every building × subset is re-rated in one batch: the thermal series
+    model (``temperatures_c``: 12 monthly or 8760 hourly values, default the
+    typical year of ``tmy.DEFAULT_TMY_CITY``) gives each subset's delivered
+    energy and ``estimate_epc_rating_batch`` scores it with the upgraded
+    U-values, so measures interact with each other and with the building's
+    own fabric.  A heat pump delivers the calibrated heat demand at its own
+    efficiency; PV nets off the electricity meter (base load, and heating
+    when electric), as in the physics engine.  Measures with no model term (LED lighting) add their
+    indicative ``sap_lift``.
+
+    Returns ``names``, ``measures``, ``masks`` (2^K, K), ``sap`` (N, 2^K)
+    and, per building, the chosen ``subset`` index and its ``cost_gbp``,
+    ``sap_before`` / ``sap_after``, ``band_before`` / ``band_after``,
+    ``energy_before_mwh`` / ``energy_after_mwh``, ``reachable`` and
+    ``valid``.  Unreachable buildings get their highest-scoring subset;
+    invalid ones the empty subset.
+    """
+    bands = {band: thresh for thresh, band, _ in _EPC_BANDS_LIST}
+    if target_band not in bands:
+        raise ValueError(f"Invalid target band '{target_band}'. Must be A–G.")
+    if len(measures) > 12:
+        raise ValueError("At most 12 measures are supported (2^K subsets per building).")
+    if measures is MEES_MEASURES and cost_basis == "mid":
+        table = _DEFAULT_PATH_TABLE
+    else:
+        table = _path_table(measures, cost_basis)
+    if temperatures_c is None:
+        temperatures_c = tmy.monthly_mean_temperatures(tmy.DEFAULT_TMY_CITY)
+    temps = np.asarray(temperatures_c, dtype=float).reshape(-1)
+
+    names = list(buildings)
+    bcols = building_columns(buildings[n] for n in names)
+    combo_energy, valid = _combo_energy(bcols, temps, table["combos"])
+    energy_mwh = combo_energy[:, table["combo_index"]]
+
+    # Re-rate every (building, subset) pair in one flattened EPC batch
+    n, s = energy_mwh.shape
+    fabric = table["fabric"]
+    ratings = estimate_epc_rating_batch(
+        floor_area_m2=np.repeat(bcols["floor_area_m2"], s),
+        annual_energy_kwh=np.nan_to_num(energy_mwh).ravel() * 1000.0,
+        u_wall=np.multiply.outer(bcols["u_value_wall"], fabric[:, 0]).ravel(),
+        u_roof=np.multiply.outer(bcols["u_value_roof"], fabric[:, 1]).ravel(),
+        u_glazing=np.multiply.outer(bcols["u_value_glazing"], fabric[:, 2]).ravel(),
+        glazing_ratio=np.repeat(bcols["glazing_ratio"], s),
+        building_type=building_type,
+        strict=False,
+    )
+    valid = valid & ratings["valid"].reshape(n, s).all(axis=1)
+    sap = np.minimum(ratings["sap_score"].reshape(n, s) + table["fixed_lift"][None, :], 100.0)
+    sap = np.where(valid[:, None], sap, np.nan)
+
+    # Cheapest subset reaching the band (higher SAP breaks cost ties),
+    # otherwise the highest SAP available (lower cost breaks ties)
+    cost = table["cost_gbp"]
+    score = np.nan_to_num(sap, nan=-1.0)
+    reaches = score >= bands[target_band]
+    reachable = reaches.any(axis=1) & valid
+    cheapest = np.argmin(np.where(reaches, cost[None, :] - 1e-6 * score, np.inf), axis=1)
+    best = np.argmax(score - 1e-9 * cost[None, :], axis=1)
+    subset = np.where(reachable, cheapest, np.where(valid, best, 0))
+
+    rows = np.arange(n)
+    sap_before, sap_after = sap[:, 0], sap[rows, subset]
+    return {
+        "names":             names,
+        "measures":          [m["name"] for m in measures],
+        "masks":             table["masks"],
+        "target_band":       target_band,
+        "sap":               sap,
+        "subset":            subset,
+        "cost_gbp":          cost[subset],
+        "sap_before":        sap_before,
+        "sap_after":         sap_after,
+        "band_before":       np.where(valid, _BAND_LETTERS[band_index(np.nan_to_num(sap_before))], ""),
+        "band_after":        np.where(valid, _BAND_LETTERS[band_index(np.nan_to_num(sap_after))], ""),
+        "energy_before_mwh": np.where(valid, energy_mwh[:, 0], np.nan),
+        "energy_after_mwh":  np.where(valid, energy_mwh[rows, subset], np.nan),
+        "reachable":         reachable,
+        "valid":             valid,
+        "cost_basis":        cost_basis,
+    }
@@ -0,0 +1,156 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Pareto Frontier (Skyline) Engine
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Non-dominated building × scenario options over install cost (min), carbon
+# saving (max), simple payback (min) and NPV (max).  An option is on the
+# frontier when no other option is at least as good on every objective and
+# strictly better on one — the set a decision-maker actually chooses from.
+#
+# Algorithm: sort-filter-skyline.  Points are ordered by a monotone score
+# (sum of min–max normalised objectives) so no point can be dominated by a
+# later one; they are then filtered block-by-block against the skyline found
+# so far with vectorised comparisons, instead of all n² pairs.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+
+import core.physics as physics
+from config.constants import DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH
+from core.finance import level_npv
+from core.scenario_registry import scenario_columns_for
+
+# Objective → sense.  Payback is +inf where an option never pays back.
+OBJECTIVES: dict[str, str] = {
+    "install_cost_gbp": "min",
+    "carbon_saving_t":  "max",
+    "payback_years":    "min",
+    "npv_gbp":          "max",
+}
+SKYLINE_BLOCK = 256
+
+
+def pareto_mask(points: "np.typing.ArrayLike") -> np.ndarray:
+    """
+    Boolean mask of the non-dominated rows of an (n, d) array, all minimised.
+
+    NaN counts as the worst possible value.  Duplicate points are all kept.
+    """
+    pts = np.asarray(points, dtype=float)
+    if pts.ndim != 2:
+        raise ValueError("points must be a 2-D (n, d) array.")
+    n = len(pts)
+    if n == 0:
+        return np.zeros(0, dtype=bool)
+    pts = np.where(np.isnan(pts), np.inf, pts)
+
+    # Monotone score: finite values scaled to [0, 1], ±inf pushed past either end
+    fin = np.isfinite(pts)
+    lo = np.where(fin, pts, np.inf).min(axis=0)
+    hi = np.where(fin, pts, -np.inf).max(axis=0)
+    lo = np.where(np.isfinite(lo), lo, 0.0)
+    span = np.where(hi > lo, hi - lo, 1.0)
+    scaled = np.where(fin, (pts - lo) / span, np.where(pts > 0, 2.0, -1.0))
+    order = np.argsort(scaled.sum(axis=1), kind="stable")
+
+    keep = np.zeros(n, dtype=bool)
+    skyline = np.empty((0, pts.shape[1]))
+    for start in range(0, n, SKYLINE_BLOCK):
+        idx = order[start:start + SKYLINE_BLOCK]
+        block = pts[idx]
+        if len(skyline):
+            le = (skyline[None, :, :] <= block[:, None, :]).all(axis=2)
+            lt = (skyline[None, :, :] < block[:, None, :]).any(axis=2)
+            alive = ~(le & lt).any(axis=1)
+            idx, block = idx[alive], block[alive]
+        # Dominance inside the block (transitive, so pairwise is enough)
+        le = (block[None, :, :] <= block[:, None, :]).all(axis=2)
+        lt = (block[None, :, :] < block[:, None, :]).any(axis=2)
+        alive = ~(le & lt).any(axis=1)
+        keep[idx[alive]] = True
+        skyline = np.vstack([skyline, block[alive]])
+    return keep
+
+
+def frontier_from_grid(
+    grid: Mapping[str, np.ndarray],
+    building_names: Sequence[str],
+    scenario_names: Sequence[str],
+    *,
+    discount_rate: float = 0.05,
+    term_years: int = 10,
+    objectives: Sequence[str] = tuple(OBJECTIVES),
+) -> dict:
+    """
+    Pareto frontier of an existing batch-engine grid.
+
+    Only valid cells that save carbon or money are candidates (the baseline
+    and no-benefit options are dropped).  Returns ``{"candidates", "objectives",
+    "frontier"}`` where ``frontier`` is a list of option dicts sorted by
+    install cost.
+    """
+    unknown = [o for o in objectives if o not in OBJECTIVES]
+    if unknown or not objectives:
+        raise ValueError(f"objectives must be a non-empty subset of {tuple(OBJECTIVES)}.")
+    cost = grid["install_cost_gbp"]
+    carbon = grid["carbon_saving_t"]
+    saving = grid["annual_saving_gbp"]
+    metrics = {
+        "install_cost_gbp": cost,
+        "carbon_saving_t":  carbon,
+        "payback_years":    np.where(np.isnan(grid["payback_years"]), np.inf, grid["payback_years"]),
+        "npv_gbp":          level_npv(cost, saving, discount_rate, term_years),
+    }
+    candidate = grid["valid"] & ((carbon > 0) | (saving > 0))
+    rows, cols = np.nonzero(candidate)
+    points = np.column_stack([
+        metrics[o][rows, cols] * (1.0 if OBJECTIVES[o] == "min" else -1.0) for o in objectives
+    ])
+    on_front = pareto_mask(points)
+
+    frontier = []
+    for i, j in zip(rows[on_front], cols[on_front]):
+        payback = metrics["payback_years"][i, j]
+        frontier.append({
+            "building":          building_names[i],
+            "scenario":          scenario_names[j],
+            "install_cost_gbp":  float(cost[i, j]),
+            "carbon_saving_t":   float(carbon[i, j]),
+            "annual_saving_gbp": float(saving[i, j]),
+            "payback_years":     float(payback) if np.isfinite(payback) else None,
+            "npv_gbp":           float(metrics["npv_gbp"][i, j]),
+        })
+    frontier.sort(key=lambda r: (r["install_cost_gbp"], -r["carbon_saving_t"]))
+    return {"candidates": int(len(rows)), "objectives": list(objectives), "frontier": frontier}
+
+
+def portfolio_frontier(
+    buildings: Mapping[str, Mapping],
+    scenario_names: Sequence[str],
+    temperature_c: float,
+    *,
+    scenarios: Mapping[str, Mapping] | None = None,
+    tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = physics.GRID_CARBON_INTENSITY_KG_PER_KWH,
+    discount_rate: float = 0.05,
+    term_years: int = 10,
+    objectives: Sequence[str] = tuple(OBJECTIVES),
+) -> dict:
+    """Evaluate every building × scenario in one batch call and return its frontier."""
+    names = list(buildings)
+    grid = physics.calculate_thermal_load_batch(
+        physics.building_columns(buildings[n] for n in names),
+        scenario_columns_for(scenario_names, scenarios),
+        temperature_c,
+        tariff_gbp_per_kwh,
+        carbon_intensity_kg_per_kwh,
+        strict=False,
+    )
+    return frontier_from_grid(
+        grid, names, list(scenario_names),
+        discount_rate=discount_rate, term_years=term_years, objectives=objectives,
+    )
@@ -0,0 +1,236 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Multi-Year Retrofit Phasing Simulator
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Schedules retrofit measures year by year under an annual capex limit and
+# rolls energy, carbon (electricity on a declining grid-intensity pathway,
+# gas, oil and LPG at fixed factors) and EPC band forward per asset,
+# reporting when each asset becomes MEES-compliant.
+#
+# Each year is one exact knapsack (core.optimiser.solve_knapsack) over the
+# measures an asset has not installed yet, prioritising assets that miss the
+# band required now, then the band required at the next MEES deadline, then
+# carbon.  Per-asset outcomes for every measure combination are computed once.
+#
+# Evaluation is incremental: the installed-measure state after every year is
+# kept, so changing the budget for year Y re-plans only years Y onwards.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from app.compliance import _EPC_BANDS_LIST, MEES_MEASURES, _band_from_sap
+from config.constants import (
+    CI_ELECTRICITY,
+    DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    GRID_CARBON_TRAJECTORY,
+    MEES_2028_TARGET_BAND,
+    MEES_2030_TARGET_BAND,
+    MEES_CURRENT_MIN_BAND,
+)
+from core.optimiser import measure_outcomes, solve_knapsack
+
+DEFAULT_START_YEAR = 2025
+DEFAULT_END_YEAR = 2035
+# Year from which each minimum band applies (England & Wales, non-domestic)
+MEES_SCHEDULE: tuple[tuple[int, str], ...] = (
+    (0, MEES_CURRENT_MIN_BAND),
+    (2028, MEES_2028_TARGET_BAND),
+    (2030, MEES_2030_TARGET_BAND),
+)
+LOOKAHEAD_YEARS = 3
+
+_BAND_THRESHOLD = {band: thresh for thresh, band, _ in _EPC_BANDS_LIST}
+
+
+def grid_carbon_intensity(year: int, trajectory: Mapping[int, float] = GRID_CARBON_TRAJECTORY) -> float:
+    """kgCO₂e/kWh for *year*; years outside the table take the nearest entry."""
+    if not trajectory:
+        return CI_ELECTRICITY
+    if year in trajectory:
+        return float(trajectory[year])
+    nearest = min(trajectory, key=lambda y: (abs(y - year), y))
+    return float(trajectory[nearest])
+
+
+def required_band(year: int) -> str:
+    """Minimum EPC band in force in *year*."""
+    band = MEES_CURRENT_MIN_BAND
+    for start, b in MEES_SCHEDULE:
+        if year >= start:
+            band = b
+    return band
+
+
+def _strictest(bands: Sequence[str]) -> str:
+    return max(bands, key=lambda b: _BAND_THRESHOLD[b])
+
+
+class PhasingSimulator:
+    """
+    Year-by-year retrofit roll-forward for one portfolio.
+
+    Build once per portfolio / weather / tariff; call ``run`` with the annual
+    capex limit (a number, or a ``{year: £}`` mapping) as often as needed.
+    ``run`` reuses every year whose inputs — and all earlier years' inputs —
+    are unchanged since the previous call.
+    """
+
+    def __init__(
+        self,
+        buildings: Mapping[str, Mapping],
+        temperature_c: float,
+        tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+        *,
+        start_year: int = DEFAULT_START_YEAR,
+        end_year: int = DEFAULT_END_YEAR,
+        measures: Sequence[Mapping] = MEES_MEASURES,
+        carbon_trajectory: Mapping[int, float] = GRID_CARBON_TRAJECTORY,
+        cost_basis: str = "mid",
+    ):
+        if end_year < start_year:
+            raise ValueError("end_year must be >= start_year.")
+        self.years = list(range(int(start_year), int(end_year) + 1))
+        self.outcomes = measure_outcomes(
+            buildings, temperature_c, tariff_gbp_per_kwh, measures=measures, cost_basis=cost_basis
+        )
+        self.carbon_intensity = np.array([grid_carbon_intensity(y, carbon_trajectory) for y in self.years])
+        self._budgets: list[float] = []
+        self._states: list[np.ndarray] = []   # installed subset per asset after each year
+        self._picks: list[np.ndarray] = []    # subset installed during each year
+        self.recomputed_from: int | None = None
+
+    # ── public ─────────────────────────────────────────────────────────────
+    def run(self, annual_capex_gbp: float | Mapping[int, float]) -> dict:
+        """Plan the horizon under *annual_capex_gbp* and return the trajectory."""
+        budgets = self._budget_list(annual_capex_gbp)
+        k = 0
+        while k < min(len(budgets), len(self._budgets)) and budgets[k] == self._budgets[k]:
+            k += 1
+        del self._states[k:], self._picks[k:]
+
+        n = len(self.outcomes["names"])
+        installed = self._states[-1] if self._states else np.zeros(n, dtype=np.intp)
+        for y in range(k, len(self.years)):
+            pick = self._plan_year(y, installed, budgets[y])
+            installed = installed | pick
+            self._picks.append(pick)
+            self._states.append(installed)
+        self._budgets = budgets
+        self.recomputed_from = self.years[k] if k < len(self.years) else None
+        return self._report()
+
+    # ── internals ──────────────────────────────────────────────────────────
+    def _budget_list(self, annual_capex_gbp) -> list[float]:
+        if isinstance(annual_capex_gbp, Mapping):
+            budgets = [float(annual_capex_gbp.get(y, 0.0)) for y in self.years]
+        else:
+            budgets = [float(annual_capex_gbp)] * len(self.years)
+        if any(b < 0 for b in budgets):
+            raise ValueError("Annual capex limits must be >= 0.")
+        return budgets
+
+    def _plan_year(self, y: int, installed: np.ndarray, budget: float) -> np.ndarray:
+        out = self.outcomes
+        year = self.years[y]
+        n_subsets = len(out["cost_gbp"])
+        subsets = np.arange(n_subsets)
+        rows = np.arange(len(installed))[:, None]
+        after = installed[:, None] | subsets[None, :]
+        disjoint = (installed[:, None] & subsets[None, :]) == 0
+
+        # Grid intensity of the year on the electricity meter; fuels at fixed factors
+        annual = out["electricity_mwh"] * self.carbon_intensity[y] + out["fuel_carbon_t"]
+        carbon = annual[rows, installed[:, None]] - annual[rows, after]
+        carbon = np.where(disjoint & np.isfinite(carbon), np.maximum(carbon, 0.0), 0.0)
+
+        # Deadlines: band in force now (weight 2) and the strictest band due
+        # within the look-ahead window (weight 1).  Below one whole asset:
+        # SAP progress towards that band (so multi-year packages can start
+        # before they cross it), then carbon.
+        sap_now = out["current_sap"] + out["sap_lift"][installed]
+        sap_after = out["current_sap"][:, None] + out["sap_lift"][after]
+        now_band = required_band(year)
+        next_band = _strictest([required_band(year + d) for d in range(LOOKAHEAD_YEARS + 1)])
+        cap = _BAND_THRESHOLD[next_band]
+        progress = np.minimum(sap_after, cap) - np.minimum(sap_now, cap)[:, None]
+        progress = np.where(disjoint & np.isfinite(progress), progress, 0.0)
+        value = (
+            0.5 * progress / (progress.max(axis=1).sum() + 1.0)
+            + 0.5 * carbon / (carbon.max(axis=1).sum() + 1.0)
+        )
+        for band, weight in ((now_band, 2.0), (next_band, 1.0)):
+            thr = _BAND_THRESHOLD[band]
+            crosses = (sap_now[:, None] < thr) & (sap_after >= thr)
+            value = value + weight * crosses
+        value = np.where(disjoint & out["valid"][:, None], value, 0.0)
+        value[:, 0] = 0.0
+
+        picked, _ = solve_knapsack(out["cost_gbp"], value, budget, valid=out["valid"])
+        return picked
+
+    def _report(self) -> dict:
+        out = self.outcomes
+        names = out["names"]
+        rows = np.arange(len(names))
+        states = np.array(self._states)                     # (Y, N)
+        picks = np.array(self._picks)
+        energy = out["energy_mwh"][rows[None, :], states]   # (Y, N)
+        sap = out["current_sap"][None, :] + out["sap_lift"][states]
+        carbon = (
+            out["electricity_mwh"][rows[None, :], states] * self.carbon_intensity[:, None]
+            + out["fuel_carbon_t"][rows[None, :], states]
+        )
+        compliant = np.array([
+            [
+                s >= _BAND_THRESHOLD[required_band(year)] if np.isfinite(s) else False
+                for s in sap[y]
+            ]
+            for y, year in enumerate(self.years)
+        ])
+
+        assets = {}
+        for i, name in enumerate(names):
+            # First year from which the asset stays compliant to the horizon
+            ok = compliant[:, i]
+            tail_ok = np.flip(np.logical_and.accumulate(np.flip(ok)))
+            first = int(np.argmax(tail_ok)) if tail_ok.any() else None
+            works = {
+                self.years[y]: [m for m, on in zip(out["measures"], out["masks"][picks[y, i]]) if on]
+                for y in range(len(self.years)) if picks[y, i]
+            }
+            assets[name] = {
+                "works":             works,
+                "energy_mwh":        energy[:, i].tolist(),
+                "carbon_t":          carbon[:, i].tolist(),
+                "sap_score":         sap[:, i].tolist(),
+                "epc_band":          [_band_from_sap(s)[0] if np.isfinite(s) else None for s in sap[:, i]],
+                "compliant":         ok.tolist(),
+                "compliant_from":    self.years[first] if first is not None else None,
+            }
+        return {
+            "years":               self.years,
+            "capex_limit_gbp":     list(self._budgets),
+            "spent_gbp":           out["cost_gbp"][picks].sum(axis=1).tolist(),
+            "energy_mwh":          np.nansum(energy, axis=1).tolist(),
+            "carbon_t":            np.nansum(carbon, axis=1).tolist(),
+            "grid_intensity_kg_per_kwh": self.carbon_intensity.tolist(),
+            "required_band":       [required_band(y) for y in self.years],
+            "compliant_assets":    compliant.sum(axis=1).tolist(),
+            "assets":              assets,
+            "recomputed_from":     self.recomputed_from,
+        }
+
+
+def simulate_phasing(
+    buildings: Mapping[str, Mapping],
+    temperature_c: float,
+    annual_capex_gbp: float | Mapping[int, float],
+    tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    **kwargs,
+) -> dict:
+    """One-shot ``PhasingSimulator(...).run(annual_capex_gbp)``."""
+    return PhasingSimulator(buildings, temperature_c, tariff_gbp_per_kwh, **kwargs).run(annual_capex_gbp)
@@ -8,8 +8,11 @@
 # ═══════════════════════════════════════════════════════════════════════════════
 
 from __future__ import annotations
-import functools
-import json
+import threading
+from collections import OrderedDict
+from typing import Iterable, Mapping
+
+import numpy as np
 
 from config.constants import (
     CI_ELECTRICITY as GRID_CARBON_INTENSITY_KG_PER_KWH,  # noqa: F401
@@ -21,9 +24,45 @@ from config.constants import (
     SOLAR_APERTURE_FACTOR,
     SOLAR_UTILISATION_FACTOR,
     INFILTRATION_HEAT_CAPACITY_FACTOR,
+    SOLAR_MONTHLY_PROFILE,
+    PHYSICS_CACHE_MAXSIZE,
 )
+from core import heating_systems, solar
+from core.tariffs import meter_rate, resolve_tariff, schedule_key
+from services import tmy
+
+# Column order used by the batch engine (building fabric / scenario factors).
+# Missing keys fall back to the same defaults the scalar validator applies.
+BUILDING_FIELDS: dict[str, float] = {
+    "floor_area_m2":       0.0,
+    "height_m":            0.0,
+    "glazing_ratio":       -1.0,
+    "u_value_wall":        0.0,
+    "u_value_roof":        0.0,
+    "u_value_glazing":     0.0,
+    "baseline_energy_mwh": 0.0,
+    "air_change_rate":     0.0,     # 0 → BASE_ACH
+    "base_load_mwh":       0.0,     # non-heating share of the declared baseline
+}
+SCENARIO_FIELDS: dict[str, float] = {
+    "u_wall_factor":          1.0,
+    "u_roof_factor":          1.0,
+    "u_glazing_factor":       1.0,
+    "solar_gain_reduction":   0.0,
+    "infiltration_reduction": 0.0,
+    "renewable_kwh":          0.0,
+    "pv_roof_fraction":       0.0,
+    "install_cost_gbp":       0.0,
+}
+MAX_AIR_CHANGE_RATE = 10.0
 
 
+def _air_change_rate(value: "float | np.ndarray") -> "float | np.ndarray":
+    """Building air-change rate (ach); zero or missing means ``BASE_ACH``."""
+    if np.ndim(value) == 0:
+        return float(value) if value and value > 0 else BASE_ACH
+    return np.where(value > 0, value, BASE_ACH)
+
 
 def _validate_model_inputs(building: dict, scenario: dict, weather_data: dict) -> None:
     """Hard validation to avoid non-physical or misleading outputs."""
@@ -40,10 +79,19 @@ def _validate_model_inputs(building: dict, scenario: dict, weather_data: dict) -
             raise ValueError(f"{key} must be > 0 and <= 6 W/m²K.")
     if float(building.get("baseline_energy_mwh", 0)) < 0:
         raise ValueError("baseline_energy_mwh must be >= 0.")
+    if not 0 <= float(building.get("air_change_rate", 0) or 0) <= MAX_AIR_CHANGE_RATE:
+        raise ValueError(f"air_change_rate must be between 0 and {MAX_AIR_CHANGE_RATE} ach.")
+    base_load = float(building.get("base_load_mwh", 0) or 0)
+    declared = float(building.get("baseline_energy_mwh", 0) or 0)
+    if base_load < 0 or (declared > 0 and base_load > declared):
+        raise ValueError("base_load_mwh must be >= 0 and not exceed baseline_energy_mwh.")
+    heating_systems.system_code(building.get("heating_system"))
     if float(scenario.get("infiltration_reduction", 0)) < 0 or float(scenario.get("infiltration_reduction", 0)) > 0.95:
         raise ValueError("infiltration_reduction must be between 0 and 0.95.")
     if float(scenario.get("solar_gain_reduction", 0)) < 0 or float(scenario.get("solar_gain_reduction", 0)) > 1:
         raise ValueError("solar_gain_reduction must be between 0 and 1.")
+    if not 0 <= float(scenario.get("pv_roof_fraction", 0)) <= 1:
+        raise ValueError("pv_roof_fraction must be between 0 and 1.")
     if "temperature_c" not in weather_data:
         raise ValueError("weather_data must include temperature_c.")
     _temp = float(weather_data["temperature_c"])
@@ -65,7 +113,10 @@ def _model_heating_demand_mwh(
     infiltration_reduction: float,
     solar_gain_reduction: float,
     outside_temp_c: float,
+    base_ach: float | None = None,
 ) -> float:
+    if base_ach is None:
+        base_ach = BASE_ACH
     perimeter_m = 4.0 * (floor_area_m2 ** 0.5)
     wall_area_m2 = perimeter_m * height_m * (1.0 - glazing_ratio)
     glazing_area_m2 = perimeter_m * height_m * glazing_ratio
@@ -78,7 +129,7 @@ def _model_heating_demand_mwh(
         + u_roof * roof_area_m2 * delta_t * HEATING_HOURS_PER_YEAR
         + u_glazing * glazing_area_m2 * delta_t * HEATING_HOURS_PER_YEAR
     )
-    ach = max(0.1, BASE_ACH * (1.0 - infiltration_reduction))
+    ach = max(0.1, base_ach * (1.0 - infiltration_reduction))
     q_inf_wh = (
         INFILTRATION_HEAT_CAPACITY_FACTOR * ach * volume_m3 * delta_t * HEATING_HOURS_PER_YEAR
     )
@@ -89,36 +140,144 @@ def _model_heating_demand_mwh(
     return max(0.0, (q_trans_wh + q_inf_wh) / 1_000_000.0 - solar_gain_mwh * SOLAR_UTILISATION_FACTOR)
 
 
-def _make_cache_key(building: dict, scenario: dict, weather: dict, tariff: float, carbon: float) -> tuple:
-    """Create a hashable key from mutable dictionary inputs for LRU caching."""
+# ─────────────────────────────────────────────────────────────────────────────
+# RESULT CACHE — keyed on the fields the model actually reads
+# Cosmetic asset keys (id, display_name, postcode, …) never enter the key, so
+# physically identical buildings share one entry.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Module-level names re-read from config.constants by invalidate_cache(), which
+# also re-reads the fuel prices and carbon factors in core.heating_systems
+_MODEL_CONSTANTS: dict[str, str] = {
+    "HEATING_SETPOINT_C":                "HEATING_SETPOINT_C",
+    "HEATING_HOURS_PER_YEAR":            "HEATING_HOURS_PER_YEAR",
+    "BASE_ACH":                          "BASE_ACH",
+    "SOLAR_IRRADIANCE_KWH_M2_YEAR":      "SOLAR_IRRADIANCE_KWH_M2_YEAR",
+    "SOLAR_APERTURE_FACTOR":             "SOLAR_APERTURE_FACTOR",
+    "SOLAR_UTILISATION_FACTOR":          "SOLAR_UTILISATION_FACTOR",
+    "INFILTRATION_HEAT_CAPACITY_FACTOR": "INFILTRATION_HEAT_CAPACITY_FACTOR",
+    "SOLAR_MONTHLY_PROFILE":             "SOLAR_MONTHLY_PROFILE",
+    "GRID_CARBON_INTENSITY_KG_PER_KWH":  "CI_ELECTRICITY",
+    "DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH": "DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH",
+}
+
+
+class PhysicsCache:
+    """Thread-safe bounded LRU with hit / miss / eviction counters."""
+
+    def __init__(self, maxsize: int = PHYSICS_CACHE_MAXSIZE):
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0.")
+        self.maxsize = int(maxsize)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._data: OrderedDict[tuple, dict] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> dict | None:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple, value: dict) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize: int) -> None:
+        if maxsize < 0:
+            raise ValueError("maxsize must be >= 0.")
+        with self._lock:
+            self.maxsize = int(maxsize)
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "hits":      self.hits,
+                "misses":    self.misses,
+                "evictions": self.evictions,
+                "size":      len(self._data),
+                "maxsize":   self.maxsize,
+            }
+
+    def _evict(self) -> None:
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+
+_RESULT_CACHE = PhysicsCache()
+
+
+def _key_value(value):
+    # int/float/bool collapse to float so 1450 and 1450.0 share an entry
+    if isinstance(value, (int, float)):
+        return float(value)
+    return value
+
+
+def _make_cache_key(
+    building: dict, scenario: dict, tariff: float, carbon: float, temp: float, pv_yield: float
+) -> tuple:
+    """Structural fingerprint: model-read fields only, in fixed column order."""
     return (
-        json.dumps(building, sort_keys=True),
-        json.dumps(scenario, sort_keys=True),
-        round(weather.get("temperature_c", 10.0), 1),
-        round(tariff, 4),
-        round(carbon, 5),
+        *(_key_value(building.get(f)) for f in BUILDING_FIELDS),
+        *(_key_value(scenario.get(f)) for f in SCENARIO_FIELDS),
+        building.get("heating_system"),
+        pv_yield,
+        temp,
+        tariff,
+        carbon,
     )
 
 
-@functools.lru_cache(maxsize=512)
-def _calculate_thermal_load_cached(
-    building_json: str,
-    scenario_json: str,
-    temp_rounded: float,
-    tariff: float,
-    carbon: float
-) -> dict:
-    """Cached internal implementation using hashable inputs."""
-    building = json.loads(building_json)
-    scenario = json.loads(scenario_json)
-    weather = {"temperature_c": temp_rounded}
-    return _calculate_thermal_load_impl(
-        building,
-        scenario,
-        weather,
-        tariff_gbp_per_kwh=tariff,
-        carbon_intensity_kg_per_kwh=carbon
-    )
+def cache_info() -> dict:
+    """Hit / miss / eviction counters and current size of the physics cache."""
+    return _RESULT_CACHE.info()
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Resize the physics cache (0 disables caching); evicts LRU entries if shrinking."""
+    _RESULT_CACHE.resize(maxsize)
+
+
+def invalidate_cache(reload_constants: bool = True) -> None:
+    """
+    Drop every cached result.
+
+    Call after changing ``config.constants`` at runtime: with
+    ``reload_constants=True`` the model constants bound in this module and
+    the ``core.heating_systems`` fuel prices and carbon factors are re-read
+    first, so subsequent scalar and batch calls use the new values.
+    Keyword defaults of the public functions keep their import-time values.
+    """
+    if reload_constants:
+        import config.constants as constants
+        g = globals()
+        for name, source in _MODEL_CONSTANTS.items():
+            g[name] = getattr(constants, source)
+        heating_systems.reload_constants()
+    _RESULT_CACHE.clear()
+
+
+def _roof_pv_yield(building: Mapping, scenario: Mapping) -> float:
+    """Roof PV yield in kWh/m² (core.solar) when *scenario* fits PV, else 0."""
+    fraction = scenario.get("pv_roof_fraction")
+    if fraction is None or not float(fraction) > 0:
+        return 0.0
+    return solar.roof_yield_kwh_per_m2(building)
 
 
 def _calculate_thermal_load_impl(
@@ -128,11 +287,17 @@ def _calculate_thermal_load_impl(
     *,
     tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
     carbon_intensity_kg_per_kwh: float = GRID_CARBON_INTENSITY_KG_PER_KWH,
+    pv_yield_kwh_per_m2: float | None = None,
+    baseline_tariff_gbp_per_kwh: float | None = None,
 ) -> dict:
     """
-    Internal implementation of the physics model.
+    Internal implementation of the physics model.  The baseline electricity
+    meter is priced at *baseline_tariff_gbp_per_kwh* when given (a schedule
+    priced on each meter's own profile), else at *tariff_gbp_per_kwh*.
     """
     _validate_model_inputs(building, scenario, weather_data)
+    if pv_yield_kwh_per_m2 is None:
+        pv_yield_kwh_per_m2 = _roof_pv_yield(building, scenario)
     if tariff_gbp_per_kwh <= 0:
         raise ValueError("tariff_gbp_per_kwh must be > 0.")
     if carbon_intensity_kg_per_kwh <= 0:
@@ -141,10 +306,17 @@ def _calculate_thermal_load_impl(
     b = building
     s = scenario
     temp = float(weather_data["temperature_c"])
+    system = heating_systems.system_code(b.get("heating_system"))
+    efficiency = float(heating_systems.efficiency(system, temp))
+    electric = bool(heating_systems.is_electric(system))
+    fuel_price, fuel_carbon = (
+        float(r) for r in heating_systems.fuel_rates(system, tariff_gbp_per_kwh, carbon_intensity_kg_per_kwh)
+    )
 
     u_wall = b["u_value_wall"] * s["u_wall_factor"]
     u_roof = b["u_value_roof"] * s["u_roof_factor"]
     u_glazing = b["u_value_glazing"] * s["u_glazing_factor"]
+    base_ach = _air_change_rate(_as_float(b.get("air_change_rate"), 0.0))
 
     baseline_modelled_mwh = _model_heating_demand_mwh(
         floor_area_m2=b["floor_area_m2"],
@@ -156,6 +328,7 @@ def _calculate_thermal_load_impl(
         infiltration_reduction=0.0,
         solar_gain_reduction=0.0,
         outside_temp_c=temp,
+        base_ach=base_ach,
     )
     scenario_modelled_mwh = _model_heating_demand_mwh(
         floor_area_m2=b["floor_area_m2"],
@@ -167,18 +340,25 @@ def _calculate_thermal_load_impl(
         infiltration_reduction=s["infiltration_reduction"],
         solar_gain_reduction=s["solar_gain_reduction"],
         outside_temp_c=temp,
+        base_ach=base_ach,
     )
 
-    # Handle missing or zero baseline energy by falling back to modelled baseline
+    # A declared baseline is delivered (metered) energy, so calibrating to it
+    # absorbs the system efficiency; a modelled baseline is heat demand and
+    # is divided by it.  Handle missing or zero baseline energy by falling
+    # back to modelled baseline.  A declared base load is not heating: it is
+    # electricity and passes through every scenario unchanged.
     known_baseline_mwh = float(b.get("baseline_energy_mwh", 0.0))
+    base_load_mwh = _as_float(b.get("base_load_mwh"), 0.0)
 
     if known_baseline_mwh > 0:
-        scale = known_baseline_mwh / baseline_modelled_mwh if baseline_modelled_mwh > 0 else 1.0
+        scale = (
+            (known_baseline_mwh - base_load_mwh) / baseline_modelled_mwh
+            if baseline_modelled_mwh > 0 else 1.0 / efficiency
+        )
     else:
-        scale = 1.0
-        known_baseline_mwh = baseline_modelled_mwh
-
-    adjusted_mwh = max(0.0, scenario_modelled_mwh * scale)
+        scale = 1.0 / efficiency
+        known_baseline_mwh = baseline_modelled_mwh / efficiency + base_load_mwh
 
     # Detect baseline scenario (no changes) and preserve declared baseline energy
     is_baseline = (
@@ -188,22 +368,79 @@ def _calculate_thermal_load_impl(
         and float(s.get("solar_gain_reduction", 0.0)) == 0.0
         and float(s.get("infiltration_reduction", 0.0)) == 0.0
         and int(s.get("renewable_kwh", 0)) == 0
+        and float(s.get("pv_roof_fraction", 0.0)) == 0.0
         and int(s.get("install_cost_gbp", 0)) == 0
     )
 
+    # Two meters: heating on the system's fuel and base load on electricity,
+    # each priced and carbon-counted at its own rate.  On-site generation nets
+    # off the electricity meter, which also carries electric heating.
+    if electric:
+        baseline_fuel_mwh, baseline_electric_mwh = 0.0, known_baseline_mwh
+    else:
+        baseline_fuel_mwh, baseline_electric_mwh = known_baseline_mwh - base_load_mwh, base_load_mwh
     if is_baseline:
-        adjusted_mwh = known_baseline_mwh
         renewable_mwh = 0.0
-        final_mwh = adjusted_mwh
+        scenario_fuel_mwh, scenario_electric_mwh = baseline_fuel_mwh, baseline_electric_mwh
     else:
-        renewable_mwh = s.get("renewable_kwh", 0) / 1_000.0
-        final_mwh = max(0.0, adjusted_mwh - renewable_mwh)
+        pv_kwh = float(s.get("pv_roof_fraction", 0.0)) * b["floor_area_m2"] * pv_yield_kwh_per_m2
+        renewable_mwh = (s.get("renewable_kwh", 0) + pv_kwh) / 1_000.0
+        heat_mwh = max(0.0, scenario_modelled_mwh * scale)
+        if electric:
+            scenario_fuel_mwh = 0.0
+            scenario_electric_mwh = max(0.0, heat_mwh + base_load_mwh - renewable_mwh)
+        else:
+            scenario_fuel_mwh = heat_mwh
+            scenario_electric_mwh = max(0.0, base_load_mwh - renewable_mwh)
+    final_mwh = scenario_fuel_mwh + scenario_electric_mwh
 
-    baseline_carbon = (known_baseline_mwh * 1000.0 * carbon_intensity_kg_per_kwh) / 1000.0
-    scenario_carbon = (final_mwh * 1000.0 * carbon_intensity_kg_per_kwh) / 1000.0
-
-    annual_saving = (known_baseline_mwh - final_mwh) * 1000.0 * tariff_gbp_per_kwh
+    baseline_carbon = baseline_fuel_mwh * fuel_carbon + baseline_electric_mwh * carbon_intensity_kg_per_kwh
+    scenario_carbon = scenario_fuel_mwh * fuel_carbon + scenario_electric_mwh * carbon_intensity_kg_per_kwh
+    if baseline_tariff_gbp_per_kwh is None:
+        electric_saving = (baseline_electric_mwh - scenario_electric_mwh) * tariff_gbp_per_kwh
+    else:
+        electric_saving = (
+            baseline_electric_mwh * baseline_tariff_gbp_per_kwh - scenario_electric_mwh * tariff_gbp_per_kwh
+        )
+    annual_saving = ((baseline_fuel_mwh - scenario_fuel_mwh) * fuel_price + electric_saving) * 1000.0
     install_cost = float(s["install_cost_gbp"])
+
+    return _result_dict(
+        known_baseline_mwh=known_baseline_mwh,
+        final_mwh=final_mwh,
+        renewable_mwh=renewable_mwh,
+        baseline_carbon=baseline_carbon,
+        scenario_carbon=scenario_carbon,
+        annual_saving=annual_saving,
+        install_cost=install_cost,
+        u_wall=u_wall,
+        u_roof=u_roof,
+        u_glazing=u_glazing,
+        system=system,
+        efficiency=efficiency,
+        baseline_electric_mwh=baseline_electric_mwh,
+        scenario_electric_mwh=scenario_electric_mwh,
+    )
+
+
+def _result_dict(
+    *,
+    known_baseline_mwh: float,
+    final_mwh: float,
+    renewable_mwh: float,
+    baseline_carbon: float,
+    scenario_carbon: float,
+    annual_saving: float,
+    install_cost: float,
+    u_wall: float,
+    u_roof: float,
+    u_glazing: float,
+    system: int,
+    efficiency: float,
+    baseline_electric_mwh: float,
+    scenario_electric_mwh: float,
+) -> dict:
+    """Round raw model outputs into the public result dict (scalar and batch paths)."""
     payback = (install_cost / annual_saving) if annual_saving > 0.0 else None
 
     cpt = round(install_cost / max(baseline_carbon - scenario_carbon, 0.01), 1) \
@@ -216,6 +453,7 @@ def _calculate_thermal_load_impl(
     _annual_saving   = round(annual_saving, 0)
     _payback         = round(payback, 1) if payback else None
     _renewable_mwh   = round(renewable_mwh, 1)
+    fuel = heating_systems.HEATING_SYSTEMS[heating_systems.HEATING_SYSTEM_IDS[system]]["fuel"]
 
     return {
         # Primary keys (used by the live application)
@@ -235,6 +473,21 @@ def _calculate_thermal_load_impl(
         "u_wall":              round(u_wall, 2),
         "u_roof":              round(u_roof, 2),
         "u_glazing":           round(u_glazing, 2),
+        "heating_system":      heating_systems.HEATING_SYSTEM_IDS[system],
+        "heating_efficiency":  round(efficiency, 2),
+        # Delivered energy by fuel (fuel_breakdown() adds cost and carbon)
+        **{
+            f"{side}_{f}_mwh": (
+                round(electric, 1) if f == "electricity"
+                else round(total - electric, 1) if f == fuel
+                else 0.0
+            )
+            for f in heating_systems.FUELS
+            for side, total, electric in (
+                ("baseline", known_baseline_mwh, baseline_electric_mwh),
+                ("scenario", final_mwh, scenario_electric_mwh),
+            )
+        },
         # Legacy alias keys — match field names used in older tests
         "annual_energy_mwh":    round(final_mwh, 1),
         "baseline_carbon_tco2": _base_carbon,
@@ -250,12 +503,22 @@ def calculate_thermal_load(
     building: dict,
     scenario: dict,
     weather_data: dict,
-    tariff_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    tariff_gbp_per_kwh: "float | Mapping" = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
     carbon_intensity_kg_per_kwh: float = GRID_CARBON_INTENSITY_KG_PER_KWH,
 ) -> dict:
     """
     Public entry point for the physics engine with LRU caching.
-    
+
+    ``tariff_gbp_per_kwh`` may be a £/kWh scalar or a core.tariffs schedule,
+    which prices the building's baseline and scenario electricity meters on
+    their own modelled monthly profiles (see ``electricity_rates``).  The
+    building's ``heating_system`` (core.heating_systems; default direct
+    electric) sets the fuel, efficiency or COP, and non-electric fuels are
+    priced and carbon-accounted at their own rates.  A scenario's
+    ``pv_roof_fraction`` adds rooftop PV on that share of the roof, with the
+    yield of the building's ``latitude`` / ``longitude`` or ``city``
+    (core.solar), to any fixed ``renewable_kwh``.
+
     Physics-informed thermal load calculation.
     Q_transmission = U × A × ΔT × hours  [Wh]
     Q_infiltration = 0.33 × ACH × Vol × ΔT  [Wh]
@@ -264,21 +527,953 @@ def calculate_thermal_load(
     DISCLAIMER: Simplified steady-state model. Results are indicative only.
     Not for use as sole basis for investment decisions.
     """
-    # Generate cache key from inputs
-    key = _make_cache_key(
-        building, 
-        scenario, 
-        weather_data, 
-        tariff_gbp_per_kwh, 
-        carbon_intensity_kg_per_kwh
-    )
-    
-    # Call cached implementation
+    if "temperature_c" not in weather_data:
+        raise ValueError("weather_data must include temperature_c.")
+    temp = round(float(weather_data["temperature_c"]), 1)
+    schedule = tariff_gbp_per_kwh if isinstance(tariff_gbp_per_kwh, Mapping) else None
+    tariff = round(resolve_tariff(tariff_gbp_per_kwh), 4)
+    carbon = round(carbon_intensity_kg_per_kwh, 5)
+    pv_yield = _roof_pv_yield(building, scenario)
+
+    try:
+        tariff_key = tariff if schedule is None else schedule_key(schedule)
+        key = _make_cache_key(building, scenario, tariff_key, carbon, temp, pv_yield)
+        hash(key)
+    except TypeError:
+        key = None  # unhashable field value — compute without caching
+
+    result = _RESULT_CACHE.get(key) if key is not None else None
+    if result is None:
+        baseline_tariff = None
+        if schedule is not None and -40.0 <= temp <= 60.0:
+            rates = electricity_rates(
+                electricity_meters(building_columns([building]), scenario_columns([scenario]), temp), schedule
+            )
+            baseline_tariff, tariff = (float(r.ravel()[0]) for r in rates)
+        result = _calculate_thermal_load_impl(
+            building,
+            scenario,
+            {"temperature_c": temp},
+            tariff_gbp_per_kwh=tariff,
+            carbon_intensity_kg_per_kwh=carbon,
+            pv_yield_kwh_per_m2=pv_yield,
+            baseline_tariff_gbp_per_kwh=baseline_tariff,
+        )
+        if key is not None:
+            _RESULT_CACHE.put(key, result)
+
     # We return a dict copy to ensure the cached result is not mutated by the caller
-    result = _calculate_thermal_load_cached(*key)
     return dict(result)
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+# BATCH ENGINE — N buildings × M scenarios in one NumPy pass
+# Same equations, baseline detection and scaling rules as the scalar path;
+# outputs are unrounded arrays, use thermal_load_record() for the dict form.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _as_float(value, default: float) -> float:
+    if value is None:
+        return default
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
+
+def building_columns(buildings: Iterable[Mapping]) -> dict[str, np.ndarray]:
+    """
+    Pack building dicts into the column arrays read by the batch engine,
+    plus ``heating_system`` as integer codes (-1 for an unknown id) and the
+    core.solar site columns used by roof-PV scenarios.
+    """
+    rows = list(buildings)
+    columns = {
+        field: np.fromiter((_as_float(b.get(field), default) for b in rows), float, len(rows))
+        for field, default in BUILDING_FIELDS.items()
+    }
+    columns["heating_system"] = heating_systems.system_codes((b.get("heating_system") for b in rows), len(rows))
+    columns.update(solar.site_columns(rows))
+    return columns
+
+
+def scenario_columns(scenarios: Iterable[Mapping]) -> dict[str, np.ndarray]:
+    """Pack scenario dicts into the column arrays read by the batch engine."""
+    rows = list(scenarios)
+    return {
+        field: np.fromiter((_as_float(s.get(field), default) for s in rows), float, len(rows))
+        for field, default in SCENARIO_FIELDS.items()
+    }
+
+
+def _model_heating_demand_mwh_batch(
+    *,
+    floor_area_m2: np.ndarray,
+    height_m: np.ndarray,
+    glazing_ratio: np.ndarray,
+    u_wall: np.ndarray,
+    u_roof: np.ndarray,
+    u_glazing: np.ndarray,
+    infiltration_reduction: np.ndarray,
+    solar_gain_reduction: np.ndarray,
+    outside_temp_c: "float | np.ndarray",
+    base_ach: "float | np.ndarray | None" = None,
+    setpoint_c: "float | np.ndarray | None" = None,
+    aperture: "float | np.ndarray | None" = None,
+) -> np.ndarray:
+    """
+    Broadcasting twin of ``_model_heating_demand_mwh`` (identical operation order).
+
+    ``base_ach``, ``setpoint_c`` and ``aperture`` override ``BASE_ACH``,
+    ``HEATING_SETPOINT_C`` and ``SOLAR_APERTURE_FACTOR`` (e.g. per-draw
+    samples in core.uncertainty, perturbed rows in ``sensitivity_analysis``).
+    """
+    if base_ach is None:
+        base_ach = BASE_ACH
+    if setpoint_c is None:
+        setpoint_c = HEATING_SETPOINT_C
+    if aperture is None:
+        aperture = SOLAR_APERTURE_FACTOR
+    perimeter_m = 4.0 * (floor_area_m2 ** 0.5)
+    wall_area_m2 = perimeter_m * height_m * (1.0 - glazing_ratio)
+    glazing_area_m2 = perimeter_m * height_m * glazing_ratio
+    roof_area_m2 = floor_area_m2
+    volume_m3 = floor_area_m2 * height_m
+
+    delta_t = np.maximum(0.0, setpoint_c - outside_temp_c)
+    q_trans_wh = (
+        u_wall * wall_area_m2 * delta_t * HEATING_HOURS_PER_YEAR
+        + u_roof * roof_area_m2 * delta_t * HEATING_HOURS_PER_YEAR
+        + u_glazing * glazing_area_m2 * delta_t * HEATING_HOURS_PER_YEAR
+    )
+    ach = np.maximum(0.1, base_ach * (1.0 - infiltration_reduction))
+    q_inf_wh = (
+        INFILTRATION_HEAT_CAPACITY_FACTOR * ach * volume_m3 * delta_t * HEATING_HOURS_PER_YEAR
+    )
+    solar_gain_mwh = (
+        SOLAR_IRRADIANCE_KWH_M2_YEAR * glazing_area_m2 * aperture * (1.0 - solar_gain_reduction)
+    ) / 1000.0
+
+    return np.maximum(0.0, (q_trans_wh + q_inf_wh) / 1_000_000.0 - solar_gain_mwh * SOLAR_UTILISATION_FACTOR)
+
+
+def _valid_building_rows(b: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Vectorised ``_validate_model_inputs`` building checks (NaN counts as invalid)."""
+    ok = (b["floor_area_m2"] > 0) & (b["height_m"] > 0)
+    ok &= (b["glazing_ratio"] >= 0) & (b["glazing_ratio"] <= 0.95)
+    for key in ("u_value_wall", "u_value_roof", "u_value_glazing"):
+        ok &= (b[key] > 0) & (b[key] <= 6)
+    ok &= b["baseline_energy_mwh"] >= 0
+    ok &= (b["air_change_rate"] >= 0) & (b["air_change_rate"] <= MAX_AIR_CHANGE_RATE)
+    ok &= (b["base_load_mwh"] >= 0) & ~((b["baseline_energy_mwh"] > 0) & (b["base_load_mwh"] > b["baseline_energy_mwh"]))
+    return ok
+
+
+def _valid_scenario_cols(s: Mapping[str, np.ndarray]) -> np.ndarray:
+    """Vectorised ``_validate_model_inputs`` scenario checks (NaN counts as invalid)."""
+    inf = s["infiltration_reduction"]
+    sgr = s["solar_gain_reduction"]
+    pv = s["pv_roof_fraction"]
+    return (inf >= 0) & (inf <= 0.95) & (sgr >= 0) & (sgr <= 1) & (pv >= 0) & (pv <= 1)
+
+
+def _roof_pv_yield_column(buildings: Mapping, n: int, fractions: np.ndarray) -> np.ndarray:
+    """
+    (N,) roof PV yield in kWh/m²: a precomputed ``pv_yield_kwh_per_m2``
+    column, else from the core.solar site columns (default site when absent);
+    only simulated when some scenario fits PV.
+    """
+    if not np.any(fractions > 0):
+        return np.zeros(n)
+    if "pv_yield_kwh_per_m2" in buildings:
+        return np.asarray(buildings["pv_yield_kwh_per_m2"], dtype=float).reshape(-1)
+    if "latitude" not in buildings:
+        return np.full(n, solar.roof_yield_kwh_per_m2({}))
+    return solar.roof_yield_batch(**{k: buildings[k] for k in solar.SITE_FIELDS if k in buildings})
+
+
+def _row(columns: Mapping[str, np.ndarray], index: int) -> dict:
+    return {key: float(col[index]) for key, col in columns.items()}
+
+
+def _grid_outputs(
+    bc: Mapping[str, np.ndarray],
+    sc: Mapping[str, np.ndarray],
+    temp_c: "float | np.ndarray",
+    tariff: "float | np.ndarray",
+    carbon: "float | np.ndarray",
+    baseline_tariff: "float | np.ndarray | None" = None,
+    **model,
+) -> dict[str, np.ndarray]:
+    """
+    Unmasked batch outputs for broadcastable building (``bc``) and scenario
+    (``sc``) columns.  ``tariff`` prices the scenario electricity meter and
+    ``baseline_tariff`` (default: ``tariff``) the baseline one.  ``model`` is
+    forwarded to ``_model_heating_demand_mwh_batch``
+    (its ``base_ach`` replaces the building ``air_change_rate``).  ``bc`` may
+    carry ``heating_system`` codes (default: direct electric),
+    ``air_change_rate`` and ``base_load_mwh``, and must carry
+    ``pv_yield_kwh_per_m2`` for scenarios with a ``pv_roof_fraction``.
+    """
+    if "base_ach" not in model and "air_change_rate" in bc:
+        model = {**model, "base_ach": _air_change_rate(bc["air_change_rate"])}
+    base_load = bc.get("base_load_mwh", 0.0)
+    system = bc.get("heating_system")
+    if system is None:
+        system = np.full(np.shape(bc["floor_area_m2"]), heating_systems.system_code(None))
+    efficiency = heating_systems.efficiency(system, temp_c)
+    electric = heating_systems.is_electric(system)
+    fuel = heating_systems.fuel_index(system)
+    price, fuel_carbon = heating_systems.fuel_rates(system, tariff, carbon)
+
+    u_wall = bc["u_value_wall"] * sc["u_wall_factor"]
+    u_roof = bc["u_value_roof"] * sc["u_roof_factor"]
+    u_glazing = bc["u_value_glazing"] * sc["u_glazing_factor"]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        baseline_modelled_mwh = _model_heating_demand_mwh_batch(
+            floor_area_m2=bc["floor_area_m2"],
+            height_m=bc["height_m"],
+            glazing_ratio=bc["glazing_ratio"],
+            u_wall=bc["u_value_wall"],
+            u_roof=bc["u_value_roof"],
+            u_glazing=bc["u_value_glazing"],
+            infiltration_reduction=0.0,
+            solar_gain_reduction=0.0,
+            outside_temp_c=temp_c,
+            **model,
+        )
+        scenario_modelled_mwh = _model_heating_demand_mwh_batch(
+            floor_area_m2=bc["floor_area_m2"],
+            height_m=bc["height_m"],
+            glazing_ratio=bc["glazing_ratio"],
+            u_wall=u_wall,
+            u_roof=u_roof,
+            u_glazing=u_glazing,
+            infiltration_reduction=sc["infiltration_reduction"],
+            solar_gain_reduction=sc["solar_gain_reduction"],
+            outside_temp_c=temp_c,
+            **model,
+        )
+
+        # Declared baselines are delivered energy; modelled heat is divided by the efficiency
+        declared = bc["baseline_energy_mwh"]
+        has_declared = declared > 0
+        scale = np.where(
+            has_declared & (baseline_modelled_mwh > 0),
+            (declared - base_load) / np.where(baseline_modelled_mwh > 0, baseline_modelled_mwh, 1.0),
+            1.0 / efficiency,
+        )
+        known_baseline_mwh = np.broadcast_to(
+            np.where(has_declared, declared, baseline_modelled_mwh / efficiency + base_load),
+            scenario_modelled_mwh.shape,
+        )
+
+        is_baseline = (
+            (sc["u_wall_factor"] == 1.0)
+            & (sc["u_roof_factor"] == 1.0)
+            & (sc["u_glazing_factor"] == 1.0)
+            & (sc["solar_gain_reduction"] == 0.0)
+            & (sc["infiltration_reduction"] == 0.0)
+            & (np.trunc(sc["renewable_kwh"]) == 0)
+            & (sc["pv_roof_fraction"] == 0.0)
+            & (np.trunc(sc["install_cost_gbp"]) == 0)
+        )
+        pv_fraction = sc["pv_roof_fraction"]
+        pv_kwh = (
+            np.where(pv_fraction > 0, pv_fraction * bc["floor_area_m2"] * bc["pv_yield_kwh_per_m2"], 0.0)
+            if np.any(pv_fraction > 0) else 0.0
+        )
+        renewable_mwh = np.broadcast_to(
+            np.where(is_baseline, 0.0, (sc["renewable_kwh"] + pv_kwh) / 1_000.0), scenario_modelled_mwh.shape
+        )
+
+        # Two meters: heating on the system's fuel and base load on
+        # electricity; generation nets off the electricity meter, which also
+        # carries electric heating
+        heat_mwh = np.maximum(0.0, scenario_modelled_mwh * scale)
+        baseline_electric = np.where(electric, known_baseline_mwh, base_load)
+        baseline_fuel = known_baseline_mwh - baseline_electric
+        scenario_electric = np.where(
+            is_baseline,
+            baseline_electric,
+            np.maximum(0.0, np.where(electric, heat_mwh, 0.0) + base_load - renewable_mwh),
+        )
+        scenario_fuel = np.where(is_baseline, baseline_fuel, np.where(electric, 0.0, heat_mwh))
+        final_mwh = scenario_fuel + scenario_electric
+
+        baseline_carbon = baseline_fuel * fuel_carbon + baseline_electric * carbon
+        scenario_carbon = scenario_fuel * fuel_carbon + scenario_electric * carbon
+        electric_saving = (
+            (baseline_electric - scenario_electric) * tariff if baseline_tariff is None
+            else baseline_electric * baseline_tariff - scenario_electric * tariff
+        )
+        annual_saving = ((baseline_fuel - scenario_fuel) * price + electric_saving) * 1000.0
+        install_cost = np.broadcast_to(sc["install_cost_gbp"], final_mwh.shape)
+
+        payback = np.where(
+            (annual_saving > 0.0) & (install_cost != 0.0),
+            install_cost / np.where(annual_saving > 0.0, annual_saving, 1.0),
+            np.nan,
+        )
+        cost_per_tonne = np.where(
+            install_cost > 0,
+            install_cost / np.maximum(baseline_carbon - scenario_carbon, 0.01),
+            np.nan,
+        )
+        # Delivered energy by fuel; a fuel nothing uses shares one zero array
+        present = np.unique(fuel)
+        zero = np.zeros(final_mwh.shape)
+        by_fuel = {}
+        for k, f in enumerate(heating_systems.FUELS):
+            for side, electric_mwh, fuel_mwh in (
+                ("baseline", baseline_electric, baseline_fuel),
+                ("scenario", scenario_electric, scenario_fuel),
+            ):
+                if f == "electricity":
+                    by_fuel[f"{side}_{f}_mwh"] = np.broadcast_to(electric_mwh, final_mwh.shape)
+                else:
+                    by_fuel[f"{side}_{f}_mwh"] = (
+                        zero if k not in present
+                        else np.broadcast_to(fuel_mwh, final_mwh.shape) if present.size == 1
+                        else np.where(fuel == k, fuel_mwh, 0.0)
+                    )
+        saving_pct = (known_baseline_mwh - final_mwh) / np.where(
+            known_baseline_mwh > 0, known_baseline_mwh, 1.0
+        ) * 100.0
+
+    return {
+        "baseline_energy_mwh": known_baseline_mwh,
+        "scenario_energy_mwh": final_mwh,
+        "energy_saving_mwh":   known_baseline_mwh - final_mwh,
+        "energy_saving_pct":   saving_pct,
+        "baseline_carbon_t":   baseline_carbon,
+        "scenario_carbon_t":   scenario_carbon,
+        "carbon_saving_t":     baseline_carbon - scenario_carbon,
+        "annual_saving_gbp":   annual_saving,
+        "install_cost_gbp":    install_cost,
+        "payback_years":       payback,
+        "cost_per_tonne_co2":  cost_per_tonne,
+        "renewable_mwh":       renewable_mwh,
+        "u_wall":              u_wall,
+        "u_roof":              u_roof,
+        "u_glazing":           u_glazing,
+        "heating_system":      system,
+        "heating_efficiency":  efficiency,
+        **by_fuel,
+    }
+
+
+def calculate_thermal_load_batch(
+    buildings: Mapping[str, "np.typing.ArrayLike"],
+    scenarios: Mapping[str, "np.typing.ArrayLike"],
+    temperature_c: float,
+    tariff_gbp_per_kwh: "float | Mapping" = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = GRID_CARBON_INTENSITY_KG_PER_KWH,
+    *,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Evaluate the full building × scenario grid in one vectorised pass.
+
+    ``buildings`` maps each key in ``BUILDING_FIELDS`` (and optionally
+    ``heating_system`` codes and the core.solar site columns) to a length-N array and ``scenarios`` maps each key in ``SCENARIO_FIELDS`` to a length-M array
+    (see ``building_columns`` / ``scenario_columns``); the tariff may be a
+    core.tariffs schedule, which prices every cell's baseline and scenario
+    electricity meters on their own modelled monthly profiles (see
+    ``electricity_rates``).  Every output is an
+    unrounded (N, M) float array carrying the same quantities as
+    ``calculate_thermal_load``; ``payback_years`` and ``cost_per_tonne_co2``
+    are NaN where the scalar path returns ``None``.
+
+    With ``strict=True`` the first invalid row raises the same ``ValueError``
+    as the scalar validator.  With ``strict=False`` invalid rows/columns are
+    NaN and flagged ``False`` in the boolean ``valid`` array.
+    """
+    b = {k: np.asarray(buildings[k], dtype=float).reshape(-1) for k in BUILDING_FIELDS}
+    systems = heating_systems.system_codes(buildings.get("heating_system"), len(b["floor_area_m2"]))
+    n_scenarios = max((np.size(v) for v in scenarios.values()), default=0)
+    s = {
+        k: np.asarray(scenarios[k], dtype=float).reshape(-1) if k in scenarios else np.full(n_scenarios, v)
+        for k, v in SCENARIO_FIELDS.items()
+    }
+
+    schedule = tariff_gbp_per_kwh if isinstance(tariff_gbp_per_kwh, Mapping) else None
+    tariff_gbp_per_kwh = resolve_tariff(tariff_gbp_per_kwh)
+    temp = float(temperature_c)
+    if temp > 60.0 or temp < -40.0:
+        raise ValueError(
+            f"Physics model validation: temperature_c={temp} is outside the "
+            "physically plausible range [-40, 60] °C."
+        )
+    if tariff_gbp_per_kwh <= 0:
+        raise ValueError("tariff_gbp_per_kwh must be > 0.")
+    if carbon_intensity_kg_per_kwh <= 0:
+        raise ValueError("carbon_intensity_kg_per_kwh must be > 0.")
+    baseline_tariff = None
+    if schedule is not None:
+        baseline_tariff, tariff_gbp_per_kwh = electricity_rates(electricity_meters(buildings, s, temp), schedule)
+
+    b_ok = _valid_building_rows(b) & (systems >= 0)
+    s_ok = _valid_scenario_cols(s)
+    if strict and not (b_ok.all() and s_ok.all()):
+        i = int(np.argmin(b_ok)) if not b_ok.all() else 0
+        j = int(np.argmin(s_ok)) if not s_ok.all() else 0
+        # Re-run the scalar validator on the offending row for an identical message.
+        row = {**_row(b, i), "heating_system": int(systems[i]) if systems[i] >= 0 else "unknown"}
+        _validate_model_inputs(row, _row(s, j), {"temperature_c": temp})
+        raise ValueError("Invalid batch inputs.")
+    pv_yield = _roof_pv_yield_column(buildings, len(systems), s["pv_roof_fraction"])
+    pv_ok = np.isfinite(pv_yield)[:, None] | ~(s["pv_roof_fraction"] > 0)[None, :]
+    if strict and not pv_ok.all():
+        raise ValueError(solar.INVALID_SITE_MESSAGE)
+
+    # Buildings along axis 0, scenarios along axis 1
+    result = _grid_outputs(
+        {
+            **{k: v[:, None] for k, v in b.items()},
+            "heating_system": systems[:, None],
+            "pv_yield_kwh_per_m2": pv_yield[:, None],
+        },
+        {k: v[None, :] for k, v in s.items()},
+        temp,
+        tariff_gbp_per_kwh,
+        carbon_intensity_kg_per_kwh,
+        baseline_tariff,
+    )
+    valid = b_ok[:, None] & s_ok[None, :] & pv_ok
+    masked: dict[int, np.ndarray] = {}   # outputs that alias one array are masked once
+    for k, v in result.items():
+        if id(v) not in masked:
+            masked[id(v)] = np.where(valid, np.broadcast_to(v, valid.shape), np.nan)
+        result[k] = masked[id(v)]
+    result["valid"] = valid
+    return result
+
+
+def thermal_load_record(batch: Mapping[str, np.ndarray], i: int, j: int) -> dict:
+    """Return cell (i, j) of a batch result as the dict ``calculate_thermal_load`` returns."""
+    return _result_dict(
+        known_baseline_mwh=float(batch["baseline_energy_mwh"][i, j]),
+        final_mwh=float(batch["scenario_energy_mwh"][i, j]),
+        renewable_mwh=float(batch["renewable_mwh"][i, j]),
+        baseline_carbon=float(batch["baseline_carbon_t"][i, j]),
+        scenario_carbon=float(batch["scenario_carbon_t"][i, j]),
+        annual_saving=float(batch["annual_saving_gbp"][i, j]),
+        install_cost=float(batch["install_cost_gbp"][i, j]),
+        u_wall=float(batch["u_wall"][i, j]),
+        u_roof=float(batch["u_roof"][i, j]),
+        u_glazing=float(batch["u_glazing"][i, j]),
+        system=int(batch["heating_system"][i, j]),
+        efficiency=float(batch["heating_efficiency"][i, j]),
+        baseline_electric_mwh=float(batch["baseline_electricity_mwh"][i, j]),
+        scenario_electric_mwh=float(batch["scenario_electricity_mwh"][i, j]),
+    )
+
+
+def batch_row_error(building: dict, scenario: dict, temperature_c: float) -> str:
+    """Validation message for one invalid batch cell (for per-row error reporting)."""
+    try:
+        _validate_model_inputs(building, scenario, {"temperature_c": temperature_c})
+    except ValueError as exc:
+        return str(exc)
+    return "Invalid model inputs."
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TIME-SERIES MODE — 12 monthly or 8760 hourly outdoor temperatures
+# Transmission, infiltration and solar terms are evaluated per step for every
+# building at once, then calibrated to the declared baseline like the annual
+# model.  HEATING_HOURS_PER_YEAR / 8760 is applied to every step as the
+# heating-availability fraction, so a flat temperature series reproduces the
+# annual model exactly when solar_weights are uniform per hour (proportional
+# to each step's hours).  The default SOLAR_MONTHLY_PROFILE puts more gain in
+# summer, where the clamp at zero discards the surplus, so its annual total is
+# higher than the annual model's.
+# ─────────────────────────────────────────────────────────────────────────────
+
+HOURS_PER_YEAR = 8760
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_HOURS = np.array(DAYS_IN_MONTH, dtype=float) * 24.0
+_MONTH_START_HOUR = np.concatenate(([0], np.cumsum(_MONTH_HOURS)[:-1])).astype(int)
+
+
+def _series_step_hours(n_steps: int) -> np.ndarray:
+    if n_steps == 12:
+        return _MONTH_HOURS.copy()
+    if n_steps == HOURS_PER_YEAR:
+        return np.ones(HOURS_PER_YEAR)
+    raise ValueError("temperatures_c must hold 12 monthly or 8760 hourly values.")
+
+
+def _series_solar_weights(n_steps: int, solar_weights) -> np.ndarray:
+    if solar_weights is None:
+        monthly = np.asarray(SOLAR_MONTHLY_PROFILE, dtype=float)
+        if n_steps == HOURS_PER_YEAR:
+            monthly = np.repeat(monthly / _MONTH_HOURS, _MONTH_HOURS.astype(int))
+        weights = monthly
+    else:
+        weights = np.asarray(solar_weights, dtype=float).reshape(-1)
+        if weights.size != n_steps:
+            raise ValueError("solar_weights must match the length of temperatures_c.")
+        if (weights < 0).any() or not weights.sum() > 0:
+            raise ValueError("solar_weights must be non-negative with a positive sum.")
+    return weights / weights.sum()
+
+
+def series_to_monthly(series: np.ndarray) -> np.ndarray:
+    """Sum an (..., 8760) hourly series into (..., 12) calendar months; monthly input is returned as is."""
+    series = np.asarray(series, dtype=float)
+    if series.shape[-1] == 12:
+        return series
+    if series.shape[-1] != HOURS_PER_YEAR:
+        raise ValueError("series must hold 12 monthly or 8760 hourly values.")
+    return np.add.reduceat(series, _MONTH_START_HOUR, axis=-1)
+
+
+def _series_coefficients(
+    *,
+    wall_area_m2: np.ndarray,
+    glazing_area_m2: np.ndarray,
+    roof_area_m2: np.ndarray,
+    volume_m3: np.ndarray,
+    u_wall: np.ndarray,
+    u_roof: np.ndarray,
+    u_glazing: np.ndarray,
+    infiltration_reduction: float,
+    solar_gain_reduction: float,
+    base_ach: "float | np.ndarray | None" = None,
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Transmission and infiltration loss (W/K) and annual useful solar gain (MWh), each (N,)."""
+    if base_ach is None:
+        base_ach = BASE_ACH
+    ua_w_per_k = u_wall * wall_area_m2 + u_roof * roof_area_m2 + u_glazing * glazing_area_m2
+    ach = np.maximum(0.1, base_ach * (1.0 - infiltration_reduction))
+    inf_w_per_k = INFILTRATION_HEAT_CAPACITY_FACTOR * ach * volume_m3
+    solar_mwh = (
+        SOLAR_IRRADIANCE_KWH_M2_YEAR * glazing_area_m2 * SOLAR_APERTURE_FACTOR * (1.0 - solar_gain_reduction)
+    ) / 1000.0 * SOLAR_UTILISATION_FACTOR
+    return ua_w_per_k, inf_w_per_k, solar_mwh
+
+
+def _series_geometry(b: Mapping[str, np.ndarray]) -> dict[str, np.ndarray]:
+    perimeter_m = 4.0 * (b["floor_area_m2"] ** 0.5)
+    return dict(
+        wall_area_m2=perimeter_m * b["height_m"] * (1.0 - b["glazing_ratio"]),
+        glazing_area_m2=perimeter_m * b["height_m"] * b["glazing_ratio"],
+        roof_area_m2=b["floor_area_m2"],
+        volume_m3=b["floor_area_m2"] * b["height_m"],
+    )
+
+
+def heat_loss_coefficient(
+    buildings: Mapping[str, "np.typing.ArrayLike"], scenario: Mapping | None = None
+) -> np.ndarray:
+    """
+    (N,) modelled heat-loss coefficient in W/K — the U×A transmission plus
+    infiltration terms of ``_model_heating_demand_mwh`` — for building
+    columns under *scenario* (``None`` means no intervention).  Multiply by
+    ``heat_scale`` from ``simulate_thermal_series`` for the calibrated value.
+    """
+    b = {k: np.asarray(buildings[k], dtype=float).reshape(-1) for k in BUILDING_FIELDS}
+    s = {k: _as_float(dict(scenario or {}).get(k), v) for k, v in SCENARIO_FIELDS.items()}
+    with np.errstate(invalid="ignore"):
+        ua, inf, _ = _series_coefficients(
+            u_wall=b["u_value_wall"] * s["u_wall_factor"],
+            u_roof=b["u_value_roof"] * s["u_roof_factor"],
+            u_glazing=b["u_value_glazing"] * s["u_glazing_factor"],
+            infiltration_reduction=s["infiltration_reduction"],
+            solar_gain_reduction=s["solar_gain_reduction"],
+            base_ach=_air_change_rate(b["air_change_rate"]),
+            **_series_geometry(b),
+        )
+    return ua + inf
+
+
+def _series_heating(
+    loss_w_per_k: np.ndarray, solar_mwh: np.ndarray, degree_mwh: np.ndarray, solar_weights: np.ndarray
+) -> np.ndarray:
+    """Per-step heating demand (N, T) in MWh, clamped at zero within each step."""
+    heating = np.multiply.outer(loss_w_per_k, degree_mwh)
+    heating -= np.multiply.outer(solar_mwh, solar_weights)
+    return np.maximum(heating, 0.0, out=heating)
+
+
+def simulate_thermal_series(
+    buildings: Mapping[str, "np.typing.ArrayLike"],
+    temperatures_c: "np.typing.ArrayLike",
+    scenario: Mapping | None = None,
+    *,
+    solar_weights: "np.typing.ArrayLike | None" = None,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Run the thermal model over a 12-month or 8760-hour temperature series.
+
+    ``buildings`` maps each key in ``BUILDING_FIELDS`` to a length-N array
+    (see ``building_columns``); ``scenario`` is one scenario dict (``None``
+    means no intervention).  Annual solar gain is spread over the steps by
+    ``solar_weights`` (default: ``SOLAR_MONTHLY_PROFILE``) and each step's
+    heating demand is clamped at zero, so summer surplus gains are not
+    carried over to winter.
+
+    Returns (N, T) arrays ``baseline_mwh`` / ``energy_mwh`` (delivered
+    energy of each building's heating system, calibrated to the declared
+    baseline, plus any ``base_load_mwh`` spread flat over the year),
+    ``electricity_mwh`` (the electricity meter: base load and any electric
+    heating, net of renewables per step),
+    ``heating_mwh`` (modelled scenario heat demand) and
+    ``heating_efficiency`` (heat-pump COP follows each step's temperature),
+    the (N,) ``heat_scale`` that calibrates modelled heat to the declared
+    baseline (``heating_mwh × heat_scale`` is calibrated heat), (N,) annual totals of each term and of energy, the (N,) ``fuel`` of
+    each row, plus ``step_hours`` and the boolean ``valid`` row mask.  With
+    ``strict=False`` invalid buildings are NaN instead of raising.
+    """
+    b = {k: np.asarray(buildings[k], dtype=float).reshape(-1) for k in BUILDING_FIELDS}
+    systems = heating_systems.system_codes(buildings.get("heating_system"), len(b["floor_area_m2"]))
+    scenario = dict(scenario or {})
+    s = {k: _as_float(scenario.get(k), v) for k, v in SCENARIO_FIELDS.items()}
+
+    temps = np.asarray(temperatures_c, dtype=float).reshape(-1)
+    step_hours = _series_step_hours(temps.size)
+    out_of_range = ~((temps >= -40.0) & (temps <= 60.0))
+    if out_of_range.any():
+        bad = float(temps[np.argmax(out_of_range)])
+        raise ValueError(
+            f"Physics model validation: temperature_c={bad} is outside the "
+            "physically plausible range [-40, 60] °C."
+        )
+    weights = _series_solar_weights(temps.size, solar_weights)
+
+    b_ok = _valid_building_rows(b) & (systems >= 0)
+    s_ok = bool(_valid_scenario_cols({k: np.array([v]) for k, v in s.items()})[0])
+    if strict and not (b_ok.all() and s_ok):
+        i = int(np.argmin(b_ok)) if not b_ok.all() else 0
+        row = {**_row(b, i), "heating_system": int(systems[i]) if systems[i] >= 0 else "unknown"}
+        _validate_model_inputs(row, s, {"temperature_c": float(temps[0])})
+        raise ValueError("Invalid series inputs.")
+    pv_yield = _roof_pv_yield_column(buildings, len(systems), np.array([s["pv_roof_fraction"]]))
+    pv_ok = np.isfinite(pv_yield) | (not s["pv_roof_fraction"] > 0)
+    if strict and not pv_ok.all():
+        raise ValueError(solar.INVALID_SITE_MESSAGE)
+    efficiency = heating_systems.efficiency(systems[:, None], temps[None, :])
+    electric = heating_systems.is_electric(systems)
+
+    heating_hours = step_hours * (HEATING_HOURS_PER_YEAR / HOURS_PER_YEAR)
+
+    # Degree-hours per step in MWh per W/K of heat-loss coefficient
+    degree_mwh = np.maximum(0.0, HEATING_SETPOINT_C - temps) * heating_hours / 1_000_000.0
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        geometry = _series_geometry(b)
+        geometry["base_ach"] = _air_change_rate(b["air_change_rate"])
+        base_ua, base_inf, base_solar = _series_coefficients(
+            u_wall=b["u_value_wall"],
+            u_roof=b["u_value_roof"],
+            u_glazing=b["u_value_glazing"],
+            infiltration_reduction=0.0,
+            solar_gain_reduction=0.0,
+            **geometry,
+        )
+        ua, inf, solar_mwh = _series_coefficients(
+            u_wall=b["u_value_wall"] * s["u_wall_factor"],
+            u_roof=b["u_value_roof"] * s["u_roof_factor"],
+            u_glazing=b["u_value_glazing"] * s["u_glazing_factor"],
+            infiltration_reduction=s["infiltration_reduction"],
+            solar_gain_reduction=s["solar_gain_reduction"],
+            **geometry,
+        )
+        baseline = _series_heating(base_ua + base_inf, base_solar, degree_mwh, weights) / efficiency
+
+        declared = b["baseline_energy_mwh"]
+        base_load = np.multiply.outer(b["base_load_mwh"], step_hours / HOURS_PER_YEAR)
+        modelled_annual = baseline.sum(axis=1)
+        scale = np.where(
+            (declared > 0) & (modelled_annual > 0),
+            (declared - b["base_load_mwh"]) / np.where(modelled_annual > 0, modelled_annual, 1.0),
+            1.0,
+        )[:, None]
+        baseline *= scale
+        baseline += base_load
+        # A declared baseline with no modelled heating demand is spread flat over the year
+        flat = (declared > 0) & ~(modelled_annual > 0)
+        if flat.any():
+            baseline[flat] = np.multiply.outer(declared[flat], step_hours / HOURS_PER_YEAR)
+
+        is_baseline = (
+            s["u_wall_factor"] == 1.0
+            and s["u_roof_factor"] == 1.0
+            and s["u_glazing_factor"] == 1.0
+            and s["solar_gain_reduction"] == 0.0
+            and s["infiltration_reduction"] == 0.0
+            and int(s["renewable_kwh"]) == 0
+            and s["pv_roof_fraction"] == 0.0
+            and int(s["install_cost_gbp"]) == 0
+        )
+        heating = _series_heating(ua + inf, solar_mwh, degree_mwh, weights)
+        electric = electric[:, None]
+        if is_baseline:
+            energy = baseline
+            electricity = np.where(electric, baseline, base_load)
+        else:
+            # Base load is on the electricity meter, with electric heating;
+            # generation nets off that meter step by step
+            heat = heating / efficiency * scale
+            renewable_kwh = s["renewable_kwh"] + (
+                s["pv_roof_fraction"] * b["floor_area_m2"] * pv_yield if s["pv_roof_fraction"] > 0 else 0.0
+            )
+            electricity = np.where(electric, heat, 0.0) + base_load
+            electricity -= np.multiply.outer(renewable_kwh / 1_000.0, weights)
+            np.maximum(electricity, 0.0, out=electricity)
+            energy = np.where(electric, 0.0, heat) + electricity
+
+    valid = b_ok & s_ok & pv_ok
+    if not valid.all():
+        efficiency = np.where(valid[:, None], efficiency, np.nan)
+        for series in {id(a): a for a in (baseline, energy, electricity, heating)}.values():
+            series[~valid] = np.nan
+    degree_total = degree_mwh.sum()
+    result = {
+        "baseline_mwh":        baseline,
+        "energy_mwh":          energy,
+        "electricity_mwh":     electricity,
+        "heating_mwh":         heating,
+        "transmission_mwh":    np.where(valid, ua * degree_total, np.nan),
+        "infiltration_mwh":    np.where(valid, inf * degree_total, np.nan),
+        "solar_gain_mwh":      np.where(valid, solar_mwh, np.nan),
+        "heating_efficiency":  np.broadcast_to(efficiency, baseline.shape),
+        "heat_scale":          np.where(valid, scale[:, 0], np.nan),
+    }
+    result["annual_baseline_mwh"] = result["baseline_mwh"].sum(axis=1)
+    result["annual_energy_mwh"] = result["energy_mwh"].sum(axis=1)
+    result["fuel"] = np.array(heating_systems.FUELS)[heating_systems.fuel_index(systems)]
+    result["step_hours"] = step_hours
+    result["valid"] = valid
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# TIME-OF-USE PRICING — a schedule priced on each asset's own electricity meter
+# The series model gives every building × scenario its electricity meter
+# month by month; core.tariffs.meter_rate reduces a schedule to one £/kWh per
+# meter, so the annual engine and cash-flow model stay linear in the rate.
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _monthly_temperatures(temperature_c: float) -> np.ndarray:
+    """Typical-year monthly temperatures shifted to an annual mean of *temperature_c*."""
+    try:
+        shape = tmy.monthly_mean_temperatures(tmy.DEFAULT_TMY_CITY)
+    except (OSError, ValueError, KeyError):
+        return np.full(12, float(temperature_c))
+    shifted = shape + (float(temperature_c) - np.average(shape, weights=tmy.DAYS_IN_MONTH))
+    return np.clip(shifted, -40.0, 60.0)
+
+
+def electricity_meters(
+    buildings: Mapping[str, "np.typing.ArrayLike"],
+    scenarios: Mapping[str, "np.typing.ArrayLike"],
+    temperature_c: float,
+) -> dict[str, np.ndarray]:
+    """
+    Monthly electricity meters (MWh) of N buildings × M scenario columns.
+
+    Runs ``simulate_thermal_series`` on the typical-year monthly profile
+    shifted to *temperature_c* and returns ``baseline_mwh`` (N, 1, 12),
+    ``scenario_mwh`` (N, M, 12) and the flat ``base_load_mwh`` share of each
+    meter (N, 1, 12).  Invalid rows are NaN.
+    """
+    temps = _monthly_temperatures(temperature_c)
+    n_scenarios = max((np.size(v) for v in scenarios.values()), default=0)
+    s = {
+        k: np.asarray(scenarios[k], dtype=float).reshape(-1) if k in scenarios else np.full(n_scenarios, v)
+        for k, v in SCENARIO_FIELDS.items()
+    }
+    baseline = simulate_thermal_series(buildings, temps, strict=False)
+    scenario = [
+        simulate_thermal_series(buildings, temps, {k: float(v[j]) for k, v in s.items()}, strict=False)
+        for j in range(n_scenarios)
+    ]
+    n = len(baseline["valid"])
+    base_load = np.multiply.outer(
+        np.asarray(buildings["base_load_mwh"], dtype=float).reshape(-1), baseline["step_hours"] / HOURS_PER_YEAR
+    )
+    return {
+        "baseline_mwh":  baseline["electricity_mwh"][:, None, :],
+        "scenario_mwh":  (
+            np.stack([r["electricity_mwh"] for r in scenario], axis=1) if scenario else np.zeros((n, 0, 12))
+        ),
+        "base_load_mwh": base_load[:, None, :],
+    }
+
+
+def electricity_rates(meters: Mapping[str, np.ndarray], schedule: Mapping) -> tuple[np.ndarray, np.ndarray]:
+    """
+    (N, 1) baseline and (N, M) scenario £/kWh of *schedule* on the
+    ``electricity_meters`` of each cell (see core.tariffs.meter_rate).
+    """
+    base = meters["base_load_mwh"] * 1000.0
+    return (
+        meter_rate(schedule, meters["baseline_mwh"] * 1000.0, base),
+        meter_rate(schedule, meters["scenario_mwh"] * 1000.0, base),
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SENSITIVITY — elasticity of energy, carbon and payback to every model input
+# Each input is nudged ±rel_step about its nominal value; all 2K+1 rows go
+# through the batch kernel in one call and are reduced to central-difference
+# elasticities (% change in output per 1 % change in input).  Temperatures
+# have no natural zero in °C, so they move ±SENSITIVITY_STEP_K instead and
+# report the % change in output per kelvin.
+# ─────────────────────────────────────────────────────────────────────────────
+
+# Perturbed inputs: key → (group, display label)
+SENSITIVITY_INPUTS: dict[str, tuple[str, str]] = {
+    "floor_area_m2":               ("building", "Floor area"),
+    "height_m":                    ("building", "Storey height"),
+    "glazing_ratio":               ("building", "Glazing ratio"),
+    "u_value_wall":                ("building", "Wall U-value"),
+    "u_value_roof":                ("building", "Roof U-value"),
+    "u_value_glazing":             ("building", "Glazing U-value"),
+    "baseline_energy_mwh":         ("building", "Declared baseline energy"),
+    "infiltration_reduction":      ("scenario", "Infiltration reduction"),
+    "solar_gain_reduction":        ("scenario", "Solar gain reduction"),
+    "install_cost_gbp":            ("scenario", "Install cost"),
+    "temperature_c":               ("weather",  "Outdoor temperature"),
+    "tariff_gbp_per_kwh":          ("economic", "Electricity tariff"),
+    "carbon_intensity_kg_per_kwh": ("economic", "Grid carbon intensity"),
+    "base_ach":                    ("model",    "Base air-change rate"),
+    "solar_aperture_factor":       ("model",    "Solar aperture factor"),
+    "setpoint_c":                  ("model",    "Heating setpoint"),
+}
+SENSITIVITY_METRICS = ("scenario_energy_mwh", "scenario_carbon_t", "payback_years")
+# Inputs perturbed additively, in kelvin
+SENSITIVITY_ADDITIVE_INPUTS = ("temperature_c", "setpoint_c")
+SENSITIVITY_STEP_K = 1.0
+
+
+def sensitivity_analysis(
+    building: dict,
+    scenario: dict,
+    weather_data: dict,
+    tariff_gbp_per_kwh: "float | Mapping" = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = GRID_CARBON_INTENSITY_KG_PER_KWH,
+    *,
+    rel_step: float = 0.05,
+    rank_by: str = "scenario_energy_mwh",
+) -> dict:
+    """
+    Tornado-style sensitivity of one building × scenario result.
+
+    Returns ``{"nominal", "rel_step", "inputs"}`` where ``inputs`` is a list
+    of ``{"input", "group", "label", "value", "step", "low", "high",
+    "elasticity"}`` entries sorted by the absolute ``rank_by`` swing
+    (high − low).  ``low``/``high`` hold each metric at ``value × (1 ∓
+    rel_step)``, or at ``value ∓ SENSITIVITY_STEP_K`` for the
+    ``SENSITIVITY_ADDITIVE_INPUTS`` temperatures, whose elasticity is per
+    kelvin; ``step`` is ``"±5%"`` or ``"±1 K"`` accordingly.  An elasticity
+    is ``None`` where the nominal metric is zero or undefined (no payback).
+    Proportional inputs at zero have zero elasticity and no swing.  A
+    core.tariffs schedule is priced on the nominal baseline and scenario
+    electricity meters (see ``electricity_rates``), and the tariff input
+    scales both rates together.
+    """
+    if not 0.0 < rel_step < 1.0:
+        raise ValueError("rel_step must be between 0 and 1.")
+    if rank_by not in SENSITIVITY_METRICS:
+        raise ValueError(f"rank_by must be one of {SENSITIVITY_METRICS}.")
+    _validate_model_inputs(building, scenario, weather_data)
+    schedule = tariff_gbp_per_kwh if isinstance(tariff_gbp_per_kwh, Mapping) else None
+    tariff_gbp_per_kwh = resolve_tariff(tariff_gbp_per_kwh)
+    if tariff_gbp_per_kwh <= 0:
+        raise ValueError("tariff_gbp_per_kwh must be > 0.")
+    if carbon_intensity_kg_per_kwh <= 0:
+        raise ValueError("carbon_intensity_kg_per_kwh must be > 0.")
+    baseline_ratio = None
+    if schedule is not None:
+        meters = electricity_meters(
+            building_columns([building]), scenario_columns([scenario]), float(weather_data["temperature_c"])
+        )
+        baseline_rate, tariff_gbp_per_kwh = (float(r.ravel()[0]) for r in electricity_rates(meters, schedule))
+        baseline_ratio = baseline_rate / tariff_gbp_per_kwh
+
+    nominal = {f: _as_float(building.get(f), d) for f, d in BUILDING_FIELDS.items()}
+    nominal.update({f: _as_float(scenario.get(f), d) for f, d in SCENARIO_FIELDS.items()})
+    nominal.update(
+        temperature_c=float(weather_data["temperature_c"]),
+        tariff_gbp_per_kwh=float(tariff_gbp_per_kwh),
+        carbon_intensity_kg_per_kwh=float(carbon_intensity_kg_per_kwh),
+        base_ach=float(_air_change_rate(nominal["air_change_rate"])),
+        solar_aperture_factor=float(SOLAR_APERTURE_FACTOR),
+        setpoint_c=float(HEATING_SETPOINT_C),
+    )
+
+    # Row 0 is nominal; rows 2k+1 / 2k+2 are input k moved down / up
+    names = list(SENSITIVITY_INPUTS)
+    rows = {key: np.full(2 * len(names) + 1, value) for key, value in nominal.items()}
+    for k, name in enumerate(names):
+        if name in SENSITIVITY_ADDITIVE_INPUTS:
+            rows[name][2 * k + 1] -= SENSITIVITY_STEP_K
+            rows[name][2 * k + 2] += SENSITIVITY_STEP_K
+        else:
+            rows[name][2 * k + 1] *= 1.0 - rel_step
+            rows[name][2 * k + 2] *= 1.0 + rel_step
+
+    out = _grid_outputs(
+        {
+            **{f: rows[f] for f in BUILDING_FIELDS},
+            "heating_system": np.full(2 * len(names) + 1, heating_systems.system_code(building.get("heating_system"))),
+            "pv_yield_kwh_per_m2": np.full(2 * len(names) + 1, _roof_pv_yield(building, scenario)),
+        },
+        {f: rows[f] for f in SCENARIO_FIELDS},
+        rows["temperature_c"],
+        rows["tariff_gbp_per_kwh"],
+        rows["carbon_intensity_kg_per_kwh"],
+        None if baseline_ratio is None else rows["tariff_gbp_per_kwh"] * baseline_ratio,
+        base_ach=rows["base_ach"],
+        setpoint_c=rows["setpoint_c"],
+        aperture=rows["solar_aperture_factor"],
+    )
+
+    def _value(x: float):
+        return float(x) if np.isfinite(x) else None
+
+    centre = {m: _value(out[m][0]) for m in SENSITIVITY_METRICS}
+    inputs = []
+    for k, name in enumerate(names):
+        low = {m: _value(out[m][2 * k + 1]) for m in SENSITIVITY_METRICS}
+        high = {m: _value(out[m][2 * k + 2]) for m in SENSITIVITY_METRICS}
+        additive = name in SENSITIVITY_ADDITIVE_INPUTS
+        # % change per 1 % change, or per kelvin for the temperatures
+        span = 2.0 * SENSITIVITY_STEP_K / 100.0 if additive else 2.0 * rel_step
+        elasticity = {}
+        for m in SENSITIVITY_METRICS:
+            if nominal[name] == 0.0 and not additive:
+                elasticity[m] = 0.0
+            elif not centre[m] or low[m] is None or high[m] is None:
+                elasticity[m] = None
+            else:
+                elasticity[m] = (high[m] - low[m]) / (span * centre[m])
+        group, label = SENSITIVITY_INPUTS[name]
+        inputs.append({
+            "input":      name,
+            "group":      group,
+            "label":      label,
+            "value":      nominal[name],
+            "step":       f"±{SENSITIVITY_STEP_K:g} K" if additive else f"±{rel_step * 100:g}%",
+            "low":        low,
+            "high":       high,
+            "elasticity": elasticity,
+        })
+
+    def _swing(r: dict) -> float:
+        lo, hi = r["low"][rank_by], r["high"][rank_by]
+        return 0.0 if lo is None or hi is None else abs(hi - lo)
+
+    inputs.sort(key=lambda r: -_swing(r))
+    return {"nominal": centre, "rel_step": rel_step, "inputs": inputs}
+
+
 # Legacy compatibility exports used by older agent/tests
 try:
     from config.scenarios import SCENARIOS  # noqa: F401
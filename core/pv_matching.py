@@ -0,0 +1,347 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — PV Self-Consumption and Export
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# The annual physics engine nets on-site generation straight off demand, as
+# though every kWh were used on site.  This module matches generation and
+# load hour by hour instead.  Generation comes from the core.solar profile of
+# each asset's site.  Load is the electricity meter from
+# core.physics.simulate_thermal_series (electric heating and the asset's own
+# base load) plus any extra base load passed in.  The
+# result is split into PV used directly, PV stored in an optional battery and
+# used later, and PV exported:
+#
+#   avoided import  = Σ_h (direct + discharged)_h × import rate_h
+#   export income   = Σ_h exported_h × SEG export rate
+#
+# The battery recurrence runs in NumPy over the 8760 steps, vectorised across
+# assets, and stores nothing per hour unless asked.  The portfolio is
+# processed in blocks of BLOCK_SIZE assets so memory stays bounded.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping
+
+import numpy as np
+
+import core.physics as physics
+from config.constants import DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH, SEG_EXPORT_TARIFF_GBP_PER_KWH
+from core import solar
+from core.tariffs import hourly_rates, resolve_tariff
+from services import tmy
+
+ROUND_TRIP_EFFICIENCY = 0.90     # lithium-ion AC round trip
+BATTERY_C_RATE = 0.5             # default power limit, kW per kWh of capacity
+BLOCK_SIZE = 2048                # assets per (8760, B) working set
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# HOURLY MATCHING
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _check_battery(capacity_kwh, power_kw, round_trip_efficiency: float) -> None:
+    if not 0.0 < round_trip_efficiency <= 1.0:
+        raise ValueError("round_trip_efficiency must be in (0, 1].")
+    if np.any(np.asarray(capacity_kwh) < 0) or (power_kw is not None and np.any(np.asarray(power_kw) < 0)):
+        raise ValueError("Battery capacity and power must be >= 0.")
+
+
+def simulate_battery(
+    surplus_kwh: np.ndarray,
+    deficit_kwh: np.ndarray,
+    capacity_kwh: "float | np.ndarray",
+    power_kw: "float | np.ndarray | None" = None,
+    round_trip_efficiency: float = ROUND_TRIP_EFFICIENCY,
+    *,
+    import_rates: "np.ndarray | None" = None,
+    hourly: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Greedy self-consumption battery over (N, T) hourly PV *surplus* and
+    load *deficit* (kWh, never both positive in one hour).  Surplus charges
+    the battery and deficit discharges it, each up to *power_kw* (default:
+    BATTERY_C_RATE × capacity) and the state of charge.  Losses are split
+    evenly between charge and discharge, and the battery starts empty.
+
+    Returns (N,) ``charged_kwh`` (PV drawn), ``discharged_kwh`` (delivered
+    to the load) and, with (T,) *import_rates*, ``discharged_value_gbp``.
+    With ``hourly=True`` it also returns (N, T) ``charge_hourly_kwh``,
+    ``discharge_hourly_kwh`` and end-of-hour ``soc_hourly_kwh``.
+    """
+    _check_battery(capacity_kwh, power_kw, round_trip_efficiency)
+    surplus = np.ascontiguousarray(np.asarray(surplus_kwh, dtype=float).T)     # (T, N), one row per step
+    deficit = np.ascontiguousarray(np.asarray(deficit_kwh, dtype=float).T)
+    steps, n = surplus.shape
+    capacity = np.broadcast_to(np.asarray(capacity_kwh, dtype=float), (n,))
+    power = capacity * BATTERY_C_RATE if power_kw is None else np.broadcast_to(np.asarray(power_kw, dtype=float), (n,))
+    eta = np.sqrt(round_trip_efficiency)
+
+    soc = np.zeros(n)
+    room = np.empty(n)
+    charge = np.empty(n)
+    discharge = np.empty(n)
+    charged = np.zeros(n)
+    discharged = np.zeros(n)
+    value = np.zeros(n) if import_rates is not None else None
+    if hourly:
+        charges, discharges, socs = (np.empty((steps, n)) for _ in range(3))
+    for t in range(steps):
+        # charge = min(surplus, power, headroom / eta)
+        np.subtract(capacity, soc, out=room)
+        room /= eta
+        np.minimum(surplus[t], power, out=charge)
+        np.minimum(charge, room, out=charge)
+        # discharge = min(deficit, power, soc × eta)
+        np.multiply(soc, eta, out=room)
+        np.minimum(deficit[t], power, out=discharge)
+        np.minimum(discharge, room, out=discharge)
+        soc += charge * eta - discharge / eta
+        charged += charge
+        discharged += discharge
+        if value is not None:
+            value += discharge * import_rates[t]
+        if hourly:
+            charges[t], discharges[t], socs[t] = charge, discharge, soc
+    out = {"charged_kwh": charged, "discharged_kwh": discharged}
+    if value is not None:
+        out["discharged_value_gbp"] = value
+    if hourly:
+        out.update(charge_hourly_kwh=charges.T, discharge_hourly_kwh=discharges.T, soc_hourly_kwh=socs.T)
+    return out
+
+
+def match_profiles(
+    generation_kwh: "np.typing.ArrayLike",
+    load_kwh: "np.typing.ArrayLike",
+    *,
+    battery_kwh: "float | np.ndarray" = 0.0,
+    battery_power_kw: "float | np.ndarray | None" = None,
+    round_trip_efficiency: float = ROUND_TRIP_EFFICIENCY,
+    import_rate_gbp_per_kwh: "float | np.ndarray" = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    export_rate_gbp_per_kwh: float = SEG_EXPORT_TARIFF_GBP_PER_KWH,
+    hourly: bool = False,
+) -> dict[str, np.ndarray]:
+    """
+    Hour-by-hour split of (N, T) PV *generation* against (N, T) *load* (kWh).
+
+    *import_rate_gbp_per_kwh* is a scalar or a (T,) price per step (e.g.
+    ``core.tariffs.hourly_rates``).  Returns (N,) ``generation_kwh``,
+    ``load_kwh``, ``direct_kwh`` (PV used in the hour), ``battery_kwh``
+    (PV delivered later from storage), ``self_consumed_kwh``,
+    ``export_kwh``, ``import_kwh``, ``losses_kwh``,
+    ``self_consumption_rate`` (self-consumed / generated),
+    ``self_sufficiency`` (self-consumed / load), ``avoided_import_gbp``,
+    ``export_income_gbp`` and ``pv_value_gbp``.  With ``hourly=True`` the
+    (N, T) ``import_hourly_kwh``, ``export_hourly_kwh`` and
+    ``soc_hourly_kwh`` are included.
+    """
+    generation = np.atleast_2d(np.asarray(generation_kwh, dtype=float))
+    load = np.atleast_2d(np.asarray(load_kwh, dtype=float))
+    generation, load = np.broadcast_arrays(generation, load)
+    if generation.min(initial=0.0) < 0 or load.min(initial=0.0) < 0:
+        raise ValueError("generation_kwh and load_kwh must be >= 0.")
+    if export_rate_gbp_per_kwh < 0:
+        raise ValueError("export_rate_gbp_per_kwh must be >= 0.")
+    _check_battery(battery_kwh, battery_power_kw, round_trip_efficiency)
+    steps = generation.shape[-1]
+    rates = np.broadcast_to(np.asarray(import_rate_gbp_per_kwh, dtype=float), (steps,))
+
+    direct = np.minimum(generation, load)
+    surplus = generation - direct
+    deficit = load - direct
+    has_battery = np.any(np.asarray(battery_kwh) > 0)
+    if has_battery:
+        battery = simulate_battery(
+            surplus, deficit, battery_kwh, battery_power_kw, round_trip_efficiency,
+            import_rates=rates, hourly=hourly,
+        )
+        charged, stored_used = battery["charged_kwh"], battery["discharged_kwh"]
+        stored_value = battery["discharged_value_gbp"]
+    else:
+        charged = stored_used = stored_value = np.zeros(generation.shape[0])
+
+    gen_total = generation.sum(axis=-1)
+    load_total = load.sum(axis=-1)
+    direct_total = direct.sum(axis=-1)
+    self_consumed = direct_total + stored_used
+    export = surplus.sum(axis=-1) - charged
+    avoided = direct @ rates + stored_value
+    export_income = export * export_rate_gbp_per_kwh
+    with np.errstate(invalid="ignore", divide="ignore"):
+        result = {
+            "generation_kwh":        gen_total,
+            "load_kwh":              load_total,
+            "direct_kwh":            direct_total,
+            "battery_kwh":           stored_used,
+            "self_consumed_kwh":     self_consumed,
+            "export_kwh":            export,
+            "import_kwh":            deficit.sum(axis=-1) - stored_used,
+            "losses_kwh":            charged - stored_used,
+            "self_consumption_rate": np.where(gen_total > 0, self_consumed / np.where(gen_total > 0, gen_total, 1.0), np.nan),
+            "self_sufficiency":      np.where(load_total > 0, self_consumed / np.where(load_total > 0, load_total, 1.0), np.nan),
+            "avoided_import_gbp":    avoided,
+            "export_income_gbp":     export_income,
+            "pv_value_gbp":          avoided + export_income,
+        }
+    if hourly:
+        charge_h = battery["charge_hourly_kwh"] if has_battery else 0.0
+        discharge_h = battery["discharge_hourly_kwh"] if has_battery else 0.0
+        result["import_hourly_kwh"] = deficit - discharge_h
+        result["export_hourly_kwh"] = surplus - charge_h
+        result["soc_hourly_kwh"] = battery["soc_hourly_kwh"] if has_battery else np.zeros_like(generation)
+    return result
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PORTFOLIO — PV scenarios on physics columns
+# ─────────────────────────────────────────────────────────────────────────────
+
+def simulate_self_consumption(
+    buildings: Mapping[str, "np.typing.ArrayLike"],
+    temperatures_c: "np.typing.ArrayLike",
+    scenario: Mapping,
+    *,
+    base_load_kwh: "float | np.typing.ArrayLike" = 0.0,
+    base_load_shape: "np.typing.ArrayLike | None" = None,
+    battery_kwh: "float | np.typing.ArrayLike" = 0.0,
+    battery_power_kw: "float | np.typing.ArrayLike | None" = None,
+    round_trip_efficiency: float = ROUND_TRIP_EFFICIENCY,
+    tariff_gbp_per_kwh: "float | Mapping" = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    export_tariff_gbp_per_kwh: float = SEG_EXPORT_TARIFF_GBP_PER_KWH,
+    block_size: int = BLOCK_SIZE,
+    strict: bool = True,
+) -> dict[str, np.ndarray]:
+    """
+    Hourly self-consumption of *scenario*'s PV for every building over an
+    8760-hour year.
+
+    *buildings* are batch columns (``physics.building_columns``, which
+    carry the core.solar site columns).  Generation is ``pv_roof_fraction``
+    of each roof at its site's hourly yield.  Any fixed ``renewable_kwh`` is
+    spread over the same profile.  Load is the scenario's electricity meter
+    (electric heating and ``base_load_mwh``) without the PV, plus
+    *base_load_kwh* a year (scalar or (N,)) spread
+    flat or by *base_load_shape* (8760,).  A core.tariffs schedule prices
+    import hour by hour.
+
+    Returns the (N,) ``match_profiles`` totals, plus ``netted_saving_gbp``:
+    the annual engine's value, with all generation up to the annual load
+    avoided at the effective rate.  It also returns the boolean ``valid`` mask.
+    """
+    temps = np.asarray(temperatures_c, dtype=float).reshape(-1)
+    if temps.size != physics.HOURS_PER_YEAR:
+        raise ValueError("temperatures_c must hold 8760 hourly values.")
+    if block_size < 1:
+        raise ValueError("block_size must be >= 1.")
+    scenario = dict(scenario)
+    fraction = physics._as_float(scenario.get("pv_roof_fraction"), 0.0)
+    fixed_kwh = physics._as_float(scenario.get("renewable_kwh"), 0.0)
+    if not 0.0 <= fraction <= 1.0:
+        raise ValueError("pv_roof_fraction must be between 0 and 1.")
+    if not fixed_kwh >= 0.0:
+        raise ValueError("renewable_kwh must be >= 0.")
+
+    floor_area = np.asarray(buildings["floor_area_m2"], dtype=float).reshape(-1)
+    n = floor_area.size
+    base = np.broadcast_to(np.asarray(base_load_kwh, dtype=float), (n,))
+    shape = np.full(physics.HOURS_PER_YEAR, 1.0) if base_load_shape is None else np.asarray(base_load_shape, dtype=float)
+    if shape.shape != (physics.HOURS_PER_YEAR,) or (shape < 0).any() or not shape.sum() > 0:
+        raise ValueError("base_load_shape must be 8760 non-negative values with a positive sum.")
+    if (base < 0).any():
+        raise ValueError("base_load_kwh must be >= 0.")
+    shape = shape / shape.sum()
+    battery = np.broadcast_to(np.asarray(battery_kwh, dtype=float), (n,))
+    power = None if battery_power_kw is None else np.broadcast_to(np.asarray(battery_power_kw, dtype=float), (n,))
+    rates = hourly_rates(tariff_gbp_per_kwh) if isinstance(tariff_gbp_per_kwh, Mapping) else float(tariff_gbp_per_kwh)
+    flat_rate = resolve_tariff(tariff_gbp_per_kwh)
+
+    # Load without the PV; a PV-only scenario therefore reverts to the baseline
+    heating_scenario = {**scenario, "pv_roof_fraction": 0.0, "renewable_kwh": 0.0}
+    site_cols = {k: buildings[k] for k in solar.SITE_FIELDS if k in buildings}
+    if "latitude" not in site_cols:
+        site_cols = solar.site_columns([{}] * n)
+    sites, site_index = solar.unique_sites(**site_cols)
+    profiles = np.vstack([solar.site_profiles(sites), np.full((1, physics.HOURS_PER_YEAR), np.nan)])
+    annual_profile = profiles.sum(axis=1)
+
+    keys = (
+        "generation_kwh", "load_kwh", "direct_kwh", "battery_kwh", "self_consumed_kwh", "export_kwh",
+        "import_kwh", "losses_kwh", "self_consumption_rate", "self_sufficiency",
+        "avoided_import_gbp", "export_income_gbp", "pv_value_gbp",
+    )
+    result = {k: np.full(n, np.nan) for k in keys}
+    valid = np.zeros(n, dtype=bool)
+    for start in range(0, n, block_size):
+        rows = slice(start, min(start + block_size, n))
+        block = {k: np.asarray(v).reshape(-1)[rows] for k, v in buildings.items()}
+        series = physics.simulate_thermal_series(block, temps, heating_scenario, strict=strict)
+        load = series["electricity_mwh"] * 1000.0
+        if base[rows].any():
+            load += np.multiply.outer(base[rows], shape)
+
+        idx = site_index[rows]
+        kwp = fraction * block["floor_area_m2"] * solar.MODULE_KWP_PER_M2
+        generation = profiles[idx]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            generation *= (kwp + fixed_kwh / annual_profile[idx])[:, None]
+        ok = series["valid"] & (idx >= 0)
+        if strict and not ok.all():
+            raise ValueError(solar.INVALID_SITE_MESSAGE)
+        if not ok.any():
+            continue
+        if not ok.all():
+            generation, load = generation[ok], load[ok]
+        matched = match_profiles(
+            generation, load,
+            battery_kwh=battery[rows][ok],
+            battery_power_kw=None if power is None else power[rows][ok],
+            round_trip_efficiency=round_trip_efficiency,
+            import_rate_gbp_per_kwh=rates,
+            export_rate_gbp_per_kwh=export_tariff_gbp_per_kwh,
+        )
+        where = np.arange(rows.start, rows.stop)[ok]
+        for k in keys:
+            result[k][where] = matched[k]
+        valid[where] = True
+
+    result["netted_saving_gbp"] = np.minimum(result["generation_kwh"], result["load_kwh"]) * flat_rate
+    result["valid"] = valid
+    return result
+
+
+def summarise_portfolio(
+    buildings: Mapping[str, Mapping],
+    scenario: Mapping,
+    city: str | None = None,
+    **kwargs,
+) -> dict[str, dict]:
+    """
+    Self-consumption of named building dicts under *scenario*, with heating
+    load on *city*'s typical year (default ``tmy.DEFAULT_TMY_CITY``);
+    invalid buildings are skipped.  Returns ``{name: {generation_kwh,
+    self_consumed_kwh, export_kwh, self_consumption_rate,
+    avoided_import_gbp, export_income_gbp, pv_value_gbp,
+    netted_saving_gbp}}`` rounded for display; *kwargs* go to
+    ``simulate_self_consumption``.
+    """
+    names = list(buildings)
+    temps = tmy.hourly_temperatures(city or tmy.DEFAULT_TMY_CITY)
+    res = simulate_self_consumption(
+        physics.building_columns(buildings[n] for n in names), temps, scenario, strict=False, **kwargs
+    )
+    out = {}
+    for i, name in enumerate(names):
+        if not res["valid"][i]:
+            continue
+        out[name] = {
+            "generation_kwh":        round(float(res["generation_kwh"][i]), 0),
+            "self_consumed_kwh":     round(float(res["self_consumed_kwh"][i]), 0),
+            "export_kwh":            round(float(res["export_kwh"][i]), 0),
+            "self_consumption_rate": round(float(np.nan_to_num(res["self_consumption_rate"][i])), 3),
+            "avoided_import_gbp":    round(float(res["avoided_import_gbp"][i]), 0),
+            "export_income_gbp":     round(float(res["export_income_gbp"][i]), 0),
+            "pv_value_gbp":          round(float(res["pv_value_gbp"][i]), 0),
+            "netted_saving_gbp":     round(float(res["netted_saving_gbp"][i]), 0),
+        }
+    return out
@@ -0,0 +1,141 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Compiled Scenario Registry
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Structure-of-arrays view of the scenario definitions in
+# config.scenarios.SCENARIOS: one float column per physics field
+# (core.physics.SCENARIO_FIELDS) and a stable integer ID per scenario name.
+# Hot paths gather columns by ID instead of re-resolving dict keys, and the
+# result feeds core.physics.calculate_thermal_load_batch directly.
+#
+# IDs are never reused: re-registering a name overwrites its row in place.
+# Only register() writes rows; callers with their own scenario dicts get them
+# overlaid on the registered columns without touching the shared registry.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import threading
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from core.physics import SCENARIO_FIELDS, _as_float
+
+
+class ScenarioRegistry:
+    """Scenario factor columns with stable integer IDs, grown incrementally."""
+
+    def __init__(self, scenarios: Mapping[str, Mapping] | None = None, capacity: int = 16):
+        self._capacity = max(1, int(capacity))
+        self._columns = {f: np.empty(self._capacity) for f in SCENARIO_FIELDS}
+        self._ids: dict[str, int] = {}
+        self._defs: list[Mapping] = []
+        self._lock = threading.Lock()
+        for name, definition in (scenarios or {}).items():
+            self.register(name, definition)
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self._ids
+
+    @property
+    def names(self) -> list[str]:
+        """Registered names in ID order."""
+        return list(self._ids)
+
+    def register(self, name: str, definition: Mapping) -> int:
+        """Add or overwrite *name*; returns its ID.  Call again after in-place edits."""
+        with self._lock:
+            sid = self._ids.get(name)
+            if sid is None:
+                sid = len(self._ids)
+                if sid == self._capacity:
+                    self._grow()
+                self._ids[name] = sid
+                self._defs.append(definition)
+            else:
+                self._defs[sid] = definition
+            for field, default in SCENARIO_FIELDS.items():
+                self._columns[field][sid] = _as_float(definition.get(field), default)
+            return sid
+
+    def id_of(self, name: str) -> int:
+        """ID for *name*; raises ``KeyError`` if it was never registered."""
+        return self._ids[name]
+
+    def ids(self, names: Iterable[str]) -> np.ndarray:
+        """IDs for *names* as an int array; raises ``KeyError`` for an unregistered name."""
+        return np.array([self._ids[name] for name in names], dtype=np.intp)
+
+    def columns(self, ids: "np.typing.ArrayLike | None" = None) -> dict[str, np.ndarray]:
+        """Field → column mapping for *ids* (all scenarios when ``None``)."""
+        n = len(self._ids)
+        if ids is None:
+            return {f: col[:n].copy() for f, col in self._columns.items()}
+        idx = np.asarray(ids, dtype=np.intp)
+        return {f: col[:n][idx] for f, col in self._columns.items()}
+
+    def columns_for(self, names: Iterable[str], source: Mapping[str, Mapping] | None = None) -> dict[str, np.ndarray]:
+        """
+        Columns for *names* in order.
+
+        With *source*, a name that is unregistered, or whose definition object
+        in *source* is not the registered one, is compiled from *source* into
+        the result as an overlay; the registry itself is never modified, so
+        callers with their own scenario dicts cannot change what others read.
+        """
+        names = list(names)
+        if source is None:
+            return self.columns(self.ids(names))
+        with self._lock:
+            ids = [self._ids.get(name) for name in names]
+            ids = [sid if sid is not None and self._defs[sid] is source[name] else None
+                   for name, sid in zip(names, ids)]
+        cols = {f: np.empty(len(names)) for f in SCENARIO_FIELDS}
+        hit = [i for i, sid in enumerate(ids) if sid is not None]
+        if hit:
+            for field, col in self.columns([ids[i] for i in hit]).items():
+                cols[field][hit] = col
+        for i, (name, sid) in enumerate(zip(names, ids)):
+            if sid is None:
+                definition = source[name]
+                for field, default in SCENARIO_FIELDS.items():
+                    cols[field][i] = _as_float(definition.get(field), default)
+        return cols
+
+    def _grow(self) -> None:
+        self._capacity *= 2
+        for field, col in self._columns.items():
+            grown = np.empty(self._capacity)
+            grown[: len(col)] = col
+            self._columns[field] = grown
+
+
+def _build_default() -> ScenarioRegistry:
+    from config.scenarios import SCENARIOS
+    return ScenarioRegistry(SCENARIOS)
+
+
+# Process-wide registry over config.scenarios.SCENARIOS
+REGISTRY = _build_default()
+
+
+def register_scenario(name: str, definition: Mapping) -> int:
+    """Add or update a scenario in the shared registry; returns its ID."""
+    return REGISTRY.register(name, definition)
+
+
+def scenario_columns_for(names: Iterable[str], source: Mapping[str, Mapping] | None = None) -> dict[str, np.ndarray]:
+    """
+    Batch-engine scenario columns for *names* from the shared registry.
+
+    *source* defaults to ``config.scenarios.SCENARIOS``; definitions it holds
+    that the registry does not are overlaid without registering them (see
+    ``ScenarioRegistry.columns_for``).
+    """
+    if source is None:
+        from config.scenarios import SCENARIOS as source
+    return REGISTRY.columns_for(names, source)
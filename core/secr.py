@@ -0,0 +1,337 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Streaming SECR Scope 1 & 2 Aggregation
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# app.compliance.calculate_carbon_baseline reports one entity from annual
+# totals.  This module builds the same Scope 1 / Scope 2 figures from raw
+# meter data.  The input is one row per meter reading (monthly bills,
+# half-hourly AMR or anything in between) with a site, a fuel, a kWh value
+# and a year or timestamp:
+#
+#   Scope 1 = Σ gas, oil and LPG kWh × CI_GAS / CI_OIL / CI_LPG
+#   Scope 2 = Σ electricity kWh × CI_ELECTRICITY (or the year's grid factor)
+#
+# CSV and Parquet files are read in chunks of CHUNK_ROWS rows and each chunk
+# is reduced to kWh per (site, year, fuel) before the next is read.  Memory
+# is therefore bounded by the number of sites × years, not rows, and a full
+# year of half-hourly data for a large estate streams through in one pass.
+# Totals and intensities are reported per site, region and year.
+#
+# No Streamlit dependency — safe to import from core.* and the agent.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import IO, Iterable, Iterator, Mapping
+
+import numpy as np
+import pandas as pd
+
+from config.constants import CI_ELECTRICITY, CI_GAS, CI_LPG, CI_OIL
+from services import carbon_intensity
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet input needs pyarrow; CSV works without it
+    pq = None
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MODULE CONSTANTS
+# ─────────────────────────────────────────────────────────────────────────────
+CHUNK_ROWS = 250_000
+SECR_FUELS = ("electricity", "gas", "oil", "lpg")
+FUEL_FACTORS_KG_PER_KWH: dict[str, float] = {
+    "electricity": CI_ELECTRICITY,
+    "gas":         CI_GAS,
+    "oil":         CI_OIL,
+    "lpg":         CI_LPG,
+}
+SCOPE1_FUELS = ("gas", "oil", "lpg")
+UNASSIGNED_REGION = "Unassigned"
+
+# Accepted spellings of fuels and column names (matched case-insensitively)
+FUEL_ALIASES: dict[str, str] = {
+    "electric": "electricity", "elec": "electricity", "power": "electricity",
+    "natural gas": "gas", "natural_gas": "gas", "mains gas": "gas",
+    "gas oil": "oil", "heating oil": "oil", "kerosene": "oil", "diesel": "oil",
+    "propane": "lpg",
+}
+COLUMN_ALIASES: dict[str, str] = {
+    "site_id": "site", "site_name": "site", "building": "site",
+    "meter_id": "meter", "mpan": "meter", "mprn": "meter",
+    "fuel_type": "fuel", "utility": "fuel",
+    "consumption_kwh": "kwh", "energy_kwh": "kwh", "value_kwh": "kwh",
+    "reading_date": "timestamp", "datetime": "timestamp", "date": "timestamp",
+    "period": "timestamp", "month": "timestamp",
+}
+REQUIRED_COLUMNS = ("site", "fuel", "kwh")
+OPTIONAL_COLUMNS = ("meter", "region", "year", "timestamp", "floor_area_m2")
+
+
+def _canonical(column: str) -> str:
+    name = str(column).strip().lower()
+    return COLUMN_ALIASES.get(name, name)
+
+
+def _fuel_index(label) -> int:
+    """Index of *label* in SECR_FUELS after aliasing, or -1."""
+    name = str(label).strip().lower()
+    name = FUEL_ALIASES.get(name, name)
+    return SECR_FUELS.index(name) if name in SECR_FUELS else -1
+
+
+def _stamp_years(stamps) -> np.ndarray:
+    """
+    Calendar year of each timestamp (NaN where unparseable).  Each value is
+    parsed on its own format, so ISO stamps, plain dates and written-out bill
+    dates can share a file; offsets are kept, so the year is the local one.
+    """
+    if pd.api.types.is_datetime64_any_dtype(stamps):
+        return pd.DatetimeIndex(stamps).year.to_numpy(dtype=float)
+    values = pd.Series(stamps, dtype=object)
+    try:
+        return pd.DatetimeIndex(pd.to_datetime(values, format="mixed", errors="coerce")).year.to_numpy(dtype=float)
+    except ValueError:
+        # Mixed UTC offsets cannot share one dtype; fall back per value
+        parsed = [pd.to_datetime(v, format="mixed", errors="coerce") for v in values]
+        return np.array([np.nan if pd.isna(t) else t.year for t in parsed], dtype=float)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CHUNKED READERS
+# ─────────────────────────────────────────────────────────────────────────────
+def _source_format(source: "str | Path | IO", fmt: str | None) -> str:
+    if fmt is None:
+        name = str(source) if isinstance(source, (str, Path)) else str(getattr(source, "name", ""))
+        fmt = "parquet" if name.lower().endswith((".parquet", ".pq")) else "csv"
+    if fmt not in ("csv", "parquet"):
+        raise ValueError("Meter data format must be 'csv' or 'parquet'.")
+    return fmt
+
+
+def read_meter_chunks(
+    source: "str | Path | IO",
+    *,
+    fmt: str | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield *source* in frames of at most *chunk_rows* rows, reading only the
+    columns this module uses (renamed to their canonical names).  *source*
+    is a path or file object; *fmt* defaults from its extension.
+    """
+    if chunk_rows < 1:
+        raise ValueError("chunk_rows must be >= 1.")
+    wanted = set(REQUIRED_COLUMNS) | set(OPTIONAL_COLUMNS)
+    if _source_format(source, fmt) == "csv":
+        reader = pd.read_csv(source, chunksize=chunk_rows, usecols=lambda c: _canonical(c) in wanted)
+        for frame in reader:
+            yield frame.rename(columns=_canonical)
+        return
+    if pq is None:
+        raise ImportError("Reading Parquet meter data requires pyarrow.")
+    parquet = pq.ParquetFile(source)
+    columns = [c for c in parquet.schema_arrow.names if _canonical(c) in wanted]
+    for batch in parquet.iter_batches(batch_size=chunk_rows, columns=columns):
+        yield batch.to_pandas().rename(columns=_canonical)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# AGGREGATION
+# ─────────────────────────────────────────────────────────────────────────────
+class SecrAggregator:
+    """
+    Running kWh totals per (site, year, fuel) from meter-reading frames.
+
+    ``sites`` optionally maps site → ``{"region", "floor_area_m2"}``; frame
+    columns of the same name fill in sites it omits.  ``scope2_basis``
+    ``None`` prices electricity at CI_ELECTRICITY as
+    calculate_carbon_baseline does; ``"location"`` or ``"marginal"`` uses
+    each year's services.carbon_intensity grid factor.  With
+    ``strict=False`` unusable rows (unknown fuel, missing year, negative or
+    missing kWh) are counted in ``rejected_rows`` instead of raising.
+    """
+
+    def __init__(
+        self,
+        sites: Mapping[str, Mapping] | None = None,
+        *,
+        scope2_basis: str | None = None,
+        strict: bool = True,
+    ):
+        if scope2_basis is not None and scope2_basis not in carbon_intensity.BASES:
+            raise ValueError(f"scope2_basis must be None or one of {carbon_intensity.BASES}.")
+        self.scope2_basis = scope2_basis
+        self.strict = strict
+        self.rows = 0
+        self.rejected_rows = 0
+        self.chunks = 0
+        self._kwh: dict[tuple[str, int], np.ndarray] = {}      # (site, year) → kWh per SECR_FUELS
+        self._meters: dict[str, set] = {}
+        self._region: dict[str, str] = {}
+        self._area: dict[str, float] = {}
+        for site, info in (sites or {}).items():
+            if info.get("region"):
+                self._region[str(site)] = str(info["region"])
+            if info.get("floor_area_m2"):
+                self._area[str(site)] = float(info["floor_area_m2"])
+
+    def add(self, frame: pd.DataFrame) -> None:
+        """Fold one frame of readings into the running totals."""
+        frame = frame.rename(columns=_canonical)
+        missing = [c for c in REQUIRED_COLUMNS if c not in frame.columns]
+        if "year" not in frame.columns and "timestamp" not in frame.columns:
+            missing.append("year or timestamp")
+        if missing:
+            raise ValueError(f"Meter data is missing column(s): {', '.join(missing)}.")
+        self.chunks += 1
+        self.rows += len(frame)
+
+        # Factorise repeated labels so per-row work stays in NumPy: a chunk of
+        # half-hourly readings holds few distinct sites, fuels and timestamps
+        fuel_codes, fuels = pd.factorize(frame["fuel"])
+        fuel_map = np.array([_fuel_index(f) for f in fuels] + [-1])
+        fuel_code = fuel_map[fuel_codes]
+        site_codes, site_names = pd.factorize(frame["site"])
+        site_names = [str(s).strip() for s in site_names] + [""]
+        site_codes = np.where(site_codes >= 0, site_codes, len(site_names) - 1)
+        kwh = pd.to_numeric(frame["kwh"], errors="coerce").to_numpy(dtype=float)
+        if "year" in frame.columns:
+            year = pd.to_numeric(frame["year"], errors="coerce").to_numpy(dtype=float)
+        else:
+            stamp_codes, stamps = pd.factorize(frame["timestamp"])
+            year = np.append(_stamp_years(stamps), np.nan)[stamp_codes]
+
+        named = np.array([bool(s) for s in site_names])
+        ok = (fuel_code >= 0) & np.isfinite(kwh) & (kwh >= 0) & np.isfinite(year) & named[site_codes]
+        if not ok.all():
+            bad = int(np.argmin(ok))
+            if self.strict:
+                row = self.rows - len(frame) + bad + 1
+                if not np.isfinite(year[bad]):
+                    column = "year" if "year" in frame.columns else "timestamp"
+                    raise ValueError(
+                        f"Meter data row {row}: unreadable {column} {frame[column].iloc[bad]!r}."
+                    )
+                raise ValueError(
+                    f"Meter data row {row}: unusable reading "
+                    f"(site={frame['site'].iloc[bad]!r}, fuel={frame['fuel'].iloc[bad]!r}, "
+                    f"kwh={frame['kwh'].iloc[bad]!r}); fuels must be one of {SECR_FUELS}."
+                )
+            self.rejected_rows += int((~ok).sum())
+
+        # Reduce the chunk to (site, year, fuel) sums before touching Python
+        sums = (
+            pd.DataFrame({"site": site_codes[ok], "year": year[ok].astype(int), "fuel": fuel_code[ok], "kwh": kwh[ok]})
+            .groupby(["site", "year", "fuel"], sort=False)["kwh"].sum()
+        )
+        for (s, y, f), total in sums.items():
+            key = (site_names[s], int(y))
+            if key not in self._kwh:
+                self._kwh[key] = np.zeros(len(SECR_FUELS))
+            self._kwh[key][f] += total
+
+        # Site attributes: first value seen wins; meters are counted distinct
+        extra = pd.DataFrame({"site": site_codes[ok]})
+        for column in ("region", "floor_area_m2", "meter"):
+            if column in frame.columns:
+                extra[column] = frame[column].to_numpy()[ok]
+        if "meter" in extra:
+            for s, meters in extra.dropna(subset=["meter"]).groupby("site", sort=False)["meter"].unique().items():
+                self._meters.setdefault(site_names[s], set()).update(map(str, meters))
+        if "region" in extra:
+            for s, region in extra.dropna(subset=["region"]).groupby("site", sort=False)["region"].first().items():
+                self._region.setdefault(site_names[s], str(region))
+        if "floor_area_m2" in extra:
+            area = pd.to_numeric(extra["floor_area_m2"], errors="coerce")
+            for s, a in area[area > 0].groupby(extra["site"][area > 0], sort=False).first().items():
+                self._area.setdefault(site_names[s], float(a))
+
+    def _electricity_factor(self, years: np.ndarray) -> np.ndarray:
+        if self.scope2_basis is None:
+            return np.full(len(years), CI_ELECTRICITY)
+        return np.asarray(carbon_intensity.annual_factor(years, self.scope2_basis), dtype=float)
+
+    def result(self) -> dict:
+        """
+        Scope 1 / 2 totals as DataFrames ``sites`` (per site and year),
+        ``regions`` and ``years``, plus ``rows``, ``rejected_rows``,
+        ``chunks`` and the ``factors`` used.  Intensities are kgCO₂e/m² over
+        the sites with a known floor area.
+        """
+        keys = list(self._kwh)
+        kwh = np.array([self._kwh[k] for k in keys]).reshape(-1, len(SECR_FUELS))
+        site = [k[0] for k in keys]
+        year = np.array([k[1] for k in keys], dtype=int)
+        factors = np.column_stack([
+            self._electricity_factor(year),
+            *(np.full(len(keys), FUEL_FACTORS_KG_PER_KWH[f]) for f in SCOPE1_FUELS),
+        ]) if keys else np.zeros((0, len(SECR_FUELS)))
+        kg = kwh * factors
+
+        sites = pd.DataFrame({
+            "site":   site,
+            "region": [self._region.get(s, UNASSIGNED_REGION) for s in site],
+            "year":   year,
+            **{f"{f}_kwh": kwh[:, i] for i, f in enumerate(SECR_FUELS)},
+        })
+        sites["energy_kwh"] = kwh.sum(axis=1)
+        sites["scope1_tco2e"] = kg[:, 1:].sum(axis=1) / 1000.0
+        sites["scope2_tco2e"] = kg[:, 0] / 1000.0
+        sites["total_tco2e"] = sites["scope1_tco2e"] + sites["scope2_tco2e"]
+        sites["floor_area_m2"] = [self._area.get(s, np.nan) for s in site]
+        sites["meters"] = [len(self._meters.get(s, ())) for s in site]
+        sites["intensity_kgco2_m2"] = sites["total_tco2e"] * 1000.0 / sites["floor_area_m2"]
+        sites = sites.sort_values(["year", "site"], ignore_index=True)
+
+        return {
+            "sites":         sites,
+            "regions":       _rollup(sites, ["region", "year"]),
+            "years":         _rollup(sites, ["year"]),
+            "rows":          self.rows,
+            "rejected_rows": self.rejected_rows,
+            "chunks":        self.chunks,
+            "scope2_basis":  self.scope2_basis or "fixed",
+            "factors":       {
+                "electricity": "CI_ELECTRICITY" if self.scope2_basis is None else f"{self.scope2_basis} grid factor by year",
+                **{f: FUEL_FACTORS_KG_PER_KWH[f] for f in SCOPE1_FUELS},
+            },
+        }
+
+
+def _rollup(sites: pd.DataFrame, by: list[str]) -> pd.DataFrame:
+    """Sum per-site rows over *by*; intensity over the floor area that is known."""
+    sums = [f"{f}_kwh" for f in SECR_FUELS] + ["energy_kwh", "scope1_tco2e", "scope2_tco2e", "total_tco2e"]
+    known = sites["floor_area_m2"].notna()
+    out = sites.groupby(by, sort=True)[sums].sum()
+    out["sites"] = sites.groupby(by, sort=True)["site"].nunique()
+    out["floor_area_m2"] = sites[known].groupby(by)["floor_area_m2"].sum()
+    rated_t = sites[known].groupby(by)["total_tco2e"].sum()
+    out["intensity_kgco2_m2"] = rated_t * 1000.0 / out["floor_area_m2"]
+    return out.reset_index()
+
+
+def aggregate_meter_data(
+    source: "str | Path | IO | Iterable[pd.DataFrame]",
+    sites: Mapping[str, Mapping] | None = None,
+    *,
+    fmt: str | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+    scope2_basis: str | None = None,
+    strict: bool = True,
+) -> dict:
+    """
+    Stream meter readings from a CSV / Parquet path or file object (or any
+    iterable of frames) through a ``SecrAggregator`` and return its result.
+    """
+    aggregator = SecrAggregator(sites, scope2_basis=scope2_basis, strict=strict)
+    if isinstance(source, pd.DataFrame):
+        chunks: Iterable[pd.DataFrame] = [source]
+    elif isinstance(source, (str, Path)) or hasattr(source, "read"):
+        chunks = read_meter_chunks(source, fmt=fmt, chunk_rows=chunk_rows)
+    else:
+        chunks = source
+    for frame in chunks:
+        aggregator.add(frame)
+    return aggregator.result()
@@ -0,0 +1,351 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Rooftop Solar PV Yield
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Hourly PV generation for a site from a clear-sky model and a bundled table
+# of monthly clear-sky indices:
+#
+#   1. Haurwitz clear-sky GHI at the site's solar geometry, hour by hour;
+#   2. scaled by the monthly clear-sky index (measured / clear-sky GHI,
+#      interpolated on latitude between European reference sites), giving a
+#      typical-year GHI of ≈1,030 kWh/m² in London and ≈1,880 in Madrid;
+#   3. read as a mix of clear hours (split into beam and diffuse with the
+#      Erbs correlation) and overcast hours (diffuse only), then transposed
+#      to the array tilt / azimuth (isotropic sky, ground-reflected albedo);
+#   4. derated for cell temperature using the services.tmy hourly air
+#      temperature of the nearest store city, then for system losses.
+#
+# Specific yield (kWh/kWp) is cached per site on a 0.1° grid and per whole-
+# degree tilt / azimuth, so a portfolio costs one simulation per distinct site.  A scenario places PV on a
+# fraction of each building's roof (``pv_roof_fraction``, see core.physics);
+# the roof is taken as the floor-area footprint, as in the thermal model.
+#
+# Indicative only — not a substitute for an MCS / PVGIS site assessment.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import functools
+import math
+from typing import Iterable, Mapping
+
+import numpy as np
+
+from services import tmy
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MODULE CONSTANTS
+# ─────────────────────────────────────────────────────────────────────────────
+MODULE_KWP_PER_M2      = 0.20     # ≈20 % efficient c-Si, 1 kWp per 5 m² of roof
+PERFORMANCE_RATIO      = 0.82     # inverter, wiring, soiling, mismatch (temperature separate)
+TEMP_COEFF_PER_K       = -0.004   # power temperature coefficient, c-Si
+CELL_RISE_K_PER_W_M2   = 0.03125  # (NOCT 45 °C − 20 °C) / 800 W/m²
+GROUND_ALBEDO          = 0.2
+DEFAULT_TILT_DEG       = 35.0
+# Azimuths are degrees clockwise from north; arrays face the equator unless
+# an azimuth is given (180° north of it, 0° south of it).
+SOLAR_CONSTANT_W_M2    = 1367.0
+OVERCAST_FRACTION      = 0.25     # overcast GHI as a share of clear-sky GHI
+HOURS_PER_YEAR         = 8760
+SITE_RESOLUTION_DEG    = 0.1      # yields are simulated on this lat / lon grid
+SITE_FIELDS = ("latitude", "longitude", "pv_tilt_deg", "pv_azimuth_deg")
+INVALID_SITE_MESSAGE = (
+    "PV site needs latitude within ±90°, longitude within ±180°, tilt 0–90° and azimuth 0–360°."
+)
+
+# Monthly clear-sky index (typical-year GHI / Haurwitz clear-sky GHI) at
+# reference latitudes — Madrid, London, Edinburgh — from PVGIS-SARAH monthly
+# means.  Latitudes outside the range take the nearest row; southern-
+# hemisphere sites use |lat| with the months shifted by six.
+_CLEAR_SKY_INDEX_LATS = (40.4, 51.5, 56.0)
+_CLEAR_SKY_INDEX = (
+    (0.89, 0.94, 0.90, 0.88, 0.86, 0.93, 0.96, 0.96, 0.92, 0.86, 0.87, 0.83),
+    (0.52, 0.56, 0.58, 0.62, 0.62, 0.61, 0.60, 0.61, 0.61, 0.60, 0.56, 0.54),
+    (0.52, 0.57, 0.57, 0.59, 0.59, 0.57, 0.56, 0.57, 0.58, 0.58, 0.55, 0.52),
+)
+
+DAYS_IN_MONTH = tmy.DAYS_IN_MONTH
+_MONTH_OF_HOUR = np.repeat(np.arange(12), np.array(DAYS_IN_MONTH) * 24)
+_HOUR = np.arange(HOURS_PER_YEAR) + 0.5                 # mid-hour, UTC
+_DAY_OF_YEAR = np.floor(_HOUR / 24.0) + 1.0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# IRRADIANCE
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _solar_position(lat: float, lon: float) -> tuple[np.ndarray, np.ndarray]:
+    """(cos zenith, solar azimuth in degrees from north) for every hour of the year."""
+    gamma = 2.0 * np.pi * (_DAY_OF_YEAR - 1.0) / 365.0
+    decl = np.radians(23.45) * np.sin(2.0 * np.pi * (284.0 + _DAY_OF_YEAR) / 365.0)
+    eot_min = 229.18 * (
+        0.000075 + 0.001868 * np.cos(gamma) - 0.032077 * np.sin(gamma)
+        - 0.014615 * np.cos(2 * gamma) - 0.040849 * np.sin(2 * gamma)
+    )
+    solar_time = (_HOUR % 24.0) + lon / 15.0 + eot_min / 60.0
+    omega = np.radians(15.0 * (solar_time - 12.0))
+    phi = math.radians(lat)
+    cos_z = math.sin(phi) * np.sin(decl) + math.cos(phi) * np.cos(decl) * np.cos(omega)
+    sin_z = np.sqrt(np.maximum(0.0, 1.0 - cos_z ** 2))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cos_az = (np.sin(decl) - cos_z * math.sin(phi)) / (sin_z * math.cos(phi))
+    azimuth = np.degrees(np.arccos(np.clip(np.nan_to_num(cos_az), -1.0, 1.0)))
+    azimuth = np.where(omega > 0, 360.0 - azimuth, azimuth)
+    return cos_z, azimuth
+
+
+def clear_sky_index(lat: float) -> np.ndarray:
+    """(12,) monthly clear-sky index for latitude *lat* (interpolated, clamped)."""
+    table = np.array(_CLEAR_SKY_INDEX)
+    index = np.array([np.interp(abs(lat), _CLEAR_SKY_INDEX_LATS, table[:, m]) for m in range(12)])
+    return np.roll(index, 6) if lat < 0 else index
+
+
+def hourly_irradiance(lat: float, lon: float) -> dict[str, np.ndarray]:
+    """
+    Typical-year horizontal irradiance for a site as 8760-hour arrays in
+    W/m² (mean over each hour): ``ghi``, ``dni`` and ``dhi``, plus the solar
+    ``cos_zenith`` and ``azimuth_deg``.
+    """
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lon <= 180.0):
+        raise ValueError("lat must be within ±90° and lon within ±180°.")
+    cos_z, azimuth = _solar_position(lat, lon)
+    up = cos_z > 0.0
+    mu = np.where(up, cos_z, 1.0)
+    clear = np.where(up, 1098.0 * mu * np.exp(-0.057 / mu), 0.0)
+    # Each hour is a mix of clear sky and overcast sky (diffuse only, at
+    # OVERCAST_FRACTION of clear-sky GHI) weighted to hit the monthly index.
+    index = clear_sky_index(lat)[_MONTH_OF_HOUR]
+    p_clear = np.clip((index - OVERCAST_FRACTION) / (1.0 - OVERCAST_FRACTION), 0.0, 1.0)
+    ghi = clear * index
+
+    # Erbs diffuse fraction of the clear-sky component
+    extra = SOLAR_CONSTANT_W_M2 * (1.0 + 0.033 * np.cos(2.0 * np.pi * _DAY_OF_YEAR / 365.0)) * mu
+    kt = np.where(up, np.clip(clear / extra, 0.0, 1.0), 0.0)
+    fd = np.where(
+        kt <= 0.22,
+        1.0 - 0.09 * kt,
+        np.where(
+            kt <= 0.80,
+            0.9511 - 0.1604 * kt + 4.388 * kt ** 2 - 16.638 * kt ** 3 + 12.336 * kt ** 4,
+            0.165,
+        ),
+    )
+    # Low-sun hours carry their beam in the diffuse term rather than a huge DNI
+    beam = np.where(cos_z > 0.065, p_clear * clear * (1.0 - fd), 0.0)
+    dni = beam / mu
+    dhi = ghi - beam
+    return {"ghi": ghi, "dni": dni, "dhi": dhi, "cos_zenith": cos_z, "azimuth_deg": azimuth}
+
+
+def _facing(lat: float, azimuth_deg: float | None) -> float:
+    if azimuth_deg is None:
+        return 180.0 if lat >= 0 else 0.0
+    return float(azimuth_deg)
+
+
+def plane_of_array(
+    lat: float,
+    lon: float,
+    tilt_deg: float = DEFAULT_TILT_DEG,
+    azimuth_deg: float | None = None,
+) -> np.ndarray:
+    """(8760,) irradiance on the array plane in W/m² (isotropic-sky transposition)."""
+    if not 0.0 <= tilt_deg <= 90.0:
+        raise ValueError("tilt_deg must be between 0 and 90.")
+    azimuth_deg = _facing(lat, azimuth_deg)
+    if not 0.0 <= azimuth_deg <= 360.0:
+        raise ValueError("azimuth_deg must be between 0 and 360.")
+    sky = hourly_irradiance(lat, lon)
+    beta = math.radians(tilt_deg)
+    cos_z = sky["cos_zenith"]
+    sin_z = np.sqrt(np.maximum(0.0, 1.0 - cos_z ** 2))
+    cos_incidence = cos_z * math.cos(beta) + sin_z * math.sin(beta) * np.cos(
+        np.radians(sky["azimuth_deg"] - azimuth_deg)
+    )
+    return (
+        sky["dni"] * np.maximum(cos_incidence, 0.0)
+        + sky["dhi"] * (1.0 + math.cos(beta)) / 2.0
+        + sky["ghi"] * GROUND_ALBEDO * (1.0 - math.cos(beta)) / 2.0
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# YIELD
+# ─────────────────────────────────────────────────────────────────────────────
+
+def hourly_yield(
+    lat: float,
+    lon: float,
+    tilt_deg: float = DEFAULT_TILT_DEG,
+    azimuth_deg: float | None = None,
+) -> np.ndarray:
+    """(8760,) AC generation in kWh per kWp installed, 1 Jan 00:00 UTC onwards."""
+    poa = plane_of_array(lat, lon, tilt_deg, azimuth_deg)
+    # The store is on each city's local clock; the sun model is on UTC
+    air = tmy.hourly_temperatures_utc(tmy.nearest_city(lat, lon))
+    cell = air + CELL_RISE_K_PER_W_M2 * poa
+    derate = np.maximum(0.0, 1.0 + TEMP_COEFF_PER_K * (cell - 25.0))
+    return poa / 1000.0 * derate * PERFORMANCE_RATIO
+
+
+@functools.lru_cache(maxsize=1024)
+def _specific_yield(lat: float, lon: float, tilt_deg: float, azimuth_deg: float) -> tuple[float, ...]:
+    hourly = hourly_yield(lat, lon, tilt_deg, azimuth_deg)
+    return tuple(np.bincount(_MONTH_OF_HOUR, weights=hourly, minlength=12))
+
+
+def specific_yield(
+    lat: float,
+    lon: float,
+    tilt_deg: float = DEFAULT_TILT_DEG,
+    azimuth_deg: float | None = None,
+) -> np.ndarray:
+    """
+    (12,) monthly generation in kWh/kWp; ``.sum()`` is the annual specific
+    yield.  Evaluated and cached on a SITE_RESOLUTION_DEG grid, with tilt
+    and azimuth rounded to whole degrees.
+    """
+    lat_q, lon_q = (float(v) for v in _quantise(np.array([lat, lon], dtype=float)))
+    return np.array(_specific_yield(lat_q, lon_q, round(float(tilt_deg)), round(_facing(lat, azimuth_deg))))
+
+
+def _quantise(degrees: np.ndarray) -> np.ndarray:
+    return np.round(degrees / SITE_RESOLUTION_DEG) * SITE_RESOLUTION_DEG
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# ASSETS — site columns and cached roof yields
+# ─────────────────────────────────────────────────────────────────────────────
+
+def site_location(building: Mapping) -> tuple[float, float]:
+    """
+    (lat, lon) of an asset: its ``latitude`` / ``longitude``, else the
+    services.tmy store coordinates of its ``city``, else ``tmy.DEFAULT_TMY_CITY``.
+    """
+    lat, lon = building.get("latitude"), building.get("longitude")
+    if lat is not None and lon is not None:
+        return float(lat), float(lon)
+    return tmy.city_coordinates(building.get("city") or tmy.DEFAULT_TMY_CITY)
+
+
+def site_columns(buildings: Iterable[Mapping]) -> dict[str, np.ndarray]:
+    """
+    (N,) ``latitude``, ``longitude``, ``pv_tilt_deg`` and ``pv_azimuth_deg``
+    columns for ``roof_yield_batch``.  Locations resolve as in
+    ``site_location`` (NaN where that fails); orientation is NaN where the
+    asset gives none.
+    """
+    def _site(b: Mapping) -> tuple[float, float]:
+        try:
+            return site_location(b)
+        except (TypeError, ValueError):
+            return float("nan"), float("nan")
+
+    def _angle(value) -> float:
+        try:
+            return float("nan") if value is None else float(value)
+        except (TypeError, ValueError):
+            return float("nan")
+
+    rows = list(buildings)
+    sites = np.array([_site(b) for b in rows], dtype=float).reshape(len(rows), 2)
+    return {
+        "latitude":       sites[:, 0],
+        "longitude":      sites[:, 1],
+        "pv_tilt_deg":    np.fromiter((_angle(b.get("pv_tilt_deg")) for b in rows), float, len(rows)),
+        "pv_azimuth_deg": np.fromiter((_angle(b.get("pv_azimuth_deg")) for b in rows), float, len(rows)),
+    }
+
+
+def unique_sites(
+    latitude: "np.typing.ArrayLike",
+    longitude: "np.typing.ArrayLike",
+    pv_tilt_deg: "np.typing.ArrayLike | None" = None,
+    pv_azimuth_deg: "np.typing.ArrayLike | None" = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Distinct quantised (lat, lon, tilt, azimuth) sites as an (S, 4) array
+    and the (N,) site index of each asset; -1 marks a NaN or out-of-range
+    site, tilt or azimuth.  NaN orientation means the defaults.
+    """
+    lat = _quantise(np.asarray(latitude, dtype=float).reshape(-1))
+    lon = _quantise(np.asarray(longitude, dtype=float).reshape(-1))
+    n = lat.size
+    tilt = np.full(n, DEFAULT_TILT_DEG) if pv_tilt_deg is None else np.asarray(pv_tilt_deg, dtype=float).reshape(-1)
+    tilt = np.round(np.where(np.isnan(tilt), DEFAULT_TILT_DEG, tilt))
+    azimuth = np.full(n, np.nan) if pv_azimuth_deg is None else np.asarray(pv_azimuth_deg, dtype=float).reshape(-1)
+    azimuth = np.round(np.where(np.isnan(azimuth), np.where(lat < 0, 0.0, 180.0), azimuth))
+
+    ok = (np.abs(lat) <= 90.0) & (np.abs(lon) <= 180.0) & (tilt >= 0) & (tilt <= 90) & (azimuth >= 0) & (azimuth <= 360)
+    index = np.full(n, -1)
+    if not ok.any():
+        return np.empty((0, 4)), index
+    sites, inverse = np.unique(np.column_stack([lat, lon, tilt, azimuth])[ok], axis=0, return_inverse=True)
+    index[ok] = inverse.reshape(-1)
+    return sites, index
+
+
+@functools.lru_cache(maxsize=256)
+def _site_profile(lat: float, lon: float, tilt_deg: float, azimuth_deg: float) -> np.ndarray:
+    profile = hourly_yield(lat, lon, tilt_deg, azimuth_deg)
+    profile.flags.writeable = False
+    return profile
+
+
+def site_profiles(sites: np.ndarray) -> np.ndarray:
+    """(S, 8760) hourly kWh/kWp of each ``unique_sites`` row (cached per site)."""
+    return np.array([_site_profile(*map(float, site)) for site in sites]).reshape(len(sites), HOURS_PER_YEAR)
+
+
+def roof_yield_batch(
+    latitude: "np.typing.ArrayLike",
+    longitude: "np.typing.ArrayLike",
+    pv_tilt_deg: "np.typing.ArrayLike | None" = None,
+    pv_azimuth_deg: "np.typing.ArrayLike | None" = None,
+) -> np.ndarray:
+    """
+    (N,) annual generation in kWh per m² of roof covered with PV (NaN for
+    an invalid site, see ``unique_sites``).  Each distinct site is simulated once.
+    """
+    sites, index = unique_sites(latitude, longitude, pv_tilt_deg, pv_azimuth_deg)
+    annual = np.array([sum(_specific_yield(*map(float, site))) for site in sites] + [np.nan])
+    return annual[index] * MODULE_KWP_PER_M2
+
+
+def roof_yield_kwh_per_m2(building: Mapping) -> float:
+    """
+    Annual generation per m² of roof covered with PV for one asset, at its
+    ``pv_tilt_deg`` / ``pv_azimuth_deg`` (default 35°, facing the equator).
+    Raises ``ValueError`` for an unknown city or invalid location / orientation.
+    """
+    site_location(building)
+    value = float(roof_yield_batch(**site_columns([building]))[0])
+    if not np.isfinite(value):
+        raise ValueError(INVALID_SITE_MESSAGE)
+    return value
+
+
+def building_pv(building: Mapping, roof_fraction: float) -> dict:
+    """
+    PV array on *roof_fraction* of one asset's roof: ``{"kwp", "annual_kwh",
+    "monthly_kwh", "specific_yield_kwh_per_kwp"}``.
+    """
+    if not 0.0 <= roof_fraction <= 1.0:
+        raise ValueError("roof_fraction must be between 0 and 1.")
+    area = float(building.get("floor_area_m2", 0.0))
+    if area <= 0:
+        raise ValueError("floor_area_m2 must be > 0.")
+    lat, lon = site_location(building)
+    tilt, azimuth = building.get("pv_tilt_deg"), building.get("pv_azimuth_deg")
+    per_kwp = specific_yield(
+        lat, lon, DEFAULT_TILT_DEG if tilt is None else float(tilt), None if azimuth is None else float(azimuth)
+    )
+    kwp = roof_fraction * area * MODULE_KWP_PER_M2
+    monthly = per_kwp * kwp
+    return {
+        "kwp":                        round(kwp, 2),
+        "annual_kwh":                 round(float(monthly.sum()), 1),
+        "monthly_kwh":                [round(float(v), 1) for v in monthly],
+        "specific_yield_kwh_per_kwp": round(float(per_kwp.sum()), 1),
+    }
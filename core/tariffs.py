@@ -0,0 +1,254 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Tariff Schedules
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Flat and time-of-use (TOU) electricity tariffs with annual escalation
+# curves, priced against monthly (12) or hourly (8760) energy profiles.
+#
+# A schedule is a plain dict (see flat_tariff / tou_tariff).  It is reduced
+# once to a 12 × 24 month-by-hour rate matrix; pricing a stack of N profiles
+# is then one matrix product, so TOU costs for thousands of assets cost about
+# the same as one.  Monthly profiles are spread over the hours of each day by
+# a diurnal load shape (default: HEATING_DIURNAL_PROFILE).
+#
+# Everywhere the platform takes a ``tariff_gbp_per_kwh`` it also accepts a
+# schedule.  The physics engine and cash-flow model price each asset's own
+# modelled monthly electricity meter (meter_rate: base load round the clock,
+# the rest on the heating day); pv_matching prices hour by hour.
+# resolve_tariff — the effective £/kWh on the fixed HEATING_MONTHLY_PROFILE —
+# is the scalar fallback where no asset profile exists.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+from typing import Mapping, Sequence
+
+import numpy as np
+
+from config.constants import (
+    DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    HEATING_DIURNAL_PROFILE,
+    HEATING_MONTHLY_PROFILE,
+)
+
+HOURS_PER_YEAR = 8760
+DAYS_IN_MONTH = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_MONTH_OF_HOUR = np.repeat(np.arange(12), np.array(DAYS_IN_MONTH) * 24)
+_HOUR_OF_DAY = np.tile(np.arange(24), HOURS_PER_YEAR // 24)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# SCHEDULES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def flat_tariff(
+    rate_gbp_per_kwh: float = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    *,
+    escalation: float | Sequence[float] = 0.0,
+    name: str = "Flat",
+) -> dict:
+    """Single-rate schedule."""
+    return validate_schedule({"name": name, "rate_gbp_per_kwh": rate_gbp_per_kwh, "bands": (), "escalation": escalation})
+
+
+def tou_tariff(
+    base_rate_gbp_per_kwh: float,
+    bands: Sequence[Mapping],
+    *,
+    escalation: float | Sequence[float] = 0.0,
+    name: str = "Time of use",
+) -> dict:
+    """
+    Time-of-use schedule: *base_rate_gbp_per_kwh* outside every band.
+
+    Each band is ``{"name", "start_hour", "end_hour", "rate_gbp_per_kwh"}``
+    with an optional ``"months"`` (1–12) restriction.  Hours are [start, end)
+    and may wrap midnight (22 → 6); later bands win where bands overlap.
+    """
+    return validate_schedule({
+        "name": name, "rate_gbp_per_kwh": base_rate_gbp_per_kwh, "bands": tuple(bands), "escalation": escalation,
+    })
+
+
+def validate_schedule(schedule: Mapping) -> dict:
+    """Return a normalised copy of *schedule*; raise ``ValueError`` if malformed."""
+    rate = float(schedule.get("rate_gbp_per_kwh", 0.0))
+    if not rate > 0:
+        raise ValueError("Tariff rate_gbp_per_kwh must be > 0.")
+    bands = []
+    for band in schedule.get("bands", ()):
+        start, end = int(band["start_hour"]), int(band["end_hour"])
+        if not (0 <= start <= 23 and 1 <= end <= 24) or start == end:
+            raise ValueError("Tariff band hours must satisfy 0 <= start <= 23, 1 <= end <= 24, start != end.")
+        band_rate = float(band["rate_gbp_per_kwh"])
+        if not band_rate > 0:
+            raise ValueError("Tariff band rate_gbp_per_kwh must be > 0.")
+        months = tuple(int(m) for m in band.get("months") or range(1, 13))
+        if not all(1 <= m <= 12 for m in months):
+            raise ValueError("Tariff band months must be in 1..12.")
+        bands.append({
+            "name": str(band.get("name", f"{start:02d}-{end:02d}")),
+            "start_hour": start, "end_hour": end, "rate_gbp_per_kwh": band_rate, "months": months,
+        })
+    esc = schedule.get("escalation", 0.0)
+    esc = float(esc) if np.isscalar(esc) else tuple(float(e) for e in esc)
+    if min(np.atleast_1d(esc), default=0.0) <= -1.0:
+        raise ValueError("Tariff escalation must be > -1.")
+    return {
+        "name": str(schedule.get("name", "Tariff")),
+        "rate_gbp_per_kwh": rate,
+        "bands": tuple(bands),
+        "escalation": esc,
+    }
+
+
+def schedule_key(schedule: Mapping) -> tuple:
+    """Hashable fingerprint of *schedule* for result caches."""
+    s = validate_schedule(schedule)
+    return (
+        s["rate_gbp_per_kwh"],
+        tuple((b["start_hour"], b["end_hour"], b["rate_gbp_per_kwh"], b["months"]) for b in s["bands"]),
+        s["escalation"],
+    )
+
+
+# Indicative UK non-domestic schedules (rates £/kWh, 2024 levels)
+TARIFF_PRESETS: dict[str, dict] = {
+    "Economy 7": tou_tariff(
+        0.32, [{"name": "Night", "start_hour": 0, "end_hour": 7, "rate_gbp_per_kwh": 0.15}], name="Economy 7",
+    ),
+    "Winter peak (DUoS red band)": tou_tariff(
+        0.26,
+        [{"name": "Red", "start_hour": 16, "end_hour": 19, "rate_gbp_per_kwh": 0.48, "months": (1, 2, 3, 10, 11, 12)}],
+        name="Winter peak (DUoS red band)",
+    ),
+    "Flat, 3 % escalation": flat_tariff(
+        DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH, escalation=0.03, name="Flat, 3 % escalation",
+    ),
+}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# RATES
+# ─────────────────────────────────────────────────────────────────────────────
+
+def rate_matrix(schedule: Mapping) -> np.ndarray:
+    """(12, 24) £/kWh by month and hour of day."""
+    s = validate_schedule(schedule)
+    rates = np.full((12, 24), s["rate_gbp_per_kwh"])
+    hours = np.arange(24)
+    for band in s["bands"]:
+        start, end = band["start_hour"], band["end_hour"]
+        in_band = (hours >= start) & (hours < end) if start < end else (hours >= start) | (hours < end)
+        months = np.array(band["months"]) - 1
+        rates[np.ix_(months, np.flatnonzero(in_band))] = band["rate_gbp_per_kwh"]
+    return rates
+
+
+def hourly_rates(schedule: Mapping) -> np.ndarray:
+    """(8760,) £/kWh for each hour of a non-leap year."""
+    return rate_matrix(schedule)[_MONTH_OF_HOUR, _HOUR_OF_DAY]
+
+
+def monthly_rates(schedule: Mapping, diurnal: "np.typing.ArrayLike | None" = None) -> np.ndarray:
+    """(12,) effective £/kWh per month for load following the *diurnal* shape."""
+    shape = np.asarray(HEATING_DIURNAL_PROFILE if diurnal is None else diurnal, dtype=float).reshape(-1)
+    if shape.size != 24 or (shape < 0).any() or not shape.sum() > 0:
+        raise ValueError("diurnal must hold 24 non-negative values with a positive sum.")
+    return rate_matrix(schedule) @ (shape / shape.sum())
+
+
+def price_index(schedule: Mapping, years: int) -> np.ndarray:
+    """
+    (years,) price multiplier for years 1..*years* relative to year 1.
+
+    A scalar escalation compounds every year; a curve gives the growth into
+    year 2, 3, …, and its last value repeats past its end.
+    """
+    esc = validate_schedule(schedule)["escalation"]
+    growth = np.zeros(max(int(years), 0))
+    if growth.size > 1:
+        curve = np.atleast_1d(np.asarray(esc, dtype=float))
+        if curve.size == 0:
+            curve = np.zeros(1)
+        steps = np.arange(growth.size - 1)
+        growth[1:] = curve[np.minimum(steps, curve.size - 1)]
+    return np.cumprod(1.0 + growth)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PROFILE PRICING — vectorised over any leading dimensions
+# ─────────────────────────────────────────────────────────────────────────────
+
+def _profile_cost_gbp(
+    schedule: Mapping, energy_kwh: "np.typing.ArrayLike", *, diurnal: "np.typing.ArrayLike | None" = None
+) -> np.ndarray:
+    """
+    Year-1 cost of each (..., 12) monthly or (..., 8760) hourly kWh profile.
+
+    Hourly profiles are priced hour by hour; monthly profiles at each
+    month's *diurnal*-weighted rate.
+    """
+    energy = np.asarray(energy_kwh, dtype=float)
+    if energy.shape[-1] == HOURS_PER_YEAR:
+        return energy @ hourly_rates(schedule)
+    if energy.shape[-1] == 12:
+        return energy @ monthly_rates(schedule, diurnal)
+    raise ValueError("energy_kwh must hold 12 monthly or 8760 hourly values.")
+
+
+def effective_rate(
+    schedule: Mapping,
+    energy_kwh: "np.typing.ArrayLike | None" = None,
+    *,
+    diurnal: "np.typing.ArrayLike | None" = None,
+) -> "np.ndarray | float":
+    """
+    Volume-weighted £/kWh of each profile (default: HEATING_MONTHLY_PROFILE).
+
+    Rows with no energy get the diurnal-weighted annual mean rate.
+    """
+    profile = HEATING_MONTHLY_PROFILE if energy_kwh is None else energy_kwh
+    energy = np.asarray(profile, dtype=float)
+    cost = _profile_cost_gbp(schedule, energy, diurnal=diurnal)
+    total = energy.sum(axis=-1)
+    fallback = float(_profile_cost_gbp(schedule, np.asarray(HEATING_MONTHLY_PROFILE), diurnal=diurnal)
+                     / sum(HEATING_MONTHLY_PROFILE))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(total > 0, cost / np.where(total > 0, total, 1.0), fallback)
+    return float(rate) if rate.ndim == 0 else rate
+
+
+def meter_rate(
+    schedule: Mapping,
+    electricity_kwh: "np.typing.ArrayLike",
+    base_load_kwh: "np.typing.ArrayLike" = 0.0,
+) -> "np.ndarray | float":
+    """
+    £/kWh of each (..., 12) monthly electricity meter under *schedule*.
+
+    The meter's *base_load_kwh* share (broadcast to the meter) runs round the
+    clock; the rest — electric heating, net of any generation — follows the
+    heating diurnal profile.  Meters with no net consumption get the
+    fixed-profile ``effective_rate``.
+    """
+    meter = np.asarray(electricity_kwh, dtype=float)
+    if meter.shape[-1:] != (12,):
+        raise ValueError("electricity_kwh must hold 12 monthly values.")
+    base = np.broadcast_to(np.asarray(base_load_kwh, dtype=float), meter.shape)
+    cost = base @ monthly_rates(schedule, np.ones(24)) + (meter - base) @ monthly_rates(schedule)
+    total = meter.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        rate = np.where(total > 0, cost / np.where(total > 0, total, 1.0), effective_rate(schedule))
+    return float(rate) if rate.ndim == 0 else rate
+
+
+def resolve_tariff(tariff: "float | Mapping") -> float:
+    """
+    £/kWh for a scalar tariff (returned unchanged) or a schedule's effective
+    rate on the fixed HEATING_MONTHLY_PROFILE — the fallback where no
+    asset's own meter profile is modelled (see ``meter_rate``).
+    """
+    if isinstance(tariff, Mapping):
+        return effective_rate(tariff)
+    return tariff
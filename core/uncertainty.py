@@ -0,0 +1,317 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Monte Carlo Uncertainty Engine
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Samples fabric U-values, air-change rate, tariff, grid carbon intensity and
+# install cost around their nominal values and pushes every draw through the
+# batch physics kernel (core.physics._grid_outputs), so the draws follow the
+# same calibration, baseline and fuel-pricing rules as the nominal results.
+# Reports P10 / P50 / P90 energy, carbon and bill savings, payback and NPV per
+# building × scenario and for the portfolio as a whole.
+#
+# Buildings are processed in fixed-size blocks, each with its own child seed,
+# so results are identical whether blocks run in-process or on a process pool.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Iterable, Mapping, Sequence
+
+import numpy as np
+
+import core.physics as physics
+from config.constants import CI_ELECTRICITY, DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH
+from core.finance import level_npv
+from core.scenario_registry import ScenarioRegistry, scenario_columns_for
+from core.tariffs import resolve_tariff
+
+logger = logging.getLogger(__name__)
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MODULE CONSTANTS
+# ─────────────────────────────────────────────────────────────────────────────
+QUANTILES = (0.10, 0.50, 0.90)
+BLOCK_SIZE = 32                  # buildings per task — fixed so seeds do not depend on worker count
+_MIN_CELLS_FOR_POOL = 2_000_000  # building × scenario × draw cells below which a pool costs more than it saves
+
+# Default spread of each uncertain input.  *_rel_sd are log-normal sigmas
+# (≈ relative standard deviation) around the nominal value; install cost is
+# triangular between the low / high factors with the nominal cost as mode.
+DEFAULT_UNCERTAINTY: dict[str, float] = {
+    "u_value_rel_sd":           0.15,   # in-situ U-values vs. book values
+    "ach_rel_sd":               0.25,   # infiltration, untested buildings
+    "tariff_rel_sd":            0.15,   # wholesale-driven retail price spread
+    "carbon_rel_sd":            0.10,   # grid decarbonisation pathway spread
+    "install_cost_low_factor":  0.80,
+    "install_cost_high_factor": 1.40,
+}
+
+_ADDITIVE_METRICS = ("energy_saving_mwh", "carbon_saving_t", "annual_saving_gbp", "install_cost_gbp", "npv_gbp")
+METRICS = _ADDITIVE_METRICS + ("payback_years",)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# KERNEL — one block of buildings, all scenarios, all draws
+# ─────────────────────────────────────────────────────────────────────────────
+def _simulate_block(task: dict) -> tuple[dict, dict]:
+    """Return per-cell quantiles (n, M, 3) and per-draw block sums (M, D) for one block."""
+    b = task["buildings"]
+    s = task["scenarios"]
+    spec = task["spec"]
+    draws = task["draws"]
+    rng = np.random.default_rng(task["seed"])
+    n, m = len(b["floor_area_m2"]), len(s["install_cost_gbp"])
+
+    def lognormal(sigma: float, shape: tuple) -> np.ndarray:
+        return rng.lognormal(0.0, sigma, shape) if sigma > 0 else np.ones(shape)
+
+    u_mult = lognormal(spec["u_value_rel_sd"], (3, n, 1, draws))
+    base_ach = physics._air_change_rate(b["air_change_rate"])[:, None, None] * lognormal(
+        spec["ach_rel_sd"], (n, 1, draws)
+    )
+    bc = {k: v[:, None, None] for k, v in b.items()}
+    bc["u_value_wall"] = bc["u_value_wall"] * u_mult[0]
+    bc["u_value_roof"] = bc["u_value_roof"] * u_mult[1]
+    bc["u_value_glazing"] = bc["u_value_glazing"] * u_mult[2]
+    sc = {k: v[None, :, None] for k, v in s.items()}
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        # Same calibration, baseline and two-meter pricing rules as the batch engine
+        grid = physics._grid_outputs(
+            bc, sc, task["temperature_c"],
+            task["scenario_rate"][:, :, None] * task["tariff_factor"][None, None, :],
+            task["carbon"][None, None, :],
+            task["baseline_rate"][:, :, None] * task["tariff_factor"][None, None, :],
+            base_ach=base_ach,
+        )
+        energy_saving = grid["energy_saving_mwh"]
+        annual_saving = grid["annual_saving_gbp"]
+        cost_low, cost_high = s["install_cost_low_gbp"], s["install_cost_high_gbp"]
+        unit = rng.random((n, m, draws))
+        install = _triangular(unit, cost_low[None, :, None], s["install_cost_gbp"][None, :, None],
+                              cost_high[None, :, None])
+        metrics = {
+            "energy_saving_mwh": energy_saving,
+            "carbon_saving_t":   grid["carbon_saving_t"],
+            "annual_saving_gbp": annual_saving,
+            "install_cost_gbp":  install,
+            "npv_gbp":           level_npv(install, annual_saving, task["discount_rate"], task["term_years"]),
+            "payback_years":     np.where(annual_saving > 0, install / np.where(annual_saving > 0, annual_saving, 1.0), np.inf),
+        }
+
+    valid = task["valid"][:, None, None]
+    quantiles = {}
+    for name, values in metrics.items():
+        values = np.broadcast_to(values, (n, m, draws))
+        q = np.moveaxis(np.quantile(values, QUANTILES, axis=-1, method="nearest"), 0, -1)
+        quantiles[name] = np.where(valid, q, np.nan)
+    sums = {
+        name: np.where(valid, np.broadcast_to(metrics[name], (n, m, draws)), 0.0).sum(axis=0)
+        for name in _ADDITIVE_METRICS
+    }
+    return quantiles, sums
+
+
+def _triangular(u: np.ndarray, low: np.ndarray, mode: np.ndarray, high: np.ndarray) -> np.ndarray:
+    """Inverse-CDF triangular sample that tolerates degenerate (low == high) ranges."""
+    span = high - low
+    safe = np.where(span > 0, span, 1.0)
+    cut = np.where(span > 0, (mode - low) / safe, 0.0)
+    left = low + np.sqrt(u * safe * (mode - low))
+    right = high - np.sqrt((1.0 - u) * safe * (high - mode))
+    return np.where(span > 0, np.where(u < cut, left, right), mode)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# PUBLIC API
+# ─────────────────────────────────────────────────────────────────────────────
+def _cost_range_columns(
+    names: Sequence[str],
+    source: Mapping[str, Mapping],
+    nominal: np.ndarray,
+    spec: Mapping[str, float],
+    cost_ranges: Mapping[str, tuple[float, float]] | None,
+) -> tuple[np.ndarray, np.ndarray]:
+    low = nominal * spec["install_cost_low_factor"]
+    high = nominal * spec["install_cost_high_factor"]
+    for j, name in enumerate(names):
+        definition = source.get(name, {})
+        rng = (cost_ranges or {}).get(name)
+        if rng is None and "install_cost_low_gbp" in definition and "install_cost_high_gbp" in definition:
+            rng = (definition["install_cost_low_gbp"], definition["install_cost_high_gbp"])
+        if rng is not None:
+            lo, hi = float(rng[0]), float(rng[1])
+            if not 0 <= lo <= hi:
+                raise ValueError(f"Install cost range for '{name}' must satisfy 0 <= low <= high.")
+            low[j], high[j] = lo, hi
+    # Keep the nominal cost inside its range so it can serve as the mode
+    return np.minimum(low, nominal), np.maximum(high, nominal)
+
+
+def run_monte_carlo(
+    buildings: Iterable[Mapping],
+    scenario_names: Sequence[str],
+    temperature_c: float,
+    *,
+    scenarios: Mapping[str, Mapping] | None = None,
+    tariff_gbp_per_kwh: float | Mapping = DEFAULT_ELECTRICITY_TARIFF_GBP_PER_KWH,
+    carbon_intensity_kg_per_kwh: float = CI_ELECTRICITY,
+    discount_rate: float = 0.05,
+    term_years: int = 10,
+    draws: int = 2000,
+    spec: Mapping[str, float] | None = None,
+    cost_ranges: Mapping[str, tuple[float, float]] | None = None,
+    seed: int = 0,
+    workers: int | None = None,
+) -> dict:
+    """
+    Monte Carlo retrofit outcomes for every building × scenario.
+
+    *spec* overrides entries of ``DEFAULT_UNCERTAINTY``.  Install-cost
+    ranges come from *cost_ranges* (scenario name → (low, high), e.g. a
+    ``MEES_MEASURES`` entry's ``cost_low`` / ``cost_high``), else from
+    ``install_cost_low_gbp`` / ``install_cost_high_gbp`` on the scenario,
+    else from the spec's cost factors.  Tariff and carbon intensity are
+    sampled once per draw and shared by all buildings (market-wide risk); a
+    core.tariffs schedule first prices each building's own electricity
+    meters (core.physics.electricity_rates), and the draw scales those rates.
+
+    Returns ``{"quantiles", "draws", "scenario_names", "valid",
+    "buildings": {metric: (N, M, 3)}, "portfolio": {metric: (M, 3)}}`` for
+    the metrics in ``METRICS``; the last axis is P10 / P50 / P90.  Payback is
+    ``inf`` where a draw never pays back; invalid buildings are NaN and left
+    out of the portfolio totals.
+
+    *workers* ``None`` uses one process per CPU for large runs; ``1`` forces
+    in-process execution.  Results do not depend on the worker count.
+    """
+    if draws < 1:
+        raise ValueError("draws must be >= 1.")
+    spec = {**DEFAULT_UNCERTAINTY, **(spec or {})}
+    if any(v < 0 for v in spec.values()):
+        raise ValueError("Uncertainty spreads must be non-negative.")
+    if scenarios is None:
+        from config.scenarios import SCENARIOS as scenarios
+
+    schedule = tariff_gbp_per_kwh if isinstance(tariff_gbp_per_kwh, Mapping) else None
+    tariff_gbp_per_kwh = resolve_tariff(tariff_gbp_per_kwh)
+    rows = list(buildings)
+    names = list(scenario_names)
+    b_cols = physics.building_columns(rows)
+    s_cols = scenario_columns_for(names, scenarios) if names else ScenarioRegistry().columns()
+    b_cols["pv_yield_kwh_per_m2"] = physics._roof_pv_yield_column(b_cols, len(rows), s_cols["pv_roof_fraction"])
+    s_cols["install_cost_low_gbp"], s_cols["install_cost_high_gbp"] = _cost_range_columns(
+        names, scenarios, s_cols["install_cost_gbp"], spec, cost_ranges
+    )
+
+    # Nominal pass: validates temperature / tariff / carbon and masks bad buildings
+    nominal = physics.calculate_thermal_load_batch(
+        b_cols, s_cols, temperature_c, tariff_gbp_per_kwh, carbon_intensity_kg_per_kwh, strict=False
+    )
+    if names and not nominal["valid"].any(axis=0).all():
+        bad = names[int(np.argmin(nominal["valid"].any(axis=0)))]
+        raise ValueError(f"Scenario '{bad}' has invalid parameters.")
+    valid = nominal["valid"].all(axis=1) if names else np.ones(len(rows), dtype=bool)
+    if schedule is not None:
+        meters = physics.electricity_meters(b_cols, s_cols, temperature_c)
+        baseline_rate, scenario_rate = physics.electricity_rates(meters, schedule)
+    else:
+        baseline_rate = scenario_rate = np.full((len(rows), 1), tariff_gbp_per_kwh)
+
+    seq = np.random.SeedSequence(seed)
+    market_seed, *block_seeds = seq.spawn(1 + max(1, -(-len(rows) // BLOCK_SIZE)))
+    market = np.random.default_rng(market_seed)
+    tariff_factor = market.lognormal(0.0, spec["tariff_rel_sd"], draws) if spec["tariff_rel_sd"] > 0 else np.ones(draws)
+    carbon = carbon_intensity_kg_per_kwh * (
+        market.lognormal(0.0, spec["carbon_rel_sd"], draws) if spec["carbon_rel_sd"] > 0 else np.ones(draws)
+    )
+
+    tasks = [
+        {
+            "buildings":     {k: v[start:start + BLOCK_SIZE] for k, v in b_cols.items()},
+            "valid":         valid[start:start + BLOCK_SIZE],
+            "scenarios":     s_cols,
+            "spec":          spec,
+            "draws":         draws,
+            "seed":          block_seeds[k],
+            "tariff_factor": tariff_factor,
+            "baseline_rate": baseline_rate[start:start + BLOCK_SIZE],
+            "scenario_rate": scenario_rate[start:start + BLOCK_SIZE],
+            "carbon":        carbon,
+            "temperature_c": float(temperature_c),
+            "discount_rate": discount_rate,
+            "term_years":    term_years,
+        }
+        for k, start in enumerate(range(0, len(rows), BLOCK_SIZE))
+    ]
+    results = _run_tasks(tasks, workers, cells=len(rows) * len(names) * draws)
+
+    m = len(names)
+    per_building = {
+        name: np.concatenate([q[name] for q, _ in results], axis=0) if results else np.empty((0, m, 3))
+        for name in METRICS
+    }
+    totals = {
+        name: sum((s[name] for _, s in results), np.zeros((m, draws))) for name in _ADDITIVE_METRICS
+    }
+    with np.errstate(invalid="ignore", divide="ignore"):
+        totals["payback_years"] = np.where(
+            totals["annual_saving_gbp"] > 0,
+            totals["install_cost_gbp"] / np.where(totals["annual_saving_gbp"] > 0, totals["annual_saving_gbp"], 1.0),
+            np.inf,
+        )
+    portfolio = {
+        name: np.moveaxis(np.quantile(v, QUANTILES, axis=-1, method="nearest"), 0, -1)
+        for name, v in totals.items()
+    }
+    return {
+        "quantiles":      QUANTILES,
+        "draws":          draws,
+        "scenario_names": names,
+        "valid":          valid,
+        "buildings":      per_building,
+        "portfolio":      portfolio,
+    }
+
+
+def _run_tasks(tasks: list[dict], workers: int | None, cells: int) -> list[tuple[dict, dict]]:
+    if workers is None:
+        workers = os.cpu_count() or 1
+        if cells < _MIN_CELLS_FOR_POOL:
+            workers = 1
+    workers = min(workers, len(tasks))
+    if workers <= 1:
+        return [_simulate_block(t) for t in tasks]
+    try:
+        # spawn: forking a multi-threaded Streamlit server is not safe
+        ctx = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=ctx) as pool:
+            return list(pool.map(_simulate_block, tasks))
+    except (OSError, BrokenProcessPool) as exc:
+        logger.warning("Process pool unavailable (%s); running Monte Carlo in-process.", type(exc).__name__)
+        return [_simulate_block(t) for t in tasks]
+
+
+def summarise_cell(result: dict, i: int, j: int) -> dict[str, dict[str, float | None]]:
+    """P10 / P50 / P90 for building *i*, scenario *j* as plain floats (``None`` for no payback)."""
+    return _summarise({k: v[i, j] for k, v in result["buildings"].items()})
+
+
+def summarise_portfolio(result: dict, j: int) -> dict[str, dict[str, float | None]]:
+    """Portfolio-total P10 / P50 / P90 for scenario *j* as plain floats."""
+    return _summarise({k: v[j] for k, v in result["portfolio"].items()})
+
+
+def _summarise(cells: Mapping[str, np.ndarray]) -> dict[str, dict[str, float | None]]:
+    out = {}
+    for name, q in cells.items():
+        out[name] = {
+            label: (float(v) if np.isfinite(v) else None)
+            for label, v in zip(("p10", "p50", "p90"), q)
+        }
+    return out
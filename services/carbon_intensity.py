@@ -0,0 +1,299 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Grid Carbon Intensity Store
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Historical and projected GB grid electricity carbon factors (kgCO₂e/kWh) on
+# two accounting bases:
+#   location — annual average generation mix (DESNZ/BEIS GHG conversion
+#              factors to 2024; 2025–2035 follow GRID_CARBON_TRAJECTORY, then
+#              an indicative path to 2050).  Use for SECR / Scope 2 reporting.
+#   marginal — short-run operating margin (the plant that flexes when demand
+#              changes, mostly gas CCGT).  Use to appraise interventions.
+#
+# Annual tables live in the JSON index; within-year variation is one bundled
+# half-hourly shape per basis (17 520 values, mean 1.0 over the year), stored
+# as int16 and memory-mapped like the TMY weather store.  Any year's monthly,
+# hourly or half-hourly curve is its annual factor × that shape.
+#
+# Because the shape does not change between years, lifetime carbon over any
+# year range is (profile-weighted shape) × (sum of annual factors), and the
+# sums come from a precomputed cumulative table — O(1) per query, vectorised.
+# Years outside the table hold the nearest value.  Rebuild the bundled files
+# with:  python -m services.carbon_intensity
+#
+# No Streamlit dependency — safe to import from core.* and the agent.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import zlib
+from pathlib import Path
+
+import numpy as np
+
+from config.constants import CI_ELECTRICITY, GRID_CARBON_TRAJECTORY
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MODULE CONSTANTS
+# ─────────────────────────────────────────────────────────────────────────────
+CARBON_DATA_DIR    = Path(__file__).with_name("data")
+CARBON_ARRAY_PATH  = CARBON_DATA_DIR / "grid_carbon_halfhourly.npy"
+CARBON_INDEX_PATH  = CARBON_DATA_DIR / "grid_carbon_index.json"
+BASES              = ("location", "marginal")
+HALF_HOURS_PER_YEAR = 17520
+HOURS_PER_YEAR     = 8760
+DAYS_IN_MONTH      = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_SCALE             = 1e-4                 # int16 → relative shape
+
+_MONTH_HALF_HOURS = np.array(DAYS_IN_MONTH) * 48
+_MONTH_OF_HALF_HOUR = np.repeat(np.arange(12), _MONTH_HALF_HOURS)
+
+# ── Generator inputs ─────────────────────────────────────────────────────────
+# Location-based annual factors, kgCO₂e/kWh (UK generation, DESNZ/BEIS
+# conversion factors; 2023 is the CI_ELECTRICITY value used platform-wide).
+_LOCATION_HISTORY: dict[int, float] = {
+    2013: 0.44548, 2014: 0.49426, 2015: 0.46219, 2016: 0.41205, 2017: 0.35156,
+    2018: 0.28307, 2019: 0.25560, 2020: 0.23314, 2021: 0.21233, 2022: 0.19338,
+    2023: CI_ELECTRICITY, 2024: 0.20705,
+}
+# Indicative path beyond the 2035 trajectory end point
+_LOCATION_LONG_RUN: dict[int, float] = {2040: 0.025, 2045: 0.015, 2050: 0.010}
+# Short-run marginal factors at anchor years (interpolated between them)
+_MARGINAL_ANCHORS: dict[int, float] = {
+    2013: 0.520, 2018: 0.420, 2023: 0.380, 2030: 0.330, 2035: 0.250, 2040: 0.170, 2050: 0.100,
+}
+# Relative monthly level, Jan–Dec (winter gas share high, summer solar)
+_MONTHLY_SHAPE = {
+    "location": (1.14, 1.10, 1.02, 0.94, 0.87, 0.84, 0.87, 0.90, 0.95, 1.03, 1.10, 1.16),
+    "marginal": (1.04, 1.03, 1.01, 0.99, 0.97, 0.96, 0.97, 0.98, 0.99, 1.01, 1.02, 1.04),
+}
+# Diurnal swing (fraction of the level): evening peak, solar midday dip
+_DIURNAL_AMPLITUDE = {"location": 0.12, "marginal": 0.05}
+_SOLAR_DIP = {"location": 0.15, "marginal": 0.04}
+_DAILY_AR_PHI = 0.8            # day-to-day persistence of wind-driven anomalies
+_DAILY_ANOMALY_SD = {"location": 0.15, "marginal": 0.04}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STORE ACCESS
+# ─────────────────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _store() -> dict:
+    """Load the index, memory-map the shapes and build cumulative sums once per process."""
+    index = json.loads(CARBON_INDEX_PATH.read_text(encoding="utf-8"))
+    data = np.load(CARBON_ARRAY_PATH, mmap_mode="r")
+    if data.shape != (len(index["bases"]), HALF_HOURS_PER_YEAR):
+        raise ValueError(f"Carbon store shape {data.shape} does not match its index.")
+    store = {"shape": {}, "years": {}, "factors": {}, "cumulative": {}}
+    for row, basis in enumerate(index["bases"]):
+        table = {int(y): float(v) for y, v in index["annual"][basis].items()}
+        years = np.arange(min(table), max(table) + 1)
+        factors = np.interp(years, sorted(table), [table[y] for y in sorted(table)])
+        store["shape"][basis] = np.asarray(data[row], dtype=float) * float(index["scale"])
+        store["years"][basis] = years
+        store["factors"][basis] = factors
+        store["cumulative"][basis] = np.concatenate(([0.0], np.cumsum(factors)))
+    return store
+
+
+def _check_basis(basis: str) -> None:
+    if basis not in BASES:
+        raise ValueError(f"basis must be one of {BASES}.")
+
+
+def annual_table(basis: str = "location") -> dict[int, float]:
+    """Every tabulated ``{year: kgCO₂e/kWh}`` on *basis*."""
+    _check_basis(basis)
+    s = _store()
+    return {int(y): float(f) for y, f in zip(s["years"][basis], s["factors"][basis])}
+
+
+def annual_factor(year: "np.typing.ArrayLike", basis: str = "location") -> "np.ndarray | float":
+    """Annual factor(s) for *year*; years outside the table take the nearest entry."""
+    _check_basis(basis)
+    s = _store()
+    years, factors = s["years"][basis], s["factors"][basis]
+    idx = np.clip(np.asarray(year, dtype=int) - years[0], 0, len(years) - 1)
+    out = factors[idx]
+    return float(out) if out.ndim == 0 else out
+
+
+def half_hourly_factors(year: int, basis: str = "location") -> np.ndarray:
+    """(17520,) kgCO₂e/kWh for each half hour of *year* (non-leap calendar)."""
+    return annual_factor(year, basis) * _store()["shape"][basis]
+
+
+def hourly_factors(year: int, basis: str = "location") -> np.ndarray:
+    """(8760,) hourly means of the half-hourly curve."""
+    return half_hourly_factors(year, basis).reshape(HOURS_PER_YEAR, 2).mean(axis=1)
+
+
+def monthly_factors(year: int, basis: str = "location") -> np.ndarray:
+    """(12,) calendar-month means of the half-hourly curve."""
+    hh = half_hourly_factors(year, basis)
+    return np.bincount(_MONTH_OF_HALF_HOUR, weights=hh, minlength=12) / _MONTH_HALF_HOURS
+
+
+def _shape_at(n_steps: int, basis: str) -> np.ndarray:
+    shape = _store()["shape"][basis]
+    if n_steps == HALF_HOURS_PER_YEAR:
+        return shape
+    if n_steps == HOURS_PER_YEAR:
+        return shape.reshape(HOURS_PER_YEAR, 2).mean(axis=1)
+    if n_steps == 12:
+        return np.bincount(_MONTH_OF_HALF_HOUR, weights=shape, minlength=12) / _MONTH_HALF_HOURS
+    raise ValueError("Energy profiles must hold 12 monthly, 8760 hourly or 17520 half-hourly values.")
+
+
+def profile_weight(energy_kwh: "np.typing.ArrayLike", basis: str = "location") -> "np.ndarray | float":
+    """
+    Consumption-weighted shape factor of each (..., T) profile: the ratio of
+    its carbon to annual kWh × annual factor.  1.0 for flat load; NaN-free
+    (empty profiles get 1.0).
+    """
+    _check_basis(basis)
+    energy = np.asarray(energy_kwh, dtype=float)
+    weighted = energy @ _shape_at(energy.shape[-1], basis)
+    total = energy.sum(axis=-1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        out = np.where(total > 0, weighted / np.where(total > 0, total, 1.0), 1.0)
+    return float(out) if out.ndim == 0 else out
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# CARBON — single year and lifetime
+# ─────────────────────────────────────────────────────────────────────────────
+
+def carbon_kg(
+    energy_kwh: "np.typing.ArrayLike", year: int, basis: str = "location", *, profile: bool = True
+) -> "np.ndarray | float":
+    """
+    kgCO₂e for one year of electricity.
+
+    With ``profile=True`` the last axis of *energy_kwh* is a 12 / 8760 /
+    17520-step profile priced step by step; otherwise every element is an
+    annual kWh total at the annual factor.
+    """
+    energy = np.asarray(energy_kwh, dtype=float)
+    if not profile:
+        return energy * annual_factor(year, basis)
+    return profile_weight(energy, basis) * energy.sum(axis=-1) * annual_factor(year, basis)
+
+
+def _cumulative_to(year: np.ndarray, basis: str) -> np.ndarray:
+    """Sum of annual factors for all table years < *year*, extrapolated flat at both ends."""
+    s = _store()
+    years, factors, cum = s["years"][basis], s["factors"][basis], s["cumulative"][basis]
+    y = np.asarray(year, dtype=float)
+    inside = cum[np.clip(y - years[0], 0, len(years)).astype(int)]
+    below = (y - years[0]) * factors[0]
+    above = cum[-1] + (y - years[-1] - 1) * factors[-1]
+    return np.where(y < years[0], below, np.where(y > years[-1] + 1, above, inside))
+
+
+def factor_sum(
+    start_year: "np.typing.ArrayLike", end_year: "np.typing.ArrayLike", basis: str = "location"
+) -> "np.ndarray | float":
+    """Σ annual factors over ``start_year..end_year`` inclusive — O(1) per pair, broadcasts."""
+    _check_basis(basis)
+    start = np.asarray(start_year, dtype=int)
+    end = np.asarray(end_year, dtype=int)
+    if (end < start).any():
+        raise ValueError("end_year must be >= start_year.")
+    out = _cumulative_to(end + 1, basis) - _cumulative_to(start, basis)
+    return float(out) if out.ndim == 0 else out
+
+
+def lifetime_carbon_t(
+    annual_kwh: "np.typing.ArrayLike",
+    start_year: "np.typing.ArrayLike",
+    end_year: "np.typing.ArrayLike",
+    basis: str = "location",
+    *,
+    profile_kwh: "np.typing.ArrayLike | None" = None,
+) -> "np.ndarray | float":
+    """
+    tCO₂e from a constant *annual_kwh* over ``start_year..end_year`` inclusive.
+
+    *profile_kwh* (any scale, last axis 12 / 8760 / 17520) gives the load
+    shape, so e.g. a heating profile is weighted towards winter factors.
+    """
+    weight = 1.0 if profile_kwh is None else profile_weight(profile_kwh, basis)
+    return np.asarray(annual_kwh, dtype=float) * weight * factor_sum(start_year, end_year, basis) / 1000.0
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GENERATOR — rebuilds the bundled files from the tables above
+# ─────────────────────────────────────────────────────────────────────────────
+def _annual_tables() -> dict[str, dict[int, float]]:
+    location = {**_LOCATION_HISTORY, **GRID_CARBON_TRAJECTORY, **_LOCATION_LONG_RUN}
+    first, last = min(location), max(location)
+    anchors = sorted(location)
+    location = {
+        y: round(float(np.interp(y, anchors, [location[a] for a in anchors])), 5) for y in range(first, last + 1)
+    }
+    m_years = sorted(_MARGINAL_ANCHORS)
+    marginal = {
+        y: round(float(np.interp(y, m_years, [_MARGINAL_ANCHORS[a] for a in m_years])), 5)
+        for y in range(first, last + 1)
+    }
+    return {"location": location, "marginal": marginal}
+
+
+def synthesise_shape(basis: str) -> np.ndarray:
+    """Deterministic (17520,) relative intensity shape with an annual mean of 1.0."""
+    rng = np.random.default_rng(zlib.crc32(basis.encode("utf-8")))
+    monthly = np.asarray(_MONTHLY_SHAPE[basis], dtype=float)
+    level = monthly[_MONTH_OF_HALF_HOUR]
+
+    hour = (np.arange(HALF_HOURS_PER_YEAR) % 48) / 2.0
+    evening = np.cos(2.0 * math.pi * (hour - 18.0) / 24.0)
+    # Solar dip scales with summer-ness (inverse of the monthly level)
+    summer = ((monthly.max() - monthly) / max(monthly.max() - monthly.min(), 1e-9))[_MONTH_OF_HALF_HOUR]
+    midday = np.exp(-0.5 * ((hour - 13.0) / 2.5) ** 2)
+    diurnal = 1.0 + _DIURNAL_AMPLITUDE[basis] * evening - _SOLAR_DIP[basis] * summer * midday
+
+    anomaly = np.empty(366)
+    anomaly[0] = rng.normal(0.0, _DAILY_ANOMALY_SD[basis])
+    innovation = _DAILY_ANOMALY_SD[basis] * math.sqrt(1.0 - _DAILY_AR_PHI ** 2)
+    for d in range(1, 366):
+        anomaly[d] = _DAILY_AR_PHI * anomaly[d - 1] + rng.normal(0.0, innovation)
+    weather = np.interp(np.arange(HALF_HOURS_PER_YEAR) / 48.0, np.arange(366), anomaly)
+
+    shape = np.maximum(level * diurnal * (1.0 + weather), 0.05)
+    # Re-centre each month on its level, then the year on 1.0
+    month_mean = np.bincount(_MONTH_OF_HALF_HOUR, weights=shape, minlength=12) / _MONTH_HALF_HOURS
+    shape *= (monthly / month_mean)[_MONTH_OF_HALF_HOUR]
+    return shape / shape.mean()
+
+
+def build_store(out_dir: Path = CARBON_DATA_DIR) -> Path:
+    """Regenerate the bundled shape array and the annual-factor index."""
+    data = np.stack([np.round(synthesise_shape(b) / _SCALE).astype(np.int16) for b in BASES])
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / CARBON_ARRAY_PATH.name, data)
+    tables = _annual_tables()
+    index = {
+        "version": 1,
+        "units": "kgCO2e/kWh",
+        "scale": _SCALE,
+        "half_hours": HALF_HOURS_PER_YEAR,
+        "bases": list(BASES),
+        "first_projected_year": min(GRID_CARBON_TRAJECTORY),
+        "source": (
+            "Location: DESNZ/BEIS UK electricity factors to 2024, GRID_CARBON_TRAJECTORY 2025-2035, "
+            "indicative to 2050. Marginal: indicative short-run operating margin. "
+            "Half-hourly shapes synthesised in services/carbon_intensity.py."
+        ),
+        "annual": {b: {str(y): f for y, f in tables[b].items()} for b in BASES},
+    }
+    (out_dir / CARBON_INDEX_PATH.name).write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    _store.cache_clear()
+    return out_dir / CARBON_ARRAY_PATH.name
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_store()}")
@@ -0,0 +1,337 @@
+# ═══════════════════════════════════════════════════════════════════════════════
+# CrowAgent™ Platform — Offline Typical-Year Weather Store
+# © 2026 Aparajita Parihar. All rights reserved.
+#
+# Hourly typical-meteorological-year (TMY) outdoor temperatures for every city
+# in services.location.CITIES, shipped as one int16 array (deci-°C,
+# cities × 8760) and opened with np.load(mmap_mode="r") — reading a city is a
+# row slice of the mapped file, with no parsing.
+#
+# The bundled file is synthesised deterministically from 1991–2020 monthly
+# climate normals (Met Office / national met services) plus a mean diurnal
+# cycle and seeded day-to-day variability; monthly means reproduce the
+# normals exactly.  Each city's hours are on its own local clock (the index
+# records the IANA timezone); hourly_temperatures_utc re-reads them on the
+# UTC hours the solar model uses.  Rebuild with:  python -m services.tmy
+#
+# No Streamlit dependency — safe to import from core.* and the agent.
+# ═══════════════════════════════════════════════════════════════════════════════
+
+from __future__ import annotations
+
+import functools
+import json
+import math
+import zlib
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+# ─────────────────────────────────────────────────────────────────────────────
+# MODULE CONSTANTS
+# ─────────────────────────────────────────────────────────────────────────────
+TMY_DATA_DIR      = Path(__file__).with_name("data")
+TMY_ARRAY_PATH    = TMY_DATA_DIR / "tmy_hourly_temperature.npy"
+TMY_INDEX_PATH    = TMY_DATA_DIR / "tmy_index.json"
+DEFAULT_TMY_CITY  = "Reading, Berkshire"
+FALLBACK_TEMP_C   = 10.5                 # UK annual average — used if the store is missing
+HOURS_PER_YEAR    = 8760
+DAYS_IN_MONTH     = (31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31)
+_SCALE            = 0.1                  # int16 deci-°C → °C
+TMY_TIMEZONE      = "Europe/London"      # clock of UK cities and of index entries without one
+
+# ── Generator inputs: monthly mean °C (Jan–Dec), mean diurnal range °C ──────
+_MONTHLY_NORMALS: dict[str, tuple[tuple[float, ...], float]] = {
+    # UK — South East & East
+    "Reading, Berkshire":  ((4.9, 5.1, 7.3, 9.7, 13.0, 16.0, 18.2, 17.9, 15.1, 11.6, 7.8, 5.3), 8.0),
+    "London":              ((5.8, 6.1, 8.2, 10.8, 14.1, 17.2, 19.4, 19.1, 16.2, 12.6, 8.7, 6.1), 7.5),
+    "Brighton":            ((6.0, 5.9, 7.6, 9.8, 12.9, 15.7, 17.8, 18.0, 16.0, 13.0, 9.3, 6.8), 6.0),
+    "Southampton":         ((5.5, 5.6, 7.6, 10.0, 13.3, 16.2, 18.3, 18.1, 15.6, 12.3, 8.5, 5.9), 8.0),
+    "Portsmouth":          ((6.2, 6.1, 7.8, 10.1, 13.3, 16.1, 18.2, 18.3, 16.1, 13.0, 9.4, 6.8), 6.0),
+    "Oxford":              ((5.0, 5.3, 7.3, 9.6, 12.9, 15.9, 18.1, 17.8, 15.0, 11.4, 7.7, 5.2), 8.5),
+    "Cambridge":           ((4.6, 4.9, 7.1, 9.5, 12.8, 15.8, 18.2, 18.0, 15.1, 11.3, 7.3, 4.8), 8.5),
+    "Norwich":             ((4.5, 4.6, 6.6, 9.0, 12.2, 15.2, 17.6, 17.5, 14.9, 11.2, 7.3, 4.8), 8.0),
+    # UK — Midlands
+    "Birmingham":          ((4.3, 4.5, 6.5, 8.8, 12.0, 15.0, 17.1, 16.8, 14.1, 10.7, 7.0, 4.5), 7.5),
+    "Coventry":            ((4.3, 4.5, 6.6, 8.9, 12.1, 15.1, 17.3, 17.0, 14.3, 10.8, 7.0, 4.5), 7.5),
+    "Leicester":           ((4.2, 4.4, 6.5, 8.8, 12.0, 15.0, 17.3, 17.0, 14.3, 10.7, 6.9, 4.4), 7.5),
+    "Nottingham":          ((4.1, 4.3, 6.3, 8.7, 11.9, 14.9, 17.2, 16.9, 14.2, 10.6, 6.8, 4.3), 7.5),
+    "Derby":               ((4.0, 4.2, 6.2, 8.6, 11.8, 14.7, 17.0, 16.7, 14.0, 10.5, 6.7, 4.2), 7.5),
+    # UK — North West & Yorkshire
+    "Manchester":          ((4.4, 4.6, 6.4, 8.7, 11.9, 14.6, 16.6, 16.3, 13.9, 10.6, 7.1, 4.6), 6.5),
+    "Leeds":               ((4.0, 4.3, 6.1, 8.4, 11.5, 14.3, 16.4, 16.1, 13.6, 10.2, 6.6, 4.2), 6.5),
+    "Sheffield":           ((4.3, 4.5, 6.4, 8.7, 11.8, 14.7, 16.9, 16.6, 14.0, 10.6, 7.0, 4.5), 6.5),
+    "Liverpool":           ((5.0, 5.1, 6.7, 8.9, 12.0, 14.7, 16.6, 16.5, 14.3, 11.2, 7.8, 5.3), 6.0),
+    "Bradford":            ((3.6, 3.8, 5.6, 7.9, 11.0, 13.8, 15.9, 15.6, 13.1, 9.8, 6.2, 3.8), 6.0),
+    # UK — North East & Scotland
+    "Newcastle upon Tyne": ((4.3, 4.6, 6.1, 8.1, 10.8, 13.6, 15.8, 15.6, 13.5, 10.3, 6.8, 4.5), 6.5),
+    "Sunderland":          ((4.4, 4.6, 6.0, 7.9, 10.4, 13.3, 15.6, 15.6, 13.5, 10.4, 6.9, 4.6), 6.0),
+    "Edinburgh":           ((4.0, 4.3, 5.8, 7.9, 10.6, 13.4, 15.2, 14.9, 12.9, 9.8, 6.5, 4.1), 7.0),
+    "Glasgow":             ((4.2, 4.5, 5.9, 8.1, 11.0, 13.7, 15.4, 15.0, 12.9, 9.8, 6.5, 4.2), 7.0),
+    "Aberdeen":            ((3.7, 4.0, 5.3, 7.0, 9.6, 12.3, 14.3, 14.2, 12.3, 9.3, 6.0, 3.8), 7.0),
+    "Dundee":              ((3.7, 4.1, 5.6, 7.6, 10.3, 13.1, 15.0, 14.7, 12.6, 9.4, 6.0, 3.8), 7.0),
+    # UK — Wales & Northern Ireland
+    "Cardiff":             ((5.4, 5.5, 7.2, 9.4, 12.5, 15.3, 17.2, 17.0, 14.6, 11.5, 8.0, 5.6), 7.0),
+    "Swansea":             ((5.8, 5.7, 7.1, 9.0, 12.0, 14.7, 16.5, 16.5, 14.5, 11.7, 8.4, 6.1), 6.0),
+    "Belfast":             ((4.6, 4.8, 6.3, 8.2, 10.9, 13.6, 15.3, 15.0, 13.0, 10.2, 6.9, 4.8), 7.0),
+    # Europe
+    "Paris":               ((5.0, 5.6, 8.8, 11.5, 15.2, 18.3, 20.5, 20.3, 16.9, 13.0, 8.3, 5.5), 8.0),
+    "Berlin":              ((0.9, 1.8, 5.0, 9.8, 14.4, 17.6, 19.8, 19.5, 15.2, 10.0, 5.3, 2.0), 8.0),
+    "Hamburg":             ((1.8, 2.3, 5.0, 9.0, 13.1, 16.2, 18.4, 18.1, 14.5, 10.0, 5.7, 2.8), 7.5),
+    "Munich":              ((0.3, 1.4, 5.2, 9.4, 13.6, 17.0, 18.9, 18.6, 14.5, 9.8, 4.6, 1.2), 9.0),
+    "Amsterdam":           ((3.7, 3.9, 6.4, 9.4, 13.0, 15.7, 17.9, 17.7, 14.7, 11.0, 7.1, 4.3), 7.0),
+    "Brussels":            ((3.6, 4.1, 7.0, 10.2, 13.9, 16.8, 18.8, 18.4, 15.2, 11.4, 7.1, 4.3), 7.5),
+    "Madrid":              ((6.3, 7.9, 11.2, 13.3, 17.2, 22.7, 26.0, 25.6, 21.0, 15.5, 10.1, 7.0), 12.0),
+    "Barcelona":           ((9.8, 10.5, 12.7, 14.9, 18.3, 22.2, 25.0, 25.4, 22.5, 18.9, 13.9, 10.8), 7.0),
+    "Rome":                ((8.1, 8.9, 11.3, 14.0, 18.2, 22.4, 25.2, 25.5, 21.6, 17.6, 12.6, 9.2), 11.0),
+    "Milan":               ((3.3, 5.2, 9.5, 13.2, 17.6, 21.8, 24.2, 23.5, 19.2, 14.1, 8.4, 4.0), 9.0),
+    "Stockholm":           ((-1.0, -1.3, 1.2, 5.9, 11.2, 15.4, 18.3, 17.1, 12.6, 7.4, 3.3, 0.4), 6.5),
+    "Oslo":                ((-3.1, -2.8, 0.6, 5.3, 10.7, 14.7, 17.3, 16.0, 11.4, 5.9, 1.3, -2.1), 7.0),
+    "Copenhagen":          ((1.4, 1.2, 3.1, 7.1, 11.5, 15.0, 17.6, 17.4, 13.9, 9.6, 5.6, 2.6), 6.0),
+    "Helsinki":            ((-3.8, -4.6, -1.6, 3.7, 9.7, 14.2, 17.4, 15.9, 11.2, 5.9, 1.7, -1.6), 6.5),
+    "Zurich":              ((0.8, 2.0, 5.5, 9.5, 13.5, 17.2, 19.0, 18.5, 14.6, 10.2, 5.0, 1.8), 8.0),
+    "Vienna":              ((0.6, 2.2, 6.2, 11.3, 15.8, 19.4, 21.5, 21.2, 16.3, 11.0, 5.7, 1.7), 8.0),
+    "Warsaw":              ((-1.5, -0.3, 3.4, 9.0, 14.1, 17.4, 19.3, 18.7, 13.8, 8.6, 3.6, -0.2), 8.5),
+    "Prague":              ((-0.4, 0.6, 4.1, 9.1, 13.7, 17.1, 19.0, 18.6, 14.2, 9.1, 4.3, 0.8), 8.5),
+    "Lisbon":              ((11.6, 12.6, 14.6, 15.8, 18.1, 21.2, 23.0, 23.6, 22.1, 19.0, 15.0, 12.5), 8.0),
+    # Global
+    "New York":            ((0.5, 1.6, 5.4, 11.4, 17.0, 22.1, 25.3, 24.6, 20.7, 14.4, 8.7, 3.4), 8.0),
+    "Chicago":             ((-4.6, -2.5, 3.1, 9.3, 15.1, 20.7, 23.6, 22.8, 18.5, 11.8, 4.8, -1.5), 9.0),
+    "Los Angeles":         ((14.4, 14.8, 15.8, 17.2, 18.6, 20.3, 22.4, 23.1, 22.6, 20.2, 16.9, 14.1), 9.0),
+    "Toronto":             ((-5.5, -4.5, -0.1, 6.7, 12.9, 18.3, 21.5, 20.8, 16.5, 9.7, 3.7, -2.2), 8.5),
+    "Dubai":               ((19.7, 20.9, 23.8, 27.8, 32.0, 34.0, 35.5, 35.8, 33.5, 30.0, 25.5, 21.5), 9.0),
+    "Mumbai":              ((24.4, 25.3, 27.3, 28.9, 30.3, 29.6, 28.0, 27.7, 27.9, 28.8, 27.7, 25.6), 7.0),
+    "Singapore":           ((26.5, 27.1, 27.7, 28.0, 28.4, 28.3, 27.9, 27.9, 27.6, 27.6, 27.0, 26.5), 6.5),
+    "Hong Kong":           ((16.3, 16.8, 19.1, 22.6, 25.9, 27.9, 28.8, 28.6, 27.7, 25.5, 21.8, 17.9), 5.0),
+    "Tokyo":               ((5.4, 6.1, 9.4, 14.3, 18.8, 21.9, 25.7, 26.9, 23.3, 18.0, 12.5, 7.7), 7.5),
+    "Sydney":              ((23.5, 23.4, 22.1, 19.5, 16.6, 14.2, 13.4, 14.5, 17.0, 19.0, 20.4, 22.1), 7.5),
+    "Melbourne":           ((21.0, 21.0, 19.2, 16.4, 13.6, 11.2, 10.6, 11.6, 13.4, 15.4, 17.6, 19.6), 10.0),
+}
+
+# IANA timezone of every non-UK city (UK cities use TMY_TIMEZONE)
+_CITY_TIMEZONES: dict[str, str] = {
+    "Paris": "Europe/Paris",          "Berlin": "Europe/Berlin",        "Hamburg": "Europe/Berlin",
+    "Munich": "Europe/Berlin",        "Amsterdam": "Europe/Amsterdam",  "Brussels": "Europe/Brussels",
+    "Madrid": "Europe/Madrid",        "Barcelona": "Europe/Madrid",     "Rome": "Europe/Rome",
+    "Milan": "Europe/Rome",           "Stockholm": "Europe/Stockholm",  "Oslo": "Europe/Oslo",
+    "Copenhagen": "Europe/Copenhagen", "Helsinki": "Europe/Helsinki",   "Zurich": "Europe/Zurich",
+    "Vienna": "Europe/Vienna",        "Warsaw": "Europe/Warsaw",        "Prague": "Europe/Prague",
+    "Lisbon": "Europe/Lisbon",        "New York": "America/New_York",   "Chicago": "America/Chicago",
+    "Los Angeles": "America/Los_Angeles", "Toronto": "America/Toronto", "Dubai": "Asia/Dubai",
+    "Mumbai": "Asia/Kolkata",         "Singapore": "Asia/Singapore",    "Hong Kong": "Asia/Hong_Kong",
+    "Tokyo": "Asia/Tokyo",            "Sydney": "Australia/Sydney",     "Melbourne": "Australia/Melbourne",
+}
+
+_PEAK_HOUR          = 15      # local hour of the diurnal maximum
+_DAILY_AR_PHI       = 0.7     # day-to-day persistence of weather anomalies
+_DAILY_ANOMALY_SD_C = 2.0     # °C
+
+_MONTH_HOURS = np.array(DAYS_IN_MONTH) * 24
+_MONTH_OF_HOUR = np.repeat(np.arange(12), _MONTH_HOURS)
+_MONTH_OF_DAY = np.repeat(np.arange(12), DAYS_IN_MONTH)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# STORE ACCESS
+# ─────────────────────────────────────────────────────────────────────────────
+@functools.lru_cache(maxsize=1)
+def _store() -> tuple[np.ndarray, dict[str, int], np.ndarray, np.ndarray, float, list[str]]:
+    """Memory-map the bundled array once per process."""
+    index = json.loads(TMY_INDEX_PATH.read_text(encoding="utf-8"))
+    data = np.load(TMY_ARRAY_PATH, mmap_mode="r")
+    cities = index["cities"]
+    if data.shape != (len(cities), HOURS_PER_YEAR):
+        raise ValueError(f"TMY store shape {data.shape} does not match its index.")
+    rows = {c["name"]: i for i, c in enumerate(cities)}
+    lats = np.array([c["lat"] for c in cities], dtype=float)
+    lons = np.array([c["lon"] for c in cities], dtype=float)
+    zones = [c.get("timezone", TMY_TIMEZONE) for c in cities]
+    return data, rows, lats, lons, float(index["scale"]), zones
+
+
+def _row(city: str) -> int:
+    rows = _store()[1]
+    if city not in rows:
+        raise ValueError(f"No typical-year weather for '{city}'.")
+    return rows[city]
+
+
+def available_cities() -> list[str]:
+    """City names present in the bundled store, in file order."""
+    return list(_store()[1])
+
+
+def hourly_temperatures(city: str) -> np.ndarray:
+    """8760 hourly typical-year temperatures (°C) for *city*, 1 Jan 00:00 onwards."""
+    data, _, _, _, scale, _ = _store()
+    return np.round(data[_row(city)] * scale, 1)
+
+
+def monthly_mean_temperatures(city: str) -> np.ndarray:
+    """12 calendar-month mean temperatures (°C) for *city*."""
+    return np.bincount(_MONTH_OF_HOUR, weights=hourly_temperatures(city), minlength=12) / _MONTH_HOURS
+
+
+def annual_mean_temperature(city: str) -> float:
+    """Annual mean typical-year temperature (°C), rounded to 0.1."""
+    return round(float(hourly_temperatures(city).mean()), 1)
+
+
+def nearest_city(lat: float, lon: float) -> str:
+    """Store city closest to (*lat*, *lon*) by great-circle distance."""
+    _, rows, lats, lons, _, _ = _store()
+    phi1, phi2 = math.radians(lat), np.radians(lats)
+    dphi = phi2 - phi1
+    dlmb = np.radians(lons - lon)
+    a = np.sin(dphi / 2) ** 2 + math.cos(phi1) * np.cos(phi2) * np.sin(dlmb / 2) ** 2
+    return list(rows)[int(np.argmin(a))]
+
+
+def city_coordinates(city: str) -> tuple[float, float]:
+    """(lat, lon) of a store city."""
+    _, _, lats, lons, _, _ = _store()
+    row = _row(city)
+    return float(lats[row]), float(lons[row])
+
+
+def city_timezone(city: str) -> str:
+    """IANA timezone whose local clock indexes *city*'s typical-year hours."""
+    return _store()[5][_row(city)]
+
+
+def _hour_of_year(when: datetime) -> int:
+    """Typical-year hour index of a local calendar hour (29 Feb reads 28 Feb)."""
+    day = when.timetuple().tm_yday - 1
+    if when.month > 2 and (when.year % 4 == 0 and (when.year % 100 != 0 or when.year % 400 == 0)):
+        day -= 1
+    elif when.month == 2 and when.day == 29:
+        day -= 1
+    return day * 24 + when.hour
+
+
+def temperature_at(city: str, when: datetime) -> float:
+    """
+    Typical-year temperature for the calendar hour of *when* (29 Feb reads
+    28 Feb).  A timezone-aware *when* (e.g. UTC) is converted to the city's
+    own timezone first; a naive one is taken as local time already.
+    """
+    if when.tzinfo is not None:
+        when = when.astimezone(ZoneInfo(city_timezone(city)))
+    data, _, _, _, scale, _ = _store()
+    return round(float(data[_row(city), _hour_of_year(when)]) * scale, 1)
+
+
+@functools.lru_cache(maxsize=64)
+def _utc_hour_index(zone: str) -> np.ndarray:
+    """Local typical-year hour read at each of the 8760 UTC hours of a non-leap year."""
+    tz = ZoneInfo(zone)
+    start = datetime(2023, 1, 1, tzinfo=timezone.utc)
+    return np.array([
+        _hour_of_year((start + timedelta(hours=h)).astimezone(tz)) for h in range(HOURS_PER_YEAR)
+    ]) % HOURS_PER_YEAR
+
+
+def hourly_temperatures_utc(city: str) -> np.ndarray:
+    """8760 typical-year temperatures (°C) for *city*, 1 Jan 00:00 UTC onwards."""
+    return hourly_temperatures(city)[_utc_hour_index(city_timezone(city))]
+
+
+def default_annual_temperature(lat: float | None = None, lon: float | None = None) -> float:
+    """
+    Annual mean temperature for the store city nearest (*lat*, *lon*), or
+    ``DEFAULT_TMY_CITY`` when no location is given.  Returns
+    ``FALLBACK_TEMP_C`` if the bundled store cannot be read.
+    """
+    try:
+        city = DEFAULT_TMY_CITY if lat is None or lon is None else nearest_city(lat, lon)
+        return annual_mean_temperature(city)
+    except (OSError, ValueError, KeyError):
+        return FALLBACK_TEMP_C
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# GENERATOR — rebuilds the bundled files from _MONTHLY_NORMALS
+# ─────────────────────────────────────────────────────────────────────────────
+def _daily_means(monthly: np.ndarray) -> np.ndarray:
+    """Smooth periodic daily curve whose calendar-month means equal *monthly*."""
+    starts = np.concatenate(([0], np.cumsum(DAYS_IN_MONTH)[:-1]))
+    mid = starts + np.array(DAYS_IN_MONTH) / 2.0
+    days = np.arange(365) + 0.5
+    xp = np.concatenate((mid - 365, mid, mid + 365))
+    target = monthly.copy()
+    for _ in range(20):
+        curve = np.interp(days, xp, np.tile(target, 3))
+        err = monthly - np.bincount(_MONTH_OF_DAY, weights=curve, minlength=12) / np.array(DAYS_IN_MONTH)
+        target += err
+    return curve
+
+
+def synthesise_city(name: str, monthly: tuple[float, ...], diurnal_range_c: float) -> np.ndarray:
+    """Deterministic 8760-hour series (°C) for one city."""
+    monthly_arr = np.asarray(monthly, dtype=float)
+    rng = np.random.default_rng(zlib.crc32(name.encode("utf-8")))
+
+    daily = _daily_means(monthly_arr)
+    anomaly = np.empty(366)
+    anomaly[0] = rng.normal(0.0, _DAILY_ANOMALY_SD_C)
+    innovation_sd = _DAILY_ANOMALY_SD_C * math.sqrt(1.0 - _DAILY_AR_PHI ** 2)
+    for d in range(1, 366):
+        anomaly[d] = _DAILY_AR_PHI * anomaly[d - 1] + rng.normal(0.0, innovation_sd)
+
+    hours = np.arange(HOURS_PER_YEAR)
+    day_pos = hours / 24.0
+    base = np.interp(day_pos, np.arange(365) + 0.5, daily, period=365)
+    weather = np.interp(day_pos, np.arange(366), anomaly)
+
+    # Larger diurnal swing in the warm season
+    span = monthly_arr.max() - monthly_arr.min()
+    warmth = (monthly_arr - monthly_arr.min()) / span if span > 0 else np.full(12, 0.5)
+    half_range = 0.5 * diurnal_range_c * (0.75 + 0.5 * warmth)[_MONTH_OF_HOUR]
+    diurnal = half_range * np.cos(2.0 * math.pi * ((hours % 24) - _PEAK_HOUR) / 24.0)
+
+    series = base + weather + diurnal
+    # Re-centre each month on its normal
+    month_mean = np.bincount(_MONTH_OF_HOUR, weights=series, minlength=12) / _MONTH_HOURS
+    return series + (monthly_arr - month_mean)[_MONTH_OF_HOUR]
+
+
+def build_store(out_dir: Path = TMY_DATA_DIR) -> Path:
+    """Regenerate the bundled array and index for every city in services.location.CITIES."""
+    from services.location import CITIES
+
+    missing = sorted(set(CITIES) - set(_MONTHLY_NORMALS))
+    if missing:
+        raise ValueError(f"No monthly normals for: {', '.join(missing)}")
+    missing = sorted(n for n, c in CITIES.items() if c.get("country") != "UK" and n not in _CITY_TIMEZONES)
+    if missing:
+        raise ValueError(f"No timezone for: {', '.join(missing)}")
+
+    names = list(CITIES)
+    data = np.stack([
+        np.round(synthesise_city(n, *_MONTHLY_NORMALS[n]) / _SCALE).astype(np.int16) for n in names
+    ])
+    out_dir.mkdir(parents=True, exist_ok=True)
+    np.save(out_dir / TMY_ARRAY_PATH.name, data)
+    index = {
+        "version": 2,
+        "units": "deci-degC",
+        "scale": _SCALE,
+        "hours": HOURS_PER_YEAR,
+        "source": "Synthesised from 1991-2020 monthly normals (services/tmy.py)",
+        "cities": [
+            {
+                "name": n, "lat": CITIES[n]["lat"], "lon": CITIES[n]["lon"],
+                "timezone": _CITY_TIMEZONES.get(n, TMY_TIMEZONE),
+            }
+            for n in names
+        ],
+    }
+    (out_dir / TMY_INDEX_PATH.name).write_text(json.dumps(index, indent=1) + "\n", encoding="utf-8")
+    _store.cache_clear()
+    return out_dir / TMY_ARRAY_PATH.name
+
+
+if __name__ == "__main__":
+    print(f"Wrote {build_store()}")
@@ -6,7 +6,8 @@
 #   1. Met Office DataPoint  — UK only, authoritative, free with registration
 #   2. OpenWeatherMap        — Global, free tier 1,000 req/day, key required
 #   3. Open-Meteo            — Global, fully free, no key, 10,000 req/day (default)
-#   4. Manual override       — Offline fallback; user-set temperature slider
+#   4. Manual override       — Offline fallback; user-set temperature, else the
+#                              bundled typical-year temperature (services.tmy)
 #
 # BYOK (Bring Your Own Key) model:
 #   API keys are supplied by the user/admin in the sidebar config panel.
@@ -24,6 +25,8 @@ import requests
 from datetime import datetime, timezone
 from typing import Optional
 
+from services import tmy
+
 
 class WeatherFetchError(RuntimeError):
     """Raised when all weather providers fail and manual fallback is unavailable."""
@@ -317,7 +320,7 @@ def get_weather(
     met_office_location:  str            = MET_OFFICE_LOCATION,
     openweathermap_key:   Optional[str]  = None,
     enable_fallback:      bool           = True,
-    manual_temp_c:        float          = 10.5,
+    manual_temp_c:        Optional[float] = None,
     force_refresh:        bool           = False,
 ) -> dict:
     """
@@ -343,7 +346,9 @@ def get_weather(
     met_office_location : Met Office site ID for the chosen location
     openweathermap_key  : OpenWeatherMap API key (BYOK)
     enable_fallback     : Fall back to next provider or Open-Meteo on failure
-    manual_temp_c       : Manual temperature when all APIs unavailable
+    manual_temp_c       : Manual temperature when all APIs unavailable; if None,
+                          the offline typical-year temperature for this hour
+                          at the nearest bundled city is used
     force_refresh       : Clear caches and fetch immediately
     """
     if force_refresh:
@@ -398,9 +403,16 @@ def get_weather(
                 break # drop to manual
 
     # ── Manual fallback (offline / all APIs down) ─────────────────────────
+    now = datetime.now(timezone.utc)
+    if manual_temp_c is None:
+        return _typical_year_weather(lat, lon, location_name, now)
+    return _manual_weather(manual_temp_c, location_name, now)
+
+
+def _manual_weather(temp_c: float, location_name: str, now: datetime) -> dict:
     return {
-        "temperature_c":   manual_temp_c,
-        "feels_like_c":    round(manual_temp_c - 2.0, 1),
+        "temperature_c":   temp_c,
+        "feels_like_c":    round(temp_c - 2.0, 1),
         "wind_speed_mph":  9.2,
         "wind_dir_deg":    225,
         "humidity_pct":    75,
@@ -409,14 +421,32 @@ def get_weather(
         "pressure_hpa":    1013.0,
         "condition":       "Manual override",
         "condition_icon":  "🌡️",
-        "source":          f"Manual input ({manual_temp_c}°C)",
+        "source":          f"Manual input ({temp_c}°C)",
         "source_url":      None,
         "is_live":         False,
-        "fetched_utc":     datetime.now(timezone.utc).isoformat(),
+        "fetched_utc":     now.isoformat(),
         "location_name":   f"{location_name} (manual override)",
     }
 
 
+def _typical_year_weather(lat: float, lon: float, location_name: str, now: datetime) -> dict:
+    """Offline reading from the bundled typical-year store (services.tmy)."""
+    try:
+        city = tmy.nearest_city(lat, lon)
+        temp_c = tmy.temperature_at(city, now)
+    except (OSError, ValueError, KeyError) as exc:
+        logger.warning("Typical-year store unavailable (%s).", type(exc).__name__)
+        return _manual_weather(tmy.FALLBACK_TEMP_C, location_name, now)
+    result = _manual_weather(temp_c, location_name, now)
+    result.update({
+        "condition":     "Typical year (offline)",
+        "condition_icon": "📅",
+        "source":        f"Typical-year data — {city} ({temp_c}°C)",
+        "location_name": f"{location_name} (offline typical year)",
+    })
+    return result
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # HELPERS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -0,0 +1,171 @@
+"""
+QA Test Suite — core/calibration.py meter calibration
+======================================================
+Readings generated by the hourly physics engine from known parameters must
+be fitted back to the same heat-loss coefficient and base load at monthly,
+hourly and half-hourly resolution; bounds, missing readings and invalid
+rows must be handled; and a calibrated asset must reproduce its metered
+baseline in the physics engine while its base load survives every scenario.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.calibration as calibration
+import core.physics as physics
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+from core.agent import _store_calibration, execute_tool
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+DECLARED = list(BUILDINGS.values())
+TRUE_FACTOR, TRUE_ACH, TRUE_BASE = 1.4, 0.8, 30.0
+TRUTH = [
+    {**b, "baseline_energy_mwh": 0.0, "air_change_rate": TRUE_ACH, "base_load_mwh": TRUE_BASE,
+     **{k: b[k] * TRUE_FACTOR for k in ("u_value_wall", "u_value_roof", "u_value_glazing")}}
+    for b in DECLARED
+]
+
+
+def _metered(steps: int, truth=TRUTH) -> tuple[np.ndarray, np.ndarray]:
+    """Hourly model readings (summed into months when *steps* is 12) and the hourly temperatures."""
+    temps = calibration.default_temperatures()
+    hourly = physics.simulate_thermal_series(physics.building_columns(truth), temps)["baseline_mwh"]
+    return (physics.series_to_monthly(hourly) if steps == 12 else hourly), temps
+
+
+def _hlc(rows, fit=None) -> np.ndarray:
+    if fit is not None:
+        rows = [{**b, **{f: fit[f][i] for f in ("u_value_wall", "u_value_roof", "u_value_glazing", "air_change_rate")}}
+                for i, b in enumerate(rows)]
+    return physics.heat_loss_coefficient(physics.building_columns(rows))
+
+
+class TestFit:
+    @pytest.mark.parametrize("steps", [12, 8760])
+    def test_recovers_heat_loss_and_base_load(self, steps):
+        meter, temps = _metered(steps)
+        fit = calibration.calibrate_batch(physics.building_columns(DECLARED), meter, temps)
+        np.testing.assert_allclose(_hlc(DECLARED, fit), _hlc(TRUTH), rtol=1e-3)
+        np.testing.assert_allclose(fit["base_load_mwh"], TRUE_BASE, rtol=0.02)
+        np.testing.assert_allclose(fit["baseline_energy_mwh"], meter.sum(axis=1), rtol=1e-3)
+        assert fit["meets_guideline_14"].all()
+        assert ((fit["heating_fraction"] > 0) & (fit["heating_fraction"] < 1)).all()
+
+    def test_monthly_round_trip_uses_hourly_degree_hours(self):
+        truth = [{**b, "base_load_mwh": 60.0} for b in TRUTH]
+        meter, _ = _metered(12, truth)
+        # Default temperatures: the hourly typical year, summed per month
+        fit = calibration.calibrate_batch(physics.building_columns(DECLARED), meter)
+        np.testing.assert_allclose(fit["base_load_mwh"], 60.0, rtol=0.01)
+        np.testing.assert_allclose(_hlc(DECLARED, fit), _hlc(truth), rtol=1e-3)
+        # Summer heating from cool hours survives into the monthly fit
+        np.testing.assert_allclose(fit["fitted_mwh"][:, 5:8], meter[:, 5:8], rtol=0.01)
+        with pytest.raises(ValueError, match="temperatures_c"):
+            calibration.calibrate_batch(physics.building_columns(DECLARED), meter, np.zeros(24))
+
+    def test_split_follows_prior(self):
+        meter, temps = _metered(12)
+        fit = calibration.calibrate_batch(physics.building_columns(DECLARED), meter, temps)
+        # Extra heat loss is shared between fabric and ventilation, never against the data
+        assert (fit["fabric_factor"] > 1.0).all() and (fit["air_change_rate"] > 0.5).all()
+        np.testing.assert_allclose(fit["u_value_wall"] / [b["u_value_wall"] for b in DECLARED], fit["fabric_factor"])
+
+    def test_half_hourly_and_missing_readings(self):
+        meter, temps = _metered(8760)
+        half = np.repeat(meter / 2.0, 2, axis=1)
+        half[:, :2000] = np.nan
+        fit = calibration.calibrate_batch(physics.building_columns(DECLARED), half, temps)
+        np.testing.assert_allclose(_hlc(DECLARED, fit), _hlc(TRUTH), rtol=1e-3)
+        assert (fit["n_readings"] == 8760 - 1000).all()
+
+    def test_bounds_hold(self):
+        meter, temps = _metered(12)
+        fit = calibration.calibrate_batch(physics.building_columns(DECLARED), meter * 40.0, temps)
+        assert (fit["fabric_factor"] <= calibration.FABRIC_FACTOR_LIMITS[1] + 1e-9).all()
+        assert (fit["air_change_rate"] <= physics.MAX_AIR_CHANGE_RATE + 1e-9).all()
+        flat = calibration.calibrate_batch(physics.building_columns(DECLARED), np.full(meter.shape, 1.0), temps)
+        assert (flat["base_load_mwh"] >= 0).all()
+        assert (flat["air_change_rate"] >= calibration.MIN_AIR_CHANGE_RATE - 1e-9).all()
+        assert (flat["fabric_factor"] >= calibration.FABRIC_FACTOR_LIMITS[0] - 1e-9).all()
+
+    def test_invalid_rows(self):
+        meter, temps = _metered(12)
+        rows = DECLARED[:2] + [{**DECLARED[0], "u_value_wall": -1.0}]
+        meter = np.vstack([meter[:2], meter[:1]])
+        with pytest.raises(ValueError, match="u_value_wall"):
+            calibration.calibrate_batch(physics.building_columns(rows), meter, temps)
+        fit = calibration.calibrate_batch(physics.building_columns(rows), meter, temps, strict=False)
+        assert fit["valid"].tolist() == [True, True, False]
+        assert np.isnan(fit["fabric_factor"][2])
+        sparse = np.where(np.arange(12) < 4, meter[:1], np.nan)
+        with pytest.raises(ValueError, match="readings"):
+            calibration.calibrate_batch(physics.building_columns(DECLARED[:1]), sparse, temps)
+        with pytest.raises(ValueError):
+            calibration.meter_steps(np.arange(24.0))
+
+
+class TestAssets:
+    def test_calibrated_asset_in_physics(self):
+        meter, _ = _metered(12)
+        names = list(BUILDINGS)
+        assets = calibration.calibrate_assets(BUILDINGS, {n: meter[i] for i, n in enumerate(names)})
+        name = names[0]
+        asset = assets[name]
+        assert asset["baseline_energy_mwh"] == pytest.approx(meter[0].sum(), rel=1e-3)
+        assert asset["calibration"]["prior"]["u_value_wall"] == BUILDINGS[name]["u_value_wall"]
+
+        weather = {"temperature_c": 10.5}
+        base = physics.calculate_thermal_load(asset, SCENARIOS["Baseline (No Intervention)"], weather)
+        assert base["baseline_energy_mwh"] == pytest.approx(asset["baseline_energy_mwh"], abs=0.1)
+        # Draught-proofing every window and door cannot remove the base load
+        sealed = {**SCENARIOS["Baseline (No Intervention)"], "infiltration_reduction": 0.95,
+                  "u_wall_factor": 0.01, "u_roof_factor": 0.01, "u_glazing_factor": 0.01, "install_cost_gbp": 1.0}
+        assert physics.calculate_thermal_load(asset, sealed, weather)["scenario_energy_mwh"] >= asset["base_load_mwh"] - 0.1
+
+        # Re-calibrating starts from the declared values again
+        again = calibration.calibrate_assets({name: asset}, {name: meter[0]})[name]
+        assert again["calibration"]["prior"] == asset["calibration"]["prior"]
+        assert again["u_value_wall"] == pytest.approx(asset["u_value_wall"])
+
+    def test_base_load_consistent_across_engines(self):
+        asset = {**DECLARED[0], "air_change_rate": 0.9, "base_load_mwh": 0.3 * DECLARED[0]["baseline_energy_mwh"]}
+        scenario = SCENARIOS["Glazing Upgrade"]
+        scalar = physics.calculate_thermal_load(asset, scenario, {"temperature_c": 10.5})
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns([asset]), physics.scenario_columns([scenario]), 10.5
+        )
+        assert physics.thermal_load_record(grid, 0, 0) == scalar
+        with pytest.raises(ValueError, match="base_load_mwh"):
+            physics.calculate_thermal_load({**asset, "base_load_mwh": 1e6}, scenario, {"temperature_c": 10.5})
+
+    def test_agent_tool(self):
+        meter, _ = _metered(12)
+        name = next(iter(BUILDINGS))
+        out = execute_tool("calibrate_building", {"building_name": name, "monthly_mwh": meter[0].tolist()},
+                           BUILDINGS, SCENARIOS)
+        assert out["meets_guideline_14"] is True
+        assert out["declared"]["u_value_wall"] == BUILDINGS[name]["u_value_wall"]
+        assert "error" in execute_tool("calibrate_building", {"building_name": name, "monthly_mwh": [1.0]},
+                                       BUILDINGS, SCENARIOS)
+
+        # The agent loop saves the fit onto the session portfolio entry
+        portfolio = [{**BUILDINGS[name], "name": name, "id": "a1"}]
+        entry = portfolio[0]
+        _store_calibration(portfolio, out)
+        assert portfolio[0] is entry and entry["id"] == "a1"
+        assert entry["u_value_wall"] == out["u_value_wall"]
+        assert entry["base_load_mwh"] == out["base_load_mwh"]
+        assert entry["calibration"]["prior"]["u_value_wall"] == BUILDINGS[name]["u_value_wall"]
@@ -0,0 +1,133 @@
+"""
+QA Test Suite — services/carbon_intensity.py grid carbon factors
+=================================================================
+The bundled location series must match the published 2023 factor and the
+projected trajectory; the half-hourly shape must average to the annual
+factor; cumulative sums must agree with a brute-force loop inside and
+outside the table; and SECR and agent callers must keep their defaults.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from app.compliance import calculate_carbon_baseline
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.constants import CI_ELECTRICITY, CI_GAS, GRID_CARBON_TRAJECTORY, HEATING_MONTHLY_PROFILE
+from config.scenarios import SCENARIOS
+from core.agent import execute_tool
+from services import carbon_intensity as ci
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+
+
+class TestAnnualFactors:
+    def test_location_history_and_trajectory(self):
+        assert ci.annual_factor(2023) == pytest.approx(CI_ELECTRICITY)
+        for year, factor in GRID_CARBON_TRAJECTORY.items():
+            assert ci.annual_factor(year) == pytest.approx(factor)
+
+    def test_clamped_and_vectorised(self):
+        table = ci.annual_table()
+        first, last = min(table), max(table)
+        assert ci.annual_factor(first - 10) == table[first]
+        assert ci.annual_factor(last + 10) == table[last]
+        np.testing.assert_allclose(ci.annual_factor([2025, 2030]), [table[2025], table[2030]])
+
+    def test_marginal_exceeds_location_as_grid_decarbonises(self):
+        assert ci.annual_factor(2030, "marginal") > ci.annual_factor(2030, "location")
+
+    def test_unknown_basis_rejected(self):
+        with pytest.raises(ValueError, match="basis"):
+            ci.annual_factor(2030, "market")
+
+
+class TestShape:
+    @pytest.mark.parametrize("basis", ci.BASES)
+    def test_curve_means_to_annual_factor(self, basis):
+        hh = ci.half_hourly_factors(2030, basis)
+        assert hh.shape == (ci.HALF_HOURS_PER_YEAR,)
+        assert hh.mean() == pytest.approx(ci.annual_factor(2030, basis))
+        assert ci.hourly_factors(2030, basis).mean() == pytest.approx(hh.mean())
+        days = np.array([31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30, 31])
+        monthly = ci.monthly_factors(2030, basis)
+        assert (monthly * days).sum() / days.sum() == pytest.approx(hh.mean())
+
+    def test_profile_weight(self):
+        assert ci.profile_weight(np.ones(12)) == pytest.approx(1.0, abs=0.01)
+        assert ci.profile_weight(np.ones(8760)) == pytest.approx(1.0)
+        # Heating load is winter-weighted, and winter is the dirtier season
+        assert ci.profile_weight(HEATING_MONTHLY_PROFILE) > 1.0
+        np.testing.assert_allclose(ci.profile_weight(np.zeros((3, 12))), 1.0)
+
+    def test_carbon_kg_profile_matches_stepwise(self):
+        rng = np.random.default_rng(1)
+        load = rng.uniform(0, 3, (4, 8760))
+        np.testing.assert_allclose(
+            ci.carbon_kg(load, 2028), load @ ci.hourly_factors(2028), rtol=1e-9
+        )
+        assert ci.carbon_kg(1000.0, 2028, profile=False) == pytest.approx(1000.0 * ci.annual_factor(2028))
+
+
+class TestLifetime:
+    @pytest.mark.parametrize("basis", ci.BASES)
+    def test_factor_sum_matches_loop(self, basis):
+        table = ci.annual_table(basis)
+        first, last = min(table), max(table)
+        for start, end in [(2025, 2035), (first - 3, first + 2), (last - 1, last + 5), (first - 5, last + 5)]:
+            expected = sum(ci.annual_factor(y, basis) for y in range(start, end + 1))
+            assert ci.factor_sum(start, end, basis) == pytest.approx(expected)
+        np.testing.assert_allclose(
+            ci.factor_sum([2025, 2030], [2030, 2030], basis),
+            [ci.factor_sum(2025, 2030, basis), ci.annual_factor(2030, basis)],
+        )
+        with pytest.raises(ValueError):
+            ci.factor_sum(2030, 2029, basis)
+
+    def test_lifetime_carbon_with_profile(self):
+        flat = ci.lifetime_carbon_t(10_000.0, 2025, 2035)
+        assert flat == pytest.approx(10.0 * sum(GRID_CARBON_TRAJECTORY.values()))
+        heated = ci.lifetime_carbon_t(10_000.0, 2025, 2035, profile_kwh=HEATING_MONTHLY_PROFILE)
+        assert heated == pytest.approx(flat * ci.profile_weight(HEATING_MONTHLY_PROFILE))
+
+
+class TestCallers:
+    def test_secr_default_unchanged(self):
+        res = calculate_carbon_baseline(elec_kwh=1_000_000)
+        assert res["scope2_tco2e"] == pytest.approx(CI_ELECTRICITY * 1000.0)
+        assert res["scope2_basis"] == "location"
+
+    def test_secr_reporting_year_and_basis(self):
+        res = calculate_carbon_baseline(elec_kwh=1_000_000, reporting_year=2030)
+        assert res["scope2_tco2e"] == pytest.approx(GRID_CARBON_TRAJECTORY[2030] * 1000.0)
+        marginal = calculate_carbon_baseline(elec_kwh=1_000_000, reporting_year=2030, basis="marginal")
+        assert marginal["scope2_tco2e"] > res["scope2_tco2e"]
+        assert marginal["scope2_basis"] == "marginal"
+
+    def test_agent_lifetime_carbon(self):
+        name = next(iter(BUILDINGS))
+        args = {"building_name": name, "scenario_name": "Fabric Upgrade (Insulation)"}
+        location = execute_tool("lifetime_carbon", args, BUILDINGS, SCENARIOS)
+        marginal = execute_tool("lifetime_carbon", {**args, "basis": "marginal"}, BUILDINGS, SCENARIOS)
+        assert location["saving_tco2e"] > 0
+        assert marginal["saving_tco2e"] > location["saving_tco2e"]
+        assert "error" in execute_tool("lifetime_carbon", {**args, "basis": "market"}, BUILDINGS, SCENARIOS)
+
+    def test_agent_lifetime_carbon_keeps_gas_factor(self):
+        name = next(iter(BUILDINGS))
+        gas = {name: {**BUILDINGS[name], "heating_system": "gas_boiler"}}
+        args = {"building_name": name, "scenario_name": "Baseline (No Intervention)"}
+        out = execute_tool("lifetime_carbon", args, gas, SCENARIOS)
+        expected = 11 * BUILDINGS[name]["baseline_energy_mwh"] * CI_GAS
+        assert out["baseline_tco2e"] == pytest.approx(expected, abs=0.1)
@@ -0,0 +1,134 @@
+"""
+QA Test Suite — core/cashflow.py asset × scenario × year cash-flow model
+=========================================================================
+Neutral assumptions must reproduce the flat level-annuity model, each
+extra assumption must move the flows the way its definition says, and
+repeated assumption sets must be served from the model's cache.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+from core.cashflow import CashFlowModel, cash_flow_matrix, normalise_assumptions
+from core.finance import annuity_factor
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+
+
+def _grid():
+    # Two assets × two scenarios: fabric only, and a mostly-PV measure
+    return {
+        "install_cost_gbp":  np.array([[20_000.0, 8_000.0], [30_000.0, 8_000.0]]),
+        "annual_saving_gbp": np.array([[3_000.0, 1_400.0], [2_500.0, 1_400.0]]),
+        "energy_saving_mwh": np.array([[10.0, 5.0], [9.0, 5.0]]),
+        "renewable_mwh":     np.array([[0.0, 5.0], [0.0, 5.0]]),
+    }
+
+
+class TestMatrix:
+    def test_neutral_assumptions_match_level_model(self):
+        g = _grid()
+        res = CashFlowModel(g).evaluate({"discount_rate": 0.04, "term_years": 12})
+        assert res["flows"].shape == (2, 2, 13)
+        np.testing.assert_allclose(
+            res["npv_gbp"], g["annual_saving_gbp"] * annuity_factor(0.04, 12) - g["install_cost_gbp"]
+        )
+        # Level flows discount to zero at the IRR
+        np.testing.assert_allclose(
+            g["annual_saving_gbp"] * annuity_factor(res["irr"], 12), g["install_cost_gbp"], rtol=1e-8
+        )
+        np.testing.assert_allclose(res["payback_years"], g["install_cost_gbp"] / g["annual_saving_gbp"])
+
+    def test_escalation_and_degradation(self):
+        flows = cash_flow_matrix(_grid(), {"energy_price_escalation": 0.03, "pv_degradation": 0.01})
+        fabric, pv = flows[0, 0], flows[0, 1]
+        assert fabric[5] == pytest.approx(3_000.0 * 1.03 ** 4)
+        assert pv[5] == pytest.approx(1_400.0 * 1.03 ** 4 * 0.99 ** 4)
+
+    def test_loan_at_discount_rate_is_npv_neutral(self):
+        model = CashFlowModel(_grid())
+        flat = model.evaluate({"discount_rate": 0.06})
+        for loan_term in (5, 10, 20):
+            levered = model.evaluate({
+                "discount_rate": 0.06, "loan_fraction": 0.7, "loan_rate": 0.06, "loan_term_years": loan_term,
+            })
+            np.testing.assert_allclose(levered["npv_gbp"], flat["npv_gbp"], atol=1e-6)
+            assert levered["flows"][0, 0, 0] == pytest.approx(-0.3 * 20_000)
+
+    def test_full_expensing_returns_tax_on_capex(self):
+        g = _grid()
+        taxed = cash_flow_matrix(g, {"corporation_tax_rate": 0.25, "first_year_allowance": 1.0})
+        pre_tax = cash_flow_matrix(g)
+        # Year 1: saving taxed, plus relief on the whole capex
+        np.testing.assert_allclose(
+            taxed[..., 1], 0.75 * pre_tax[..., 1] + 0.25 * g["install_cost_gbp"]
+        )
+        # Allowances over an infinite horizon never exceed the capex
+        wda = cash_flow_matrix(g, {"corporation_tax_rate": 1.0, "term_years": 200, "writing_down_rate": 0.18})
+        relief = (wda[..., 1:] - cash_flow_matrix(g, {"corporation_tax_rate": 1.0, "term_years": 200,
+                                                        "writing_down_rate": 0.0})[..., 1:]).sum(axis=-1)
+        np.testing.assert_allclose(relief, g["install_cost_gbp"], rtol=1e-6)
+
+    def test_maintenance_and_salvage(self):
+        flows = cash_flow_matrix(_grid(), {"maintenance_pct_capex": 0.02, "salvage_pct_capex": 0.1})
+        assert flows[0, 0, 1] == pytest.approx(3_000.0 - 400.0)
+        assert flows[0, 0, -1] == pytest.approx(3_000.0 - 400.0 + 2_000.0)
+
+
+class TestAssumptions:
+    def test_cache_serves_repeated_sets(self):
+        model = CashFlowModel(_grid())
+        first = model.evaluate({"energy_price_escalation": 0.02})
+        model.evaluate({})
+        again = model.evaluate({"energy_price_escalation": 0.02})
+        assert again is first
+        assert model.cache_info()["hits"] == 1
+
+    @pytest.mark.parametrize("bad", [
+        {"term_years": 0}, {"term_years": 2.5}, {"loan_fraction": 1.5},
+        {"discount_rate": -1.0}, {"maintenance_pct_capex": -0.1}, {"bogus": 1.0},
+    ])
+    def test_invalid_assumptions_rejected(self, bad):
+        with pytest.raises(ValueError):
+            normalise_assumptions(bad)
+
+    def test_tariff_reprices_savings_without_physics(self):
+        g = _grid()
+        model = CashFlowModel(g)
+        res = model.evaluate({}, tariff_gbp_per_kwh=0.30)
+        np.testing.assert_allclose(res["annual_saving_gbp"], g["energy_saving_mwh"] * 300.0)
+        np.testing.assert_allclose(res["flows"][..., 1], g["energy_saving_mwh"] * 300.0)
+        assert model.evaluate({}, tariff_gbp_per_kwh=0.30) is res
+        assert model.evaluate({}) is not res
+        with pytest.raises(ValueError, match="tariff"):
+            model.evaluate({}, tariff_gbp_per_kwh=0.0)
+
+    def test_tariff_leaves_gas_savings_at_fuel_price(self):
+        building = {**next(iter(BUILDINGS.values())), "base_load_mwh": 20.0}
+        rows = [building, {**building, "heating_system": "gas_boiler"}]
+        scenarios = [SCENARIOS["Fabric Upgrade (Insulation)"], SCENARIOS["Renewables (Solar PV)"]]
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(rows), physics.scenario_columns(scenarios), 10.5, 0.28
+        )
+        res = CashFlowModel(grid).evaluate({}, tariff_gbp_per_kwh=0.28)
+        np.testing.assert_allclose(res["annual_saving_gbp"], grid["annual_saving_gbp"], rtol=1e-9)
+        dearer = CashFlowModel(grid).evaluate({}, tariff_gbp_per_kwh=0.56)["annual_saving_gbp"]
+        # Electric heating doubles; gas fabric savings keep the gas price; PV savings are electricity on both
+        assert dearer[0, 0] == pytest.approx(2 * grid["annual_saving_gbp"][0, 0])
+        assert dearer[1, 0] == pytest.approx(grid["annual_saving_gbp"][1, 0])
+        assert dearer[1, 1] == pytest.approx(2 * grid["annual_saving_gbp"][1, 1])
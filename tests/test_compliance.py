@@ -3,18 +3,34 @@
 # © 2026 Aparajita Parihar. All rights reserved.
 # ═══════════════════════════════════════════════════════════════════════════════
 
+import time
+
+import numpy as np
+import pandas as pd
 import pytest
 from app.compliance import (
+    ComplianceStore,
+    asset_content_key,
+    asset_store_key,
+    meter_sites,
+    band_index,
+    epc_inputs,
+    epc_recommendation,
     estimate_epc_rating,
+    estimate_epc_rating_batch,
     mees_gap_analysis,
     secr_carbon_baseline,
     part_l_check,
+    part_l_compliance_check,
+    part_l_compliance_check_batch,
+    part_l_details,
     validate_energy_kwh,
     validate_floor_area,
     validate_u_value,
     MEES_MEASURES,
 )
 from config.constants import EPC_BANDS
+from core.secr import aggregate_meter_data
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -151,6 +167,207 @@ class TestEstimateEpcRating:
         assert len(result["recommendation"]) > 0
 
 
+class TestEstimateEpcRatingBatch:
+    """Tests for estimate_epc_rating_batch() against the scalar estimate."""
+
+    @staticmethod
+    def _inputs(n, seed=0):
+        rng = np.random.default_rng(seed)
+        return {
+            "floor_area_m2":     rng.uniform(20, 5_000, n),
+            "annual_energy_kwh": rng.uniform(0, 2_000_000, n),
+            "u_wall":            rng.uniform(0.1, 3.0, n),
+            "u_roof":            rng.uniform(0.1, 3.0, n),
+            "u_glazing":         rng.uniform(0.8, 5.5, n),
+            "glazing_ratio":     rng.uniform(0.05, 0.9, n),
+        }
+
+    # Every row matches the scalar function, for both building types
+    @pytest.mark.parametrize("building_type", ["commercial", "residential"])
+    def test_matches_scalar(self, building_type):
+        inputs = self._inputs(300)
+        batch = estimate_epc_rating_batch(**inputs, building_type=building_type)
+        for i in range(300):
+            scalar = estimate_epc_rating(**{k: float(v[i]) for k, v in inputs.items()}, building_type=building_type)
+            for key in ("sap_score", "epc_band", "epc_colour", "eui_kwh_m2", "mees_compliant_now",
+                        "mees_2028_compliant", "mees_gap_bands"):
+                assert batch[key][i] == scalar[key], key
+
+    # Band search agrees with the threshold table at every boundary
+    def test_band_boundaries(self):
+        thresholds = [b["threshold"] for b in EPC_BANDS]
+        assert band_index(thresholds).tolist() == list(range(7))
+        assert band_index(np.array(thresholds[:-1]) - 0.01).tolist() == list(range(1, 7))
+        assert band_index([0.5, 100.0]).tolist() == [6, 0]
+
+    # Invalid rows raise the scalar message, or are masked
+    def test_invalid_rows(self):
+        inputs = self._inputs(3)
+        inputs["floor_area_m2"][1] = -10.0
+        with pytest.raises(ValueError, match="(?i)floor area"):
+            estimate_epc_rating_batch(**inputs)
+        res = estimate_epc_rating_batch(**inputs, strict=False)
+        assert res["valid"].tolist() == [True, False, True]
+        assert np.isnan(res["sap_score"][1]) and res["epc_band"][1] == ""
+        assert not res["mees_compliant_now"][1]
+
+    # Portfolio assets pack into the batch inputs
+    def test_epc_inputs_from_assets(self):
+        asset = {"floor_area_m2": 500, "baseline_energy_mwh": 72, "u_value_wall": 0.5,
+                 "u_value_roof": 0.3, "u_value_glazing": 2.0, "glazing_ratio": 0.4}
+        res = estimate_epc_rating_batch(**epc_inputs([asset]))
+        scalar = estimate_epc_rating(500, 72_000, 0.5, 0.3, 2.0, 0.4)
+        assert res["sap_score"][0] == scalar["sap_score"]
+        assert epc_recommendation(res["epc_band"][0]) == scalar["recommendation"]
+
+    # A 10k-unit landlord book screens well inside a second
+    def test_ten_thousand_units_sub_second(self):
+        inputs = self._inputs(10_000)
+        start = time.perf_counter()
+        res = estimate_epc_rating_batch(**inputs)
+        assert time.perf_counter() - start < 1.0
+        assert res["sap_score"].shape == (10_000,)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# COMPLIANCE RESULT STORE
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestComplianceStore:
+    """Tests for ComplianceStore incremental recomputation."""
+
+    @staticmethod
+    def _assets(n, seed=0):
+        rng = np.random.default_rng(seed)
+        return {
+            f"Unit {i}": {
+                "floor_area_m2":       float(rng.uniform(50, 3_000)),
+                "baseline_energy_mwh": float(rng.uniform(5, 600)),
+                "u_value_wall":        float(rng.uniform(0.15, 2.5)),
+                "u_value_roof":        float(rng.uniform(0.1, 2.0)),
+                "u_value_glazing":     float(rng.uniform(1.0, 5.0)),
+                "glazing_ratio":       float(rng.uniform(0.1, 0.6)),
+                "postcode":            f"RG{i} 1AA",
+            }
+            for i in range(n)
+        }
+
+    @staticmethod
+    def _fresh(assets, building_type="commercial"):
+        store = ComplianceStore()
+        store.sync(assets, building_type)
+        return store.aggregates()
+
+    # Results equal the one-shot scalar functions
+    def test_results_match_scalar(self):
+        assets = self._assets(20)
+        store = ComplianceStore()
+        store.sync(assets)
+        for name, a in assets.items():
+            scalar = estimate_epc_rating(a["floor_area_m2"], a["baseline_energy_mwh"] * 1000, a["u_value_wall"],
+                                         a["u_value_roof"], a["u_value_glazing"], a["glazing_ratio"])
+            r = store.result(name)
+            assert r["epc"]["sap_score"] == scalar["sap_score"]
+            assert r["epc"]["epc_band"] == scalar["epc_band"]
+            if scalar["mees_2028_compliant"]:
+                assert r["mees_gap"] is None
+            else:
+                assert r["mees_gap"] == mees_gap_analysis(scalar["sap_score"], "C")
+        totals = store.aggregates()
+        assert totals["below_target"] == sum(r["mees_gap"] is not None for r in store.results().values())
+        assert totals["gap_cost_low"] == sum(r["mees_gap"]["total_cost_low"]
+                                             for r in store.results().values() if r["mees_gap"])
+
+    # A rerun with one asset changed recomputes only that asset
+    def test_only_dirty_assets_recomputed(self):
+        assets = self._assets(50)
+        store = ComplianceStore()
+        assert len(store.sync(assets)) == 50
+        assert store.sync(assets) == []
+        assets["Unit 7"] = {**assets["Unit 7"], "u_value_wall": 0.2}
+        assets["Unit 9"] = {**assets["Unit 9"], "postcode": "SW1A 1AA"}   # cosmetic only
+        assert store.sync(assets) == ["Unit 7"]
+        assert store.info()["computed"] == 51
+
+    # Aggregates track a full recompute through update, remove and sync
+    def test_aggregates_incremental(self):
+        assets = self._assets(40, seed=3)
+        store = ComplianceStore()
+        store.sync(assets)
+        store.update("Unit 3", {**assets["Unit 3"], "baseline_energy_mwh": 1.0})
+        assets["Unit 3"] = {**assets["Unit 3"], "baseline_energy_mwh": 1.0}
+        store.remove("Unit 5")
+        del assets["Unit 5"]
+        assert store.aggregates() == self._fresh(assets)
+        del assets["Unit 6"]
+        assets["New"] = {**assets["Unit 0"], "u_value_roof": 3.0}
+        assets["Bad"] = {**assets["Unit 0"], "floor_area_m2": -1.0}
+        store.sync(assets)
+        assert store.aggregates() == self._fresh(assets)
+        assert store.result("Bad")["epc"] is None and store.result("Bad")["part_l"] is None
+        assert store.aggregates()["rated"] == len(assets) - 1
+
+    # Identical inputs share one entry, which is dropped with its last asset
+    def test_identical_assets_share_entry(self):
+        a = self._assets(1)["Unit 0"]
+        store = ComplianceStore()
+        assert store.update("A", a)
+        assert not store.update("B", {**a, "postcode": "EC1A 1BB"})
+        assert store.info() == {"assets": 2, "entries": 1, "computed": 1, "reused": 1}
+        store.remove("A")
+        assert store.info()["entries"] == 1 and store.aggregates()["assets"] == 1
+        store.remove("B")
+        assert store.info()["entries"] == 0 and store.aggregates() == self._fresh({})
+
+    # Building type picks the Part L targets; EPC ratings keep the default type
+    def test_building_type_only_changes_part_l(self):
+        assets = self._assets(20, seed=5)
+        inputs = epc_inputs(assets.values())
+        default = estimate_epc_rating_batch(**inputs, strict=False)
+        store = ComplianceStore()
+        store.sync(assets, "individual_selfbuild")
+        commercial = ComplianceStore()
+        commercial.sync(assets)
+        for i, name in enumerate(assets):
+            assert store.result(name)["epc"]["sap_score"] == default["sap_score"][i]
+            assert store.result(name)["mees_gap"] == commercial.result(name)["mees_gap"]
+        assert any(store.result(n)["part_l"] != commercial.result(n)["part_l"] for n in assets)
+
+    # Portfolio assets are stored by id, so same-named assets stay apart
+    def test_same_named_assets_kept_apart(self):
+        a = self._assets(2)
+        portfolio = [{**a["Unit 0"], "id": "a1", "name": "Unit"}, {**a["Unit 1"], "id": "a2", "name": "Unit"},
+                     {**a["Unit 1"], "name": "Unit"}]
+        store = ComplianceStore()
+        store.sync({asset_store_key(x, i): x for i, x in enumerate(portfolio)})
+        assert store.names() == ["a1", "a2", "slot-2"]
+        assert store.aggregates()["assets"] == 3
+
+    # Meter files name sites as users do, not by store key
+    def test_meter_sites_match_asset_names(self):
+        buildings = {
+            "univ_lib_01": {"name": "Library", "display_name": "Main Library", "floor_area_m2": 2000.0},
+            "slot-1": {"name": "Gym", "floor_area_m2": 500.0},
+        }
+        sites = meter_sites(buildings)
+        assert set(sites) == {"Main Library", "Library", "univ_lib_01", "Gym", "slot-1"}
+        readings = pd.DataFrame({
+            "site": ["Main Library", "Gym"], "fuel": ["electricity", "gas"],
+            "kwh": [100_000.0, 50_000.0], "year": [2024, 2024],
+        })
+        out = aggregate_meter_data(readings, sites)["sites"].set_index("site")
+        assert out.loc["Main Library", "floor_area_m2"] == 2000.0
+        assert out["intensity_kgco2_m2"].notna().all()
+
+    # Building type is part of the key
+    def test_building_type_in_key(self):
+        a = self._assets(1)["Unit 0"]
+        assert asset_content_key(a, "commercial") != asset_content_key(a, "individual_selfbuild")
+        assert asset_content_key({**a, "floor_area_m2": 500}) == asset_content_key({**a, "floor_area_m2": 500.0})
+        with pytest.raises(ValueError):
+            ComplianceStore("H")
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # MEES GAP ANALYSIS
 # ─────────────────────────────────────────────────────────────────────────────
@@ -397,6 +614,59 @@ class TestPartLCheck:
         assert len(result["overall_verdict"]) > 0
 
 
+class TestPartLCheckBatch:
+    """Tests for part_l_compliance_check_batch() against the scalar check."""
+
+    @staticmethod
+    def _inputs(n, seed=0):
+        rng = np.random.default_rng(seed)
+        return {
+            "u_wall":            rng.uniform(0.1, 0.6, n),
+            "u_roof":            rng.uniform(0.05, 0.4, n),
+            "u_glazing":         rng.uniform(0.8, 2.5, n),
+            "floor_area_m2":     rng.uniform(60, 400, n),
+            "annual_energy_kwh": rng.uniform(500, 20_000, n),
+        }
+
+    # Each row expands to exactly the scalar result, for both target tables
+    @pytest.mark.parametrize("building_type", ["residential", "commercial"])
+    def test_details_match_scalar(self, building_type):
+        inputs = self._inputs(200)
+        batch = part_l_compliance_check_batch(**inputs, building_type=building_type)
+        for i in range(200):
+            scalar = part_l_compliance_check(**{k: float(v[i]) for k, v in inputs.items()},
+                                             building_type=building_type)
+            assert part_l_details({k: v[i] for k, v in batch.items()}) == scalar
+        assert batch["part_l_2021_pass"].any() and not batch["part_l_2021_pass"].all()
+
+    # Mixed building types resolve their own targets row by row
+    def test_mixed_building_types(self):
+        u = [0.25, 0.25], [0.15, 0.15], [1.4, 1.4]
+        res = part_l_compliance_check_batch(*u, 500.0, 5_000.0, building_type=["residential", "commercial"])
+        assert res["element_pass"][:, 0].tolist() == [False, True]
+        assert res["part_l_2021_pass"].tolist() == [False, True]
+        assert "ADL1A" in res["regs_label"][0] and "ADL2A" in res["regs_label"][1]
+
+    # Invalid rows raise the scalar message, or are masked
+    def test_invalid_rows(self):
+        inputs = self._inputs(3)
+        inputs["u_roof"][1] = 7.0
+        with pytest.raises(ValueError, match="Part L check: U-roof"):
+            part_l_compliance_check_batch(**inputs)
+        res = part_l_compliance_check_batch(**inputs, strict=False)
+        assert res["valid"].tolist() == [True, False, True]
+        assert not res["part_l_2021_pass"][1] and not res["fhs_ready"][1]
+        assert np.isnan(res["primary_energy_est"][1]) and res["failed_elements"][1] == 0
+
+    # A development of thousands of plots checks well inside a second
+    def test_thousands_of_plots_sub_second(self):
+        inputs = self._inputs(10_000)
+        start = time.perf_counter()
+        res = part_l_compliance_check_batch(**inputs)
+        assert time.perf_counter() - start < 1.0
+        assert res["element_pass"].shape == (10_000, 3)
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 # EPC BANDS CONSTANT INTEGRITY
 # ─────────────────────────────────────────────────────────────────────────────
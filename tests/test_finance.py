@@ -0,0 +1,139 @@
+"""
+QA Test Suite — core/finance.py vectorised financial maths
+===========================================================
+Closed forms must agree with explicit cash-flow sums, and the vectorised
+IRR must agree with a scalar Newton reference wherever one converges.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.finance as finance
+
+
+def _flows(capex, annual, years, width=None):
+    width = width or years + 1
+    cf = np.zeros(width)
+    cf[0] = -capex
+    cf[1:years + 1] = annual
+    return cf
+
+
+def _scalar_irr(cash_flows):
+    rate = 0.1
+    for _ in range(200):
+        t = np.arange(len(cash_flows))
+        v = (cash_flows / (1 + rate) ** t).sum()
+        d = (-t * cash_flows / (1 + rate) ** (t + 1)).sum()
+        new = rate - v / d
+        if abs(new - rate) < 1e-12:
+            return new
+        rate = new
+    return None
+
+
+class TestClosedForms:
+    def test_annuity_factor(self):
+        assert finance.annuity_factor(0.05, 10) == pytest.approx(7.721734929)
+        assert finance.annuity_factor(0.0, 7) == 7.0
+        assert finance.annuity_factor(0.05, 0) == 0.0
+        np.testing.assert_allclose(
+            finance.annuity_factor(np.array([0.0, 0.05]), 10), [10.0, 7.721734929]
+        )
+
+    def test_level_npv_matches_cash_flow_sum(self):
+        rng = np.random.default_rng(0)
+        capex = rng.uniform(0, 50_000, 200)
+        annual = rng.uniform(-500, 10_000, 200)
+        years = rng.integers(1, 26, 200)
+        flows = np.array([_flows(c, a, n, 26) for c, a, n in zip(capex, annual, years)])
+        np.testing.assert_allclose(
+            finance.level_npv(capex, annual, 0.035, years), finance.npv(0.035, flows), rtol=1e-10, atol=1e-6
+        )
+
+    def test_discounted_payback(self):
+        assert finance.discounted_payback(10_000, 2_000, 0.0) == 5.0
+        closed = finance.discounted_payback(10_000, 2_000, 0.05)
+        assert closed == pytest.approx(-np.log(1 - 10_000 * 0.05 / 2_000) / np.log(1.05))
+        # Stepwise version crosses in the same year
+        assert int(finance.discounted_payback_flows(0.05, _flows(10_000, 2_000, 10))) == int(closed)
+        assert finance.discounted_payback(10_000, 400, 0.05) == np.inf
+        assert finance.discounted_payback_flows(0.05, _flows(10_000, 400, 10)) == np.inf
+
+    def test_lcoe(self):
+        # No opex: capex spread over discounted lifetime kWh
+        assert finance.lcoe(10_000, 5_000, 0.05, 10) == pytest.approx(10_000 / (5_000 * 7.721734929))
+        assert np.isnan(finance.lcoe(10_000, 0.0, 0.05, 10))
+
+
+class TestIrr:
+    def test_level_irr_matches_scalar_newton(self):
+        rng = np.random.default_rng(1)
+        capex = rng.uniform(1_000, 50_000, 300)
+        annual = rng.uniform(500, 20_000, 300)
+        years = rng.integers(5, 26, 300)
+        got = finance.level_irr(capex, annual, years)
+        for c, a, n, g in zip(capex, annual, years, got):
+            ref = _scalar_irr(_flows(c, a, n))
+            if ref is not None and -0.99 < ref < 100:
+                assert g == pytest.approx(ref, rel=1e-7, abs=1e-9)
+
+    def test_irr_matches_scalar_newton(self):
+        rng = np.random.default_rng(3)
+        capex = rng.uniform(1_000, 50_000, 100)
+        annual = rng.uniform(500, 20_000, 100)
+        years = rng.integers(5, 26, 100)
+        flows = np.array([_flows(c, a, n, 26) for c, a, n in zip(capex, annual, years)])
+        for row, g in zip(flows, finance.irr(flows)):
+            ref = _scalar_irr(row)
+            if ref is not None and -0.99 < ref < 100:
+                assert g == pytest.approx(ref, rel=1e-7, abs=1e-9)
+
+    def test_npv_is_zero_at_irr(self):
+        flows = np.array([_flows(25_000, 4_000, 12), _flows(8_000, 900, 12), _flows(1_000, 5_000, 12)])
+        rates = finance.irr(flows)
+        np.testing.assert_allclose(finance.npv(rates, flows), 0.0, atol=1e-6)
+
+    def test_negative_irr_is_found(self):
+        # Savings never recover the capex undiscounted → IRR below zero
+        rate = finance.level_irr(10_000, 800, 10)
+        assert -0.99 < rate < 0
+        assert finance.level_npv(10_000, 800, rate, 10) == pytest.approx(0.0, abs=1e-6)
+        assert finance.irr(_flows(10_000, 800, 10)) == pytest.approx(rate)
+
+    def test_level_forms_near_zero_rate(self):
+        # Savings that exactly repay the capex: IRR 0, and the annuity stays accurate there
+        rate = finance.level_irr(30_000, 2_500, 12)
+        assert rate == pytest.approx(0.0, abs=1e-9)
+        assert finance.annuity_factor(rate, 12) == pytest.approx(12.0)
+        assert finance.level_npv(30_000, 2_500, rate, 12) == pytest.approx(0.0, abs=1e-4)
+
+    def test_undefined_cases_are_nan(self):
+        out = finance.level_irr([0.0, 10_000, 10_000], [1_000, 0.0, -50.0], 10)
+        assert np.isnan(out).all()
+        assert np.isnan(finance.irr(np.array([[-100.0, -10.0, -10.0]])))[0]
+
+    def test_generic_and_level_irr_agree(self):
+        capex = np.array([5_000, 12_000, 40_000])
+        annual = np.array([1_200, 1_500, 3_000])
+        flows = np.array([_flows(c, a, 15) for c, a in zip(capex, annual)])
+        np.testing.assert_allclose(finance.irr(flows), finance.level_irr(capex, annual, 15), rtol=1e-8)
+
+    def test_large_grid_is_fast(self):
+        import time
+
+        rng = np.random.default_rng(2)
+        capex = rng.uniform(1_000, 50_000, (1_000, 50))
+        annual = rng.uniform(100, 20_000, (1_000, 50))
+        start = time.perf_counter()
+        finance.level_irr(capex, annual, 10)
+        finance.level_npv(capex, annual, 0.05, 10)
+        assert time.perf_counter() - start < 1.0
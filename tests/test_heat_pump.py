@@ -0,0 +1,116 @@
+"""
+QA Test Suite — core/heat_pump.py sizing and hourly COP simulation
+===================================================================
+COP must follow the temperature lift, sizing must cover the design heat
+loss, energy must balance hour by hour between heat pump and backup, and
+the portfolio pass must agree with one-building runs.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.heat_pump as hp
+import core.physics as physics
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.constants import HEATING_SETPOINT_C
+from config.scenarios import SCENARIOS
+from core.agent import execute_tool
+from services import tmy
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+TEMPS = tmy.hourly_temperatures(tmy.DEFAULT_TMY_CITY)
+COLS = physics.building_columns(BUILDINGS.values())
+
+
+class TestPerformance:
+    def test_cop_rises_with_source_temperature(self):
+        cop = hp.hourly_cop([-10.0, 0.0, 7.0, 15.0], design_temp_c=-3.0)
+        assert (np.diff(cop) > 0).all()
+        assert cop.min() >= hp.COP_LIMITS[0] and cop.max() <= hp.COP_LIMITS[1]
+
+    def test_higher_flow_temperature_lowers_cop(self):
+        hot, warm = hp.hourly_cop(TEMPS, flow_temp_c=55.0), hp.hourly_cop(TEMPS, flow_temp_c=45.0)
+        cold = TEMPS < hp.COMPENSATION_END_C
+        assert (hot[cold] < warm[cold]).all() and (hot[~cold] == warm[~cold]).all()
+
+    def test_ground_source_is_damped(self):
+        ground = hp.source_temperature(TEMPS, "gshp")
+        assert ground.mean() == pytest.approx(TEMPS.mean(), abs=0.5)
+        assert np.ptp(ground) < 0.5 * np.ptp(TEMPS)
+
+    def test_capacity_derates_below_rating_point(self):
+        np.testing.assert_allclose(hp.capacity_factor([7.0, 20.0, -3.0]), [1.0, 1.0, 0.85])
+        np.testing.assert_allclose(hp.capacity_factor([-3.0], "gshp"), [1.0])
+
+    def test_unknown_kind_rejected(self):
+        with pytest.raises(ValueError, match="kind"):
+            hp.hourly_cop(TEMPS, "water")
+
+
+class TestSimulation:
+    def test_sizing_covers_design_load(self):
+        res = hp.simulate_heat_pump(COLS, TEMPS)
+        np.testing.assert_allclose(
+            res["design_load_kw"],
+            physics.heat_loss_coefficient(COLS) * (HEATING_SETPOINT_C - res["design_temp_c"]) / 1000.0,
+        )
+        derated = res["capacity_kw"] * hp.capacity_factor(res["design_temp_c"])
+        assert (derated >= res["design_load_kw"] - 1e-9).all()
+        assert (res["capacity_kw"] % 1.0 == 0).all()
+
+    def test_energy_balance_and_spf(self):
+        res = hp.simulate_heat_pump(COLS, TEMPS, sizing_factor=0.6, hourly=True)
+        heat = res["heat_hourly_mwh"]
+        np.testing.assert_allclose(heat.sum(axis=1), res["heat_mwh"])
+        hp_heat = heat - res["backup_hourly_mwh"]
+        np.testing.assert_allclose(res["electricity_hourly_mwh"], hp_heat / res["cop"] + res["backup_hourly_mwh"])
+        assert (res["backup_fraction"] > 0).all()
+        assert (res["spf"] < res["scop"]).all()
+        np.testing.assert_allclose(res["spf"], res["heat_mwh"] / res["electricity_mwh"])
+
+    def test_portfolio_pass_matches_single_buildings(self):
+        res = hp.simulate_heat_pump(COLS, TEMPS, SCENARIOS["Fabric Upgrade (Insulation)"])
+        for i, b in enumerate(list(BUILDINGS.values())[:3]):
+            one = hp.simulate_heat_pump(
+                physics.building_columns([b]), TEMPS, SCENARIOS["Fabric Upgrade (Insulation)"]
+            )
+            assert one["electricity_mwh"][0] == pytest.approx(res["electricity_mwh"][i])
+            assert one["capacity_kw"][0] == res["capacity_kw"][i]
+
+    def test_replacing_a_gas_boiler(self):
+        b = {**next(iter(BUILDINGS.values())), "heating_system": "gas_boiler"}
+        res = hp.simulate_heat_pump(physics.building_columns([b]), TEMPS)
+        assert res["current_fuel"][0] == "gas"
+        assert res["current_mwh"][0] == pytest.approx(res["heat_mwh"][0] / 0.89)
+        assert res["electricity_added_mwh"][0] == pytest.approx(res["electricity_mwh"][0])
+
+    def test_fabric_first_shrinks_the_unit(self):
+        before = hp.simulate_heat_pump(COLS, TEMPS)
+        after = hp.simulate_heat_pump(COLS, TEMPS, SCENARIOS["Deep Retrofit (All Interventions)"])
+        assert (after["capacity_kw"] < before["capacity_kw"]).all()
+
+    def test_requires_hourly_series(self):
+        with pytest.raises(ValueError, match="8760"):
+            hp.simulate_heat_pump(COLS, np.full(12, 8.0))
+
+
+class TestScreening:
+    def test_screen_and_agent_tool(self):
+        screen = hp.screen_portfolio(BUILDINGS)
+        assert set(screen) == set(BUILDINGS)
+        assert all(r["spf"] >= hp.MIN_SPF for r in screen.values() if r["suitable"])
+        out = execute_tool("heat_pump_screen", {"kind": "gshp"}, BUILDINGS, SCENARIOS)
+        assert out["kind"] == "gshp" and set(out["buildings"]) == set(BUILDINGS)
+        assert "error" in execute_tool("heat_pump_screen", {"building_names": ["Nowhere"]}, BUILDINGS, SCENARIOS)
@@ -0,0 +1,170 @@
+"""
+QA Test Suite — core/heating_systems.py fuel-aware physics
+===========================================================
+Undeclared systems must keep the direct-electric accounting; declared
+baselines are delivered energy, so only prices and carbon change with the
+fuel; modelled baselines are divided by the efficiency or COP; base load
+and PV sit on the electricity meter whatever the heating fuel; and the
+scalar, batch, series and Monte Carlo paths must agree on every system.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.heating_systems as hs
+import core.physics as physics
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.constants import CI_ELECTRICITY, CI_GAS, GAS_COST_PER_KWH
+from config.scenarios import SCENARIOS
+from core.uncertainty import run_monte_carlo
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+BUILDING = next(iter(BUILDINGS.values()))
+FABRIC = SCENARIOS["Fabric Upgrade (Insulation)"]
+PV = SCENARIOS["Renewables (Solar PV)"]
+
+
+def _with(system, **extra):
+    return {**BUILDING, "heating_system": system, **extra}
+
+
+class TestSystems:
+    def test_cop_curve_interpolates_and_clamps(self):
+        ashp = hs.system_code("ashp")
+        np.testing.assert_allclose(hs.efficiency(ashp, [-20.0, -7.0, 4.5, 7.0, 30.0]), [2.2, 2.2, 3.1, 3.4, 4.4])
+        gas = hs.system_code("gas_boiler")
+        np.testing.assert_allclose(hs.efficiency([gas, ashp], 7.0), [0.89, 3.4])
+
+    def test_codes(self):
+        codes = hs.system_codes(["gas_boiler", None, "steam_engine"], 3)
+        assert codes.tolist() == [hs.system_code("gas_boiler"), hs.system_code(None), -1]
+        with pytest.raises(ValueError, match="heating_system"):
+            hs.system_code("steam_engine")
+
+
+class TestScalar:
+    def test_default_is_direct_electric(self):
+        r = physics.calculate_thermal_load(BUILDING, FABRIC, {"temperature_c": 10.5})
+        assert r["heating_system"] == "direct_electric" and r["heating_efficiency"] == 1.0
+        assert r["baseline_electricity_mwh"] == r["baseline_energy_mwh"]
+        assert r["scenario_gas_mwh"] == 0.0
+
+    def test_declared_baseline_keeps_energy_and_reprices(self):
+        elec = physics.calculate_thermal_load(BUILDING, FABRIC, {"temperature_c": 10.5})
+        gas = physics.calculate_thermal_load(_with("gas_boiler"), FABRIC, {"temperature_c": 10.5})
+        assert gas["scenario_energy_mwh"] == elec["scenario_energy_mwh"]
+        assert gas["scenario_gas_mwh"] == gas["scenario_energy_mwh"]
+        assert gas["scenario_electricity_mwh"] == 0.0
+        assert gas["annual_saving_gbp"] == pytest.approx(elec["energy_saving_mwh"] * 1000 * GAS_COST_PER_KWH, abs=60)
+        assert gas["baseline_carbon_t"] == pytest.approx(elec["baseline_carbon_t"] * CI_GAS / CI_ELECTRICITY, abs=0.1)
+
+    def test_modelled_baseline_divided_by_efficiency(self):
+        undeclared = {"baseline_energy_mwh": 0.0}
+        heat = physics.calculate_thermal_load(_with("direct_electric", **undeclared), FABRIC, {"temperature_c": 7.0})
+        pump = physics.calculate_thermal_load(_with("ashp", **undeclared), FABRIC, {"temperature_c": 7.0})
+        assert pump["heating_efficiency"] == 3.4
+        assert pump["baseline_energy_mwh"] == pytest.approx(heat["baseline_energy_mwh"] / 3.4, abs=0.1)
+
+    def test_pv_offsets_electric_heating_only(self):
+        gas = physics.calculate_thermal_load(_with("gas_boiler"), PV, {"temperature_c": 10.5})
+        assert gas["energy_saving_mwh"] == 0.0
+        elec = physics.calculate_thermal_load(BUILDING, PV, {"temperature_c": 10.5})
+        assert elec["energy_saving_mwh"] == pytest.approx(5.0)
+
+    def test_base_load_and_pv_on_the_electricity_meter(self):
+        gas = _with("gas_boiler", base_load_mwh=60.0)
+        base = physics.calculate_thermal_load(gas, SCENARIOS["Baseline (No Intervention)"], {"temperature_c": 10.5})
+        assert base["baseline_electricity_mwh"] == 60.0
+        assert base["baseline_gas_mwh"] == pytest.approx(BUILDING["baseline_energy_mwh"] - 60.0, abs=0.05)
+        assert base["baseline_carbon_t"] == pytest.approx(
+            base["baseline_gas_mwh"] * CI_GAS + 60.0 * CI_ELECTRICITY, abs=0.1
+        )
+
+        pv = physics.calculate_thermal_load(gas, PV, {"temperature_c": 10.5}, tariff_gbp_per_kwh=0.30)
+        assert pv["scenario_gas_mwh"] == base["baseline_gas_mwh"]
+        assert pv["scenario_electricity_mwh"] == pytest.approx(55.0)
+        assert pv["annual_saving_gbp"] == pytest.approx(5_000 * 0.30, abs=1)
+        assert pv["carbon_saving_t"] == pytest.approx(5.0 * CI_ELECTRICITY, abs=0.05)
+
+    def test_unknown_system_rejected_and_cached_separately(self):
+        with pytest.raises(ValueError, match="heating_system"):
+            physics.calculate_thermal_load(_with("coal"), FABRIC, {"temperature_c": 10.5})
+        a = physics.calculate_thermal_load(_with("oil_boiler"), FABRIC, {"temperature_c": 10.5})
+        b = physics.calculate_thermal_load(_with("lpg_boiler"), FABRIC, {"temperature_c": 10.5})
+        assert a["scenario_oil_mwh"] > 0 and b["scenario_lpg_mwh"] > 0
+
+    def test_fuel_breakdown(self):
+        r = physics.calculate_thermal_load(_with("gas_boiler"), FABRIC, {"temperature_c": 10.5})
+        gas = hs.fuel_breakdown(r)["gas"]
+        assert gas["scenario_cost_gbp"] == pytest.approx(r["scenario_gas_mwh"] * 1000 * GAS_COST_PER_KWH)
+        assert gas["scenario_carbon_t"] == pytest.approx(r["scenario_gas_mwh"] * CI_GAS)
+
+
+class TestBatchAndSeries:
+    def test_batch_matches_scalar_for_mixed_systems(self):
+        rows = [
+            _with(sid, baseline_energy_mwh=e, base_load_mwh=load)
+            for sid in hs.HEATING_SYSTEM_IDS for e in (0.0, 400.0) for load in (0.0, 3.0)
+        ]
+        scenarios = [FABRIC, PV, SCENARIOS["Baseline (No Intervention)"]]
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(rows), physics.scenario_columns(scenarios), 4.5
+        )
+        for i, b in enumerate(rows):
+            for j, s in enumerate(scenarios):
+                expected = physics.calculate_thermal_load(b, s, {"temperature_c": 4.5})
+                assert physics.thermal_load_record(grid, i, j) == expected
+
+    def test_batch_masks_unknown_system(self):
+        cols = physics.building_columns([_with("gas_boiler"), _with("coal")])
+        with pytest.raises(ValueError, match="heating_system"):
+            physics.calculate_thermal_load_batch(cols, physics.scenario_columns([FABRIC]), 10.5)
+        grid = physics.calculate_thermal_load_batch(cols, physics.scenario_columns([FABRIC]), 10.5, strict=False)
+        assert grid["valid"][:, 0].tolist() == [True, False]
+
+    def test_series_cop_follows_temperature(self):
+        temps = np.array([2.0, 7.0] * 6)
+        cols = physics.building_columns([_with("ashp"), _with("gas_boiler")])
+        series = physics.simulate_thermal_series(cols, temps, FABRIC)
+        np.testing.assert_allclose(series["heating_efficiency"][0, :2], [2.8, 3.4])
+        np.testing.assert_allclose(series["heating_efficiency"][1], 0.89)
+        assert series["fuel"].tolist() == ["electricity", "gas"]
+        # Declared baselines are delivered energy on every system
+        np.testing.assert_allclose(series["annual_baseline_mwh"], BUILDING["baseline_energy_mwh"])
+
+    def test_series_electricity_meter(self):
+        cols = physics.building_columns([_with("gas_boiler", base_load_mwh=60.0), _with("direct_electric")])
+        hours = np.array(physics.DAYS_IN_MONTH) * 24.0
+        series = physics.simulate_thermal_series(cols, np.full(12, 8.0), PV, solar_weights=hours)
+        electricity = series["electricity_mwh"].sum(axis=1)
+        assert electricity[0] == pytest.approx(55.0)
+        assert electricity[1] == pytest.approx(series["annual_energy_mwh"][1])
+        grid = physics.calculate_thermal_load_batch(cols, physics.scenario_columns([PV]), 8.0)
+        np.testing.assert_allclose(electricity, grid["scenario_electricity_mwh"][:, 0], rtol=1e-6)
+
+    def test_flat_series_matches_annual_model(self):
+        cols = physics.building_columns([_with("oil_boiler", baseline_energy_mwh=0.0)])
+        hours = np.array(physics.DAYS_IN_MONTH) * 24.0
+        series = physics.simulate_thermal_series(cols, np.full(12, 8.0), FABRIC, solar_weights=hours)
+        grid = physics.calculate_thermal_load_batch(cols, physics.scenario_columns([FABRIC]), 8.0)
+        assert series["annual_energy_mwh"][0] == pytest.approx(grid["scenario_energy_mwh"][0, 0], rel=1e-9)
+
+    def test_monte_carlo_prices_fuel(self):
+        spec = {"u_value_rel_sd": 0.0, "ach_rel_sd": 0.0, "tariff_rel_sd": 0.0, "carbon_rel_sd": 0.0,
+                "install_cost_low_factor": 1.0, "install_cost_high_factor": 1.0}
+        mc = run_monte_carlo([_with("gas_boiler")], ["Fabric Upgrade (Insulation)"], 10.5,
+                             draws=8, spec=spec, workers=1)
+        r = physics.calculate_thermal_load(_with("gas_boiler"), FABRIC, {"temperature_c": 10.5})
+        assert mc["buildings"]["annual_saving_gbp"][0, 0, 1] == pytest.approx(r["annual_saving_gbp"], abs=1)
@@ -0,0 +1,208 @@
+"""
+QA Test Suite — core/optimiser.py retrofit package optimiser
+=============================================================
+The knapsack solution must match brute force on small portfolios, never
+exceed the budget, and scale to a 1,000-asset portfolio; the MEES
+pathfinder must re-rate every measure subset through the thermal series
+model and pick the cheapest one that reaches the target band.
+"""
+from __future__ import annotations
+
+import itertools
+import os
+import sys
+import time
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.optimiser as optimiser
+import core.physics as physics
+from app.compliance import estimate_epc_rating
+from app.segments import SEGMENT_IDS, get_segment_handler
+from core.agent import execute_tool
+from services import tmy
+
+REGISTRY = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+
+
+def _portfolio(n: int, seed: int = 0) -> dict:
+    rng = np.random.default_rng(seed)
+    base = list(REGISTRY.values())
+    out = {}
+    for i in range(n):
+        b = dict(base[i % len(base)])
+        b["floor_area_m2"] *= rng.uniform(0.5, 1.5)
+        b["u_value_wall"] = min(6.0, b["u_value_wall"] * rng.uniform(0.7, 1.5))
+        out[f"Asset {i}"] = b
+    return out
+
+
+def _brute_force(outcomes, values, budget):
+    best = 0.0
+    n = len(outcomes["names"])
+    for combo in itertools.product(range(len(outcomes["cost_gbp"])), repeat=n):
+        if sum(outcomes["cost_gbp"][k] for k in combo) <= budget:
+            best = max(best, sum(values[i, k] for i, k in enumerate(combo)))
+    return best
+
+
+class TestOutcomeTable:
+    def test_empty_subset_is_do_nothing(self):
+        out = optimiser.measure_outcomes(_portfolio(4), 10.5)
+        assert out["masks"].shape == (64, 6)
+        assert out["cost_gbp"][0] == 0.0
+        assert (out["carbon_saving_t"][:, 0] == 0.0).all()
+
+    def test_combined_fabric_beats_single_measure(self):
+        out = optimiser.measure_outcomes(_portfolio(3), 10.5)
+        roof = 1 << out["measures"].index("Loft / Roof Insulation Upgrade")
+        wall = 1 << out["measures"].index("Cavity / External Wall Insulation")
+        both, single = out["carbon_saving_t"][:, roof | wall], out["carbon_saving_t"][:, roof]
+        # Demand can already bottom out at zero with one measure
+        assert (both >= single).all() and (both > single).any()
+        assert out["cost_gbp"][roof | wall] == out["cost_gbp"][roof] + out["cost_gbp"][wall]
+
+    def test_invalid_building_only_does_nothing(self):
+        portfolio = {**_portfolio(2), "Bad": {**REGISTRY[next(iter(REGISTRY))], "height_m": 0}}
+        res = optimiser.optimise_portfolio(portfolio, 1e6, 10.5)
+        assert "Bad" not in {p["building"] for p in res["plan"]}
+
+
+class TestOptimality:
+    @pytest.mark.parametrize("budget", [0, 9_000, 40_000])
+    def test_carbon_matches_brute_force(self, budget):
+        out = optimiser.measure_outcomes(_portfolio(3, seed=1), 10.5)
+        res = optimiser.optimise_portfolio(None, budget, outcomes=out)
+        assert res["carbon_saving_t"] == pytest.approx(_brute_force(out, out["carbon_saving_t"], budget))
+        assert res["spent_gbp"] <= budget
+
+    def test_mees_objective_matches_brute_force(self):
+        out = optimiser.measure_outcomes(_portfolio(3, seed=2), 10.5)
+        res = optimiser.optimise_portfolio(None, 30_000, outcomes=out, objective="mees")
+        values = optimiser._objective_values(out, "mees", "C")
+        assert res["assets_lifted"] == int(np.floor(_brute_force(out, values, 30_000)))
+        for entry in res["plan"]:
+            assert entry["sap_after"] == pytest.approx(
+                entry["sap_before"] + sum(
+                    m["sap_lift"] for m in optimiser.MEES_MEASURES if m["name"] in entry["measures"]
+                )
+            )
+
+    def test_more_budget_never_worse(self):
+        out = optimiser.measure_outcomes(_portfolio(30), 10.5)
+        totals = [
+            optimiser.optimise_portfolio(None, b, outcomes=out)["carbon_saving_t"]
+            for b in (50_000, 100_000, 200_000)
+        ]
+        assert totals == sorted(totals)
+
+
+class TestScaleAndValidation:
+    def test_thousand_assets_under_a_few_seconds(self):
+        portfolio = _portfolio(1000)
+        start = time.perf_counter()
+        res = optimiser.optimise_portfolio(portfolio, 2_000_000, 10.5)
+        assert time.perf_counter() - start < 5.0
+        assert res["spent_gbp"] <= 2_000_000
+        assert res["buildings_upgraded"] > 0
+
+    def test_bad_objective_rejected(self):
+        with pytest.raises(ValueError, match="objective"):
+            optimiser.optimise_portfolio(_portfolio(1), 1_000, 10.5, objective="profit")
+
+    def test_agent_tool(self):
+        out = execute_tool("optimise_retrofit_plan", {"budget_gbp": 50_000}, _portfolio(5), {})
+        assert "error" not in out
+        assert out["spent_gbp"] <= 50_000
+
+
+class TestPathfinder:
+    @staticmethod
+    def _subset(out, *names):
+        return sum(1 << out["measures"].index(n) for n in names)
+
+    def test_baseline_rates_as_estimate(self):
+        portfolio = _portfolio(6)
+        out = optimiser.mees_pathfinder(portfolio)
+        assert out["sap"].shape == (6, 64)
+        for i, b in enumerate(portfolio.values()):
+            scalar = estimate_epc_rating(b["floor_area_m2"], b["baseline_energy_mwh"] * 1000, b["u_value_wall"],
+                                         b["u_value_roof"], b["u_value_glazing"], b["glazing_ratio"])
+            assert out["sap_before"][i] == scalar["sap_score"]
+            assert out["band_before"][i] == scalar["epc_band"]
+
+    def test_fabric_energy_matches_series_engine(self):
+        portfolio = _portfolio(4)
+        temps = tmy.monthly_mean_temperatures(tmy.DEFAULT_TMY_CITY)
+        cols = physics.building_columns(portfolio.values())
+        table = optimiser._DEFAULT_PATH_TABLE
+        energy, valid = optimiser._combo_energy(cols, temps, table["combos"])
+        k = self._subset(optimiser.mees_pathfinder(portfolio), "Loft / Roof Insulation Upgrade",
+                         "Rooftop Solar PV (10 kWp)")
+        scenario = {"u_roof_factor": 0.4, "renewable_kwh": 10 * optimiser.PV_YIELD_KWH_PER_KWP, "install_cost_gbp": 1.0}
+        series = physics.simulate_thermal_series(cols, temps, scenario)
+        np.testing.assert_allclose(energy[:, table["combo_index"][k]], series["annual_energy_mwh"])
+        np.testing.assert_allclose(energy[:, table["combo_index"][0]], series["annual_baseline_mwh"])
+        assert valid.all()
+
+    def test_cheapest_reaching_subset(self):
+        out = optimiser.mees_pathfinder(_portfolio(20, seed=4))
+        cost = optimiser._DEFAULT_PATH_TABLE["cost_gbp"]
+        for i in range(20):
+            reaching = np.flatnonzero(out["sap"][i] >= 69)
+            assert out["reachable"][i] == bool(len(reaching))
+            if len(reaching):
+                assert out["cost_gbp"][i] == cost[reaching].min()
+                assert out["band_after"][i] in "ABC"
+            else:
+                assert out["sap_after"][i] == np.nanmax(out["sap"][i])
+
+    def test_compliant_and_unreachable(self):
+        good = {**REGISTRY[next(iter(REGISTRY))], "baseline_energy_mwh": 1.0, "u_value_wall": 0.2,
+                "u_value_roof": 0.15, "u_value_glazing": 1.2}
+        out = optimiser.mees_pathfinder({"Good": good}, "C")
+        assert out["subset"][0] == 0 and out["cost_gbp"][0] == 0.0 and out["reachable"][0]
+        out = optimiser.mees_pathfinder(_portfolio(3), "A")
+        assert not out["reachable"].all()
+
+    def test_heat_pump_interacts_with_pv(self):
+        gas = {**REGISTRY[next(iter(REGISTRY))], "heating_system": "gas_boiler"}
+        out = optimiser.mees_pathfinder({"Gas": gas})
+        pv, hp = self._subset(out, "Rooftop Solar PV (10 kWp)"), self._subset(out, "Air Source Heat Pump (ASHP)")
+        table = optimiser._DEFAULT_PATH_TABLE
+        energy, _ = optimiser._combo_energy(physics.building_columns([gas]),
+                                            tmy.monthly_mean_temperatures(tmy.DEFAULT_TMY_CITY), table["combos"])
+        e = energy[0, table["combo_index"]]
+        assert e[pv] == pytest.approx(e[0])          # PV cannot offset gas heating
+        assert e[hp] < e[0] and e[hp | pv] < e[hp]   # after the swap it can
+        assert out["sap"][0, hp | pv] >= out["sap"][0, hp] > out["sap"][0, 0]
+
+    def test_invalid_rows_and_scale(self):
+        portfolio = {**_portfolio(2), "Bad": {**REGISTRY[next(iter(REGISTRY))], "height_m": 0}}
+        out = optimiser.mees_pathfinder(portfolio)
+        assert out["valid"].tolist() == [True, True, False]
+        assert out["subset"][2] == 0 and out["band_after"][2] == ""
+        with pytest.raises(ValueError, match="target band"):
+            optimiser.mees_pathfinder(portfolio, "Z")
+        big = _portfolio(5000)
+        start = time.perf_counter()
+        optimiser.mees_pathfinder(big)
+        assert time.perf_counter() - start < 3.0
+
+    def test_agent_tool(self):
+        portfolio = _portfolio(3)
+        out = execute_tool("mees_upgrade_path", {"building_name": "Asset 1"}, portfolio, {})
+        row = out["buildings"]["Asset 1"]
+        assert set(out["buildings"]) == {"Asset 1"}
+        assert row["band_after"] in "ABC" if row["reaches_target"] else row["band_after"] not in "ABC"
+        assert len(execute_tool("mees_upgrade_path", {}, portfolio, {})["buildings"]) == 3
+        assert "error" in execute_tool("mees_upgrade_path", {"building_name": "Nope"}, portfolio, {})
@@ -0,0 +1,97 @@
+"""
+QA Test Suite — core/pareto.py skyline engine
+==============================================
+The block sort-filter skyline must agree with the O(n²) definition of
+dominance, and the building × scenario frontier must only drop options
+that another option beats on every objective.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.pareto as pareto
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+from core.agent import execute_tool
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+
+
+def _naive_mask(points):
+    pts = np.where(np.isnan(points), np.inf, points)
+    return np.array([
+        not ((pts <= p).all(axis=1) & (pts < p).any(axis=1)).any() for p in pts
+    ])
+
+
+class TestParetoMask:
+    @pytest.mark.parametrize("d", [2, 3, 4])
+    @pytest.mark.parametrize("n", [1, 7, 600])
+    def test_matches_naive_definition(self, n, d):
+        rng = np.random.default_rng(n * 10 + d)
+        pts = rng.integers(0, 15, (n, d)).astype(float)
+        pts[rng.random((n, d)) < 0.05] = np.inf
+        np.testing.assert_array_equal(pareto.pareto_mask(pts), _naive_mask(pts))
+
+    def test_duplicates_are_all_kept(self):
+        pts = np.array([[1.0, 1.0], [1.0, 1.0], [2.0, 2.0]])
+        assert pareto.pareto_mask(pts).tolist() == [True, True, False]
+
+    def test_nan_is_worst(self):
+        pts = np.array([[1.0, np.nan], [1.0, 5.0]])
+        assert pareto.pareto_mask(pts).tolist() == [False, True]
+
+    def test_empty_and_bad_shape(self):
+        assert pareto.pareto_mask(np.empty((0, 3))).size == 0
+        with pytest.raises(ValueError, match="2-D"):
+            pareto.pareto_mask([1.0, 2.0])
+
+
+class TestPortfolioFrontier:
+    def test_frontier_is_non_dominated_and_drops_baseline(self):
+        front = pareto.portfolio_frontier(BUILDINGS, list(SCENARIOS), 10.5)
+        rows = front["frontier"]
+        assert rows and front["candidates"] >= len(rows)
+        assert all(r["scenario"] != "Baseline (No Intervention)" for r in rows)
+        pts = np.array([
+            [r["install_cost_gbp"], -r["carbon_saving_t"],
+             r["payback_years"] if r["payback_years"] is not None else np.inf, -r["npv_gbp"]]
+            for r in rows
+        ])
+        assert _naive_mask(pts).all()
+
+    def test_two_objective_frontier_is_monotone(self):
+        front = pareto.portfolio_frontier(
+            BUILDINGS, list(SCENARIOS), 10.5, objectives=("install_cost_gbp", "carbon_saving_t")
+        )
+        costs = [r["install_cost_gbp"] for r in front["frontier"]]
+        carbon = [r["carbon_saving_t"] for r in front["frontier"]]
+        assert costs == sorted(costs)
+        # More spend on the frontier must buy strictly more carbon
+        for a, b in zip(front["frontier"], front["frontier"][1:]):
+            if b["install_cost_gbp"] > a["install_cost_gbp"]:
+                assert b["carbon_saving_t"] > a["carbon_saving_t"]
+        assert max(carbon) == pytest.approx(max(
+            r["carbon_saving_t"] for r in pareto.portfolio_frontier(BUILDINGS, list(SCENARIOS), 10.5)["frontier"]
+        ))
+
+    def test_unknown_objective_rejected(self):
+        with pytest.raises(ValueError, match="objectives"):
+            pareto.portfolio_frontier(BUILDINGS, list(SCENARIOS), 10.5, objectives=("irr",))
+
+    def test_agent_tool(self):
+        out = execute_tool("pareto_options", {"discount_rate_pct": 3.5}, BUILDINGS, SCENARIOS)
+        assert "error" not in out
+        assert out["frontier"]
@@ -0,0 +1,106 @@
+"""
+QA Test Suite — core/phasing.py multi-year retrofit simulator
+==============================================================
+Plans must respect every annual capex limit, never install a measure
+twice, and an incremental re-run must equal a fresh run from scratch.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.phasing as phasing
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.constants import CI_GAS, GRID_CARBON_TRAJECTORY
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+
+
+class TestSchedule:
+    def test_required_band_follows_mees_dates(self):
+        assert phasing.required_band(2027) == "E"
+        assert phasing.required_band(2028) == "C"
+        assert phasing.required_band(2031) == "B"
+
+    def test_grid_intensity_declines_and_clamps(self):
+        series = [phasing.grid_carbon_intensity(y) for y in range(2025, 2036)]
+        assert series == sorted(series, reverse=True)
+        assert phasing.grid_carbon_intensity(2050) == GRID_CARBON_TRAJECTORY[2035]
+        assert phasing.grid_carbon_intensity(2020) == GRID_CARBON_TRAJECTORY[2025]
+
+
+class TestRollForward:
+    def test_capex_limit_respected_every_year(self):
+        res = phasing.simulate_phasing(BUILDINGS, 10.5, 40_000)
+        assert len(res["years"]) == 11
+        assert all(spent <= 40_000 for spent in res["spent_gbp"])
+
+    def test_measures_installed_at_most_once(self):
+        res = phasing.simulate_phasing(BUILDINGS, 10.5, 60_000)
+        for asset in res["assets"].values():
+            installed = [m for works in asset["works"].values() for m in works]
+            assert len(installed) == len(set(installed))
+
+    def test_sap_and_carbon_trajectories(self):
+        res = phasing.simulate_phasing(BUILDINGS, 10.5, 60_000)
+        for asset in res["assets"].values():
+            assert asset["sap_score"] == sorted(asset["sap_score"])
+        # Falling grid intensity and added measures both cut carbon
+        assert res["carbon_t"] == sorted(res["carbon_t"], reverse=True)
+
+    def test_zero_budget_changes_nothing(self):
+        res = phasing.simulate_phasing(BUILDINGS, 10.5, 0)
+        assert sum(res["spent_gbp"]) == 0
+        assert all(not a["works"] for a in res["assets"].values())
+        assert len(set(round(e, 6) for e in res["energy_mwh"])) == 1
+
+    def test_fossil_carbon_does_not_follow_the_grid(self):
+        name = next(iter(BUILDINGS))
+        gas = {name: {**BUILDINGS[name], "heating_system": "gas_boiler", "base_load_mwh": 10.0}}
+        res = phasing.simulate_phasing(gas, 10.5, 0)
+        gas_mwh = BUILDINGS[name]["baseline_energy_mwh"] - 10.0
+        expected = [gas_mwh * CI_GAS + 10.0 * phasing.grid_carbon_intensity(y) for y in res["years"]]
+        np.testing.assert_allclose(res["carbon_t"], expected, rtol=1e-9)
+
+    def test_compliant_from_is_stable_to_horizon(self):
+        res = phasing.simulate_phasing(BUILDINGS, 10.5, 1_000_000)
+        for asset in res["assets"].values():
+            if asset["compliant_from"] is not None:
+                k = res["years"].index(asset["compliant_from"])
+                assert all(asset["compliant"][k:])
+        assert res["compliant_assets"][0] == len(BUILDINGS)
+
+
+class TestIncremental:
+    def test_rerun_matches_fresh_run_and_recomputes_from_change(self):
+        sim = phasing.PhasingSimulator(BUILDINGS, 10.5)
+        sim.run(30_000)
+        assert sim.recomputed_from == 2025
+        changed = {y: 30_000 for y in sim.years} | {2031: 90_000}
+        res = sim.run(changed)
+        assert sim.recomputed_from == 2031
+        fresh = phasing.simulate_phasing(BUILDINGS, 10.5, changed)
+        np.testing.assert_allclose(res["carbon_t"], fresh["carbon_t"])
+        assert res["assets"] == fresh["assets"]
+
+    def test_identical_rerun_recomputes_nothing(self):
+        sim = phasing.PhasingSimulator(BUILDINGS, 10.5)
+        first = sim.run(30_000)
+        again = sim.run(30_000)
+        assert sim.recomputed_from is None
+        assert again["spent_gbp"] == first["spent_gbp"]
+
+    def test_negative_budget_rejected(self):
+        with pytest.raises(ValueError, match="capex"):
+            phasing.simulate_phasing(BUILDINGS, 10.5, -1)
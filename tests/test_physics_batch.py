@@ -0,0 +1,114 @@
+"""
+QA Test Suite — core/physics.py batch engine
+=============================================
+calculate_thermal_load_batch must reproduce the scalar engine exactly,
+including baseline detection, declared-baseline scaling and validation.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.agent as agent
+import core.physics as physics
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+
+
+def _grid(buildings, scenarios, temp=10.5, **kwargs):
+    return physics.calculate_thermal_load_batch(
+        physics.building_columns(buildings),
+        physics.scenario_columns(scenarios),
+        temp,
+        **kwargs,
+    )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Parity with the scalar engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestScalarParity:
+    @pytest.mark.parametrize("temp", [-10.0, 4.2, 10.5, 25.0])
+    def test_every_cell_matches_scalar_result(self, temp):
+        b_list = list(BUILDINGS.values()) + [{**BUILDINGS["Greenfield Library"], "baseline_energy_mwh": 0.0}]
+        s_list = list(SCENARIOS.values())
+        grid = _grid(b_list, s_list, temp, tariff_gbp_per_kwh=0.31)
+        for i, b in enumerate(b_list):
+            for j, s in enumerate(s_list):
+                expected = physics.calculate_thermal_load(b, s, {"temperature_c": temp}, 0.31)
+                assert physics.thermal_load_record(grid, i, j) == expected
+
+    def test_grid_shape_is_buildings_by_scenarios(self):
+        grid = _grid(list(BUILDINGS.values()), list(SCENARIOS.values()))
+        assert grid["scenario_energy_mwh"].shape == (len(BUILDINGS), len(SCENARIOS))
+        assert grid["valid"].all()
+
+    def test_baseline_column_preserves_declared_energy(self):
+        b_list = list(BUILDINGS.values())
+        grid = _grid(b_list, [SCENARIOS["Baseline (No Intervention)"]])
+        declared = np.array([b["baseline_energy_mwh"] for b in b_list], dtype=float)
+        np.testing.assert_array_equal(grid["scenario_energy_mwh"][:, 0], declared)
+        assert np.isnan(grid["payback_years"]).all()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Validation
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestBatchValidation:
+    def test_strict_raises_scalar_message(self):
+        bad = {**BUILDINGS["Greenfield Library"], "u_value_wall": 9.0}
+        with pytest.raises(ValueError, match="u_value_wall"):
+            _grid([BUILDINGS["Office Block A"], bad], list(SCENARIOS.values()))
+
+    def test_non_strict_masks_invalid_rows(self):
+        bad = {**BUILDINGS["Greenfield Library"], "floor_area_m2": 0}
+        grid = _grid([BUILDINGS["Office Block A"], bad], list(SCENARIOS.values()), strict=False)
+        assert grid["valid"][0].all()
+        assert not grid["valid"][1].any()
+        assert np.isnan(grid["scenario_energy_mwh"][1]).all()
+
+    def test_temperature_out_of_range_always_raises(self):
+        with pytest.raises(ValueError, match="Physics model validation"):
+            _grid(list(BUILDINGS.values()), list(SCENARIOS.values()), 99.0, strict=False)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Agent tools — batched path matches an injected per-call engine
+# ─────────────────────────────────────────────────────────────────────────────
+
+class TestAgentBatchPath:
+    @pytest.mark.parametrize("tool,args", [
+        ("compare_all_buildings", {"scenario_name": "Deep Retrofit (All Interventions)"}),
+        ("find_best_for_budget", {"budget_gbp": 30000}),
+    ])
+    def test_batched_tool_matches_per_call_tool(self, tool, args):
+        def per_call(b, s, w, t):
+            return physics.calculate_thermal_load(b, s, w, t)
+
+        batched = agent.execute_tool(tool, args, BUILDINGS, SCENARIOS)
+        looped = agent.execute_tool(tool, args, BUILDINGS, SCENARIOS, calculate_fn=per_call)
+        assert batched == looped
+
+    def test_invalid_building_reported_per_row(self):
+        buildings = {**BUILDINGS, "Broken": {**BUILDINGS["Office Block A"], "height_m": 0}}
+        result = agent.execute_tool(
+            "compare_all_buildings", {"scenario_name": "Glazing Upgrade"}, buildings, SCENARIOS
+        )
+        assert [e["building"] for e in result["calculation_errors"]] == ["Broken"]
+        assert "height_m" in result["calculation_errors"][0]["error"]
+        assert len(result["results"]) == len(BUILDINGS)
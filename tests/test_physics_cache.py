@@ -0,0 +1,117 @@
+"""
+QA Test Suite — core/physics.py result cache
+=============================================
+The cache keys on model-read fields only, reports hit / miss / eviction
+counters, and can be invalidated after a runtime constants change.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import config.constants as constants
+import core.physics as physics
+from config.scenarios import SCENARIOS
+
+BUILDING = {
+    "floor_area_m2": 1200.0,
+    "height_m": 3.5,
+    "glazing_ratio": 0.3,
+    "u_value_wall": 1.6,
+    "u_value_roof": 2.0,
+    "u_value_glazing": 2.8,
+    "baseline_energy_mwh": 250.0,
+}
+SCENARIO = SCENARIOS["Deep Retrofit (All Interventions)"]
+WEATHER = {"temperature_c": 10.5}
+
+
+@pytest.fixture(autouse=True)
+def _fresh_cache():
+    physics.set_cache_size(constants.PHYSICS_CACHE_MAXSIZE)
+    physics.invalidate_cache()
+    yield
+    physics.set_cache_size(constants.PHYSICS_CACHE_MAXSIZE)
+    physics.invalidate_cache()
+
+
+class TestStructuralKey:
+    def test_cosmetic_fields_share_one_entry(self):
+        before = physics.cache_info()
+        a = physics.calculate_thermal_load(
+            {**BUILDING, "id": "a1", "display_name": "North Hall", "postcode": "RG1 1AA"},
+            SCENARIO, WEATHER,
+        )
+        b = physics.calculate_thermal_load(
+            {**BUILDING, "id": "b2", "display_name": "South Hall", "postcode": "RG2 2BB"},
+            SCENARIO, WEATHER,
+        )
+        after = physics.cache_info()
+        assert a == b
+        assert after["misses"] - before["misses"] == 1
+        assert after["hits"] - before["hits"] == 1
+        assert after["size"] == 1
+
+    def test_int_and_float_values_share_one_entry(self):
+        physics.calculate_thermal_load({**BUILDING, "floor_area_m2": 1200}, SCENARIO, WEATHER)
+        physics.calculate_thermal_load(BUILDING, SCENARIO, WEATHER)
+        assert physics.cache_info()["size"] == 1
+
+    def test_returned_dict_is_a_copy(self):
+        first = physics.calculate_thermal_load(BUILDING, SCENARIO, WEATHER)
+        first["scenario_energy_mwh"] = -1
+        again = physics.calculate_thermal_load(BUILDING, SCENARIO, WEATHER)
+        assert again["scenario_energy_mwh"] != -1
+
+
+class TestCacheBounds:
+    def test_evictions_counted_when_full(self):
+        physics.set_cache_size(2)
+        for temp in (1.0, 2.0, 3.0, 4.0):
+            physics.calculate_thermal_load(BUILDING, SCENARIO, {"temperature_c": temp})
+        info = physics.cache_info()
+        assert info["size"] == 2
+        assert info["evictions"] >= 2
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            physics.set_cache_size(-1)
+
+
+class TestInvalidation:
+    def test_constants_change_takes_effect_after_invalidate(self, monkeypatch):
+        # No declared baseline, so the modelled demand is reported unscaled
+        building = {**BUILDING, "baseline_energy_mwh": 0.0}
+        baseline = physics.calculate_thermal_load(building, SCENARIO, WEATHER)
+        monkeypatch.setattr(constants, "HEATING_HOURS_PER_YEAR", constants.HEATING_HOURS_PER_YEAR * 2)
+        assert physics.calculate_thermal_load(building, SCENARIO, WEATHER) == baseline
+
+        physics.invalidate_cache()
+        changed = physics.calculate_thermal_load(building, SCENARIO, WEATHER)
+        assert changed["scenario_energy_mwh"] != baseline["scenario_energy_mwh"]
+
+        monkeypatch.undo()
+        physics.invalidate_cache()
+        assert physics.calculate_thermal_load(building, SCENARIO, WEATHER) == baseline
+
+    def test_fuel_price_change_takes_effect_after_invalidate(self, monkeypatch):
+        building = {**BUILDING, "heating_system": "gas_boiler"}
+        baseline = physics.calculate_thermal_load(building, SCENARIO, WEATHER)
+        monkeypatch.setattr(constants, "GAS_COST_PER_KWH", constants.GAS_COST_PER_KWH * 2)
+        monkeypatch.setattr(constants, "CI_GAS", constants.CI_GAS * 2)
+        assert physics.calculate_thermal_load(building, SCENARIO, WEATHER) == baseline
+
+        physics.invalidate_cache()
+        changed = physics.calculate_thermal_load(building, SCENARIO, WEATHER)
+        assert changed["annual_saving_gbp"] == pytest.approx(2 * baseline["annual_saving_gbp"], rel=1e-3)
+        assert changed["carbon_saving_t"] == pytest.approx(2 * baseline["carbon_saving_t"], rel=1e-3)
+
+        monkeypatch.undo()
+        physics.invalidate_cache()
+        assert physics.calculate_thermal_load(building, SCENARIO, WEATHER) == baseline
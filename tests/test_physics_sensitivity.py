@@ -0,0 +1,132 @@
+"""
+QA Test Suite — core/physics.py sensitivity analysis
+=====================================================
+Batched elasticities must agree with finite differences taken through the
+scalar engine, and the model-constant overrides must not disturb the
+default batch path.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+from core.agent import execute_tool
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+
+BUILDING = next(iter(get_segment_handler(SEGMENT_IDS[0]).building_registry.values()))
+SCENARIO = SCENARIOS["Fabric Upgrade (Insulation)"]
+WEATHER = {"temperature_c": 9.0}
+STEP = 0.05
+
+
+def _scalar(building, scenario, temp=9.0, tariff=0.28, carbon=0.2):
+    return physics._calculate_thermal_load_impl(
+        building, scenario, {"temperature_c": temp},
+        tariff_gbp_per_kwh=tariff, carbon_intensity_kg_per_kwh=carbon,
+    )
+
+
+def _entry(result, name):
+    return next(r for r in result["inputs"] if r["input"] == name)
+
+
+class TestAgainstScalarEngine:
+    @pytest.mark.parametrize("field", ["u_value_wall", "glazing_ratio", "height_m", "baseline_energy_mwh"])
+    def test_building_field_elasticity(self, field):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIO, WEATHER, 0.28, 0.2, rel_step=STEP)
+        x = BUILDING[field]
+        lo = _scalar({**BUILDING, field: x * (1 - STEP)}, SCENARIO)
+        hi = _scalar({**BUILDING, field: x * (1 + STEP)}, SCENARIO)
+        f0 = res["nominal"]["scenario_energy_mwh"]
+        # Scalar outputs are rounded to 0.1 MWh
+        expected = (hi["scenario_energy_mwh"] - lo["scenario_energy_mwh"]) / (2 * STEP * f0)
+        assert _entry(res, field)["elasticity"]["scenario_energy_mwh"] == pytest.approx(expected, abs=2e-3)
+
+    def test_temperature_and_tariff(self):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIO, WEATHER, 0.28, 0.2, rel_step=STEP)
+        # Temperatures move ±1 K, not ±STEP of their °C value
+        lo = _scalar(BUILDING, SCENARIO, temp=9.0 - physics.SENSITIVITY_STEP_K)
+        hi = _scalar(BUILDING, SCENARIO, temp=9.0 + physics.SENSITIVITY_STEP_K)
+        assert _entry(res, "temperature_c")["low"]["scenario_energy_mwh"] == pytest.approx(
+            lo["scenario_energy_mwh"], abs=0.05
+        )
+        assert _entry(res, "temperature_c")["high"]["scenario_energy_mwh"] == pytest.approx(
+            hi["scenario_energy_mwh"], abs=0.05
+        )
+        entry = _entry(res, "temperature_c")
+        per_kelvin = (hi["scenario_energy_mwh"] - lo["scenario_energy_mwh"]) / (
+            2 * physics.SENSITIVITY_STEP_K * res["nominal"]["scenario_energy_mwh"]
+        ) * 100.0
+        assert entry["step"] == "±1 K"
+        assert entry["elasticity"]["scenario_energy_mwh"] == pytest.approx(per_kelvin, abs=0.05)
+        # payback ∝ 1 / tariff
+        e = _entry(res, "tariff_gbp_per_kwh")["elasticity"]["payback_years"]
+        assert e == pytest.approx(-1.0 / (1 - STEP**2), rel=1e-9)
+
+    def test_freezing_temperature_still_has_a_swing(self):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIO, {"temperature_c": 0.0})
+        entry = _entry(res, "temperature_c")
+        assert entry["low"]["scenario_energy_mwh"] > entry["high"]["scenario_energy_mwh"]
+        assert entry["elasticity"]["scenario_energy_mwh"] < 0
+
+    def test_nominal_matches_scalar(self):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIO, WEATHER, 0.28, 0.2)
+        ref = _scalar(BUILDING, SCENARIO)
+        assert res["nominal"]["scenario_energy_mwh"] == pytest.approx(ref["scenario_energy_mwh"], abs=0.05)
+        assert res["nominal"]["scenario_carbon_t"] == pytest.approx(ref["scenario_carbon_t"], abs=0.05)
+
+
+class TestModelConstants:
+    def test_setpoint_override_matches_patched_constant(self, monkeypatch):
+        res = physics.sensitivity_analysis({**BUILDING, "baseline_energy_mwh": 0}, SCENARIO, WEATHER)
+        high = _entry(res, "setpoint_c")["high"]["scenario_energy_mwh"]
+        monkeypatch.setattr(physics, "HEATING_SETPOINT_C", physics.HEATING_SETPOINT_C + physics.SENSITIVITY_STEP_K)
+        ref = physics._calculate_thermal_load_impl(
+            {**BUILDING, "baseline_energy_mwh": 0}, SCENARIO, WEATHER
+        )
+        assert high == pytest.approx(ref["scenario_energy_mwh"], abs=0.05)
+
+    def test_carbon_intensity_is_unit_elastic_for_carbon(self):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIO, WEATHER)
+        e = _entry(res, "carbon_intensity_kg_per_kwh")["elasticity"]
+        assert e["scenario_carbon_t"] == pytest.approx(1.0)
+        assert e["scenario_energy_mwh"] == 0.0
+
+
+class TestShape:
+    def test_sorted_by_rank_metric(self):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIO, WEATHER, rank_by="payback_years")
+        swings = [abs(r["high"]["payback_years"] - r["low"]["payback_years"]) if r["low"]["payback_years"] is not None
+                  and r["high"]["payback_years"] is not None else 0.0 for r in res["inputs"]]
+        assert swings == sorted(swings, reverse=True)
+        assert {r["input"] for r in res["inputs"]} == set(physics.SENSITIVITY_INPUTS)
+
+    def test_baseline_scenario_has_no_payback_elasticity(self):
+        res = physics.sensitivity_analysis(BUILDING, SCENARIOS["Baseline (No Intervention)"], WEATHER)
+        assert res["nominal"]["payback_years"] is None
+        assert _entry(res, "u_value_wall")["elasticity"]["payback_years"] is None
+
+    def test_invalid_inputs_rejected(self):
+        with pytest.raises(ValueError, match="height_m"):
+            physics.sensitivity_analysis({**BUILDING, "height_m": 0}, SCENARIO, WEATHER)
+        with pytest.raises(ValueError, match="rel_step"):
+            physics.sensitivity_analysis(BUILDING, SCENARIO, WEATHER, rel_step=0)
+
+    def test_agent_tool(self):
+        name = next(iter(get_segment_handler(SEGMENT_IDS[0]).building_registry))
+        out = execute_tool(
+            "explain_drivers",
+            {"building_name": name, "scenario_name": "Fabric Upgrade (Insulation)"},
+            get_segment_handler(SEGMENT_IDS[0]).building_registry,
+            SCENARIOS,
+        )
+        assert "error" not in out
+        assert len(out["drivers"]) == len(physics.SENSITIVITY_INPUTS)
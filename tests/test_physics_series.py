@@ -0,0 +1,101 @@
+"""
+QA Test Suite — core/physics.py time-series mode
+=================================================
+simulate_thermal_series must agree with the annual model on a flat year
+with uniform per-hour solar weights, calibrate to declared baselines and aggregate hourly runs into months.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+
+BUILDINGS = [
+    data
+    for seg in SEGMENT_IDS
+    for data in get_segment_handler(seg).building_registry.values()
+]
+MONTHLY_TEMPS = [5.0, 5.2, 7.6, 10.3, 13.8, 16.9, 19.7, 19.2, 15.9, 12.0, 8.1, 5.8]
+
+
+def _series(temps, scenario=None, **kwargs):
+    return physics.simulate_thermal_series(
+        physics.building_columns(BUILDINGS), temps, scenario, **kwargs
+    )
+
+
+class TestAnnualParity:
+    @pytest.mark.parametrize("steps", [12, 8760])
+    @pytest.mark.parametrize("scenario", list(SCENARIOS))
+    def test_flat_year_matches_annual_model(self, steps, scenario):
+        # Parity needs solar gain spread uniformly per hour, like the annual model
+        hours = np.ones(steps) if steps == 8760 else np.array(physics.DAYS_IN_MONTH) * 24.0
+        result = _series(np.full(steps, 8.3), SCENARIOS[scenario], solar_weights=hours)
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(BUILDINGS), physics.scenario_columns([SCENARIOS[scenario]]), 8.3
+        )
+        np.testing.assert_allclose(
+            result["annual_energy_mwh"], grid["scenario_energy_mwh"][:, 0], rtol=1e-9, atol=1e-9
+        )
+
+    def test_seasonal_solar_never_below_annual_model(self):
+        # Summer surplus gains are clamped away, so the default profile only adds heating
+        scenario = SCENARIOS["Deep Retrofit (All Interventions)"]
+        result = _series(np.full(12, 8.3), scenario)
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(BUILDINGS), physics.scenario_columns([scenario]), 8.3
+        )
+        assert (result["annual_energy_mwh"] >= grid["scenario_energy_mwh"][:, 0] - 1e-9).all()
+        assert (result["annual_energy_mwh"] > grid["scenario_energy_mwh"][:, 0] + 1e-6).any()
+
+
+class TestSeasonalShape:
+    def test_baseline_months_sum_to_declared(self):
+        result = _series(MONTHLY_TEMPS)
+        declared = np.array([b["baseline_energy_mwh"] for b in BUILDINGS], dtype=float)
+        np.testing.assert_allclose(result["annual_baseline_mwh"], declared)
+        assert result["energy_mwh"].shape == (len(BUILDINGS), 12)
+
+    def test_winter_exceeds_summer(self):
+        result = _series(MONTHLY_TEMPS)
+        heated = result["heating_mwh"].sum(axis=1) > 0
+        assert (result["energy_mwh"][heated, 0] > result["energy_mwh"][heated, 6]).all()
+
+    def test_retrofit_reduces_every_month(self):
+        result = _series(MONTHLY_TEMPS, SCENARIOS["Deep Retrofit (All Interventions)"])
+        assert (result["energy_mwh"] <= result["baseline_mwh"] + 1e-9).all()
+
+    def test_hourly_run_aggregates_to_months(self):
+        hourly = np.repeat(MONTHLY_TEMPS, np.array(physics.DAYS_IN_MONTH) * 24)
+        result = _series(hourly)
+        monthly = physics.series_to_monthly(result["energy_mwh"])
+        assert monthly.shape == (len(BUILDINGS), 12)
+        np.testing.assert_allclose(monthly.sum(axis=1), result["annual_energy_mwh"])
+
+
+class TestSeriesValidation:
+    def test_unsupported_length_rejected(self):
+        with pytest.raises(ValueError, match="12 monthly or 8760 hourly"):
+            _series(np.full(24, 10.0))
+
+    def test_out_of_range_temperature_rejected(self):
+        temps = list(MONTHLY_TEMPS)
+        temps[3] = 75.0
+        with pytest.raises(ValueError, match="temperature_c=75.0"):
+            _series(temps)
+
+    def test_non_strict_masks_invalid_buildings(self):
+        cols = physics.building_columns([BUILDINGS[0], {**BUILDINGS[0], "height_m": 0}])
+        result = physics.simulate_thermal_series(cols, MONTHLY_TEMPS, strict=False)
+        assert result["valid"].tolist() == [True, False]
+        assert np.isnan(result["energy_mwh"][1]).all()
@@ -0,0 +1,161 @@
+"""
+QA Test Suite — core/pv_matching.py hourly self-consumption
+============================================================
+Direct use, storage, export and import must close the energy balance every
+hour; the battery must respect its capacity, power and losses and agree
+asset by asset with a scalar replay; and the portfolio model must value
+self-consumed PV at the import rate and the rest at the export rate, never
+beating the annual-netting assumption of the physics engine.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+import core.pv_matching as pv
+import core.tariffs as tariffs
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+from core.agent import execute_tool
+from services import tmy
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+TEMPS = tmy.hourly_temperatures(tmy.DEFAULT_TMY_CITY)
+BASELINE = SCENARIOS["Baseline (No Intervention)"]
+ROOF_PV = {**BASELINE, "pv_roof_fraction": 0.3, "install_cost_gbp": 10_000.0}
+
+
+def _profiles(n=3, steps=96, seed=0):
+    rng = np.random.default_rng(seed)
+    hour = np.arange(steps) % 24
+    sun = np.clip(np.sin((hour - 6) / 12 * np.pi), 0, None)
+    generation = rng.uniform(0.5, 2.0, (n, 1)) * sun * rng.uniform(0.5, 1.0, (n, steps))
+    load = rng.uniform(0.2, 1.2, (n, steps))
+    return generation, load
+
+
+def _replay(surplus, deficit, capacity, power, rte):
+    """Scalar reference for one asset."""
+    eta, soc, charged, discharged = rte ** 0.5, 0.0, 0.0, 0.0
+    for s, d in zip(surplus, deficit):
+        c = min(s, power, (capacity - soc) / eta)
+        x = min(d, power, soc * eta)
+        soc += c * eta - x / eta
+        charged += c
+        discharged += x
+    return charged, discharged
+
+
+class TestMatching:
+    def test_balance_without_battery(self):
+        generation, load = _profiles()
+        r = pv.match_profiles(generation, load, hourly=True)
+        np.testing.assert_allclose(r["direct_kwh"], np.minimum(generation, load).sum(axis=1))
+        np.testing.assert_allclose(r["self_consumed_kwh"] + r["export_kwh"], r["generation_kwh"])
+        np.testing.assert_allclose(r["self_consumed_kwh"] + r["import_kwh"], r["load_kwh"])
+        np.testing.assert_allclose(r["import_hourly_kwh"] - r["export_hourly_kwh"], load - generation)
+
+    def test_battery_matches_scalar_replay(self):
+        generation, load = _profiles(n=4)
+        capacity, power = np.array([0.0, 1.0, 3.0, 10.0]), np.array([0.5, 0.5, 1.0, 2.0])
+        r = pv.match_profiles(generation, load, battery_kwh=capacity, battery_power_kw=power,
+                              round_trip_efficiency=0.81, hourly=True)
+        direct = np.minimum(generation, load)
+        for i in range(4):
+            charged, discharged = _replay(generation[i] - direct[i], load[i] - direct[i], capacity[i], power[i], 0.81)
+            assert r["battery_kwh"][i] == pytest.approx(discharged)
+            assert r["losses_kwh"][i] == pytest.approx(charged - discharged)
+        assert (r["soc_hourly_kwh"] <= capacity[:, None] + 1e-9).all()
+        # Stored energy closes: charged × η − discharged / η = final state of charge
+        np.testing.assert_allclose(
+            (r["losses_kwh"] + r["battery_kwh"]) * 0.9 - r["battery_kwh"] / 0.9, r["soc_hourly_kwh"][:, -1], atol=1e-9
+        )
+
+    def test_battery_raises_self_consumption(self):
+        generation, load = _profiles()
+        bare = pv.match_profiles(generation, load)
+        stored = pv.match_profiles(generation, load, battery_kwh=5.0)
+        assert (stored["self_consumed_kwh"] > bare["self_consumed_kwh"]).all()
+        assert (stored["export_kwh"] < bare["export_kwh"]).all()
+        assert (stored["avoided_import_gbp"] > bare["avoided_import_gbp"]).all()
+
+    def test_time_of_use_values_each_hour(self):
+        generation, load = _profiles(steps=8760)
+        rates = tariffs.hourly_rates(tariffs.TARIFF_PRESETS["Economy 7"])
+        r = pv.match_profiles(generation, load, battery_kwh=2.0, import_rate_gbp_per_kwh=rates,
+                              export_rate_gbp_per_kwh=0.04, hourly=True)
+        self_hourly = load - r["import_hourly_kwh"]
+        np.testing.assert_allclose(r["avoided_import_gbp"], self_hourly @ rates)
+        np.testing.assert_allclose(r["export_income_gbp"], r["export_kwh"] * 0.04)
+
+    @pytest.mark.parametrize("kwargs", [
+        {"round_trip_efficiency": 0.0},
+        {"battery_kwh": -1.0},
+        {"export_rate_gbp_per_kwh": -0.1},
+    ])
+    def test_invalid_inputs(self, kwargs):
+        generation, load = _profiles()
+        with pytest.raises(ValueError):
+            pv.match_profiles(generation, load, **kwargs)
+
+
+class TestPortfolio:
+    def test_fixed_generation_spread_and_netting_bound(self):
+        cols = physics.building_columns(BUILDINGS.values())
+        r = pv.simulate_self_consumption(cols, TEMPS, {**BASELINE, "renewable_kwh": 5000.0, "install_cost_gbp": 1.0})
+        np.testing.assert_allclose(r["generation_kwh"], 5000.0)
+        assert (r["self_consumed_kwh"] <= np.minimum(r["generation_kwh"], r["load_kwh"]) + 1e-6).all()
+        assert (r["avoided_import_gbp"] <= r["netted_saving_gbp"] + 1e-6).all()
+
+    def test_roof_pv_matches_physics_generation(self):
+        building = next(iter(BUILDINGS.values()))
+        r = pv.simulate_self_consumption(physics.building_columns([building]), TEMPS, ROOF_PV)
+        annual = physics.calculate_thermal_load(building, ROOF_PV, {"temperature_c": 10.5})
+        assert r["generation_kwh"][0] == pytest.approx(annual["renewable_kwh"], abs=100.0)
+
+    def test_non_electric_heating_exports_everything(self):
+        building = {**next(iter(BUILDINGS.values())), "heating_system": "gas_boiler"}
+        cols = physics.building_columns([building])
+        r = pv.simulate_self_consumption(cols, TEMPS, ROOF_PV)
+        assert r["self_consumed_kwh"][0] == 0.0
+        assert r["pv_value_gbp"][0] == pytest.approx(r["generation_kwh"][0] * pv.SEG_EXPORT_TARIFF_GBP_PER_KWH)
+        with_base = pv.simulate_self_consumption(cols, TEMPS, ROOF_PV, base_load_kwh=50_000.0)
+        assert with_base["self_consumed_kwh"][0] > 0.0
+
+    def test_blocks_and_invalid_rows(self):
+        rows = list(BUILDINGS.values()) + [{**next(iter(BUILDINGS.values())), "city": "Atlantis"}]
+        cols = physics.building_columns(rows)
+        whole = pv.simulate_self_consumption(cols, TEMPS, ROOF_PV, battery_kwh=20.0, strict=False)
+        blocked = pv.simulate_self_consumption(cols, TEMPS, ROOF_PV, battery_kwh=20.0, strict=False, block_size=3)
+        np.testing.assert_allclose(whole["pv_value_gbp"], blocked["pv_value_gbp"])
+        assert whole["valid"].tolist() == [True] * len(BUILDINGS) + [False]
+        with pytest.raises(ValueError):
+            pv.simulate_self_consumption(cols, TEMPS, ROOF_PV)
+
+    def test_agent_tool(self):
+        out = execute_tool("pv_self_consumption", {"roof_fraction": 0.2, "battery_kwh": 10}, BUILDINGS, SCENARIOS)
+        assert set(out["buildings"]) == set(BUILDINGS)
+        row = next(iter(out["buildings"].values()))
+        assert row["pv_value_gbp"] == pytest.approx(row["avoided_import_gbp"] + row["export_income_gbp"], abs=1)
+        assert "error" in execute_tool("pv_self_consumption", {"scenario_name": "Nope"}, BUILDINGS, SCENARIOS)
+
+    def test_agent_tool_prices_time_of_use(self):
+        args = {"roof_fraction": 0.2, "base_load_kwh": 20_000}
+        flat = execute_tool("pv_self_consumption", args, BUILDINGS, SCENARIOS,
+                            tariff=tariffs.resolve_tariff(tariffs.TARIFF_PRESETS["Economy 7"]))
+        tou = execute_tool("pv_self_consumption", args, BUILDINGS, SCENARIOS, tariff=tariffs.TARIFF_PRESETS["Economy 7"])
+        name = next(iter(BUILDINGS))
+        assert tou["buildings"][name]["self_consumed_kwh"] == flat["buildings"][name]["self_consumed_kwh"]
+        assert tou["buildings"][name]["avoided_import_gbp"] != flat["buildings"][name]["avoided_import_gbp"]
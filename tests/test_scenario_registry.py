@@ -0,0 +1,98 @@
+"""
+QA Test Suite — core/scenario_registry.py
+==========================================
+Compiled scenario columns must match the source dicts, keep stable IDs and
+pick up scenarios added or replaced after import.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+from config.scenarios import SCENARIOS
+from core.scenario_registry import REGISTRY, ScenarioRegistry, scenario_columns_for
+
+
+class TestCompiledColumns:
+    def test_columns_match_dict_packing(self):
+        names = list(SCENARIOS)
+        compiled = scenario_columns_for(names)
+        packed = physics.scenario_columns(SCENARIOS[n] for n in names)
+        for field in physics.SCENARIO_FIELDS:
+            np.testing.assert_array_equal(compiled[field], packed[field])
+
+    def test_subset_order_follows_request(self):
+        names = ["Glazing Upgrade", "Baseline (No Intervention)"]
+        cols = scenario_columns_for(names)
+        assert cols["u_glazing_factor"].tolist() == [0.4, 1.0]
+
+    def test_unknown_name_raises_key_error(self):
+        with pytest.raises(KeyError):
+            REGISTRY.columns_for(["No Such Scenario"])
+
+
+class TestIncrementalRegistration:
+    def test_ids_stable_across_growth(self):
+        reg = ScenarioRegistry(capacity=2)
+        first = reg.register("A", {"u_wall_factor": 0.9})
+        for i in range(40):
+            reg.register(f"S{i}", {"install_cost_gbp": i})
+        assert reg.id_of("A") == first
+        assert reg.columns([first])["u_wall_factor"][0] == 0.9
+        assert len(reg) == 41
+
+    def test_re_register_overwrites_in_place(self):
+        reg = ScenarioRegistry({"A": {"install_cost_gbp": 1.0}})
+        sid = reg.id_of("A")
+        assert reg.register("A", {"install_cost_gbp": 2.0}) == sid
+        assert reg.columns()["install_cost_gbp"].tolist() == [2.0]
+
+    def test_missing_fields_take_physics_defaults(self):
+        reg = ScenarioRegistry({"Empty": {}})
+        cols = reg.columns()
+        for field, default in physics.SCENARIO_FIELDS.items():
+            assert cols[field][0] == default
+
+    def test_replaced_source_definition_is_picked_up(self):
+        source = {"A": {"install_cost_gbp": 1.0}}
+        reg = ScenarioRegistry(source)
+        source["A"] = {"install_cost_gbp": 5.0}
+        assert reg.columns_for(["A"], source)["install_cost_gbp"].tolist() == [5.0]
+        # Overlaid, not registered: the registry still serves its own row
+        assert reg.columns()["install_cost_gbp"].tolist() == [1.0]
+
+    def test_injected_scenarios_stay_out_of_shared_registry(self):
+        from core.agent import execute_tool
+
+        before = (REGISTRY.names, REGISTRY.columns())
+        stock = next(iter(SCENARIOS))
+        injected = {stock: {**SCENARIOS[stock], "install_cost_gbp": 1.0}, "Agent Only": {"u_wall_factor": 0.5, "install_cost_gbp": 2000.0}}
+        cols = scenario_columns_for([stock, "Agent Only"], injected)
+        assert cols["install_cost_gbp"][0] == 1.0 and cols["u_wall_factor"][1] == 0.5
+        building = {"floor_area_m2": 500.0, "height_m": 3.0, "glazing_ratio": 0.3, "u_value_wall": 1.5,
+                    "u_value_roof": 1.5, "u_value_glazing": 2.8, "baseline_energy_mwh": 100.0}
+        out = execute_tool("compare_all_buildings", {"scenario_name": "Agent Only"}, {"B": building}, injected)
+        assert "error" not in out
+        assert REGISTRY.names == before[0]
+        for field, col in REGISTRY.columns().items():
+            np.testing.assert_array_equal(col, before[1][field])
+
+    def test_add_scenario_from_json_extends_shared_registry(self):
+        import app.main as main
+
+        ok, name = main._add_scenario_from_json(
+            '{"name": "Heat Pump Only", "u_wall_factor": 1.0, "install_cost_gbp": 12000}'
+        )
+        try:
+            assert ok and name in REGISTRY
+            assert scenario_columns_for([name])["install_cost_gbp"].tolist() == [12000.0]
+        finally:
+            SCENARIOS.pop(name, None)
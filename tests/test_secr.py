@@ -0,0 +1,135 @@
+"""
+QA Test Suite — core/secr.py streaming Scope 1 & 2 aggregation
+===============================================================
+Per-site totals must match calculate_carbon_baseline; results must not
+depend on chunk size or file format; readings must split by year, roll up
+by region with floor-area intensities, and reject or count bad rows; and
+the running state must grow with sites × years, never with rows.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.secr as secr
+from app.compliance import calculate_carbon_baseline
+from services import carbon_intensity
+
+SITES = {"Meridian House": {"region": "South East", "floor_area_m2": 1200.0},
+         "Granary":        {"region": "South East", "floor_area_m2": 800.0},
+         "Apex Hub":       {"region": "North West"}}
+
+
+def _half_hourly(seed: int = 0) -> pd.DataFrame:
+    """Two meters per site over the 2023/24 boundary, half-hourly."""
+    rng = np.random.default_rng(seed)
+    stamps = pd.date_range("2023-12-01", "2024-01-31 23:30", freq="30min")
+    frames = []
+    for k, site in enumerate(SITES):
+        for fuel in ("Electricity", "natural gas") if k < 2 else ("ELEC", "kerosene"):
+            frames.append(pd.DataFrame({
+                "Site_ID": site, "MPAN": f"{site}-{fuel}", "Fuel_Type": fuel,
+                "timestamp": stamps.strftime("%Y-%m-%d %H:%M"), "consumption_kwh": rng.uniform(0, 4, len(stamps)),
+            }))
+    return pd.concat(frames, ignore_index=True)
+
+
+class TestTotals:
+    def test_matches_calculate_carbon_baseline(self):
+        frame = pd.DataFrame({
+            "site": ["A", "A", "A", "A", "B"], "year": 2024,
+            "fuel": ["electricity", "gas", "oil", "lpg", "gas"], "kwh": [50_000, 80_000, 3_000, 1_000, 10_000],
+        })
+        res = secr.aggregate_meter_data(frame)
+        row = res["sites"].set_index("site").loc["A"]
+        ref = calculate_carbon_baseline(elec_kwh=50_000, gas_kwh=80_000, oil_kwh=3_000, lpg_kwh=1_000)
+        assert row["scope1_tco2e"] == pytest.approx(ref["scope1_tco2e"], abs=0.005)
+        assert row["scope2_tco2e"] == pytest.approx(ref["scope2_tco2e"], abs=0.005)
+        assert res["years"]["total_tco2e"].iloc[0] == pytest.approx(res["sites"]["total_tco2e"].sum())
+
+    def test_years_regions_and_intensity(self):
+        data = _half_hourly()
+        res = secr.aggregate_meter_data(data, SITES)
+        sites = res["sites"]
+        assert sorted(sites["year"].unique()) == [2023, 2024]
+        dec = pd.to_datetime(data["timestamp"]).dt.year == 2023
+        assert sites.loc[sites["year"] == 2023, "energy_kwh"].sum() == pytest.approx(data.loc[dec, "consumption_kwh"].sum())
+        apex = sites[sites["site"] == "Apex Hub"]
+        assert (apex["oil_kwh"] > 0).all() and (apex["gas_kwh"] == 0).all()
+        assert (sites["meters"] == 2).all()
+
+        se = res["regions"].set_index(["region", "year"]).loc[("South East", 2024)]
+        se_sites = sites[(sites["region"] == "South East") & (sites["year"] == 2024)]
+        assert se["sites"] == 2 and se["floor_area_m2"] == 2000.0
+        assert se["intensity_kgco2_m2"] == pytest.approx(se_sites["total_tco2e"].sum() * 1000 / 2000)
+        nw = res["regions"].set_index(["region", "year"]).loc[("North West", 2024)]
+        assert np.isnan(nw["intensity_kgco2_m2"])
+
+    def test_annual_grid_factor(self):
+        frame = pd.DataFrame({"site": "A", "year": [2019, 2024], "fuel": "electricity", "kwh": 1000.0})
+        res = secr.aggregate_meter_data(frame, scope2_basis="location")
+        expected = carbon_intensity.annual_factor(np.array([2019, 2024]), "location")
+        np.testing.assert_allclose(res["sites"]["scope2_tco2e"], expected)
+        with pytest.raises(ValueError, match="scope2_basis"):
+            secr.SecrAggregator(scope2_basis="average")
+
+
+class TestStreaming:
+    @pytest.mark.parametrize("fmt", ["csv", "parquet"])
+    def test_file_chunks_match_whole_frame(self, tmp_path, fmt):
+        data = _half_hourly()
+        path = tmp_path / f"amr.{fmt}"
+        if fmt == "csv":
+            data.to_csv(path, index=False)
+        else:
+            pytest.importorskip("pyarrow")
+            data.to_parquet(path, index=False)
+        whole = secr.aggregate_meter_data(data, SITES)
+        streamed = secr.aggregate_meter_data(path, SITES, chunk_rows=1_000)
+        assert streamed["chunks"] == -(-len(data) // 1_000)
+        assert streamed["rows"] == len(data)
+        pd.testing.assert_frame_equal(streamed["sites"], whole["sites"])
+
+    def test_state_bounded_by_sites_and_years(self):
+        agg = secr.SecrAggregator()
+        for seed in range(5):
+            agg.add(_half_hourly(seed))
+        assert len(agg._kwh) == len(SITES) * 2
+        assert agg.rows == 5 * len(_half_hourly())
+
+    def test_bad_rows(self):
+        frame = pd.DataFrame({
+            "site": ["A", "A", "A", None, "A"], "year": [2024, 2024, None, 2024, 2024],
+            "fuel": ["gas", "steam", "gas", "gas", "gas"], "kwh": [10.0, 5.0, 5.0, 5.0, -1.0],
+        })
+        with pytest.raises(ValueError, match="row 2"):
+            secr.aggregate_meter_data(frame)
+        res = secr.aggregate_meter_data(frame, strict=False)
+        assert res["rejected_rows"] == 4
+        assert res["sites"]["gas_kwh"].tolist() == [10.0]
+        with pytest.raises(ValueError, match="year or timestamp"):
+            secr.aggregate_meter_data(frame.drop(columns="year"))
+        with pytest.raises(ValueError, match="format"):
+            list(secr.read_meter_chunks("meters.csv", fmt="xlsx"))
+
+    def test_mixed_timestamp_formats(self):
+        frame = pd.DataFrame({
+            "site": ["A"] * 5, "fuel": ["gas"] * 5, "kwh": [1.0, 2.0, 4.0, 8.0, 16.0],
+            "timestamp": ["2024-01-15", "2024-03-01 00:30", "2023-12-31T23:30:00",
+                          "01 Feb 2024", "2024-06-01T12:00:00+01:00"],
+        })
+        res = secr.aggregate_meter_data(frame)
+        assert res["rejected_rows"] == 0
+        assert res["sites"].set_index("year")["gas_kwh"].to_dict() == {2023: 4.0, 2024: 27.0}
+        frame.loc[3, "timestamp"] = "not a date"
+        with pytest.raises(ValueError, match="row 4: unreadable timestamp 'not a date'"):
+            secr.aggregate_meter_data(frame)
+        assert secr.aggregate_meter_data(frame, strict=False)["rejected_rows"] == 1
@@ -0,0 +1,169 @@
+"""
+QA Test Suite — core/solar.py rooftop PV yield
+===============================================
+Typical-year irradiance must land on published UK and Spanish totals;
+orientation, latitude and hemisphere must move the yield the right way;
+per-site results must be cached; and a ``pv_roof_fraction`` scenario must
+give the same generation on the scalar, batch, series and Monte Carlo paths.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+import core.solar as solar
+from app.segments import SEGMENT_IDS, get_segment_handler
+from core.agent import execute_tool
+from config.scenarios import SCENARIOS
+from core.uncertainty import run_monte_carlo
+from services import tmy
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+BUILDING = next(iter(BUILDINGS.values()))
+ROOF_PV = {**SCENARIOS["Baseline (No Intervention)"], "pv_roof_fraction": 0.4, "install_cost_gbp": 20_000.0}
+LONDON = tmy.city_coordinates("London")
+MADRID = tmy.city_coordinates("Madrid")
+
+
+class TestIrradiance:
+    def test_annual_totals(self):
+        london = solar.hourly_irradiance(*LONDON)
+        assert 950 < london["ghi"].sum() / 1000 < 1100
+        assert 1750 < solar.hourly_irradiance(*MADRID)["ghi"].sum() / 1000 < 2000
+
+    def test_components_close_and_night_is_dark(self):
+        sky = solar.hourly_irradiance(*LONDON)
+        np.testing.assert_allclose(sky["dhi"] + sky["dni"] * np.maximum(sky["cos_zenith"], 0.0), sky["ghi"])
+        assert (sky["ghi"][sky["cos_zenith"] <= 0] == 0).all()
+        assert sky["ghi"][:24].argmax() in (11, 12)          # solar noon in UTC
+
+    def test_invalid_site_rejected(self):
+        with pytest.raises(ValueError):
+            solar.hourly_irradiance(95.0, 0.0)
+        with pytest.raises(ValueError, match="tilt"):
+            solar.plane_of_array(*LONDON, tilt_deg=120.0)
+
+
+class TestYield:
+    def test_uk_specific_yield(self):
+        monthly = solar.specific_yield(*LONDON)
+        assert monthly.shape == (12,)
+        assert 900 < monthly.sum() < 1050
+        assert monthly[5] > 3 * monthly[11]
+
+    def test_orientation_and_latitude(self):
+        south = solar.specific_yield(*LONDON).sum()
+        assert south > solar.specific_yield(*LONDON, tilt_deg=0).sum()
+        assert south > solar.specific_yield(*LONDON, azimuth_deg=90).sum() > solar.specific_yield(*LONDON, azimuth_deg=0).sum()
+        assert solar.specific_yield(*MADRID).sum() > 1.5 * south
+        assert solar.specific_yield(*tmy.city_coordinates("Edinburgh")).sum() < south
+
+    def test_southern_hemisphere_faces_north(self):
+        sydney = tmy.city_coordinates("Sydney")
+        assert solar.specific_yield(*sydney).sum() > solar.specific_yield(*sydney, azimuth_deg=180).sum()
+        monthly = solar.specific_yield(*sydney, tilt_deg=0)
+        assert monthly[0] > monthly[6]
+
+    def test_sites_cached_on_grid(self):
+        solar._specific_yield.cache_clear()
+        lat = np.array([51.501, 51.502, 51.499, 53.48])
+        lon = np.array([-0.120, -0.121, -0.119, -2.24])
+        yields = solar.roof_yield_batch(lat, lon)
+        assert solar._specific_yield.cache_info().currsize == 2
+        assert yields[0] == yields[1] == yields[2] != yields[3]
+
+    def test_site_columns_and_batch_match_scalar(self):
+        rows = [
+            {"latitude": 52.2, "longitude": 0.12},
+            {"city": "Madrid", "pv_azimuth_deg": 135.0},
+            {},
+            {"city": "Atlantis"},
+            {"pv_tilt_deg": 95.0},
+        ]
+        yields = solar.roof_yield_batch(**solar.site_columns(rows))
+        assert yields[:3] == pytest.approx([solar.roof_yield_kwh_per_m2(r) for r in rows[:3]])
+        assert np.isnan(yields[3:]).all()
+        assert yields[2] == solar.roof_yield_kwh_per_m2({"city": tmy.DEFAULT_TMY_CITY})
+        with pytest.raises(ValueError, match="Atlantis"):
+            solar.roof_yield_kwh_per_m2(rows[3])
+
+    def test_building_pv(self):
+        pv = solar.building_pv({"floor_area_m2": 100.0, "city": "London"}, 0.5)
+        assert pv["kwp"] == 10.0
+        assert pv["annual_kwh"] == pytest.approx(sum(pv["monthly_kwh"]), abs=0.5)
+        assert pv["annual_kwh"] == pytest.approx(10.0 * pv["specific_yield_kwh_per_kwp"], abs=1.0)
+        with pytest.raises(ValueError, match="roof_fraction"):
+            solar.building_pv({"floor_area_m2": 100.0}, 1.5)
+
+
+class TestPhysics:
+    def _expected_kwh(self, building, fraction=0.4):
+        return fraction * building["floor_area_m2"] * solar.roof_yield_kwh_per_m2(building)
+
+    def test_scalar_generation_follows_roof_and_site(self):
+        r = physics.calculate_thermal_load(BUILDING, ROOF_PV, {"temperature_c": 10.5})
+        assert r["renewable_kwh"] == pytest.approx(self._expected_kwh(BUILDING), abs=100.0)
+        north = {**BUILDING, "latitude": 57.15, "longitude": -2.09}
+        r_north = physics.calculate_thermal_load(north, ROOF_PV, {"temperature_c": 10.5})
+        assert r_north["renewable_mwh"] < r["renewable_mwh"]
+        fixed = {**ROOF_PV, "renewable_kwh": 5000.0}
+        r_fixed = physics.calculate_thermal_load(BUILDING, fixed, {"temperature_c": 10.5})
+        assert r_fixed["renewable_mwh"] == pytest.approx(r["renewable_mwh"] + 5.0, abs=0.1)
+
+    def test_zero_fraction_is_baseline(self):
+        plain = physics.calculate_thermal_load(BUILDING, SCENARIOS["Baseline (No Intervention)"], {"temperature_c": 10.5})
+        zero = {**SCENARIOS["Baseline (No Intervention)"], "pv_roof_fraction": 0.0}
+        assert physics.calculate_thermal_load(BUILDING, zero, {"temperature_c": 10.5}) == plain
+
+    def test_batch_matches_scalar(self):
+        names = list(BUILDINGS)
+        buildings = [{**BUILDINGS[n], "latitude": 50.5 + k, "longitude": -1.0} for k, n in enumerate(names)]
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(buildings), physics.scenario_columns([ROOF_PV, SCENARIOS["Glazing Upgrade"]]), 10.5
+        )
+        for i, b in enumerate(buildings):
+            assert physics.thermal_load_record(grid, i, 0) == physics.calculate_thermal_load(
+                b, ROOF_PV, {"temperature_c": 10.5}
+            )
+
+    def test_invalid_inputs(self):
+        with pytest.raises(ValueError, match="pv_roof_fraction"):
+            physics.calculate_thermal_load(BUILDING, {**ROOF_PV, "pv_roof_fraction": 1.5}, {"temperature_c": 10.5})
+        cols = physics.building_columns([BUILDING, {**BUILDING, "city": "Atlantis"}])
+        with pytest.raises(ValueError, match="PV site"):
+            physics.calculate_thermal_load_batch(cols, physics.scenario_columns([ROOF_PV]), 10.5)
+        grid = physics.calculate_thermal_load_batch(
+            cols, physics.scenario_columns([ROOF_PV, SCENARIOS["Glazing Upgrade"]]), 10.5, strict=False
+        )
+        assert grid["valid"].tolist() == [[True, True], [False, True]]
+
+    def test_series_and_monte_carlo_agree(self):
+        cols = physics.building_columns([BUILDING])
+        hours = np.array(physics.DAYS_IN_MONTH) * 24.0
+        series = physics.simulate_thermal_series(cols, np.full(12, 10.5), ROOF_PV, solar_weights=hours)
+        grid = physics.calculate_thermal_load_batch(cols, physics.scenario_columns([ROOF_PV]), 10.5)
+        assert series["annual_energy_mwh"][0] == pytest.approx(grid["scenario_energy_mwh"][0, 0], rel=1e-9)
+        assert series["valid"].dtype == bool
+        spec = {"u_value_rel_sd": 0.0, "ach_rel_sd": 0.0, "tariff_rel_sd": 0.0, "carbon_rel_sd": 0.0,
+                "install_cost_low_factor": 1.0, "install_cost_high_factor": 1.0}
+        mc = run_monte_carlo([BUILDING], ["Roof PV"], 10.5, scenarios={"Roof PV": ROOF_PV},
+                             draws=8, spec=spec, workers=1)
+        assert mc["buildings"]["energy_saving_mwh"][0, 0, 1] == pytest.approx(grid["energy_saving_mwh"][0, 0])
+
+    def test_agent_tool(self):
+        name = next(iter(BUILDINGS))
+        out = execute_tool("solar_pv_yield", {"building_name": name, "roof_fraction": 0.4}, BUILDINGS, SCENARIOS)
+        assert out["annual_kwh"] == pytest.approx(self._expected_kwh(BUILDINGS[name]), rel=1e-3)
+        assert "error" in execute_tool("solar_pv_yield", {"building_name": "Nowhere"}, BUILDINGS, SCENARIOS)
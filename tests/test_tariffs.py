@@ -0,0 +1,170 @@
+"""
+QA Test Suite — core/tariffs.py flat and time-of-use schedules
+===============================================================
+Rate matrices must honour band hours, months and midnight wrap; monthly
+and hourly pricing must agree on the same load; and a schedule passed to
+the physics engine, the cash-flow model or the agent must price each
+asset's own modelled electricity meter, identically on every path.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+import core.tariffs as tariffs
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.constants import HEATING_DIURNAL_PROFILE, HEATING_MONTHLY_PROFILE
+from config.scenarios import SCENARIOS
+from core.agent import execute_tool
+from core.cashflow import CashFlowModel
+from core.scenario_registry import scenario_columns_for
+from services import tmy
+
+BUILDINGS = {
+    name: data
+    for seg in SEGMENT_IDS
+    for name, data in get_segment_handler(seg).building_registry.items()
+}
+E7 = tariffs.TARIFF_PRESETS["Economy 7"]
+WINTER_PEAK = tariffs.TARIFF_PRESETS["Winter peak (DUoS red band)"]
+
+
+def _hourly_from_monthly(monthly_kwh, diurnal=HEATING_DIURNAL_PROFILE):
+    days = np.array(tariffs.DAYS_IN_MONTH)
+    shape = np.asarray(diurnal, dtype=float) / sum(diurnal)
+    per_day = np.asarray(monthly_kwh, dtype=float)[..., :, None] / days[:, None] * shape
+    return np.concatenate([np.tile(per_day[..., m, :], d) for m, d in enumerate(days)], axis=-1)
+
+
+class TestSchedules:
+    def test_flat_rate_everywhere(self):
+        flat = tariffs.flat_tariff(0.25)
+        assert (tariffs.rate_matrix(flat) == 0.25).all()
+        assert tariffs.effective_rate(flat) == pytest.approx(0.25)
+
+    def test_band_hours_months_and_wrap(self):
+        night = tariffs.tou_tariff(0.30, [{"start_hour": 22, "end_hour": 6, "rate_gbp_per_kwh": 0.10}])
+        rates = tariffs.rate_matrix(night)
+        assert rates[0, 23] == rates[0, 0] == rates[0, 5] == 0.10
+        assert rates[0, 6] == rates[0, 21] == 0.30
+        peak = tariffs.rate_matrix(WINTER_PEAK)
+        assert peak[0, 17] == 0.48 and peak[6, 17] == 0.26
+
+    def test_hourly_rates_layout(self):
+        hourly = tariffs.hourly_rates(WINTER_PEAK)
+        assert hourly.shape == (8760,)
+        assert hourly[17] == 0.48                        # 1 Jan 17:00
+        assert hourly[181 * 24 + 17] == 0.26             # 1 Jul 17:00
+
+    @pytest.mark.parametrize("bad", [
+        {"rate_gbp_per_kwh": 0.0},
+        {"rate_gbp_per_kwh": 0.2, "bands": [{"start_hour": 5, "end_hour": 5, "rate_gbp_per_kwh": 0.1}]},
+        {"rate_gbp_per_kwh": 0.2, "bands": [{"start_hour": 1, "end_hour": 2, "rate_gbp_per_kwh": 0.1, "months": [13]}]},
+        {"rate_gbp_per_kwh": 0.2, "escalation": -1.0},
+    ])
+    def test_invalid_schedules_rejected(self, bad):
+        with pytest.raises(ValueError):
+            tariffs.validate_schedule(bad)
+
+
+class TestProfilePricing:
+    def test_monthly_and_hourly_paths_agree(self):
+        monthly = np.array([HEATING_MONTHLY_PROFILE, np.full(12, 100.0)])
+        for schedule in (E7, WINTER_PEAK):
+            np.testing.assert_allclose(
+                tariffs.effective_rate(schedule, monthly),
+                tariffs.effective_rate(schedule, _hourly_from_monthly(monthly)),
+            )
+
+    def test_load_shape_changes_the_rate(self):
+        overnight = np.zeros(24)
+        overnight[:6] = 1.0
+        assert tariffs.effective_rate(E7, diurnal=overnight) == pytest.approx(0.15)
+        # Heating runs 06–22, so one of its 16 hours falls in the 00–07 night band
+        assert tariffs.effective_rate(E7) == pytest.approx((15 * 0.32 + 0.15) / 16)
+
+    def test_vectorised_over_assets(self):
+        rng = np.random.default_rng(0)
+        loads = rng.uniform(0, 5, (3000, 8760))
+        costs = tariffs.effective_rate(WINTER_PEAK, loads) * loads.sum(axis=1)
+        rates = tariffs.hourly_rates(WINTER_PEAK)
+        np.testing.assert_allclose(costs[:5], [(row * rates).sum() for row in loads[:5]])
+        assert np.isnan(tariffs.effective_rate(E7, np.zeros((2, 12)))).sum() == 0
+
+    def test_meter_rate_prices_base_load_round_the_clock(self):
+        heating = np.array(HEATING_MONTHLY_PROFILE) * 1200.0
+        assert tariffs.meter_rate(E7, heating) == pytest.approx(tariffs.effective_rate(E7))
+        flat = np.full(12, 100.0)
+        assert tariffs.meter_rate(E7, flat, flat) == pytest.approx((17 * 0.32 + 7 * 0.15) / 24)
+        mixed = tariffs.meter_rate(WINTER_PEAK, np.stack([heating + flat, heating]), flat)
+        assert mixed.shape == (2,) and mixed[0] != mixed[1]
+        # No net consumption falls back to the fixed-profile rate
+        assert tariffs.meter_rate(E7, np.zeros(12)) == pytest.approx(tariffs.effective_rate(E7))
+        with pytest.raises(ValueError):
+            tariffs.meter_rate(E7, np.ones(24))
+
+    def test_price_index(self):
+        np.testing.assert_allclose(
+            tariffs.price_index(tariffs.flat_tariff(0.2, escalation=0.1), 3), [1.0, 1.1, 1.21]
+        )
+        curve = tariffs.flat_tariff(0.2, escalation=[0.05, 0.0, -0.02])
+        np.testing.assert_allclose(
+            tariffs.price_index(curve, 5), np.cumprod([1.0, 1.05, 1.0, 0.98, 0.98])
+        )
+
+
+class TestConsistency:
+    def test_physics_prices_each_assets_meter(self):
+        building = {**next(iter(BUILDINGS.values())), "base_load_mwh": 200.0}
+        rows = [building, {**building, "heating_system": "gas_boiler"}]
+        cols = physics.building_columns(rows)
+        names = [s for s in SCENARIOS if not s.startswith("Baseline")]
+        meters = physics.electricity_meters(cols, scenario_columns_for(names), 10.5)
+        baseline_rate, scenario_rate = physics.electricity_rates(meters, E7)
+        assert baseline_rate.shape == (2, 1) and scenario_rate.shape == (2, len(names))
+        # The gas-heated meter is base load only, so it is priced round the clock
+        assert baseline_rate[1, 0] == pytest.approx((17 * 0.32 + 7 * 0.15) / 24)
+        assert baseline_rate[0, 0] != pytest.approx(baseline_rate[1, 0])
+        grid = physics.calculate_thermal_load_batch(cols, scenario_columns_for(names), 10.5, WINTER_PEAK)
+        for i, b in enumerate(rows):
+            for j, name in enumerate(names):
+                scalar = physics.calculate_thermal_load(b, SCENARIOS[name], {"temperature_c": 10.5}, WINTER_PEAK)
+                assert scalar["annual_saving_gbp"] == pytest.approx(grid["annual_saving_gbp"][i, j], abs=0.5)
+
+    def test_cash_flow_model_prices_meters_like_the_grid(self):
+        building = {**next(iter(BUILDINGS.values())), "base_load_mwh": 200.0}
+        cols = physics.building_columns([building, {**building, "heating_system": "gas_boiler"}])
+        sc = scenario_columns_for([s for s in SCENARIOS if not s.startswith("Baseline")])
+        grid = physics.calculate_thermal_load_batch(cols, sc, 10.5)
+        model = CashFlowModel(grid, electricity_meters=physics.electricity_meters(cols, sc, 10.5))
+        priced = physics.calculate_thermal_load_batch(cols, sc, 10.5, WINTER_PEAK)
+        res = model.evaluate({}, tariff_gbp_per_kwh=WINTER_PEAK)
+        np.testing.assert_allclose(res["annual_saving_gbp"], priced["annual_saving_gbp"], rtol=1e-9)
+        # Without meters the schedule falls back to its fixed-profile rate
+        fallback = CashFlowModel(grid).evaluate({}, tariff_gbp_per_kwh=WINTER_PEAK)
+        assert fallback["tariff_gbp_per_kwh"] == pytest.approx(tariffs.effective_rate(WINTER_PEAK))
+
+    def test_cash_flow_follows_schedule_escalation(self):
+        grid = {
+            "install_cost_gbp": np.array([10_000.0]), "annual_saving_gbp": np.array([1.0]),
+            "energy_saving_mwh": np.array([10.0]), "renewable_mwh": np.array([0.0]),
+        }
+        schedule = tariffs.flat_tariff(0.20, escalation=0.05)
+        res = CashFlowModel(grid).evaluate({"term_years": 3}, tariff_gbp_per_kwh=schedule)
+        np.testing.assert_allclose(res["flows"][0, 1:], 2_000.0 * np.array([1.0, 1.05, 1.05 ** 2]))
+
+    def test_agent_accepts_schedule(self):
+        name = next(iter(BUILDINGS))
+        args = {"building_name": name, "scenario_name": "Fabric Upgrade (Insulation)"}
+        by_schedule = execute_tool("run_scenario", args, BUILDINGS, SCENARIOS, tariff=E7)
+        weather = {"temperature_c": tmy.default_annual_temperature()}
+        direct = physics.calculate_thermal_load(BUILDINGS[name], SCENARIOS[args["scenario_name"]], weather, E7)
+        assert by_schedule["annual_saving_gbp"] == direct["annual_saving_gbp"]
@@ -0,0 +1,96 @@
+"""
+QA Test Suite — services/tmy.py offline typical-year store
+===========================================================
+The bundled store must cover every selectable city, reproduce its monthly
+normals, be memory-mapped, and regenerate byte-for-byte from the module.
+"""
+from __future__ import annotations
+
+import os
+import sys
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+from services import tmy
+from services.location import CITIES
+
+
+class TestBundledStore:
+    def test_every_city_is_covered(self):
+        assert set(tmy.available_cities()) == set(CITIES)
+
+    def test_store_is_memory_mapped(self):
+        data = tmy._store()[0]
+        assert isinstance(data, np.memmap)
+        assert data.dtype == np.int16
+
+    @pytest.mark.parametrize("city", ["Reading, Berkshire", "Helsinki", "Sydney", "Dubai"])
+    def test_monthly_means_reproduce_normals(self, city):
+        normals = np.array(tmy._MONTHLY_NORMALS[city][0])
+        np.testing.assert_allclose(tmy.monthly_mean_temperatures(city), normals, atol=0.06)
+
+    def test_hourly_series_has_diurnal_cycle(self):
+        temps = tmy.hourly_temperatures("London").reshape(365, 24)
+        assert temps.shape == (365, 24)
+        assert temps[:, 15].mean() > temps[:, 3].mean() + 2.0
+
+    def test_regeneration_is_deterministic(self, tmp_path):
+        rebuilt = np.load(tmy.build_store(tmp_path))
+        np.testing.assert_array_equal(rebuilt, np.load(tmy.TMY_ARRAY_PATH))
+
+
+class TestLookups:
+    def test_nearest_city(self):
+        assert tmy.nearest_city(51.46, -0.97) == "Reading, Berkshire"
+        assert tmy.nearest_city(-33.9, 151.2) == "Sydney"
+
+    def test_unknown_city_rejected(self):
+        with pytest.raises(ValueError, match="No typical-year weather"):
+            tmy.hourly_temperatures("Atlantis")
+
+    def test_leap_day_reads_28_february(self):
+        feb28 = tmy.temperature_at("London", datetime(2023, 2, 28, 12))
+        assert tmy.temperature_at("London", datetime(2024, 2, 29, 12)) == feb28
+        assert tmy.temperature_at("London", datetime(2024, 3, 1, 0)) == tmy.temperature_at(
+            "London", datetime(2023, 3, 1, 0)
+        )
+
+    def test_aware_times_read_london_clock(self):
+        # 23:30 UTC on 30 June is 00:30 BST on 1 July; in January UTC is GMT
+        summer = datetime(2023, 6, 30, 23, 30, tzinfo=timezone.utc)
+        assert tmy.temperature_at("London", summer) == tmy.temperature_at("London", datetime(2023, 7, 1, 0))
+        winter = datetime(2023, 1, 10, 12, tzinfo=timezone.utc)
+        assert tmy.temperature_at("London", winter) == tmy.temperature_at("London", datetime(2023, 1, 10, 12))
+
+    def test_aware_times_read_each_citys_own_clock(self):
+        # 06:00 UTC is 15:00 in Tokyo, its warmest hour, not the 06:00 morning value
+        assert tmy.city_timezone("Tokyo") == "Asia/Tokyo"
+        noon_utc = datetime(2023, 7, 1, 6, tzinfo=timezone.utc)
+        assert tmy.temperature_at("Tokyo", noon_utc) == tmy.temperature_at("Tokyo", datetime(2023, 7, 1, 15))
+        assert tmy.city_timezone("Reading, Berkshire") == tmy.TMY_TIMEZONE
+
+    def test_utc_series_shifts_the_local_clock(self):
+        local = tmy.hourly_temperatures("Tokyo")
+        utc = tmy.hourly_temperatures_utc("Tokyo")
+        # Japan keeps UTC+9 all year, so UTC hour h reads local hour h + 9
+        np.testing.assert_array_equal(utc[:-9], local[9:])
+        assert utc.reshape(365, 24).mean(axis=0).argmax() == 15 - 9
+        # London: GMT in January, so the first weeks read unshifted
+        np.testing.assert_array_equal(
+            tmy.hourly_temperatures_utc("London")[:24 * 28], tmy.hourly_temperatures("London")[:24 * 28]
+        )
+
+    def test_default_annual_temperature_falls_back_without_store(self, monkeypatch):
+        monkeypatch.setattr(tmy, "TMY_INDEX_PATH", tmy.TMY_DATA_DIR / "missing.json")
+        tmy._store.cache_clear()
+        try:
+            assert tmy.default_annual_temperature() == tmy.FALLBACK_TEMP_C
+        finally:
+            monkeypatch.undo()
+            tmy._store.cache_clear()
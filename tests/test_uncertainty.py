@@ -0,0 +1,116 @@
+"""
+QA Test Suite — core/uncertainty.py Monte Carlo engine
+=======================================================
+With zero spread the draws must collapse onto the deterministic engine;
+with spread, quantiles must be ordered, reproducible and independent of
+how blocks are scheduled.
+"""
+from __future__ import annotations
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+_root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _root not in sys.path:
+    sys.path.insert(0, _root)
+
+import core.physics as physics
+import core.uncertainty as uncertainty
+from app.segments import SEGMENT_IDS, get_segment_handler
+from config.scenarios import SCENARIOS
+from core.finance import level_npv
+
+BUILDINGS = [
+    data
+    for seg in SEGMENT_IDS
+    for data in get_segment_handler(seg).building_registry.values()
+]
+NAMES = list(SCENARIOS)
+NO_SPREAD = {
+    "u_value_rel_sd": 0.0, "ach_rel_sd": 0.0, "tariff_rel_sd": 0.0, "carbon_rel_sd": 0.0,
+    "install_cost_low_factor": 1.0, "install_cost_high_factor": 1.0,
+}
+
+
+class TestDeterministicLimit:
+    def test_zero_spread_matches_batch_engine(self):
+        result = uncertainty.run_monte_carlo(BUILDINGS, NAMES, 10.5, draws=5, spec=NO_SPREAD, workers=1)
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(BUILDINGS), physics.scenario_columns(SCENARIOS.values()), 10.5
+        )
+        for metric in ("energy_saving_mwh", "carbon_saving_t", "annual_saving_gbp", "install_cost_gbp"):
+            p50 = result["buildings"][metric][..., 1]
+            np.testing.assert_allclose(p50, grid[metric], rtol=1e-12, atol=1e-9)
+
+    def test_mixed_fuels_and_base_load_match_batch_engine(self):
+        systems = ("gas_boiler", "oil_boiler", "ashp")
+        rows = [
+            {**b, "heating_system": systems[i % len(systems)], "base_load_mwh": 0.2 * b["baseline_energy_mwh"]}
+            for i, b in enumerate(BUILDINGS)
+        ]
+        result = uncertainty.run_monte_carlo(rows, NAMES, 10.5, draws=3, spec=NO_SPREAD, workers=1)
+        grid = physics.calculate_thermal_load_batch(
+            physics.building_columns(rows), physics.scenario_columns(SCENARIOS.values()), 10.5
+        )
+        for metric in ("energy_saving_mwh", "carbon_saving_t", "annual_saving_gbp"):
+            np.testing.assert_allclose(result["buildings"][metric][..., 1], grid[metric], rtol=1e-12, atol=1e-9)
+
+    def test_npv_is_level_annuity_npv(self):
+        result = uncertainty.run_monte_carlo(
+            BUILDINGS[:1], ["Glazing Upgrade"], 10.5, draws=1, spec=NO_SPREAD,
+            discount_rate=0.05, term_years=10, workers=1,
+        )
+        cell = uncertainty.summarise_cell(result, 0, 0)
+        expected = level_npv(15000.0, cell["annual_saving_gbp"]["p50"], 0.05, 10)
+        assert cell["npv_gbp"]["p50"] == pytest.approx(expected)
+
+
+class TestSampling:
+    def test_quantiles_are_ordered(self):
+        result = uncertainty.run_monte_carlo(BUILDINGS, NAMES, 10.5, draws=400, workers=1)
+        for metric, q in result["buildings"].items():
+            finite = np.isfinite(q).all(axis=-1)
+            assert (q[finite][:, 0] <= q[finite][:, 1]).all(), metric
+            assert (q[finite][:, 1] <= q[finite][:, 2]).all(), metric
+
+    def test_seeded_runs_are_reproducible(self):
+        a = uncertainty.run_monte_carlo(BUILDINGS, NAMES, 10.5, draws=200, seed=7, workers=1)
+        b = uncertainty.run_monte_carlo(BUILDINGS, NAMES, 10.5, draws=200, seed=7, workers=1)
+        for metric in uncertainty.METRICS:
+            np.testing.assert_array_equal(a["portfolio"][metric], b["portfolio"][metric])
+
+    def test_explicit_cost_range_bounds_install_cost(self):
+        result = uncertainty.run_monte_carlo(
+            BUILDINGS[:3], ["Fabric Upgrade (Insulation)"], 10.5, draws=500,
+            cost_ranges={"Fabric Upgrade (Insulation)": (20_000, 30_000)}, workers=1,
+        )
+        q = result["buildings"]["install_cost_gbp"]
+        assert (q >= 20_000).all() and (q <= 30_000).all()
+
+    def test_baseline_never_pays_back(self):
+        result = uncertainty.run_monte_carlo(
+            BUILDINGS[:2], ["Baseline (No Intervention)"], 10.5, draws=50, workers=1
+        )
+        assert uncertainty.summarise_portfolio(result, 0)["payback_years"]["p50"] is None
+
+
+class TestValidation:
+    def test_invalid_building_masked(self):
+        bad = {**BUILDINGS[0], "height_m": 0}
+        result = uncertainty.run_monte_carlo([BUILDINGS[0], bad], NAMES, 10.5, draws=20, workers=1)
+        assert result["valid"].tolist() == [True, False]
+        assert np.isnan(result["buildings"]["npv_gbp"][1]).all()
+
+    def test_bad_cost_range_rejected(self):
+        with pytest.raises(ValueError, match="Install cost range"):
+            uncertainty.run_monte_carlo(
+                BUILDINGS[:1], ["Glazing Upgrade"], 10.5, draws=5,
+                cost_ranges={"Glazing Upgrade": (9_000, 1_000)}, workers=1,
+            )
+
+    def test_draws_must_be_positive(self):
+        with pytest.raises(ValueError, match="draws"):
+            uncertainty.run_monte_carlo(BUILDINGS, NAMES, 10.5, draws=0)